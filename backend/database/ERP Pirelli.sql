@@ -238,6 +238,7 @@ CREATE TABLE IF NOT EXISTS activos_produccion (
     id_area INT,
     fecha_adquisicion DATE,
     estado ENUM('operativo', 'mantenimiento', 'baja') DEFAULT 'operativo',
+    capacidad_diaria INT,
     FOREIGN KEY (id_area) REFERENCES areas_trabajo(id_area) ON DELETE SET NULL
 );
 
@@ -260,4 +261,47 @@ CREATE TABLE IF NOT EXISTS configuracion_sistema (
     parametro VARCHAR(50) UNIQUE NOT NULL,
     valor TEXT,
     descripcion TEXT
-);
\ No newline at end of file
+);
+-- Tabla de KPI Mensual (rollup de métricas por año, mes, métrica y dimensión)
+CREATE TABLE IF NOT EXISTS kpi_mensual (
+    anio INT NOT NULL,
+    mes INT NOT NULL,
+    metrica VARCHAR(50) NOT NULL,
+    dimension VARCHAR(50) NOT NULL DEFAULT 'total',
+    valor DECIMAL(14,2) NOT NULL DEFAULT 0,
+    registros INT NOT NULL DEFAULT 0,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (anio, mes, metrica, dimension)
+);
+
+-- Caché de costos estándar (equivale a la migración database/migrations/003_costos.sql)
+CREATE TABLE IF NOT EXISTS costos_materiales (
+    id_material INT PRIMARY KEY,
+    precio_promedio DECIMAL(12,4) NOT NULL,
+    precio_ultimo DECIMAL(12,4) NOT NULL,
+    cantidad_comprada INT NOT NULL DEFAULT 0,
+    fecha_ultima_compra DATE,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_material) REFERENCES materiales(id_material) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS costos_productos (
+    id_producto INT PRIMARY KEY,
+    costo_promedio DECIMAL(12,4) NOT NULL DEFAULT 0,
+    costo_ultimo DECIMAL(12,4) NOT NULL DEFAULT 0,
+    materiales INT NOT NULL DEFAULT 0,
+    materiales_sin_precio INT NOT NULL DEFAULT 0,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_producto) REFERENCES productos(id_producto) ON DELETE CASCADE
+);
+
+-- Índices por fecha (y estado) para los filtros por rango del dashboard y los listados
+-- (equivalen a la migración database/migrations/001_indices_fechas.sql)
+CREATE INDEX idx_ventas_fecha_estado ON ventas (fecha, estado);
+CREATE INDEX idx_ordenes_produccion_fecha_estado ON ordenes_produccion (fecha_inicio, estado);
+CREATE INDEX idx_ordenes_compra_fecha_estado ON ordenes_compra (fecha, estado);
+CREATE INDEX idx_nominas_fecha_pago ON nominas (fecha_pago);
+CREATE INDEX idx_mantenimiento_fecha ON mantenimiento (fecha);
+CREATE INDEX idx_control_calidad_fecha ON control_calidad (fecha);
+CREATE INDEX idx_incidentes_fecha ON incidentes (fecha);
+CREATE INDEX idx_asistencia_fecha ON asistencia (fecha);
@@ -0,0 +1,12 @@
+-- Migración 001: índices de fecha (y estado) para filtros por rango y orden por fecha
+-- Los filtros usan rangos semiabiertos (fecha >= inicio AND fecha < fin), por lo que
+-- estos índices sirven tanto al dashboard como a los listados paginados.
+
+CREATE INDEX idx_ventas_fecha_estado ON ventas (fecha, estado);
+CREATE INDEX idx_ordenes_produccion_fecha_estado ON ordenes_produccion (fecha_inicio, estado);
+CREATE INDEX idx_ordenes_compra_fecha_estado ON ordenes_compra (fecha, estado);
+CREATE INDEX idx_nominas_fecha_pago ON nominas (fecha_pago);
+CREATE INDEX idx_mantenimiento_fecha ON mantenimiento (fecha);
+CREATE INDEX idx_control_calidad_fecha ON control_calidad (fecha);
+CREATE INDEX idx_incidentes_fecha ON incidentes (fecha);
+CREATE INDEX idx_asistencia_fecha ON asistencia (fecha);
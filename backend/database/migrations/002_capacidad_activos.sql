@@ -0,0 +1,5 @@
+-- Migración 002: capacidad diaria de los activos de producción
+-- Unidades que un activo fabrica por día; la usa el programador de la producción
+-- (si es NULL se toma una capacidad por defecto).
+
+ALTER TABLE activos_produccion ADD COLUMN capacidad_diaria INT;
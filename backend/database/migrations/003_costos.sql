@@ -0,0 +1,25 @@
+-- Migración 003: caché de costos estándar
+-- costos_materiales guarda el precio medio ponderado y el último precio de las compras
+-- recibidas de cada material; costos_productos, el costo de cada producto según su receta.
+-- Se mantienen de forma incremental al confirmar cambios de recetas y órdenes de compra
+-- (utils/costing.py); `flask --app main costos rebuild` las reconstruye por completo.
+
+CREATE TABLE IF NOT EXISTS costos_materiales (
+    id_material INT PRIMARY KEY,
+    precio_promedio DECIMAL(12,4) NOT NULL,
+    precio_ultimo DECIMAL(12,4) NOT NULL,
+    cantidad_comprada INT NOT NULL DEFAULT 0,
+    fecha_ultima_compra DATE,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_material) REFERENCES materiales(id_material) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS costos_productos (
+    id_producto INT PRIMARY KEY,
+    costo_promedio DECIMAL(12,4) NOT NULL DEFAULT 0,
+    costo_ultimo DECIMAL(12,4) NOT NULL DEFAULT 0,
+    materiales INT NOT NULL DEFAULT 0,
+    materiales_sin_precio INT NOT NULL DEFAULT 0,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_producto) REFERENCES productos(id_producto) ON DELETE CASCADE
+);
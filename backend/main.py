@@ -3,6 +3,7 @@ from config import create_app, db
 from routes.auth import auth_bp
 from routes.products import products_bp
 from routes.sales import ventas_bp
+from routes.sales_details import sales_details_bp
 from routes.clients import clients_bp
 from routes.employees import employees_bp
 from routes.attendance import attendance_bp
@@ -17,6 +18,7 @@ from routes.work_areas import work_areas_bp
 from routes.suppliers import suppliers_bp
 from routes.quality_control import quality_control_bp
 from routes.payroll import payroll_bp
+from routes.payroll_runs import payroll_runs_bp
 from routes.r_d_projects import r_d_projects_bp
 from routes.legal_regulations import legal_regulations_bp
 from routes.incidents import incidents_bp
@@ -25,16 +27,51 @@ from routes.maintenance import maintenance_bp
 from routes.system_configuration import system_configuration_bp
 from routes.users import users_bp
 from routes.dashboard import dashboard_bp
+from routes.imports import imports_bp
+from routes.exports import exports_bp
+from routes.changes import changes_bp
+from routes.mrp import mrp_bp
+from routes.scheduling import scheduling_bp
+from routes.costs import costs_bp
+from routes.metrics import metrics_bp
+from utils.kpi_rollup import kpi_cli, register_rollup_listeners
+from utils.costing import costs_cli, register_cost_listeners
+from utils.migrations import schema_cli
+from utils.db_pool import pool_cli
+from utils.benchmark import bench_cli
+from utils.scheduler import production_scheduler, schedule_cli
 from flask_cors import CORS
 
 app = create_app()
-CORS(app)
+CORS(app, expose_headers=['X-Next-Cursor'])
+
+# Rollup mensual de KPIs: mantenimiento incremental y comando de reconstrucción
+register_rollup_listeners()
+app.cli.add_command(kpi_cli)
+
+# Costos estándar: recálculo incremental de los productos afectados y comando de reconstrucción
+register_cost_listeners()
+app.cli.add_command(costs_cli)
+
+# Migraciones versionadas del esquema (database/migrations)
+app.cli.add_command(schema_cli)
+
+# Programación de la producción: replan incremental al confirmar cambios y benchmark
+production_scheduler.init_app(app, db.session)
+app.cli.add_command(schedule_cli)
+
+# Pool de conexiones: prueba de carga contra un servidor en marcha (métricas en /api/_metrics)
+app.cli.add_command(pool_cli)
+
+# Benchmark de los endpoints principales con datos sintéticos (bench generate / run / compare)
+app.cli.add_command(bench_cli)
 
 # Registrar blueprints mediante una lista para mejor organización
 blueprints = [
     (auth_bp, '/api'),
     (products_bp, '/api'),
     (ventas_bp, '/api'),
+    (sales_details_bp, '/api'),
     (clients_bp, '/api'),
     (employees_bp, '/api'),
     (attendance_bp, '/api'),
@@ -49,6 +86,7 @@ blueprints = [
     (suppliers_bp, '/api/proveedores'),
     (quality_control_bp, '/api'),
     (payroll_bp, '/api'),
+    (payroll_runs_bp, '/api'),
     (r_d_projects_bp, '/api'),
     (legal_regulations_bp, '/api'),
     (incidents_bp, '/api'),
@@ -56,7 +94,14 @@ blueprints = [
     (maintenance_bp, '/api'),
     (system_configuration_bp, '/api'),
     (users_bp, '/api'),
-    (dashboard_bp, '/api')
+    (dashboard_bp, '/api'),
+    (imports_bp, '/api'),
+    (exports_bp, '/api'),
+    (changes_bp, '/api'),
+    (mrp_bp, '/api'),
+    (scheduling_bp, '/api'),
+    (costs_bp, '/api'),
+    (metrics_bp, '/api')
 ]
 
 # Registrar cada blueprint con su prefijo correspondiente
@@ -68,4 +113,5 @@ with app.app_context():
     db.create_all()
 
 if __name__ == '__main__':
+    # Servidor de desarrollo; en producción usar wsgi.py
     app.run(debug=True, port=5000)
@@ -50,6 +50,8 @@ class Empleado(db.Model):
 # Asistencia
 class Asistencia(db.Model):
     __tablename__ = 'asistencia'
+    __table_args__ = (db.Index('idx_asistencia_fecha', 'fecha'),
+                      db.UniqueConstraint('id_empleado', 'fecha'))
     id_asistencia = db.Column(db.Integer, primary_key=True)
     id_empleado = db.Column(db.Integer, db.ForeignKey('empleados.id_empleado'), nullable=False)
     fecha = db.Column(db.Date, nullable=False)
@@ -93,6 +95,7 @@ class Inventario(db.Model):
 # Orden de Compra
 class OrdenCompra(db.Model):
     __tablename__ = 'ordenes_compra'
+    __table_args__ = (db.Index('idx_ordenes_compra_fecha_estado', 'fecha', 'estado'),)
     id_orden_compra = db.Column(db.Integer, primary_key=True)
     id_proveedor = db.Column(db.Integer, db.ForeignKey('proveedores.id_proveedor'), nullable=False)
     id_usuario = db.Column(db.Integer, db.ForeignKey('usuarios.id_usuario'), nullable=False)
@@ -128,6 +131,7 @@ class Producto(db.Model):
 # Orden de Producción
 class OrdenProduccion(db.Model):
     __tablename__ = 'ordenes_produccion'
+    __table_args__ = (db.Index('idx_ordenes_produccion_fecha_estado', 'fecha_inicio', 'estado'),)
     id_orden_produccion = db.Column(db.Integer, primary_key=True)
     id_producto = db.Column(db.Integer, db.ForeignKey('productos.id_producto'), nullable=False)
     cantidad = db.Column(db.Integer, nullable=False)
@@ -161,6 +165,7 @@ class RecetaProduccion(db.Model):
 # Control de Calidad
 class ControlCalidad(db.Model):
     __tablename__ = 'control_calidad'
+    __table_args__ = (db.Index('idx_control_calidad_fecha', 'fecha'),)
     id_control = db.Column(db.Integer, primary_key=True)
     id_orden_produccion = db.Column(db.Integer, db.ForeignKey('ordenes_produccion.id_orden_produccion'), nullable=False)
     fecha = db.Column(db.Date, nullable=False)
@@ -184,6 +189,7 @@ class Cliente(db.Model):
 # Venta
 class Venta(db.Model):
     __tablename__ = 'ventas'
+    __table_args__ = (db.Index('idx_ventas_fecha_estado', 'fecha', 'estado'),)
     id_venta = db.Column(db.Integer, primary_key=True)
     id_cliente = db.Column(db.Integer, db.ForeignKey('clientes.id_cliente'), nullable=False)
     fecha = db.Column(db.Date, nullable=False)
@@ -208,6 +214,7 @@ class DetalleVenta(db.Model):
 # Nómina
 class Nomina(db.Model):
     __tablename__ = 'nominas'
+    __table_args__ = (db.Index('idx_nominas_fecha_pago', 'fecha_pago'),)
     id_nomina = db.Column(db.Integer, primary_key=True)
     id_empleado = db.Column(db.Integer, db.ForeignKey('empleados.id_empleado'), nullable=False)
     periodo = db.Column(db.String(20), nullable=False)
@@ -242,6 +249,7 @@ class NormativaLegal(db.Model):
 # Incidente
 class Incidente(db.Model):
     __tablename__ = 'incidentes'
+    __table_args__ = (db.Index('idx_incidentes_fecha', 'fecha'),)
     id_incidente = db.Column(db.Integer, primary_key=True)
     tipo = db.Column(db.Enum('seguridad', 'calidad', 'logistica'), nullable=False)
     descripcion = db.Column(db.Text, nullable=False)
@@ -261,11 +269,13 @@ class ActivoProduccion(db.Model):
     id_area = db.Column(db.Integer, db.ForeignKey('areas_trabajo.id_area'))
     fecha_adquisicion = db.Column(db.Date)
     estado = db.Column(db.Enum('operativo', 'mantenimiento', 'baja'), default='operativo')
+    capacidad_diaria = db.Column(db.Integer)  # Unidades por día (programación de la producción)
     area = db.relationship('AreaTrabajo', backref='activos')
 
 # Mantenimiento
 class Mantenimiento(db.Model):
     __tablename__ = 'mantenimiento'
+    __table_args__ = (db.Index('idx_mantenimiento_fecha', 'fecha'),)
     id_mantenimiento = db.Column(db.Integer, primary_key=True)
     id_activo = db.Column(db.Integer, db.ForeignKey('activos_produccion.id_activo'), nullable=False)
     tipo = db.Column(db.Enum('preventivo', 'correctivo'), nullable=False)
@@ -282,4 +292,32 @@ class ConfiguracionSistema(db.Model):
     id_config = db.Column(db.Integer, primary_key=True)
     parametro = db.Column(db.String(50), unique=True, nullable=False)
     valor = db.Column(db.Text)
-    descripcion = db.Column(db.Text)
\ No newline at end of file
+    descripcion = db.Column(db.Text)
+# KPI Mensual (rollup de métricas agregadas por año, mes, métrica y dimensión)
+class KpiMensual(db.Model):
+    __tablename__ = 'kpi_mensual'
+    anio = db.Column(db.Integer, primary_key=True)
+    mes = db.Column(db.Integer, primary_key=True)
+    metrica = db.Column(db.String(50), primary_key=True)
+    dimension = db.Column(db.String(50), primary_key=True, default='total')
+    valor = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    registros = db.Column(db.Integer, nullable=False, default=0)
+    fecha_actualizacion = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+# Costo de materiales (precio medio ponderado y último precio de las compras recibidas)
+class CostoMaterial(db.Model):
+    __tablename__ = 'costos_materiales'
+    id_material = db.Column(db.Integer, db.ForeignKey('materiales.id_material', ondelete='CASCADE'), primary_key=True)
+    precio_promedio = db.Column(db.Numeric(12, 4), nullable=False)
+    precio_ultimo = db.Column(db.Numeric(12, 4), nullable=False)
+    cantidad_comprada = db.Column(db.Integer, nullable=False, default=0)
+    fecha_ultima_compra = db.Column(db.Date)
+    fecha_actualizacion = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+# Costo estándar de productos (receta x costo de materiales)
+class CostoProducto(db.Model):
+    __tablename__ = 'costos_productos'
+    id_producto = db.Column(db.Integer, db.ForeignKey('productos.id_producto', ondelete='CASCADE'), primary_key=True)
+    costo_promedio = db.Column(db.Numeric(12, 4), nullable=False, default=0)
+    costo_ultimo = db.Column(db.Numeric(12, 4), nullable=False, default=0)
+    materiales = db.Column(db.Integer, nullable=False, default=0)
+    materiales_sin_precio = db.Column(db.Integer, nullable=False, default=0)
+    fecha_actualizacion = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
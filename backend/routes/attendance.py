@@ -1,16 +1,20 @@
+import logging
 from flask import Blueprint, jsonify, request
 from models import Asistencia, Empleado, db
 from datetime import datetime, time
 from routes.auth import role_required, login_required
 from flask_login import current_user
+from sqlalchemy.orm import joinedload
+from utils.pagination import paginated_response
+from utils.attendance_ingest import load_shift, ingest_punches, read_csv_punches
+from utils.http_cache import publish_core_writes
 
 attendance_bp = Blueprint('attendance', __name__)
+logger = logging.getLogger(__name__)
 
-@attendance_bp.route('/attendance', methods=['GET'])
-@role_required('admin', 'supervisor')
-def get_attendance():
-    attendance_records = Asistencia.query.all()
-    return jsonify([{
+def serialize_attendance(record):
+    """Serializa un registro de asistencia para la respuesta JSON"""
+    return {
         'id_asistencia': record.id_asistencia,
         'id_empleado': record.id_empleado,
         'empleado_name': f"{record.empleado.nombre} {record.empleado.apellidos}",
@@ -18,7 +22,14 @@ def get_attendance():
         'hora_entrada': record.hora_entrada.isoformat() if record.hora_entrada else None,
         'hora_salida': record.hora_salida.isoformat() if record.hora_salida else None,
         'estado': record.estado
-    } for record in attendance_records])
+    }
+
+@attendance_bp.route('/attendance', methods=['GET'])
+@role_required('admin', 'supervisor')
+def get_attendance():
+    query = Asistencia.query.options(joinedload(Asistencia.empleado))
+    return paginated_response(query, serialize_attendance, Asistencia.id_asistencia,
+                              date_column=Asistencia.fecha, estado_column=Asistencia.estado)
 
 @attendance_bp.route('/attendance/<int:id>', methods=['GET'])
 @login_required
@@ -26,15 +37,7 @@ def get_attendance_by_id(id):
     record = Asistencia.query.get_or_404(id)
     if current_user.rol == 'empleado' and record.id_empleado != current_user.id_empleado:
         return jsonify({'error': 'No tienes permiso para ver este registro'}), 403
-    return jsonify({
-        'id_asistencia': record.id_asistencia,
-        'id_empleado': record.id_empleado,
-        'empleado_name': f"{record.empleado.nombre} {record.empleado.apellidos}",
-        'fecha': record.fecha.isoformat(),
-        'hora_entrada': record.hora_entrada.isoformat() if record.hora_entrada else None,
-        'hora_salida': record.hora_salida.isoformat() if record.hora_salida else None,
-        'estado': record.estado
-    })
+    return jsonify(serialize_attendance(record))
 
 @attendance_bp.route('/attendance', methods=['POST'])
 @role_required ('admin', 'supervisor')
@@ -51,6 +54,55 @@ def create_attendance():
     db.session.commit()
     return jsonify({'message': 'Attendance record created successfully'}), 201
 
+# Ingesta de marcas de los relojes de fichaje: agrupa entrada/salida por empleado y día,
+# clasifica presente/tardanza según el turno y escribe con upsert (reenviar un lote no cambia nada)
+# JSON: {"marcas": [{"id_empleado", "timestamp", "tipo"?}], "turno": {"entrada", "tolerancia_minutos"}?,
+#        "marcar_ausentes": bool?}
+# CSV (text/csv): columnas id_empleado,timestamp[,tipo]; turno y marcar_ausentes por query string
+@attendance_bp.route('/attendance/bulk', methods=['POST'])
+@role_required('admin', 'supervisor')
+def bulk_attendance():
+    if request.mimetype == 'text/csv':
+        options = request.args
+        turno = {'entrada': options.get('entrada'), 'tolerancia_minutos': options.get('tolerancia_minutos')}
+        try:
+            punches = read_csv_punches(request.get_data(as_text=True))
+            first = next(punches, None)
+        except UnicodeDecodeError:
+            return jsonify({'error': 'El CSV debe estar codificado en UTF-8'}), 400
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        punches = [first, *punches] if first is not None else []
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, list):
+            data = {'marcas': data}
+        if not isinstance(data, dict) or not isinstance(data.get('marcas'), list):
+            return jsonify({'error': 'Se requiere una lista de marcas'}), 400
+        options = data
+        turno = data.get('turno') or {}
+        if not isinstance(turno, dict):
+            return jsonify({'error': 'Formato de turno inválido'}), 400
+        punches = enumerate(data['marcas'], start=1)
+
+    marcar_ausentes = str(options.get('marcar_ausentes', '')).lower() in ('1', 'true', 'si')
+    try:
+        shift = load_shift(db.session, turno.get('entrada'), turno.get('tolerancia_minutos'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        summary = ingest_punches(db.session, punches, shift, marcar_ausentes=marcar_ausentes)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error al registrar marcas de asistencia: {str(e)}")
+        return jsonify({'error': 'Error interno al registrar las marcas'}), 500
+    if summary['escritos']:
+        # El upsert es una sentencia Core: no pasa por los eventos del ORM
+        publish_core_writes(['asistencia'])
+    return jsonify(summary)
+
 @attendance_bp.route('/attendance/<int:id>', methods=['PUT'])
 @role_required ('admin', 'supervisor')
 def update_attendance(id):
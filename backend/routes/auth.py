@@ -62,10 +62,7 @@ def register():
 def login():
     data = request.json
     user = Usuario.query.filter_by(email=data['email']).first()
-    
-    print(f"Debug - User type: {type(user)}")  # Debería ser <class 'models.Usuario'>
-    print(f"Debug - User ID: {user.id_usuario if user else 'No user'}")  # Verifica el ID
-    
+
     if user and user.check_password(data['password']):
         login_user(user)
         return jsonify({"message": "Login exitoso", "rol": user.rol})
@@ -0,0 +1,66 @@
+from flask import Blueprint, request, jsonify, Response
+from flask_login import login_required, current_user
+from config import db
+from utils.change_feed import change_feed, visible_changes, viewer_of, format_sse
+
+changes_bp = Blueprint('changes', __name__)
+
+# Segundos entre comentarios de keep-alive cuando no hay cambios
+HEARTBEAT_SECONDS = 15
+# Segundos que se indican en Retry-After cuando no hay puestos de suscriptor libres
+RETRY_AFTER_SECONDS = 30
+
+# Canal de cambios en tiempo real (Server-Sent Events)
+# Parámetros: tablas (lista separada por comas); Last-Event-ID o ?desde= para reanudar
+@changes_bp.route('/cambios', methods=['GET'])
+@login_required
+def stream_cambios():
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('desde')
+    try:
+        last_id = int(last_id) if last_id is not None else change_feed.last_id
+    except ValueError:
+        return jsonify({'error': 'Last-Event-ID debe ser un número entero'}), 400
+
+    # Cada conexión ocupa un hilo del servidor mientras dura: se limitan para dejar hilos al resto del API
+    if not change_feed.subscribe():
+        response = jsonify({'error': 'Demasiadas conexiones al canal de cambios; reintente más tarde'})
+        response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+        return response, 503
+
+    tablas = request.args.get('tablas')
+    tablas = {t.strip() for t in tablas.split(',') if t.strip()} if tablas else None
+    viewer = viewer_of(current_user)
+
+    # La conexión puede durar horas: se devuelve la conexión a la base de datos antes de emitir
+    db.session.remove()
+
+    def generate():
+        cursor = last_id
+        if not change_feed.is_resumable(cursor):
+            # Se perdieron cambios: el cliente debe recargar lo que tenga abierto
+            cursor = change_feed.last_id
+            yield f"id: {cursor}\nevent: reinicio\ndata: {{}}\n\n"
+        else:
+            # Primer mensaje: el identificador actual, para reanudar desde aquí
+            yield f"id: {cursor}\nevent: conectado\ndata: {{}}\n\n"
+        while True:
+            events = change_feed.wait(cursor, HEARTBEAT_SECONDS)
+            if events is None:
+                # El cliente no leyó a tiempo y salieron eventos del historial
+                cursor = change_feed.last_id
+                yield f"id: {cursor}\nevent: reinicio\ndata: {{}}\n\n"
+                continue
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for event_id, changes in events:
+                cursor = event_id
+                changes = visible_changes(changes, viewer, tablas)
+                if changes:
+                    yield format_sse(event_id, changes)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.call_on_close(change_feed.unsubscribe)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
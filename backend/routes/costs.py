@@ -0,0 +1,123 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy import select
+from config import db
+from models import Producto, DetalleVenta, Venta, CostoProducto
+from routes.auth import role_required
+from utils.costing import product_cost, rebuild
+from utils.db_routing import read_only
+from utils.http_cache import http_cache
+from utils.pagination import paginated_response, parse_id_list
+
+costs_bp = Blueprint('costs', __name__)
+
+
+def _round(value, digits=2):
+    return round(float(value), digits) if value is not None else None
+
+
+def serialize_costo_producto(row):
+    costo = row.costo
+    precio = float(row.precio)
+    margen = precio - float(costo) if costo is not None else None
+    return {
+        'id_producto': row.id_producto,
+        'codigo': row.codigo,
+        'nombre': row.nombre,
+        'precio': precio,
+        'costo_promedio': _round(row.costo_promedio, 4),
+        'costo_ultimo': _round(row.costo_ultimo, 4),
+        'materiales': row.materiales,
+        'materiales_sin_precio': row.materiales_sin_precio,
+        'margen_unitario': _round(margen),
+        'margen_porcentaje': _round(margen / precio * 100) if margen is not None and precio else None,
+        'fecha_actualizacion': row.fecha_actualizacion.isoformat() if row.fecha_actualizacion else None
+    }
+
+
+def serialize_margen(row):
+    subtotal = float(row.subtotal)
+    costo = float(row.costo) * row.cantidad if row.costo is not None else None
+    margen = subtotal - costo if costo is not None else None
+    return {
+        'id_detalle': row.id_detalle,
+        'id_venta': row.id_venta,
+        'fecha': row.fecha.strftime('%Y-%m-%d'),
+        'estado': row.estado,
+        'id_producto': row.id_producto,
+        'producto_nombre': row.nombre,
+        'cantidad': row.cantidad,
+        'precio_unitario': float(row.precio_unitario),
+        'subtotal': subtotal,
+        'costo_unitario': _round(row.costo, 4),
+        'costo_total': _round(costo),
+        'margen': _round(margen),
+        'margen_porcentaje': _round(margen / subtotal * 100) if margen is not None and subtotal else None
+    }
+
+
+# Costo estándar de los productos (caché costos_productos) y su margen sobre el precio de lista
+# Parámetros: metodo (promedio|ultimo), ids (1,2,3)
+@costs_bp.route('/costos/productos', methods=['GET'])
+@role_required('admin', 'supervisor')
+@read_only
+def costos_productos():
+    try:
+        costo = product_cost(request.args.get('metodo', 'promedio'))
+        ids = parse_id_list(request.args.get('ids'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    stmt = select(
+        Producto.id_producto, Producto.codigo, Producto.nombre, Producto.precio,
+        CostoProducto.costo_promedio, CostoProducto.costo_ultimo, CostoProducto.materiales,
+        CostoProducto.materiales_sin_precio, CostoProducto.fecha_actualizacion,
+        costo.label('costo')
+    ).outerjoin(CostoProducto, Producto.id_producto == CostoProducto.id_producto).order_by(Producto.id_producto)
+    if ids is not None:
+        stmt = stmt.where(Producto.id_producto.in_(ids))
+    return jsonify([serialize_costo_producto(row) for row in db.session.execute(stmt)])
+
+
+# Margen por línea de venta: un join de detalle_ventas con costos_productos
+# Parámetros: metodo, id_venta, id_producto y los de listado (limit, cursor, orden, desde, hasta, estado, ids)
+# Sin ?estado= se excluyen las ventas canceladas
+@costs_bp.route('/costos/margenes', methods=['GET'])
+@role_required('admin', 'supervisor')
+@read_only
+def margenes_ventas():
+    try:
+        costo = product_cost(request.args.get('metodo', 'promedio'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    query = db.session.query(
+        DetalleVenta.id_detalle, DetalleVenta.id_venta, DetalleVenta.id_producto,
+        DetalleVenta.cantidad, DetalleVenta.precio_unitario, DetalleVenta.subtotal,
+        Venta.fecha, Venta.estado, Producto.nombre, costo.label('costo')
+    ).join(Venta, DetalleVenta.id_venta == Venta.id_venta) \
+     .join(Producto, DetalleVenta.id_producto == Producto.id_producto) \
+     .outerjoin(CostoProducto, DetalleVenta.id_producto == CostoProducto.id_producto)
+
+    if request.args.get('id_venta'):
+        query = query.filter(DetalleVenta.id_venta == request.args.get('id_venta', type=int))
+    if request.args.get('id_producto'):
+        query = query.filter(DetalleVenta.id_producto == request.args.get('id_producto', type=int))
+    if not request.args.get('estado'):
+        query = query.filter(Venta.estado != 'cancelada')
+
+    return paginated_response(query, serialize_margen, DetalleVenta.id_detalle,
+                              date_column=Venta.fecha, estado_column=Venta.estado)
+
+
+# Reconstruye la caché de costos por completo (normalmente se mantiene sola)
+@costs_bp.route('/costos/recalcular', methods=['POST'])
+@role_required('admin')
+def recalcular_costos():
+    try:
+        materiales, productos = rebuild(db.session)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    http_cache.bump_tables(['costos_materiales', 'costos_productos'])
+    return jsonify({'materiales': materiales, 'productos': productos})
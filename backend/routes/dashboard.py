@@ -1,109 +1,97 @@
 from flask import Blueprint, jsonify
 from models import (
-    Venta, OrdenProduccion, Inventario, Empleado, Material, 
-    Asistencia, Proveedor, OrdenCompra, Producto, 
-    ControlCalidad, Cliente, Nomina, Incidente, 
+    Venta, OrdenProduccion, Inventario, Empleado, Material,
+    Asistencia, Proveedor, OrdenCompra, Producto,
+    ControlCalidad, Cliente, Incidente,
     ActivoProduccion, Mantenimiento, DetalleVenta, AreaTrabajo
 )
-from sqlalchemy import func, extract, and_
-from datetime import datetime, timedelta
+from sqlalchemy import func, and_
+from sqlalchemy.orm import joinedload
+from datetime import datetime
 import calendar
 from config import db
+from utils.aggregates import month_window, month_bounds, month_label
+from utils.kpi_rollup import rollup_series
+from utils.cache import dashboard_cache
 
 dashboard_bp = Blueprint('dashboard_bp', __name__)
 
 def get_last_day_of_month(year, month):
     return calendar.monthrange(year, month)[1]
 
-@dashboard_bp.route('/dashboard', methods=['GET'])
-def get_dashboard_data():
-    now = datetime.now()
-    current_month = now.month
-    current_year = now.year
-    
-    # 1. Estadísticas principales
-    # Ventas mensuales
-    ventas_mensuales = db.session.query(func.sum(Venta.total)).filter(
-        extract('month', Venta.fecha) == current_month,
-        extract('year', Venta.fecha) == current_year,
-        Venta.estado == 'completada'
-    ).scalar() or 0
 
-    # Producción mensual
-    produccion_mensual = db.session.query(func.sum(OrdenProduccion.cantidad)).filter(
-        extract('month', OrdenProduccion.fecha_inicio) == current_month,
-        extract('year', OrdenProduccion.fecha_inicio) == current_year,
-        OrdenProduccion.estado == 'completada'
-    ).scalar() or 0
+class PeriodoDashboard:
+    """Fechas de referencia compartidas por todas las secciones del dashboard"""
+
+    def __init__(self, now):
+        self.now = now
+        self.meses = month_window(now, 6)
+        self.categorias = [month_label(year, month) for year, month in self.meses]
+        self.inicio_mes, self.fin_mes = month_bounds(now.year, now.month)
+        # Las secciones cacheadas solo son válidas para el mes en que se calcularon
+        self.version = f"{now.year}-{now.month:02d}"
+
+
+# 1. Estadísticas principales
+def seccion_ventas_mensuales(periodo):
+    return rollup_series(periodo.meses[-1:], ['ventas'])['ventas'][-1]
 
+def seccion_produccion_mensual(periodo):
+    return rollup_series(periodo.meses[-1:], ['produccion'])['produccion'][-1]
+
+def seccion_nivel_inventario(periodo):
     # Nivel de inventario (porcentaje de stock disponible)
     total_materiales = db.session.query(func.sum(Inventario.cantidad)).scalar() or 0
     materiales_con_stock = db.session.query(Material).count()
-    nivel_inventario = round((total_materiales / (materiales_con_stock * 100)) * 100) if materiales_con_stock else 0
+    return round((total_materiales / (materiales_con_stock * 100)) * 100) if materiales_con_stock else 0
 
-    # Empleados activos
-    empleados_activos = db.session.query(Empleado).filter_by(activo=True).count()
+def seccion_empleados_activos(periodo):
+    return db.session.query(Empleado).filter_by(activo=True).count()
 
-    # 2. Distribución de materiales
+# 2. Distribución de materiales
+def seccion_distribucion_materiales(periodo):
     materiales_distribucion = db.session.query(
         Material.nombre,
         func.sum(Inventario.cantidad)
     ).join(Inventario).group_by(Material.nombre).all()
-    distribucion_materiales = {nombre: str(cantidad) for nombre, cantidad in materiales_distribucion}
+    return {nombre: str(cantidad) for nombre, cantidad in materiales_distribucion}
 
-    # 3. Ventas vs Producción (últimos 6 meses)
-    ventas_vs_produccion = {
-        "ventas": [],
-        "produccion": [],
-        "categorias": []
+# 3. Ventas vs Producción (últimos 6 meses)
+def seccion_ventas_vs_produccion(periodo):
+    series = rollup_series(periodo.meses, ['ventas', 'produccion'])
+    return {
+        "ventas": series['ventas'],
+        "produccion": series['produccion'],
+        "categorias": periodo.categorias
     }
-    
-    for i in range(5, -1, -1):
-        target_month = (now.month - i - 1) % 12 + 1
-        target_year = now.year - (1 if now.month - i - 1 < 0 else 0)
-        
-        # Ventas del mes
-        ventas_mes = db.session.query(func.sum(Venta.total)).filter(
-            extract('month', Venta.fecha) == target_month,
-            extract('year', Venta.fecha) == target_year,
-            Venta.estado == 'completada'
-        ).scalar() or 0
-        
-        # Producción del mes
-        produccion_mes = db.session.query(func.sum(OrdenProduccion.cantidad)).filter(
-            extract('month', OrdenProduccion.fecha_inicio) == target_month,
-            extract('year', OrdenProduccion.fecha_inicio) == target_year,
-            OrdenProduccion.estado == 'completada'
-        ).scalar() or 0
-        
-        ventas_vs_produccion["ventas"].append(float(ventas_mes))
-        ventas_vs_produccion["produccion"].append(float(produccion_mes))
-        ventas_vs_produccion["categorias"].append(f"{calendar.month_abbr[target_month]} {target_year}")
-
-    # 4. NUEVO: Control de calidad
+
+# 4. Control de calidad
+def seccion_control_calidad(periodo):
     control_calidad_query = db.session.query(
         ControlCalidad.resultado,
         func.count(ControlCalidad.id_control)
     ).filter(
-        extract('month', ControlCalidad.fecha) == current_month,
-        extract('year', ControlCalidad.fecha) == current_year
+        ControlCalidad.fecha >= periodo.inicio_mes,
+        ControlCalidad.fecha < periodo.fin_mes
     ).group_by(ControlCalidad.resultado).all()
-    
+
     control_calidad = {}
     # Inicializar con valores por defecto
     control_calidad["aprobado"] = 0
     control_calidad["rechazado"] = 0
     control_calidad["reparacion"] = 0
-    
+
     # Llenar con datos reales
     for resultado, count in control_calidad_query:
         control_calidad[resultado] = count
-    
+
     # Si no hay datos, usar datos de ejemplo
     if sum(control_calidad.values()) == 0:
         control_calidad = {"aprobado": 85, "rechazado": 10, "reparacion": 5}
+    return control_calidad
 
-    # 5. NUEVO: Materiales con stock bajo
+# 5. Materiales con stock bajo
+def seccion_materiales_stock_bajo(periodo):
     materiales_stock_bajo_query = db.session.query(
         Material.nombre,
         Inventario.cantidad,
@@ -111,14 +99,14 @@ def get_dashboard_data():
     ).join(Inventario).filter(
         Inventario.cantidad <= Material.stock_minimo
     ).all()
-    
+
     materiales_stock_bajo = {}
     for nombre, cantidad, minimo in materiales_stock_bajo_query:
         materiales_stock_bajo[nombre] = {
             "actual": cantidad,
             "minimo": minimo
         }
-    
+
     # Si no hay datos críticos, mostrar algunos materiales normales
     if not materiales_stock_bajo:
         materiales_normales = db.session.query(
@@ -126,14 +114,16 @@ def get_dashboard_data():
             Inventario.cantidad,
             Material.stock_minimo
         ).join(Inventario).limit(5).all()
-        
+
         for nombre, cantidad, minimo in materiales_normales:
             materiales_stock_bajo[nombre] = {
                 "actual": cantidad or 0,
                 "minimo": minimo or 0
             }
+    return materiales_stock_bajo
 
-    # 6. NUEVO: Empleados por área
+# 6. Empleados por área
+def seccion_empleados_por_area(periodo):
     empleados_por_area_query = db.session.query(
         AreaTrabajo.nombre_area,
         func.count(Empleado.id_empleado).label('total_empleados'),
@@ -141,17 +131,18 @@ def get_dashboard_data():
     ).join(Empleado, AreaTrabajo.id_area == Empleado.id_area)\
      .outerjoin(Asistencia, and_(
          Asistencia.id_empleado == Empleado.id_empleado,
-         extract('month', Asistencia.fecha) == current_month,
+         Asistencia.fecha >= periodo.inicio_mes,
+         Asistencia.fecha < periodo.fin_mes,
          Asistencia.estado == 'presente'
      )).group_by(AreaTrabajo.nombre_area).all()
-    
+
     empleados_por_area = {}
     for area, empleados, asistencias in empleados_por_area_query:
         empleados_por_area[area] = {
             "empleados": empleados,
             "asistencias": asistencias or 0
         }
-    
+
     # Datos de ejemplo si no hay datos reales
     if not empleados_por_area:
         empleados_por_area = {
@@ -160,20 +151,23 @@ def get_dashboard_data():
             "Mantenimiento": {"empleados": 5, "asistencias": 95},
             "Administración": {"empleados": 6, "asistencias": 115}
         }
+    return empleados_por_area
 
-    # 7. NUEVO: Clientes por tipo
+# 7. Clientes por tipo
+def seccion_clientes_por_tipo(periodo):
     clientes_por_tipo_query = db.session.query(
         Cliente.tipo,
         func.sum(Venta.total).label('total_ventas')
     ).join(Venta).filter(
-        extract('month', Venta.fecha) == current_month,
+        Venta.fecha >= periodo.inicio_mes,
+        Venta.fecha < periodo.fin_mes,
         Venta.estado == 'completada'
     ).group_by(Cliente.tipo).all()
-    
+
     clientes_por_tipo = {}
     for tipo, total in clientes_por_tipo_query:
         clientes_por_tipo[tipo] = float(total)
-    
+
     # Datos de ejemplo si no hay ventas este mes
     if not clientes_por_tipo:
         clientes_por_tipo = {
@@ -182,89 +176,68 @@ def get_dashboard_data():
             "minorista": 18000,
             "OEM": 25000
         }
+    return clientes_por_tipo
 
-    # 8. NUEVO: Mantenimiento de equipos
+# 8. Mantenimiento de equipos
+def seccion_mantenimiento_equipos(periodo):
     mantenimiento_equipos_query = db.session.query(
         Mantenimiento.tipo,
         func.count(Mantenimiento.id_mantenimiento),
         func.sum(Mantenimiento.costo)
     ).filter(
-        extract('month', Mantenimiento.fecha) == current_month
+        Mantenimiento.fecha >= periodo.inicio_mes,
+        Mantenimiento.fecha < periodo.fin_mes
     ).group_by(Mantenimiento.tipo).all()
-    
+
     mantenimiento_equipos = {}
     for tipo, cantidad, costo in mantenimiento_equipos_query:
         mantenimiento_equipos[tipo] = {
             "cantidad": cantidad,
             "costo": float(costo or 0)
         }
-    
+
     # Datos de ejemplo si no hay mantenimientos este mes
     if not mantenimiento_equipos:
         mantenimiento_equipos = {
             "preventivo": {"cantidad": 12, "costo": 8500},
             "correctivo": {"cantidad": 5, "costo": 15200}
         }
+    return mantenimiento_equipos
 
-    # 9. NUEVO: Análisis financiero (últimos 6 meses)
+# 9. Análisis financiero (últimos 6 meses)
+def seccion_analisis_financiero(periodo):
+    # Ingresos (ventas) frente a gastos (nóminas + compras + mantenimiento)
+    series = rollup_series(periodo.meses, ['ventas', 'nominas', 'compras', 'mantenimiento'])
     analisis_financiero = {
-        "ingresos": [],
-        "gastos": [],
-        "categorias": []
+        "ingresos": series['ventas'],
+        "gastos": [
+            nominas + compras + mantenimiento
+            for nominas, compras, mantenimiento in zip(
+                series['nominas'], series['compras'], series['mantenimiento']
+            )
+        ],
+        "categorias": periodo.categorias
     }
 
-    for i in range(5, -1, -1):
-        target_month = (now.month - i - 1) % 12 + 1
-        target_year = now.year - (1 if now.month - i - 1 < 0 else 0)
-        
-        # Ingresos (ventas)
-        ingresos_mes = db.session.query(func.sum(Venta.total)).filter(
-            extract('month', Venta.fecha) == target_month,
-            extract('year', Venta.fecha) == target_year,
-            Venta.estado == 'completada'
-        ).scalar() or 0
-        
-        # Gastos (nóminas + compras + mantenimiento)
-        nominas_mes = db.session.query(func.sum(Nomina.salario_neto)).filter(
-            extract('month', Nomina.fecha_pago) == target_month,
-            extract('year', Nomina.fecha_pago) == target_year
-        ).scalar() or 0
-        
-        compras_mes = db.session.query(func.sum(OrdenCompra.total)).filter(
-            extract('month', OrdenCompra.fecha) == target_month,
-            extract('year', OrdenCompra.fecha) == target_year,
-            OrdenCompra.estado == 'recibida'
-        ).scalar() or 0
-        
-        mantenimiento_mes = db.session.query(func.sum(Mantenimiento.costo)).filter(
-            extract('month', Mantenimiento.fecha) == target_month,
-            extract('year', Mantenimiento.fecha) == target_year
-        ).scalar() or 0
-        
-        gastos_mes = float(nominas_mes or 0) + float(compras_mes or 0) + float(mantenimiento_mes or 0)
-        
-        analisis_financiero["ingresos"].append(float(ingresos_mes))
-        analisis_financiero["gastos"].append(gastos_mes)
-        analisis_financiero["categorias"].append(f"{calendar.month_abbr[target_month]} {target_year}")
-
     # Si no hay datos financieros, usar datos de ejemplo
     if sum(analisis_financiero["ingresos"]) == 0:
         analisis_financiero = {
             "ingresos": [120000, 135000, 128000, 145000, 152000, 148000],
             "gastos": [95000, 102000, 98000, 115000, 118000, 112000],
-            "categorias": [f"{calendar.month_abbr[target_month]} {target_year}" 
-                          for target_month in range(max(1, now.month-5), now.month+1)]
+            "categorias": periodo.categorias
         }
+    return analisis_financiero
 
-    # 10. Asistencias del mes (presentes vs ausentes)
+# 10. Asistencias del mes (presentes vs ausentes)
+def seccion_asistencias_data(periodo):
     asistencias_mes = db.session.query(
         Asistencia.estado,
         func.count(Asistencia.id_asistencia)
     ).filter(
-        extract('month', Asistencia.fecha) == current_month,
-        extract('year', Asistencia.fecha) == current_year
+        Asistencia.fecha >= periodo.inicio_mes,
+        Asistencia.fecha < periodo.fin_mes
     ).group_by(Asistencia.estado).all()
-    
+
     asistencias_data = {
         "presente": 0,
         "ausente": 0,
@@ -272,36 +245,63 @@ def get_dashboard_data():
     }
     for estado, count in asistencias_mes:
         asistencias_data[estado] = count
+    return asistencias_data
 
-    # 11. Órdenes de compra pendientes
-    ordenes_compra_pendientes = db.session.query(OrdenCompra).filter(
+# 11. Órdenes de compra pendientes
+def seccion_ordenes_compra_pendientes(periodo):
+    return db.session.query(OrdenCompra).filter(
         OrdenCompra.estado == 'pendiente'
     ).count()
 
-    # 12. Productos más vendidos (top 5)
+# 12. Productos más vendidos (top 5)
+def seccion_productos_mas_vendidos(periodo):
     productos_mas_vendidos = db.session.query(
         Producto.nombre,
         func.sum(DetalleVenta.cantidad).label('total_vendido')
     ).join(DetalleVenta).group_by(Producto.nombre).order_by(
         func.sum(DetalleVenta.cantidad).desc()
     ).limit(5).all()
+    return [
+        {"nombre": nombre, "cantidad": int(cantidad)}
+        for nombre, cantidad in productos_mas_vendidos
+    ]
 
-    # 13. Estado de activos de producción
+# 13. Estado de activos de producción
+def seccion_activos_estado(periodo):
     activos_estado = db.session.query(
         ActivoProduccion.estado,
         func.count(ActivoProduccion.id_activo)
     ).group_by(ActivoProduccion.estado).all()
+    return [
+        {"estado": estado, "cantidad": cantidad}
+        for estado, cantidad in activos_estado
+    ]
 
-    # 14. Incidentes recientes
-    incidentes_recientes = db.session.query(Incidente).order_by(
+def _ultimos_incidentes(limite):
+    return db.session.query(Incidente).order_by(
         Incidente.fecha.desc()
-    ).limit(5).all()
+    ).limit(limite).all()
 
-    # 15. Actividades recientes (combinado)
+# 14. Incidentes recientes
+def seccion_incidentes_recientes(periodo):
+    return [
+        {
+            "id": i.id_incidente,
+            "tipo": i.tipo,
+            "fecha": i.fecha.strftime("%d/%m/%Y"),
+            "estado": i.estado,
+            "descripcion": i.descripcion[:50] + "..." if i.descripcion else ""
+        } for i in _ultimos_incidentes(5)
+    ]
+
+# 15. Actividades recientes (combinado)
+def seccion_actividades_recientes(periodo):
     actividades_recientes = []
-    
+
     # Últimas ventas
-    ultimas_ventas = db.session.query(Venta).order_by(Venta.fecha.desc()).limit(2).all()
+    ultimas_ventas = db.session.query(Venta).options(
+        joinedload(Venta.cliente)
+    ).order_by(Venta.fecha.desc()).limit(2).all()
     for v in ultimas_ventas:
         actividades_recientes.append({
             "titulo": f"Venta #{v.id_venta} - {v.cliente.nombre if v.cliente else 'Cliente'}",
@@ -309,9 +309,11 @@ def get_dashboard_data():
             "tipo": "venta",
             "monto": str(v.total)
         })
-    
+
     # Últimas producciones
-    ultimas_producciones = db.session.query(OrdenProduccion).order_by(
+    ultimas_producciones = db.session.query(OrdenProduccion).options(
+        joinedload(OrdenProduccion.producto)
+    ).order_by(
         OrdenProduccion.fecha_inicio.desc()
     ).limit(2).all()
     for p in ultimas_producciones:
@@ -321,62 +323,67 @@ def get_dashboard_data():
             "tipo": "produccion",
             "cantidad": p.cantidad
         })
-    
+
     # Últimos incidentes
-    for i in incidentes_recientes[:2]:
+    for i in _ultimos_incidentes(2):
         actividades_recientes.append({
             "titulo": f"Incidente #{i.id_incidente} - {i.tipo}",
             "tiempo": i.fecha.strftime("%d/%m/%Y"),
             "tipo": "incidente",
             "estado": i.estado
         })
-    
+
     # Ordenar por fecha
     actividades_recientes.sort(key=lambda x: datetime.strptime(x['tiempo'], '%d/%m/%Y %H:%M' if ':' in x['tiempo'] else '%d/%m/%Y'), reverse=True)
-    actividades_recientes = actividades_recientes[:4]
-
-    return jsonify({
-        # Estadísticas principales
-        "ventas_mensuales": float(ventas_mensuales),
-        "produccion_mensual": float(produccion_mensual),
-        "nivel_inventario": nivel_inventario,
-        "empleados_activos": empleados_activos,
-        
-        # Datos para gráficos existentes
-        "distribucion_materiales": distribucion_materiales,
-        "ventas_vs_produccion": ventas_vs_produccion,
-        "asistencias_data": asistencias_data,
-        "productos_mas_vendidos": [
-            {"nombre": nombre, "cantidad": int(cantidad)} 
-            for nombre, cantidad in productos_mas_vendidos
-        ],
-        "activos_estado": [
-            {"estado": estado, "cantidad": cantidad}
-            for estado, cantidad in activos_estado
-        ],
-        
-        # NUEVOS DATOS PARA ANÁLISIS EXPANDIDOS
-        "control_calidad": control_calidad,
-        "materiales_stock_bajo": materiales_stock_bajo,
-        "empleados_por_area": empleados_por_area,
-        "clientes_por_tipo": clientes_por_tipo,
-        "mantenimiento_equipos": mantenimiento_equipos,
-        "analisis_financiero": analisis_financiero,
-        
-        # Indicadores adicionales
-        "ordenes_compra_pendientes": ordenes_compra_pendientes,
-        
-        # Actividades recientes
-        "actividades_recientes": actividades_recientes,
-        
-        # Datos para tablas
-        "incidentes_recientes": [
-            {
-                "id": i.id_incidente,
-                "tipo": i.tipo,
-                "fecha": i.fecha.strftime("%d/%m/%Y"),
-                "estado": i.estado,
-                "descripcion": i.descripcion[:50] + "..." if i.descripcion else ""
-            } for i in incidentes_recientes
-        ]
-    })
\ No newline at end of file
+    return actividades_recientes[:4]
+
+
+# Registro de secciones: nombre -> (función, TTL en segundos, tablas que lee).
+# Una escritura en cualquiera de esas tablas invalida la sección.
+SECCIONES = {
+    'ventas_mensuales': (seccion_ventas_mensuales, 300, ('ventas',)),
+    'produccion_mensual': (seccion_produccion_mensual, 300, ('ordenes_produccion',)),
+    'nivel_inventario': (seccion_nivel_inventario, 120, ('inventario', 'materiales')),
+    'empleados_activos': (seccion_empleados_activos, 600, ('empleados',)),
+    'distribucion_materiales': (seccion_distribucion_materiales, 120, ('inventario', 'materiales')),
+    'ventas_vs_produccion': (seccion_ventas_vs_produccion, 300, ('ventas', 'ordenes_produccion')),
+    'control_calidad': (seccion_control_calidad, 300, ('control_calidad',)),
+    'materiales_stock_bajo': (seccion_materiales_stock_bajo, 120, ('inventario', 'materiales')),
+    'empleados_por_area': (seccion_empleados_por_area, 300, ('areas_trabajo', 'empleados', 'asistencia')),
+    'clientes_por_tipo': (seccion_clientes_por_tipo, 300, ('clientes', 'ventas')),
+    'mantenimiento_equipos': (seccion_mantenimiento_equipos, 300, ('mantenimiento',)),
+    'analisis_financiero': (seccion_analisis_financiero, 300,
+                            ('ventas', 'nominas', 'ordenes_compra', 'mantenimiento')),
+    'asistencias_data': (seccion_asistencias_data, 120, ('asistencia',)),
+    'ordenes_compra_pendientes': (seccion_ordenes_compra_pendientes, 120, ('ordenes_compra',)),
+    'productos_mas_vendidos': (seccion_productos_mas_vendidos, 300, ('productos', 'detalle_ventas')),
+    'activos_estado': (seccion_activos_estado, 300, ('activos_produccion',)),
+    'incidentes_recientes': (seccion_incidentes_recientes, 120, ('incidentes',)),
+    'actividades_recientes': (seccion_actividades_recientes, 60,
+                              ('ventas', 'clientes', 'ordenes_produccion', 'productos', 'incidentes')),
+}
+
+for _nombre, (_funcion, _ttl, _tablas) in SECCIONES.items():
+    dashboard_cache.section(_nombre, _ttl, _tablas)
+
+
+@dashboard_bp.route('/dashboard', methods=['GET'])
+def get_dashboard_data():
+    periodo = PeriodoDashboard(datetime.now())
+    dashboard_cache.reset_request_stats()
+
+    data = {
+        nombre: dashboard_cache.get_or_compute(
+            nombre, periodo.version, lambda funcion=funcion: funcion(periodo)
+        )
+        for nombre, (funcion, _ttl, _tablas) in SECCIONES.items()
+    }
+
+    # Aciertos/fallos de caché de esta petición, para medir latencia en frío y en caliente
+    stats = dashboard_cache.request_stats()
+    data["cache"] = stats
+
+    response = jsonify(data)
+    response.headers['X-Cache-Hits'] = str(stats['hits'])
+    response.headers['X-Cache-Misses'] = str(stats['misses'])
+    return response
@@ -3,41 +3,47 @@ from flask_login import current_user, login_required
 from models import Empleado, AreaTrabajo, db
 from datetime import datetime
 from routes.auth import role_required
+from sqlalchemy import false
+from sqlalchemy.orm import joinedload
+from utils.pagination import paginated_response
 
 employees_bp = Blueprint('employees', __name__)
 
+def serialize_employee(emp):
+    """Serializa un empleado para la respuesta JSON"""
+    return {
+        'id_empleado': emp.id_empleado,
+        'nombre': emp.nombre,
+        'apellidos': emp.apellidos,
+        'id_area': emp.id_area,
+        'area_name': emp.area.nombre_area if emp.area else None,
+        'puesto': emp.puesto,
+        # Ocultar salario para empleados que no son admin
+        'salario': float(emp.salario) if emp.salario and current_user.rol == 'admin' else None,
+        'fecha_contratacion': emp.fecha_contratacion.isoformat() if emp.fecha_contratacion else None,
+        'activo': emp.activo
+    }
+
 @employees_bp.route('/employees', methods=['GET'])
 @login_required
 def get_employees():
+    query = Empleado.query.options(joinedload(Empleado.area))
     # Admin puede ver todos los empleados
-    if current_user.rol == 'admin':
-        employees = Empleado.query.all()
     # Supervisor solo ve empleados de su área
-    elif current_user.rol == 'supervisor':
+    if current_user.rol == 'supervisor':
         # Asumiendo que current_user.id_empleado existe y está relacionado con un Empleado
         supervisor = Empleado.query.get(current_user.id_empleado)
         if supervisor and supervisor.id_area:
-            employees = Empleado.query.filter_by(id_area=supervisor.id_area).all()
+            query = query.filter(Empleado.id_area == supervisor.id_area)
         else:
-            employees = []
+            query = query.filter(false())
     # Empleado solo puede ver su propia información
     elif current_user.rol == 'empleado':
-        employees = [Empleado.query.get(current_user.id_empleado)] if current_user.id_empleado else []
-    else:
+        query = query.filter(Empleado.id_empleado == current_user.id_empleado) if current_user.id_empleado else query.filter(false())
+    elif current_user.rol != 'admin':
         return jsonify({"error": "No autorizado"}), 403
 
-    return jsonify([{
-        'id_empleado': emp.id_empleado,
-        'nombre': emp.nombre,
-        'apellidos': emp.apellidos,
-        'id_area': emp.id_area,
-        'area_name': emp.area.nombre_area if emp.area else None,
-        'puesto': emp.puesto,
-        # Ocultar salario para empleados que no son admin
-        'salario': float(emp.salario) if emp.salario and current_user.rol == 'admin' else None,
-        'fecha_contratacion': emp.fecha_contratacion.isoformat() if emp.fecha_contratacion else None,
-        'activo': emp.activo
-    } for emp in employees if emp is not None])
+    return paginated_response(query, serialize_employee, Empleado.id_empleado)
 
 @employees_bp.route('/employees/me', methods=['GET'])
 @login_required
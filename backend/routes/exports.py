@@ -0,0 +1,39 @@
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_login import login_required, current_user
+from config import db
+from utils.exports import EXPORT_SPECS, FORMATOS, stream_rows
+from utils.pagination import ListParams
+
+exports_bp = Blueprint('exports', __name__)
+
+MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Exportar una tabla completa en streaming
+# Parámetros: formato (ndjson|csv), fields, desde, hasta, estado, ids
+@exports_bp.route('/export/<recurso>', methods=['GET'])
+@login_required
+def exportar(recurso):
+    spec = EXPORT_SPECS.get(recurso)
+    if spec is None:
+        return jsonify({'error': f'Recurso no exportable: {recurso}'}), 404
+    if current_user.rol not in spec.roles:
+        return jsonify({'error': 'No autorizado'}), 403
+
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS:
+        return jsonify({'error': f"formato no válido. Use uno de: {', '.join(FORMATOS)}"}), 400
+
+    try:
+        stmt, names = spec.statement(ListParams.from_args(request.args), current_user)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = Response(
+        stream_with_context(stream_rows(db.session, stmt, names, formato)),
+        mimetype=MIMETYPES[formato]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename="{recurso}.{formato}"'
+    return response
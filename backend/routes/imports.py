@@ -0,0 +1,37 @@
+from flask import Blueprint, request, jsonify
+from config import db
+from routes.auth import role_required
+from utils.bulk_import import IMPORT_SPECS, ImportFormatError, read_rows, run_import
+
+imports_bp = Blueprint('imports', __name__)
+
+# Recursos importables y sus columnas (para las plantillas del asistente)
+@imports_bp.route('/importar', methods=['GET'])
+@role_required('admin', 'supervisor')
+def listar_importaciones():
+    return jsonify({
+        recurso: {'obligatorias': list(spec.required), 'opcionales': list(spec.optional)}
+        for recurso, spec in IMPORT_SPECS.items()
+    })
+
+# Importar un archivo CSV/XLSX (campo "archivo" del formulario multipart)
+@imports_bp.route('/importar/<recurso>', methods=['POST'])
+@role_required('admin', 'supervisor')  # Solo admin y supervisor pueden crear registros
+def importar(recurso):
+    if recurso not in IMPORT_SPECS:
+        return jsonify({'error': f'Recurso no importable: {recurso}'}), 404
+
+    archivo = request.files.get('archivo')
+    if archivo is None or not archivo.filename:
+        return jsonify({'error': 'Debe adjuntar un archivo en el campo "archivo"'}), 400
+
+    try:
+        header, rows = read_rows(archivo.stream, archivo.filename)
+        resumen = run_import(db.session, recurso, header, rows)
+    except ImportFormatError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+    if 'error_lectura' in resumen and not resumen['importadas']:
+        return jsonify({'error': resumen['error_lectura'], **resumen}), 400
+    return jsonify(resumen), 200
@@ -3,32 +3,37 @@ from models import Inventario, Material, db
 from datetime import datetime
 from flask_login import current_user, login_required
 from routes.auth import role_required
+from sqlalchemy.orm import joinedload
+from utils.pagination import paginated_response
 
 # El prefijo ahora será /api/inventario
 inventory_bp = Blueprint('inventory', __name__)
 
+def serialize_inventory(inv):
+    """Serializa un registro de inventario para la respuesta JSON"""
+    return {
+        'id_inventario': inv.id_inventario,
+        'id_material': inv.id_material,
+        'material_name': inv.material.nombre if inv.material else None,
+        'cantidad': inv.cantidad,
+        'ubicacion': inv.ubicacion,
+        'lote': inv.lote,
+        'fecha_ingreso': inv.fecha_ingreso.isoformat() if inv.fecha_ingreso else None
+    }
+
 @inventory_bp.route('', methods=['GET'])
 @login_required
 def get_inventory():
+    query = Inventario.query.options(joinedload(Inventario.material))
     # Admin y Supervisor ven todo el inventario
-    if current_user.rol in ['admin', 'supervisor']:
-        inventory = Inventario.query.all()
     # Empleados solo ven items de su ubicación
-    elif current_user.rol == 'empleado':
+    if current_user.rol == 'empleado':
         # Asumiendo que el empleado tiene un campo 'ubicacion' o similar
-        inventory = Inventario.query.filter_by(ubicacion=current_user.ubicacion).all()
-    else:
+        query = query.filter(Inventario.ubicacion == current_user.ubicacion)
+    elif current_user.rol not in ['admin', 'supervisor']:
         return jsonify({'error': 'No autorizado'}), 403
 
-    return jsonify([{
-        'id_inventario': inv.id_inventario,
-        'id_material': inv.id_material,
-        'material_name': inv.material.nombre if inv.material else None,
-        'cantidad': inv.cantidad,
-        'ubicacion': inv.ubicacion,
-        'lote': inv.lote,
-        'fecha_ingreso': inv.fecha_ingreso.isoformat() if inv.fecha_ingreso else None
-    } for inv in inventory])
+    return paginated_response(query, serialize_inventory, Inventario.id_inventario)
 
 @inventory_bp.route('/<int:id>', methods=['GET'])
 @login_required
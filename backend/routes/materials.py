@@ -2,41 +2,33 @@ from flask import Blueprint, jsonify, request, abort
 from models import db, Material, Inventario
 from routes.auth import role_required, login_required
 from flask_login import current_user
+from utils.pagination import paginated_response
 
 # ¡Corrige el prefijo aquí!
 materials_bp = Blueprint("materials", __name__, url_prefix="/api/materiales")
 
+def serialize_material(m):
+    return {
+        "id_material": m.id_material,
+        "nombre": m.nombre,
+        "descripcion": m.descripcion,
+        "unidad_medida": m.unidad_medida,
+        "stock_minimo": m.stock_minimo,
+        "stock_maximo": m.stock_maximo
+    }
+
 # GET /api/materiales - Listar todos los materiales
 @materials_bp.route("", methods=["GET"])
 @login_required
 def get_materials():
-    materiales = Material.query.all()
-    result = [
-        {
-            "id_material": m.id_material,
-            "nombre": m.nombre,
-            "descripcion": m.descripcion,
-            "unidad_medida": m.unidad_medida,
-            "stock_minimo": m.stock_minimo,
-            "stock_maximo": m.stock_maximo
-        } for m in materiales
-    ]
-    return jsonify(result), 200
+    return paginated_response(Material.query, serialize_material, Material.id_material)
 
 # GET /api/materiales/<id> - Obtener material puntual
 @materials_bp.route("/<int:material_id>", methods=["GET"])
 @login_required
 def get_material(material_id):
     m = Material.query.get_or_404(material_id)
-    data = {
-        "id_material": m.id_material,
-        "nombre": m.nombre,
-        "descripcion": m.descripcion,
-        "unidad_medida": m.unidad_medida,
-        "stock_minimo": m.stock_minimo,
-        "stock_maximo": m.stock_maximo
-    }
-    return jsonify(data), 200
+    return jsonify(serialize_material(m)), 200
 
 # POST /api/materiales - Crear material
 @materials_bp.route("", methods=["POST"])
@@ -0,0 +1,50 @@
+import os
+import threading
+import time
+from flask import Blueprint, request, jsonify
+from config import db
+from routes.auth import role_required
+from utils.db_pool import pool_status
+from utils.profiling import request_profiler
+
+metrics_bp = Blueprint('metrics', __name__)
+
+_STARTED = time.time()
+
+
+# Estado del pool de conexiones de cada base de datos en este proceso del servidor
+@metrics_bp.route('/_metrics', methods=['GET'])
+@role_required('admin')
+def get_metrics():
+    pools = {(bind or 'default'): pool_status(engine) for bind, engine in db.engines.items()}
+    return jsonify({
+        'pid': os.getpid(),
+        'hilos': threading.active_count(),
+        'segundos_activo': round(time.time() - _STARTED),
+        'pools': pools
+    })
+
+
+# Tiempos por ruta (p50/p95/p99, consultas por petición y sentencia más repetida)
+# Parámetros: orden (p95_ms|p99_ms|consultas_max|repeticion_max|...), ruta (texto contenido)
+@metrics_bp.route('/_profile', methods=['GET'])
+@role_required('admin')
+def get_profile():
+    if not request_profiler.enabled:
+        return jsonify({'error': 'El perfilado está desactivado (ERP_PROFILE=0)'}), 404
+    try:
+        rutas = request_profiler.summary(request.args.get('orden', 'p95_ms'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    filtro = request.args.get('ruta')
+    if filtro:
+        rutas = [item for item in rutas if filtro in item['ruta']]
+    return jsonify({'pid': os.getpid(), 'rutas': rutas})
+
+
+# Reinicia los agregados (p. ej. antes de medir un cambio)
+@metrics_bp.route('/_profile', methods=['DELETE'])
+@role_required('admin')
+def reset_profile():
+    request_profiler.reset()
+    return jsonify({'message': 'Perfil reiniciado'})
@@ -0,0 +1,33 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify
+from config import db
+from routes.auth import role_required
+from utils.db_routing import read_only
+from utils.mrp import build_plan, MrpUnavailable
+
+mrp_bp = Blueprint('mrp', __name__)
+
+# Plan de necesidades de materiales de las órdenes de producción abiertas
+# Parámetros: periodo (dia|semana|mes), hasta (YYYY-MM-DD), solo_faltantes (1/0)
+@mrp_bp.route('/mrp/plan', methods=['GET'])
+@role_required('admin', 'supervisor')
+@read_only
+def plan_materiales():
+    hasta = request.args.get('hasta')
+    try:
+        hasta = datetime.strptime(hasta, '%Y-%m-%d').date() if hasta else None
+    except ValueError:
+        return jsonify({'error': 'Formato de fecha inválido para hasta. Use YYYY-MM-DD'}), 400
+
+    try:
+        plan = build_plan(
+            db.session,
+            periodo=request.args.get('periodo', 'semana'),
+            hasta=hasta,
+            solo_faltantes=request.args.get('solo_faltantes', '0').lower() in ('1', 'true', 'si')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except MrpUnavailable as e:
+        return jsonify({'error': str(e)}), 501
+    return jsonify(plan)
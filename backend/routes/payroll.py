@@ -3,38 +3,43 @@ from flask_login import login_required, current_user
 from routes.auth import role_required
 from models import Nomina, Empleado, db
 from datetime import datetime
+from sqlalchemy.orm import joinedload
+from utils.pagination import paginated_response
 
 payroll_bp = Blueprint('payroll', __name__)
 
+def serialize_payroll(payroll):
+    """Serializa un registro de nómina para la respuesta JSON"""
+    return {
+        'id_nomina': payroll.id_nomina,
+        'id_empleado': payroll.id_empleado,
+        'empleado_name': f"{payroll.empleado.nombre} {payroll.empleado.apellidos}",
+        'periodo': payroll.periodo,
+        'fecha_pago': payroll.fecha_pago.isoformat(),
+        'salario_bruto': float(payroll.salario_bruto),
+        'deducciones': float(payroll.deducciones) if payroll.deducciones else None,
+        'bonos': float(payroll.bonos) if payroll.bonos else None,
+        'salario_neto': float(payroll.salario_neto)
+    }
+
 @payroll_bp.route('/payroll', methods=['GET'])
 @login_required
 def get_payrolls():
+    query = Nomina.query.options(joinedload(Nomina.empleado))
     # Admin tiene acceso completo
-    if current_user.rol == 'admin':
-        payrolls = Nomina.query.all()
     # Supervisor solo ve nóminas de su departamento
-    elif current_user.rol == 'supervisor':
+    if current_user.rol == 'supervisor':
         # Asumiendo que el supervisor tiene un id_area asociado
-        payrolls = Nomina.query.join(Empleado).filter(
+        query = query.join(Empleado, Nomina.id_empleado == Empleado.id_empleado).filter(
             Empleado.id_area == current_user.id_area
-        ).all()
+        )
     # Empleado solo ve sus propias nóminas
     elif current_user.rol == 'empleado':
-        payrolls = Nomina.query.filter_by(id_empleado=current_user.id_empleado).all()
-    else:
+        query = query.filter(Nomina.id_empleado == current_user.id_empleado)
+    elif current_user.rol != 'admin':
         return jsonify({"error": "No autorizado"}), 403
 
-    return jsonify([{
-        'id_nomina': payroll.id_nomina,
-        'id_empleado': payroll.id_empleado,
-        'empleado_name': f"{payroll.empleado.nombre} {payroll.empleado.apellidos}",
-        'periodo': payroll.periodo,
-        'fecha_pago': payroll.fecha_pago.isoformat(),
-        'salario_bruto': float(payroll.salario_bruto),
-        'deducciones': float(payroll.deducciones) if payroll.deducciones else None,
-        'bonos': float(payroll.bonos) if payroll.bonos else None,
-        'salario_neto': float(payroll.salario_neto)
-    } for payroll in payrolls])
+    return paginated_response(query, serialize_payroll, Nomina.id_nomina, date_column=Nomina.fecha_pago)
 
 @payroll_bp.route('/payroll/<int:id>', methods=['GET'])
 @login_required
@@ -50,17 +55,7 @@ def get_payroll(id):
         if not empleado or empleado.id_area != current_user.id_area:
             return jsonify({"error": "No autorizado para ver esta nómina"}), 403
     
-    return jsonify({
-        'id_nomina': payroll.id_nomina,
-        'id_empleado': payroll.id_empleado,
-        'empleado_name': f"{payroll.empleado.nombre} {payroll.empleado.apellidos}",
-        'periodo': payroll.periodo,
-        'fecha_pago': payroll.fecha_pago.isoformat(),
-        'salario_bruto': float(payroll.salario_bruto),
-        'deducciones': float(payroll.deducciones) if payroll.deducciones else None,
-        'bonos': float(payroll.bonos) if payroll.bonos else None,
-        'salario_neto': float(payroll.salario_neto)
-    })
+    return jsonify(serialize_payroll(payroll))
 
 @payroll_bp.route('/payroll', methods=['POST'])
 @role_required('admin', 'supervisor')
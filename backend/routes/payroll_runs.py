@@ -0,0 +1,53 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify, url_for
+from flask_login import current_user
+from routes.auth import role_required
+from utils.jobs import job_queue
+from utils.payroll_run import TIPO_PROCESO, period_bounds, run_payroll, np
+
+payroll_runs_bp = Blueprint('payroll_runs', __name__)
+
+# Lanza en segundo plano el cálculo de la nómina de todos los empleados activos de un periodo
+# Cuerpo: {"periodo": "YYYY-MM", "fecha_pago": "YYYY-MM-DD"?, "reemplazar": bool?}
+# Responde 202 con el proceso; su avance se consulta en GET /payroll-runs/<id_proceso>
+@payroll_runs_bp.route('/payroll-runs', methods=['POST'])
+@role_required('admin')
+def start_payroll_run():
+    data = request.get_json(silent=True) or {}
+    periodo = data.get('periodo')
+    try:
+        period_bounds(periodo)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    fecha_pago = data.get('fecha_pago')
+    try:
+        fecha_pago = datetime.strptime(fecha_pago, '%Y-%m-%d').date() if fecha_pago else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Formato de fecha inválido para fecha_pago. Use YYYY-MM-DD'}), 400
+    reemplazar = data.get('reemplazar')
+    if reemplazar is None:
+        reemplazar = False
+    elif not isinstance(reemplazar, bool):
+        return jsonify({'error': 'reemplazar debe ser true o false'}), 400
+    if np is None:
+        return jsonify({'error': 'Para calcular la nómina por periodo instale numpy'}), 501
+
+    try:
+        job = job_queue.submit(TIPO_PROCESO, run_payroll, periodo, fecha_pago, reemplazar,
+                               clave=periodo, usuario=current_user.id_usuario)
+    except RuntimeError as e:
+        return jsonify({'error': str(e), 'id_proceso': job_queue.find_active(TIPO_PROCESO, periodo)}), 409
+
+    response = jsonify(job.to_dict())
+    response.headers['Location'] = url_for('payroll_runs.get_payroll_run', id_proceso=job.id)
+    return response, 202
+
+# Estado y progreso de un cálculo de nómina (con el resumen al terminar).
+# Con varios procesos servidor requiere ERP_CACHE_REDIS_URL (ver utils/jobs.py)
+@payroll_runs_bp.route('/payroll-runs/<id_proceso>', methods=['GET'])
+@role_required('admin')
+def get_payroll_run(id_proceso):
+    status = job_queue.status(id_proceso)
+    if status is None or status['tipo'] != TIPO_PROCESO:
+        return jsonify({'error': 'Proceso no encontrado'}), 404
+    return jsonify(status)
@@ -27,7 +27,8 @@ def get_production_assets():
             'id_area': asset.id_area,
             'area_name': asset.area.nombre_area if asset.area else None,
             'fecha_adquisicion': asset.fecha_adquisicion.isoformat() if asset.fecha_adquisicion else None,
-            'estado': asset.estado
+            'estado': asset.estado,
+            'capacidad_diaria': asset.capacidad_diaria
         } for asset in assets])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -49,7 +50,8 @@ def get_production_asset(id):
             'id_area': asset.id_area,
             'area_name': asset.area.nombre_area if asset.area else None,
             'fecha_adquisicion': asset.fecha_adquisicion.isoformat() if asset.fecha_adquisicion else None,
-            'estado': asset.estado
+            'estado': asset.estado,
+            'capacidad_diaria': asset.capacidad_diaria
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -69,7 +71,8 @@ def create_production_asset():
             tipo=data['tipo'],
             id_area=data.get('id_area'),
             fecha_adquisicion=datetime.strptime(data['fecha_adquisicion'], '%Y-%m-%d').date() if 'fecha_adquisicion' in data else None,
-            estado=data.get('estado', 'operativo')
+            estado=data.get('estado', 'operativo'),
+            capacidad_diaria=data.get('capacidad_diaria')
         )
         db.session.add(new_asset)
         db.session.commit()
@@ -81,7 +84,8 @@ def create_production_asset():
             'id_area': new_asset.id_area,
             'area_name': new_asset.area.nombre_area if new_asset.area else None,
             'fecha_adquisicion': new_asset.fecha_adquisicion.isoformat() if new_asset.fecha_adquisicion else None,
-            'estado': new_asset.estado
+            'estado': new_asset.estado,
+            'capacidad_diaria': new_asset.capacidad_diaria
         }), 201
     except Exception as e:
         db.session.rollback()
@@ -110,6 +114,8 @@ def update_production_asset(id):
             asset.fecha_adquisicion = datetime.strptime(data['fecha_adquisicion'], '%Y-%m-%d').date()
         if 'estado' in data:
             asset.estado = data['estado']
+        if 'capacidad_diaria' in data:
+            asset.capacidad_diaria = data['capacidad_diaria']
             
         db.session.commit()
         return jsonify({
@@ -119,7 +125,8 @@ def update_production_asset(id):
             'id_area': asset.id_area,
             'area_name': asset.area.nombre_area if asset.area else None,
             'fecha_adquisicion': asset.fecha_adquisicion.isoformat() if asset.fecha_adquisicion else None,
-            'estado': asset.estado
+            'estado': asset.estado,
+            'capacidad_diaria': asset.capacidad_diaria
         })
     except Exception as e:
         db.session.rollback()
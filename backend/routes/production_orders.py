@@ -4,45 +4,53 @@ from routes.auth import role_required
 from datetime import datetime
 from models import OrdenProduccion, Usuario, db
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
+from utils.pagination import paginated_response
 
 production_orders_bp = Blueprint('production_orders', __name__)
 
+def serialize_production_order(order):
+    """Serializa una orden de producción para la respuesta JSON"""
+    return {
+        'id_orden_produccion': order.id_orden_produccion,
+        'id_producto': order.id_producto,
+        'producto': {
+            'id_producto': order.producto.id_producto if order.producto else None,
+            'nombre': order.producto.nombre if order.producto else 'Producto no encontrado'
+        },
+        'cantidad': order.cantidad,
+        'fecha_inicio': order.fecha_inicio.isoformat() if order.fecha_inicio else None,
+        'fecha_fin': order.fecha_fin.isoformat() if order.fecha_fin else None,
+        'estado': order.estado,
+        'id_usuario': order.id_usuario,
+        'usuario': {
+            'id_usuario': order.usuario.id_usuario if order.usuario else None,
+            'nombre': order.usuario.nombre if order.usuario else 'Usuario no encontrado'
+        }
+    }
+
 @production_orders_bp.route('/ordenes_produccion', methods=['GET'])
 @login_required
 def get_production_orders():
     try:
-        # Admin ve todas las órdenes
-        if current_user.rol == 'admin':
-            orders = OrdenProduccion.query.all()
-        # Supervisor ve órdenes de su área o equipo
-        elif current_user.rol == 'supervisor':
+        query = OrdenProduccion.query.options(
+            joinedload(OrdenProduccion.producto),
+            joinedload(OrdenProduccion.usuario)
+        )
+        # Admin ve todas las órdenes; supervisor las de su área o equipo
+        if current_user.rol == 'supervisor':
             # Asume que el supervisor tiene un id_area asociado
-            orders = OrdenProduccion.query.join(Usuario).filter(
+            query = query.join(Usuario, OrdenProduccion.id_usuario == Usuario.id_usuario).filter(
                 Usuario.id_area == current_user.id_area
-            ).all()
+            )
         # Empleado solo ve sus propias órdenes
         elif current_user.rol == 'empleado':
-            orders = OrdenProduccion.query.filter_by(id_usuario=current_user.id_usuario).all()
-        else:
+            query = query.filter(OrdenProduccion.id_usuario == current_user.id_usuario)
+        elif current_user.rol != 'admin':
             return jsonify({"error": "No autorizado"}), 403
 
-        return jsonify([{
-            'id_orden_produccion': order.id_orden_produccion,
-            'id_producto': order.id_producto,
-            'producto': {
-                'id_producto': order.producto.id_producto if order.producto else None,
-                'nombre': order.producto.nombre if order.producto else 'Producto no encontrado'
-            },
-            'cantidad': order.cantidad,
-            'fecha_inicio': order.fecha_inicio.isoformat() if order.fecha_inicio else None,
-            'fecha_fin': order.fecha_fin.isoformat() if order.fecha_fin else None,
-            'estado': order.estado,
-            'id_usuario': order.id_usuario,
-            'usuario': {
-                'id_usuario': order.usuario.id_usuario if order.usuario else None,
-                'nombre': order.usuario.nombre if order.usuario else 'Usuario no encontrado'
-            }
-        } for order in orders])
+        return paginated_response(query, serialize_production_order, OrdenProduccion.id_orden_produccion,
+                                  date_column=OrdenProduccion.fecha_inicio, estado_column=OrdenProduccion.estado)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
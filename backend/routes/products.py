@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from routes.auth import role_required
 from models import Producto, db
+from utils.pagination import parse_id_list
 from werkzeug.exceptions import BadRequest
 from datetime import datetime
 import logging
@@ -18,10 +19,16 @@ def get_products():
         categoria = request.args.get('categoria')
         estado = request.args.get('estado')
         search = request.args.get('search')
+        try:
+            ids = parse_id_list(request.args.get('ids'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         query = Producto.query
         
         # Aplicar filtros
+        if ids is not None:
+            query = query.filter(Producto.id_producto.in_(ids))
         if categoria:
             query = query.filter_by(categoria=categoria)
         if estado:
@@ -3,6 +3,8 @@ from flask_login import login_required, current_user
 from routes.auth import role_required
 from models import OrdenCompra, Proveedor, Usuario, DetalleOrdenCompra, db
 from datetime import datetime
+from sqlalchemy.orm import joinedload, selectinload
+from utils.pagination import paginated_response
 
 purchase_orders_bp = Blueprint('purchase_orders', __name__)
 
@@ -41,14 +43,18 @@ def get_purchase_orders():
     Obtiene todas las órdenes de compra.
     Admin y Supervisor ven todas, Empleados ven solo las suyas.
     """
-    if current_user.rol in ['admin', 'supervisor']:
-        orders = OrdenCompra.query.all()
-    elif current_user.rol == 'empleado':
-        orders = OrdenCompra.query.filter_by(id_usuario=current_user.id_usuario).all()
-    else:
+    query = OrdenCompra.query.options(
+        joinedload(OrdenCompra.proveedor),
+        joinedload(OrdenCompra.usuario),
+        selectinload(OrdenCompra.detalles).joinedload(DetalleOrdenCompra.material)
+    )
+    if current_user.rol == 'empleado':
+        query = query.filter(OrdenCompra.id_usuario == current_user.id_usuario)
+    elif current_user.rol not in ['admin', 'supervisor']:
         return jsonify({'error': 'No autorizado'}), 403
 
-    return jsonify([serialize_purchase_order(order) for order in orders])
+    return paginated_response(query, serialize_purchase_order, OrdenCompra.id_orden_compra,
+                              date_column=OrdenCompra.fecha, estado_column=OrdenCompra.estado)
 
 @purchase_orders_bp.route('', methods=['POST'])
 @role_required('admin', 'supervisor')  # Solo admin y supervisor pueden crear
@@ -148,8 +154,10 @@ def delete_purchase_order(id):
             'error': 'No se puede eliminar una orden en estado aprobada o completada'
         }), 400
 
-    # Primero eliminar detalles relacionados
-    DetalleOrdenCompra.query.filter_by(id_orden_compra=id).delete()
+    # Primero eliminar detalles relacionados (con el ORM, para que los costos
+    # y el canal de cambios registren las líneas eliminadas)
+    for detalle in DetalleOrdenCompra.query.filter_by(id_orden_compra=id).all():
+        db.session.delete(detalle)
     db.session.delete(order)
     db.session.commit()
 
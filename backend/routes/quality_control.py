@@ -3,36 +3,42 @@ from flask_login import login_required, current_user
 from routes.auth import role_required
 from models import ControlCalidad, OrdenProduccion, Usuario, db
 from datetime import datetime
+from sqlalchemy.orm import joinedload
+from utils.pagination import paginated_response
 
 quality_control_bp = Blueprint('quality_control_bp', __name__)
 
+def serialize_quality_control(control):
+    """Serializa un control de calidad para la respuesta JSON"""
+    return {
+        'id_control': control.id_control,
+        'id_orden_produccion': control.id_orden_produccion,
+        'orden_produccion': control.id_orden_produccion,
+        'fecha': control.fecha.isoformat(),
+        'resultado': control.resultado,
+        'observaciones': control.observaciones,
+        'id_usuario': control.id_usuario,
+        'usuario_name': control.usuario.nombre
+    }
+
 @quality_control_bp.route('/quality_control', methods=['GET'])
 @login_required
 def get_quality_controls():
-    # Admin puede ver todos los controles
-    if current_user.rol == 'admin':
-        controls = ControlCalidad.query.all()
-    # Supervisor ve los controles de su área
-    elif current_user.rol == 'supervisor':
-        controls = ControlCalidad.query.join(OrdenProduccion).filter(
+    query = ControlCalidad.query.options(joinedload(ControlCalidad.usuario))
+    # Admin puede ver todos los controles; supervisor los de su área
+    if current_user.rol == 'supervisor':
+        query = query.join(OrdenProduccion).filter(
             OrdenProduccion.id_area == current_user.id_area
-        ).all()
+        )
     # Empleados solo ven los controles que ellos realizaron
     elif current_user.rol == 'empleado':
-        controls = ControlCalidad.query.filter_by(id_usuario=current_user.id_usuario).all()
-    else:
+        query = query.filter(ControlCalidad.id_usuario == current_user.id_usuario)
+    elif current_user.rol != 'admin':
         return jsonify({'error': 'No autorizado'}), 403
 
-    return jsonify([{
-        'id_control': control.id_control,
-        'id_orden_produccion': control.id_orden_produccion,
-        'orden_produccion': control.orden_produccion.id_orden_produccion,
-        'fecha': control.fecha.isoformat(),
-        'resultado': control.resultado,
-        'observaciones': control.observaciones,
-        'id_usuario': control.id_usuario,
-        'usuario_name': control.usuario.nombre
-    } for control in controls])
+    # El filtro ?estado= se aplica sobre el resultado del control
+    return paginated_response(query, serialize_quality_control, ControlCalidad.id_control,
+                              date_column=ControlCalidad.fecha, estado_column=ControlCalidad.resultado)
 
 @quality_control_bp.route('/quality_control', methods=['POST'])
 @role_required('admin', 'supervisor', 'empleado')  # Todos los roles pueden crear
@@ -1,11 +1,17 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
-from models import db, Venta, DetalleVenta, Producto, Inventario, Cliente
+import math
+from models import db, Venta, DetalleVenta, Producto, Cliente
 from datetime import date
 from routes.auth import role_required
+from utils.serializers import venta_load_options, serialize_venta
+from utils.pagination import paginated_response
 
 ventas_bp = Blueprint('ventas', __name__)
 
+# Límite de ventas por petición en /ventas/batch
+MAX_VENTAS_LOTE = 5000
+
 # Crear una venta
 @ventas_bp.route('/ventas', methods=['POST'])
 @login_required
@@ -42,7 +48,8 @@ def crear_venta():
     db.session.add(nueva_venta)
     db.session.flush()
 
-    # Procesar detalles y validar inventario
+    # Procesar detalles. El inventario es de materiales: lo consumen las órdenes de
+    # producción (y el plan MRP), no la venta del producto terminado
     for det in detalles:
         producto = Producto.query.get(det.get("id_producto"))
         if not producto:
@@ -54,13 +61,6 @@ def crear_venta():
             db.session.rollback()
             return jsonify({'error': 'Cantidad debe ser mayor a 0'}), 400
         
-        # Verificar inventario (solo para empleados)
-        if current_user.rol == 'empleado':
-            inventario = Inventario.query.filter_by(id_producto=producto.id_producto).first()
-            if not inventario or inventario.cantidad < cantidad:
-                db.session.rollback()
-                return jsonify({'error': f'No hay suficiente stock para {producto.nombre}'}), 400
-
         precio_unitario = float(det.get("precio_unitario", producto.precio))
         subtotal = cantidad * precio_unitario
 
@@ -81,10 +81,6 @@ def crear_venta():
         })
         total_venta += subtotal
 
-        # Actualizar inventario (solo para empleados)
-        if current_user.rol == 'empleado':
-            inventario.cantidad -= cantidad
-
     nueva_venta.total = total_venta
     db.session.commit()
 
@@ -95,53 +91,167 @@ def crear_venta():
         'detalles': detalles_creados
     }), 201
 
+# Crear varias ventas en una sola petición (p. ej. importaciones EDI de distribuidores)
+@ventas_bp.route('/ventas/batch', methods=['POST'])
+@login_required
+def crear_ventas_lote():
+    """
+    Crea un lote de ventas en una sola transacción.
+
+    Cuerpo: {"ventas": [{"id_cliente", "detalles": [...], "referencia"?}, ...]}
+    Clientes y productos se cargan una sola vez para todo el lote. Cada venta
+    se valida por separado con las reglas de crear_venta: las inválidas se
+    devuelven con su error y el resto se confirma junta. Como en crear_venta,
+    la venta no descuenta inventario: los materiales los consumen las órdenes
+    de producción que fabrican el producto.
+    """
+    if current_user.rol not in ['admin', 'supervisor', 'empleado']:
+        return jsonify({'error': 'No autorizado'}), 403
+
+    data = request.get_json(silent=True) or {}
+    ventas = data.get('ventas')
+    if not isinstance(ventas, list) or not ventas:
+        return jsonify({'error': 'Debe incluir una lista de ventas'}), 400
+    if len(ventas) > MAX_VENTAS_LOTE:
+        return jsonify({'error': f'Máximo {MAX_VENTAS_LOTE} ventas por lote'}), 400
+
+    # Precarga de clientes y productos referenciados en todo el lote
+    # (los identificadores que no son enteros se rechazan después, venta por venta)
+    ids_clientes, ids_productos = set(), set()
+    for venta in ventas:
+        if isinstance(venta, dict):
+            if _es_id(venta.get('id_cliente')):
+                ids_clientes.add(venta['id_cliente'])
+            detalles = venta.get('detalles')
+            for det in detalles if isinstance(detalles, list) else []:
+                if isinstance(det, dict) and _es_id(det.get('id_producto')):
+                    ids_productos.add(det['id_producto'])
+    clientes = {c.id_cliente: c for c in
+                Cliente.query.filter(Cliente.id_cliente.in_(ids_clientes)).all()}
+    productos = {p.id_producto: p for p in
+                 Producto.query.filter(Producto.id_producto.in_(ids_productos)).all()}
+
+    resultados = []
+    preparadas = []
+    for indice, venta in enumerate(ventas):
+        resultado = {'indice': indice}
+        if isinstance(venta, dict) and venta.get('referencia') is not None:
+            resultado['referencia'] = venta['referencia']
+        resultados.append(resultado)
+        try:
+            preparadas.append((resultado, _preparar_venta(venta, clientes, productos)))
+        except ValueError as e:
+            resultado['error'] = str(e)
+
+    nuevas = []
+    for resultado, (cliente, lineas) in preparadas:
+        nueva_venta = Venta(id_cliente=cliente.id_cliente, fecha=date.today(), total=0.0,
+                            estado='pendiente', id_usuario=current_user.id_usuario)
+        total_venta = 0
+        for producto, cantidad, precio_unitario in lineas:
+            subtotal = cantidad * precio_unitario
+            nueva_venta.detalles.append(DetalleVenta(
+                id_producto=producto.id_producto,
+                cantidad=cantidad,
+                precio_unitario=precio_unitario,
+                subtotal=subtotal
+            ))
+            total_venta += subtotal
+        nueva_venta.total = total_venta
+        db.session.add(nueva_venta)
+        nuevas.append((resultado, nueva_venta))
+
+    db.session.flush()
+    for resultado, nueva_venta in nuevas:
+        resultado['id_venta'] = nueva_venta.id_venta
+        resultado['total'] = float(nueva_venta.total)
+    db.session.commit()
+
+    return jsonify({
+        'mensaje': f'{len(nuevas)} de {len(ventas)} ventas creadas',
+        'creadas': len(nuevas),
+        'errores': len(ventas) - len(nuevas),
+        'resultados': resultados
+    }), 201 if nuevas else 400
+
+
+def _es_id(value):
+    """True si el valor es un identificador entero (bool no cuenta)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _preparar_venta(venta, clientes, productos):
+    """
+    Valida una venta del lote con los clientes y productos precargados
+
+    Returns:
+        tuple: (cliente, lista de (producto, cantidad, precio_unitario))
+
+    Raises:
+        ValueError: Con el mensaje de error de la venta
+    """
+    if not isinstance(venta, dict):
+        raise ValueError('Formato de venta inválido')
+    if not _es_id(venta.get('id_cliente')):
+        raise ValueError('id_cliente debe ser un número entero')
+    cliente = clientes.get(venta['id_cliente'])
+    if not cliente:
+        raise ValueError('Cliente no encontrado')
+    if current_user.rol == 'empleado' and cliente.tipo != 'minorista':
+        raise ValueError('Solo puede vender a clientes minoristas')
+
+    detalles = venta.get('detalles') or []
+    if not isinstance(detalles, list):
+        raise ValueError('detalles debe ser una lista')
+    if not detalles:
+        raise ValueError('Debe incluir al menos un producto')
+
+    lineas = []
+    for det in detalles:
+        if not isinstance(det, dict):
+            raise ValueError('Formato de detalle inválido')
+        if not _es_id(det.get('id_producto')):
+            raise ValueError('id_producto debe ser un número entero')
+        producto = productos.get(det['id_producto'])
+        if not producto:
+            raise ValueError(f'Producto {det.get("id_producto")} no encontrado')
+        cantidad = det.get('cantidad')
+        if not isinstance(cantidad, int) or isinstance(cantidad, bool) or cantidad <= 0:
+            raise ValueError('Cantidad debe ser mayor a 0')
+        precio_unitario = det.get('precio_unitario', producto.precio)
+        if isinstance(precio_unitario, bool):
+            raise ValueError('Precio unitario inválido')
+        try:
+            precio_unitario = float(precio_unitario)
+        except (TypeError, ValueError):
+            raise ValueError('Precio unitario inválido')
+        if not math.isfinite(precio_unitario) or precio_unitario < 0:
+            raise ValueError('Precio unitario inválido')
+        lineas.append((producto, cantidad, precio_unitario))
+    return cliente, lineas
+
 # Obtener todas las ventas
 @ventas_bp.route('/ventas', methods=['GET'])
 @login_required
 def obtener_ventas():
     # Admin ve todo, supervisor ve las de su área, empleados solo las propias
-    if current_user.rol == 'admin':
-        ventas = Venta.query.all()
-    elif current_user.rol == 'supervisor':
-        ventas = Venta.query.join(Cliente).filter(
+    # Cliente, detalles y productos se cargan por adelantado (sin N+1)
+    query = Venta.query.options(*venta_load_options())
+    if current_user.rol == 'supervisor':
+        query = query.join(Cliente).filter(
             Cliente.tipo.in_(['minorista', 'distribuidor'])
-        ).all()
-    else:  # empleado
-        ventas = Venta.query.filter_by(id_usuario=current_user.id_usuario).all()
-
-    ventas_json = []
-    for v in ventas:
-        detalles = []
-        for det in v.detalles:
-            producto = Producto.query.get(det.id_producto)
-            detalles.append({
-                'id_detalle': det.id_detalle,
-                'id_producto': det.id_producto,
-                'nombre_producto': producto.nombre if producto else 'Desconocido',
-                'cantidad': det.cantidad,
-                'precio_unitario': float(det.precio_unitario),
-                'subtotal': float(det.subtotal)
-            })
-
-        ventas_json.append({
-            'id_venta': v.id_venta,
-            'fecha': v.fecha.strftime('%Y-%m-%d'),
-            'total': float(v.total),
-            'estado': v.estado,
-            'cliente': {
-                'id_cliente': v.cliente.id_cliente,
-                'nombre': v.cliente.nombre,
-                'tipo': v.cliente.tipo
-            } if v.cliente else None,
-            'detalles': detalles
-        })
-    return jsonify(ventas_json)
+        )
+    elif current_user.rol != 'admin':  # empleado
+        query = query.filter(Venta.id_usuario == current_user.id_usuario)
+
+    return paginated_response(query, serialize_venta, Venta.id_venta,
+                              date_column=Venta.fecha, estado_column=Venta.estado)
 
 # Obtener una venta por ID
 @ventas_bp.route('/ventas/<int:id_venta>', methods=['GET'])
 @login_required
 def obtener_venta(id_venta):
-    venta = Venta.query.get_or_404(id_venta)
+    venta = Venta.query.options(*venta_load_options()).filter_by(id_venta=id_venta).first_or_404()
     
     # Control de acceso
     if current_user.rol == 'empleado' and venta.id_usuario != current_user.id_usuario:
@@ -149,32 +259,7 @@ def obtener_venta(id_venta):
     elif current_user.rol == 'supervisor' and venta.cliente.tipo not in ['minorista', 'distribuidor']:
         return jsonify({'error': 'No autorizado'}), 403
 
-    detalles = []
-    for det in venta.detalles:
-        producto = Producto.query.get(det.id_producto)
-        detalles.append({
-            'id_detalle': det.id_detalle,
-            'id_producto': det.id_producto,
-            'nombre_producto': producto.nombre if producto else 'Desconocido',
-            'cantidad': det.cantidad,
-            'precio_unitario': float(det.precio_unitario),
-            'subtotal': float(det.subtotal)
-        })
-
-    venta_json = {
-        'id_venta': venta.id_venta,
-        'fecha': venta.fecha.strftime('%Y-%m-%d'),
-        'total': float(venta.total),
-        'estado': venta.estado,
-        'cliente': {
-            'id_cliente': venta.cliente.id_cliente,
-            'nombre': venta.cliente.nombre,
-            'tipo': venta.cliente.tipo
-        } if venta.cliente else None,
-        'vendedor': venta.usuario.nombre if venta.usuario else 'Desconocido',
-        'detalles': detalles
-    }
-    return jsonify(venta_json)
+    return jsonify(serialize_venta(venta, incluir_vendedor=True))
 
 # Actualizar estado de una venta
 @ventas_bp.route('/ventas/<int:id_venta>', methods=['PUT'])
@@ -192,15 +277,8 @@ def actualizar_venta(id_venta):
     if nuevo_estado == 'cancelada' and current_user.rol != 'admin':
         return jsonify({'error': 'Solo administradores pueden cancelar ventas'}), 403
     
+    # La venta no descontó inventario, así que cancelarla no devuelve nada
     venta.estado = nuevo_estado
-    
-    # Si se cancela, devolver productos al inventario
-    if nuevo_estado == 'cancelada':
-        for detalle in venta.detalles:
-            inventario = Inventario.query.filter_by(id_producto=detalle.id_producto).first()
-            if inventario:
-                inventario.cantidad += detalle.cantidad
-    
     db.session.commit()
     return jsonify({'mensaje': 'Estado de venta actualizado'})
 
@@ -214,13 +292,9 @@ def eliminar_venta(id_venta):
     if venta.estado == 'completada':
         return jsonify({'error': 'No se puede eliminar una venta completada'}), 400
     
-    # Devolver productos al inventario si estaba pendiente
-    if venta.estado == 'pendiente':
-        for detalle in venta.detalles:
-            inventario = Inventario.query.filter_by(id_producto=detalle.id_producto).first()
-            if inventario:
-                inventario.cantidad += detalle.cantidad
-    
+    # La relación no borra en cascada: las líneas se eliminan antes que la venta
+    for detalle in venta.detalles:
+        db.session.delete(detalle)
     db.session.delete(venta)
     db.session.commit()
     return jsonify({'mensaje': 'Venta eliminada permanentemente'})
\ No newline at end of file
@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
-from models import db, DetalleVenta, Producto, Venta
+from models import db, DetalleVenta, Venta
 from datetime import date
 from routes.auth import role_required
+from utils.serializers import detalle_venta_load_options, serialize_detalle_venta
 
 sales_details_bp = Blueprint('sales_details', __name__)
 
@@ -15,38 +16,21 @@ def get_sales_details():
         sale_id = request.args.get('sale_id')
         product_id = request.args.get('product_id')
         
-        query = DetalleVenta.query
+        # Venta y producto se cargan por adelantado (sin N+1)
+        query = DetalleVenta.query.options(*detalle_venta_load_options())
         
         # Admin y Supervisor ven todos los detalles
         if current_user.rol == 'empleado':
             # Empleados solo ven detalles de sus propias ventas
-            query = query.join(Venta).filter(Venta.id_empleado == current_user.id_empleado)
+            query = query.filter(DetalleVenta.venta.has(Venta.id_usuario == current_user.id_usuario))
         
         if sale_id:
-            query = query.filter_by(id_venta=sale_id)
+            query = query.filter(DetalleVenta.id_venta == sale_id)
         if product_id:
-            query = query.filter_by(id_producto=product_id)
+            query = query.filter(DetalleVenta.id_producto == product_id)
             
         details = query.all()
-        
-        details_json = []
-        for det in details:
-            producto = Producto.query.get(det.id_producto)
-            venta = Venta.query.get(det.id_venta)
-            
-            details_json.append({
-                'id_detalle': det.id_detalle,
-                'id_venta': det.id_venta,
-                'venta_fecha': venta.fecha.strftime('%Y-%m-%d') if venta else None,
-                'id_producto': det.id_producto,
-                'producto_nombre': producto.nombre if producto else None,
-                'producto_codigo': producto.codigo if producto else None,
-                'cantidad': det.cantidad,
-                'precio_unitario': float(det.precio_unitario),
-                'subtotal': float(det.subtotal)
-            })
-            
-        return jsonify(details_json)
+        return jsonify([serialize_detalle_venta(det) for det in details])
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -56,30 +40,17 @@ def get_sales_details():
 @login_required
 def get_sales_detail(id_detalle):
     try:
-        detalle = DetalleVenta.query.get_or_404(id_detalle)
+        detalle = DetalleVenta.query.options(*detalle_venta_load_options()).filter_by(
+            id_detalle=id_detalle
+        ).first_or_404()
         
         # Verificar acceso para empleados
         if current_user.rol == 'empleado':
-            venta = Venta.query.get(detalle.id_venta)
-            if not venta or venta.id_empleado != current_user.id_empleado:
+            venta = detalle.venta
+            if not venta or venta.id_usuario != current_user.id_usuario:
                 return jsonify({'error': 'No autorizado'}), 403
-            
-        producto = Producto.query.get(detalle.id_producto)
-        venta = Venta.query.get(detalle.id_venta)
         
-        return jsonify({
-            'id_detalle': detalle.id_detalle,
-            'id_venta': detalle.id_venta,
-            'venta_fecha': venta.fecha.strftime('%Y-%m-%d') if venta else None,
-            'venta_estado': venta.estado if venta else None,
-            'id_producto': detalle.id_producto,
-            'producto_nombre': producto.nombre if producto else None,
-            'producto_codigo': producto.codigo if producto else None,
-            'producto_categoria': producto.categoria if producto else None,
-            'cantidad': detalle.cantidad,
-            'precio_unitario': float(detalle.precio_unitario),
-            'subtotal': float(detalle.subtotal)
-        })
+        return jsonify(serialize_detalle_venta(detalle, completo=True))
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
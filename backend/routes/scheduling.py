@@ -0,0 +1,98 @@
+from datetime import date, datetime
+from flask import Blueprint, request, jsonify
+from sqlalchemy import select
+from config import db
+from models import Producto
+from routes.auth import role_required
+from utils.scheduler import production_scheduler
+
+scheduling_bp = Blueprint('scheduling', __name__)
+
+
+def _parse_date(value, name):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Formato de fecha inválido para {name}. Use YYYY-MM-DD")
+
+
+def serialize_plan(scheduler, desde=None, hasta=None, id_activo=None):
+    """Plan listo para un diagrama de Gantt: tareas y mantenimientos por activo"""
+    first = desde.toordinal() if desde else None
+    last = hasta.toordinal() if hasta else None
+
+    tasks = {}
+    for order_id, (asset_id, start, end) in scheduler.assignments.items():
+        if (first is not None and end < first) or (last is not None and start > last):
+            continue
+        if id_activo is not None and asset_id != id_activo:
+            continue
+        tasks.setdefault(asset_id, []).append((start, end, scheduler.jobs[order_id]))
+
+    product_ids = {job.id_producto for items in tasks.values() for _, _, job in items}
+    products = dict(db.session.execute(
+        select(Producto.id_producto, Producto.nombre).where(Producto.id_producto.in_(product_ids))
+    ).all()) if product_ids else {}
+
+    activos = []
+    for asset in sorted(scheduler.assets.values(), key=lambda a: a.id):
+        if id_activo is not None and asset.id != id_activo:
+            continue
+        activos.append({
+            'id_activo': asset.id,
+            'nombre': asset.nombre,
+            'capacidad_diaria': asset.capacidad,
+            'disponible_desde': date.fromordinal(asset.available_from).isoformat() if asset.available_from else None,
+            'mantenimientos': [date.fromordinal(day).isoformat() for day in asset.blocked
+                               if (first is None or day >= first) and (last is None or day <= last)],
+            'tareas': [{
+                'id_orden_produccion': job.id,
+                'id_producto': job.id_producto,
+                'producto': products.get(job.id_producto),
+                'cantidad': job.cantidad,
+                'en_proceso': job.en_proceso,
+                'inicio': date.fromordinal(start).isoformat(),
+                'fin': date.fromordinal(end).isoformat(),
+            } for start, end, job in sorted(tasks.get(asset.id, []), key=lambda t: t[0])],
+        })
+
+    ends = [end for _, _, end in scheduler.assignments.values()]
+    tipo, seconds, recalculated = production_scheduler.last_update or (None, 0, None)
+    return {
+        'fecha_referencia': date.fromordinal(scheduler.today).isoformat(),
+        'fin_plan': date.fromordinal(max(ends)).isoformat() if ends else None,
+        'ordenes': len(scheduler.jobs),
+        'sin_asignar': sorted(scheduler.unassigned),
+        'activos': activos,
+        'actualizacion': {
+            'tipo': tipo,
+            'ms': round(seconds * 1000, 1),
+            'ordenes_recalculadas': recalculated,
+        },
+    }
+
+
+# Plan de producción con capacidad finita (Gantt)
+# Parámetros: desde, hasta (YYYY-MM-DD, ventana de fechas), id_activo
+@scheduling_bp.route('/programacion', methods=['GET'])
+@role_required('admin', 'supervisor')
+def get_programacion():
+    try:
+        desde = _parse_date(request.args.get('desde'), 'desde')
+        hasta = _parse_date(request.args.get('hasta'), 'hasta')
+        id_activo = request.args.get('id_activo', type=int)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    scheduler = production_scheduler.current(db.session)
+    return jsonify(serialize_plan(scheduler, desde, hasta, id_activo))
+
+# Recalcular el plan completo (p. ej. tras cambios hechos directamente en la base de datos)
+@scheduling_bp.route('/programacion/recalcular', methods=['POST'])
+@role_required('admin', 'supervisor')
+def recalcular_programacion():
+    production_scheduler.invalidate()
+    scheduler = production_scheduler.current(db.session)
+    return jsonify(serialize_plan(scheduler))
@@ -2,18 +2,27 @@ from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
 from routes.auth import role_required
 from models import Proveedor, db
+from utils.pagination import parse_id_list
 
 suppliers_bp = Blueprint('suppliers', __name__)
 
 @suppliers_bp.route('', methods=['GET'])
 @login_required
 def get_suppliers():
+    try:
+        ids = parse_id_list(request.args.get('ids'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    query = Proveedor.query
+    if ids is not None:
+        query = query.filter(Proveedor.id_proveedor.in_(ids))
+
     # Admin y Supervisor ven todos los proveedores
     if current_user.rol in ['admin', 'supervisor']:
-        suppliers = Proveedor.query.all()
+        suppliers = query.all()
     # Empleados solo ven proveedores activos
     elif current_user.rol == 'empleado':
-        suppliers = Proveedor.query.filter_by(activo=True).all()
+        suppliers = query.filter_by(activo=True).all()
     else:
         return jsonify({"error": "No autorizado"}), 403
 
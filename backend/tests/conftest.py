@@ -0,0 +1,101 @@
+# backend/tests/conftest.py
+"""
+Fixtures de las pruebas del backend.
+
+La aplicación de main.py se levanta sobre una base SQLite temporal que se
+rellena con utils/synthetic_data.py a escala reducida. Desde backend/:
+
+    python -m pytest tests
+"""
+import contextlib
+import os
+import sys
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix='erp-pruebas-')
+os.environ['ERP_DATABASE_URL'] = 'sqlite:///' + os.path.join(_DB_DIR, 'erp.db')
+os.environ.pop('ERP_REPLICA_DATABASE_URL', None)
+os.environ.pop('ERP_SETTINGS', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import event
+
+# Escala de los datos sintéticos (TAMANOS * ESCALA: unas 400 ventas y 1600 líneas)
+ESCALA = 0.01
+
+
+@pytest.fixture(scope='session')
+def app():
+    from main import app
+    from config import db
+    from utils import synthetic_data
+    with app.app_context():
+        sizes = synthetic_data.parse_sizes(ESCALA)
+        synthetic_data.Generator(db.session, sizes, seed=1).run()
+        db.session.commit()
+        db.session.remove()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de pruebas con sesión iniciada como el administrador del benchmark"""
+    from utils import synthetic_data
+    client = app.test_client()
+    response = client.post('/api/login', json={'email': synthetic_data.BENCH_EMAIL,
+                                               'password': synthetic_data.BENCH_PASSWORD})
+    assert response.status_code == 200
+    return client
+
+
+@pytest.fixture
+def login_as(app):
+    """Devuelve un cliente con sesión iniciada como un usuario del rol indicado (se crea si no existe)"""
+    from config import db
+    from models import Usuario
+
+    def login(rol):
+        email = f'{rol}@pruebas.local'
+        with app.app_context():
+            if Usuario.query.filter_by(email=email).first() is None:
+                usuario = Usuario(nombre=f'Prueba {rol}', email=email, rol=rol)
+                usuario.set_password('pruebas')
+                db.session.add(usuario)
+                db.session.commit()
+        client = app.test_client()
+        response = client.post('/api/login', json={'email': email, 'password': 'pruebas'})
+        assert response.status_code == 200
+        return client
+
+    return login
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements = []
+
+    def __len__(self):
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@pytest.fixture
+def count_statements(app):
+    """Context manager que cuenta las sentencias SQL ejecutadas dentro del bloque"""
+    from config import db
+
+    @contextlib.contextmanager
+    def counting():
+        counter = StatementCounter()
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', counter)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, 'before_cursor_execute', counter)
+
+    return counting
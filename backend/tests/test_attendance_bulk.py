@@ -0,0 +1,21 @@
+# backend/tests/test_attendance_bulk.py
+"""Validación de las marcas de POST /api/attendance/bulk"""
+import pytest
+
+
+@pytest.mark.parametrize('marca, error', [
+    ({'id_empleado': 1, 'timestamp': '2025-03-03T08:00:00', 'tipo': 5}, 'tipo'),
+    ({'id_empleado': 1, 'timestamp': '2025-03-03T08:00:00', 'tipo': ['entrada']}, 'tipo'),
+    ({'id_empleado': 1, 'timestamp': '2025-03-03T08:00:00', 'tipo': 'pausa'}, 'tipo'),
+    ({'id_empleado': True, 'timestamp': '2025-03-03T08:00:00'}, 'id_empleado'),
+    ({'id_empleado': [1], 'timestamp': '2025-03-03T08:00:00'}, 'id_empleado'),
+    ({'id_empleado': 1, 'timestamp': 20250303}, 'timestamp'),
+    ('1,2025-03-03', 'Formato'),
+])
+def test_marca_invalida_se_informa_por_linea(client, marca, error):
+    response = client.post('/api/attendance/bulk', json={'marcas': [marca]})
+
+    assert response.status_code == 200
+    assert response.json['descartadas'] == 1
+    assert response.json['errores'][0]['linea'] == 1
+    assert error in response.json['errores'][0]['error']
@@ -0,0 +1,75 @@
+# backend/tests/test_bulk_import.py
+"""Importación masiva: lotes confirmados, errores de lectura y lotes rechazados"""
+import io
+
+
+def _csv(lines):
+    return io.BytesIO(('nombre,email\n' + ''.join(lines)).encode('utf-8'))
+
+
+def test_error_de_lectura_conserva_los_lotes_importados(client):
+    etag = client.get('/api/clientes').headers['ETag']
+    archivo = _csv(f'Cliente importado {n},importado{n}@erp.local\n' for n in range(1500))
+    archivo = io.BytesIO(archivo.getvalue() + b'Cliente \xff,roto@erp.local\n')
+
+    response = client.post('/api/importar/clientes', data={'archivo': (archivo, 'clientes.csv')})
+
+    assert response.status_code == 200
+    resumen = response.json
+    assert resumen['importadas'] >= 1000
+    assert 'Error de lectura' in resumen['error_lectura']
+    assert client.get('/api/clientes').headers['ETag'] != etag
+
+
+def test_error_de_lectura_sin_filas_importadas(client):
+    archivo = io.BytesIO(b'nombre,email\nCliente \xff,roto@erp.local\n')
+
+    response = client.post('/api/importar/clientes', data={'archivo': (archivo, 'clientes.csv')})
+
+    assert response.status_code == 400
+    assert response.json['importadas'] == 0
+    assert 'Error de lectura' in response.json['error']
+
+
+def test_lote_rechazado_se_reintenta_por_filas(app):
+    from config import db
+    from models import Producto
+    from utils.bulk_import import run_import
+
+    def rows():
+        yield 2, {'codigo': 'IMP-1', 'nombre': 'Importado 1', 'precio': '10'}
+        yield 3, {'codigo': 'IMP-DUP', 'nombre': 'Duplicado', 'precio': '10'}
+        # Otro proceso crea el código después de que la importación cargó los existentes
+        db.session.add(Producto(codigo='IMP-DUP', nombre='Previo', precio=10, categoria='automovil'))
+        db.session.commit()
+        yield 4, {'codigo': 'IMP-2', 'nombre': 'Importado 2', 'precio': '10'}
+
+    with app.test_request_context(), app.app_context():
+        resumen = run_import(db.session, 'productos', ['codigo', 'nombre', 'precio'], rows())
+        importados = {codigo for (codigo,) in db.session.query(Producto.codigo).filter(
+            Producto.codigo.in_(['IMP-1', 'IMP-2']))}
+
+    assert resumen['importadas'] == 2
+    assert resumen['con_error'] == 1
+    assert [error['linea'] for error in resumen['errores']] == [3]
+    assert 'restricción' in resumen['errores'][0]['error']
+    assert importados == {'IMP-1', 'IMP-2'}
+
+
+def test_valores_no_finitos_son_errores_de_fila(client):
+    archivo = io.BytesIO(b'codigo,nombre,precio\n'
+                         b'NF-1,Precio NaN,NaN\n'
+                         b'NF-2,Precio sNaN,sNaN\n'
+                         b'NF-3,Precio infinito,Infinity\n')
+    response = client.post('/api/importar/productos', data={'archivo': (archivo, 'productos.csv')})
+
+    assert response.status_code == 200
+    assert response.json['importadas'] == 0
+    assert [error['linea'] for error in response.json['errores']] == [2, 3, 4]
+
+    archivo = io.BytesIO(b'nombre,stock_minimo,stock_maximo\nMaterial infinito,Infinity,-Infinity\n')
+    response = client.post('/api/importar/materiales', data={'archivo': (archivo, 'materiales.csv')})
+
+    assert response.status_code == 200
+    assert response.json['con_error'] == 1
+    assert 'entero' in response.json['errores'][0]['error']
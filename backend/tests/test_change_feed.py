@@ -0,0 +1,107 @@
+# backend/tests/test_change_feed.py
+"""El canal de cambios solo entrega a cada rol las filas de su listado y sin campos"""
+import pytest
+
+
+@pytest.fixture
+def publicar(app):
+    """Aplica una modificación con el ORM y devuelve los cambios publicados al confirmar"""
+    from config import db
+    from utils.change_feed import change_feed
+
+    def publicar(modificar):
+        with app.app_context():
+            desde = change_feed.last_id
+            modificar(db.session)
+            db.session.commit()
+            return [cambio for _, cambios in change_feed.wait(desde, 0) for cambio in cambios]
+
+    return publicar
+
+
+def _viewer(rol, **datos):
+    return {'rol': rol, 'id_usuario': None, 'id_empleado': None, 'id_area': None,
+            'ubicacion': None, **datos}
+
+
+def test_salario_solo_para_administradores(publicar):
+    from models import Empleado
+    from utils.change_feed import visible_changes
+
+    def subir_salario(session):
+        empleado = session.get(Empleado, 1)
+        empleado.salario = float(empleado.salario) + 1
+
+    cambios = publicar(subir_salario)
+
+    admin = visible_changes(cambios, _viewer('admin'), {'empleados'})
+    assert 'salario' in admin[0]['campos']
+    assert 'alcance' not in admin[0]
+    area = cambios[0]['alcance']['id_area']
+    supervisor = visible_changes(cambios, _viewer('supervisor', id_area=area), {'empleados'})
+    assert supervisor == [{'tabla': 'empleados', 'op': 'update', 'id': 1}]
+    assert visible_changes(cambios, _viewer('supervisor', id_area=area + 1), {'empleados'}) == []
+    assert visible_changes(cambios, _viewer('empleado', id_empleado=2), {'empleados'}) == []
+
+
+def test_ventas_con_el_alcance_del_listado(publicar):
+    from models import Venta
+    from utils.change_feed import visible_changes
+
+    venta = {}
+
+    def cambiar_estado(session):
+        fila = session.query(Venta).join(Venta.cliente).filter_by(tipo='OEM').first()
+        fila.estado = 'cancelada' if fila.estado != 'cancelada' else 'pendiente'
+        venta.update(id=fila.id_venta, id_usuario=fila.id_usuario)
+
+    cambios = publicar(cambiar_estado)
+
+    propio = visible_changes(cambios, _viewer('empleado', id_usuario=venta['id_usuario']), {'ventas'})
+    assert propio == [{'tabla': 'ventas', 'op': 'update', 'id': venta['id']}]
+    assert visible_changes(cambios, _viewer('empleado', id_usuario=venta['id_usuario'] + 1), {'ventas'}) == []
+    # El supervisor solo lista ventas a minoristas y distribuidores
+    assert visible_changes(cambios, _viewer('supervisor'), {'ventas'}) == []
+
+
+def test_tablas_sin_listado_para_el_rol():
+    from utils.change_feed import visible_changes
+
+    cambios = [{'tabla': 'asistencia', 'op': 'bulk'}, {'tabla': 'materiales', 'op': 'bulk'}]
+
+    assert visible_changes(cambios, _viewer('empleado')) == [{'tabla': 'materiales', 'op': 'bulk'}]
+    assert visible_changes(cambios, _viewer('supervisor')) == cambios
+
+
+def test_suscriptores_limitados(client):
+    from utils.change_feed import change_feed
+    limite = change_feed.max_subscribers
+    change_feed.max_subscribers = 1
+    try:
+        primera = client.get('/api/cambios', buffered=False)
+        assert primera.status_code == 200
+
+        rechazada = client.get('/api/cambios', buffered=False)
+        assert rechazada.status_code == 503
+        assert int(rechazada.headers['Retry-After']) > 0
+
+        primera.close()
+        segunda = client.get('/api/cambios', buffered=False)
+        assert segunda.status_code == 200
+        segunda.close()
+    finally:
+        change_feed.max_subscribers = limite
+
+
+def test_eventos_perdidos_por_consumidor_lento():
+    from utils.change_feed import ChangeFeed
+    feed = ChangeFeed(history_size=3)
+    cursor = feed.last_id
+    feed.publish([{'tabla': 'materiales', 'op': 'bulk'}])
+    assert len(feed.wait(cursor, 0)) == 1
+
+    for _ in range(5):
+        feed.publish([{'tabla': 'materiales', 'op': 'bulk'}])
+
+    assert feed.wait(cursor, 0) is None
+    assert len(feed.wait(feed.last_id - 3, 0)) == 3
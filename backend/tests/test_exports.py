@@ -0,0 +1,29 @@
+# backend/tests/test_exports.py
+"""Las exportaciones devuelven las mismas filas que el listado del rol"""
+import json
+import pytest
+
+
+def _exportar(client, recurso):
+    response = client.get(f'/api/export/{recurso}', query_string={'formato': 'ndjson'})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+@pytest.mark.parametrize('rol', ['admin', 'supervisor'])
+def test_export_ventas_como_el_listado(login_as, rol):
+    client = login_as(rol)
+    listado = {venta['id_venta'] for venta in client.get('/api/ventas').json}
+
+    ventas = {fila['id_venta'] for fila in _exportar(client, 'ventas')}
+    detalles = {fila['id_venta'] for fila in _exportar(client, 'detalle_ventas')}
+
+    assert ventas == listado
+    assert detalles <= listado
+
+
+def test_export_ventas_supervisor_excluye_otros_clientes(client, login_as):
+    todas = {fila['id_venta'] for fila in _exportar(client, 'ventas')}
+    supervisor = {fila['id_venta'] for fila in _exportar(login_as('supervisor'), 'ventas')}
+
+    assert supervisor < todas
@@ -0,0 +1,33 @@
+# backend/tests/test_http_cache.py
+"""ETag condicionales con uno o varios procesos servidor"""
+from utils.http_cache import http_cache
+
+MULTIPROCESO = {'wsgi.multiprocess': True}
+
+
+def test_etag_con_un_proceso(client):
+    etag = client.get('/api/clientes').headers['ETag']
+
+    response = client.get('/api/clientes', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+
+
+def test_sin_etag_con_varios_procesos_y_contadores_en_memoria(client):
+    etag = client.get('/api/clientes').headers['ETag']
+
+    response = client.get('/api/clientes', headers={'If-None-Match': etag},
+                          environ_overrides=MULTIPROCESO)
+
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+
+
+def test_etag_con_varios_procesos_y_almacen_compartido(client, monkeypatch):
+    monkeypatch.setattr(http_cache, 'shared', True)
+    etag = client.get('/api/clientes', environ_overrides=MULTIPROCESO).headers['ETag']
+
+    response = client.get('/api/clientes', headers={'If-None-Match': etag},
+                          environ_overrides=MULTIPROCESO)
+
+    assert response.status_code == 304
@@ -0,0 +1,120 @@
+# backend/tests/test_indexes.py
+"""
+Los filtros por rango de fechas usan los índices de la migración 001.
+
+Se capturan las sentencias reales del dashboard, de los listados con
+?desde/?hasta y de la reconstrucción del rollup, y se comprueba su plan con
+EXPLAIN QUERY PLAN de SQLite.
+"""
+import os
+import re
+from datetime import date
+import pytest
+from sqlalchemy import event
+
+# Tabla -> índices válidos para un filtro por rango de su columna de fecha
+INDICES = {
+    'ventas': ('idx_ventas_fecha_estado',),
+    'ordenes_produccion': ('idx_ordenes_produccion_fecha_estado',),
+    'ordenes_compra': ('idx_ordenes_compra_fecha_estado',),
+    'nominas': ('idx_nominas_fecha_pago',),
+    'mantenimiento': ('idx_mantenimiento_fecha',),
+    'control_calidad': ('idx_control_calidad_fecha',),
+    # En el dashboard por áreas se une por empleado: sirve la clave única (id_empleado, fecha)
+    'asistencia': ('idx_asistencia_fecha', 'sqlite_autoindex_asistencia_1'),
+}
+
+_RANGO = re.compile(r'\b(\w+)\.(?:fecha|fecha_inicio|fecha_pago) >= ')
+
+
+def _capture(app, action):
+    """Sentencias SELECT (con sus parámetros) ejecutadas por action()"""
+    from config import db
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        action()
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+    return statements
+
+
+def _check_ranges(app, statements):
+    """
+    Comprueba que cada filtro por rango de fechas busca en su índice
+
+    Returns:
+        set: Tablas comprobadas
+    """
+    from config import db
+    checked = set()
+    with app.app_context(), db.engine.connect() as conn:
+        raw = conn.connection.driver_connection
+        for statement, parameters in statements:
+            for table in set(_RANGO.findall(statement)) & set(INDICES):
+                plan = [row[3] for row in raw.execute('EXPLAIN QUERY PLAN ' + statement, parameters)]
+                assert any(re.match(rf'SEARCH {table} USING (COVERING )?INDEX ({"|".join(INDICES[table])}) ', line)
+                           for line in plan), f'{table} no usa su índice de fecha: {plan}\n{statement}'
+                checked.add(table)
+    return checked
+
+
+def test_dashboard_usa_indices_de_fecha(app, client):
+    from config import db
+    from utils.cache import dashboard_cache
+    dashboard_cache.invalidate_tables(list(db.metadata.tables))
+
+    statements = _capture(app, lambda: client.get('/api/dashboard'))
+
+    assert _check_ranges(app, statements) >= {'ventas', 'control_calidad', 'mantenimiento', 'asistencia'}
+
+
+@pytest.mark.parametrize('ruta, tabla', [
+    ('/api/ventas', 'ventas'),
+    ('/api/ordenes_produccion', 'ordenes_produccion'),
+    ('/api/ordenes_compra', 'ordenes_compra'),
+    ('/api/payroll', 'nominas'),
+    ('/api/quality_control', 'control_calidad'),
+    ('/api/attendance', 'asistencia'),
+])
+def test_listados_por_rango_usan_indices(app, client, ruta, tabla):
+    params = {'desde': '2025-01-01', 'hasta': '2025-01-31', 'limit': 50}
+
+    statements = _capture(app, lambda: client.get(ruta, query_string=params))
+
+    assert tabla in _check_ranges(app, statements)
+
+
+def test_rollup_usa_indices_de_fecha(app):
+    from config import db
+    from utils import kpi_rollup
+
+    def rebuild():
+        with app.app_context():
+            kpi_rollup.rebuild(db.session, start=date(2025, 1, 1), end=date(2025, 3, 1))
+            db.session.rollback()
+
+    statements = _capture(app, rebuild)
+
+    assert _check_ranges(app, statements) >= {'ventas', 'ordenes_produccion', 'nominas',
+                                              'ordenes_compra', 'mantenimiento'}
+
+
+def test_migracion_crea_los_indices_de_los_modelos(app):
+    # Las pruebas crean el esquema con create_all (índices de models.py); las bases
+    # existentes los reciben con la migración 001
+    from config import db
+    path = os.path.join(app.root_path, 'database', 'migrations', '001_indices_fechas.sql')
+    with open(path, encoding='utf-8') as f:
+        migracion = set(re.findall(r'CREATE INDEX (\w+)', f.read()))
+    modelos = {index.name for table in db.metadata.tables.values() for index in table.indexes
+               if index.name.startswith('idx_') and index.name.endswith(('_fecha', '_fecha_estado', '_fecha_pago'))}
+    assert migracion == modelos
+    assert {nombre for nombres in INDICES.values() for nombre in nombres if nombre.startswith('idx_')} <= migracion
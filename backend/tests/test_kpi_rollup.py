@@ -0,0 +1,61 @@
+# backend/tests/test_kpi_rollup.py
+"""Relleno del rollup mensual al leerlo, con peticiones concurrentes"""
+import pytest
+from sqlalchemy.exc import IntegrityError
+from config import db
+from models import KpiMensual
+from utils import kpi_rollup
+
+MESES = [(2031, 1), (2031, 2)]
+
+
+@pytest.fixture
+def meses_vacios(app):
+    with app.app_context():
+        yield MESES
+        db.session.rollback()
+        db.session.query(KpiMensual).filter(KpiMensual.anio == 2031).delete()
+        db.session.commit()
+        db.session.remove()
+
+
+def test_relleno_guarda_los_meses_que_faltan(meses_vacios):
+    series = kpi_rollup.rollup_series(meses_vacios, ['ventas'])
+
+    assert series == {'ventas': [0.0, 0.0]}
+    assert db.session.query(KpiMensual).filter(KpiMensual.anio == 2031).count() == 2
+
+
+def test_relleno_concurrente_lee_las_filas_de_la_otra_peticion(meses_vacios, monkeypatch):
+    refresh_buckets = kpi_rollup.refresh_buckets
+    calls = []
+
+    def carrera(session, buckets):
+        calls.append(buckets)
+        if len(calls) == 1:
+            # Otra petición confirma los mismos meses antes que esta
+            with db.engine.begin() as connection:
+                connection.execute(KpiMensual.__table__.insert(), [
+                    {'anio': anio, 'mes': mes, 'metrica': 'ventas', 'dimension': 'total',
+                     'valor': 0, 'registros': 0}
+                    for anio, mes in MESES
+                ])
+            raise IntegrityError('INSERT INTO kpi_mensual', {}, Exception('clave duplicada'))
+        return refresh_buckets(session, buckets)
+
+    monkeypatch.setattr(kpi_rollup, 'refresh_buckets', carrera)
+
+    series = kpi_rollup.rollup_series(meses_vacios, ['ventas'])
+
+    assert series == {'ventas': [0.0, 0.0]}
+    assert len(calls) == 1
+
+
+def test_relleno_se_rinde_tras_varios_intentos(meses_vacios, monkeypatch):
+    def siempre_duplicado(session, buckets):
+        raise IntegrityError('INSERT INTO kpi_mensual', {}, Exception('clave duplicada'))
+
+    monkeypatch.setattr(kpi_rollup, 'refresh_buckets', siempre_duplicado)
+
+    with pytest.raises(IntegrityError):
+        kpi_rollup.rollup_series(meses_vacios, ['ventas'])
@@ -0,0 +1,35 @@
+# backend/tests/test_pagination.py
+"""Parámetros de los listados paginados"""
+import base64
+import json
+import pytest
+
+
+def _cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('orden, cursor', [
+    ('fecha', [1, 2]),
+    ('fecha', ['x', 1]),
+    ('fecha', ['2024-01-01', 'a']),
+    ('fecha', [None, None]),
+    ('id', [{'a': 1}]),
+    ('id', ['7']),
+    ('id', [True]),
+    ('id', [1, 2]),
+])
+def test_cursor_mal_formado(client, orden, cursor):
+    response = client.get('/api/ventas', query_string={'limit': 10, 'orden': orden, 'cursor': _cursor(cursor)})
+    assert response.status_code == 400
+    assert 'cursor' in response.json['error']
+
+
+@pytest.mark.parametrize('orden', ['id', '-id', 'fecha', '-fecha'])
+def test_cursor_recorre_el_listado(client, orden):
+    primera = client.get('/api/ventas', query_string={'limit': 50, 'orden': orden})
+    segunda = client.get('/api/ventas', query_string={'limit': 50, 'orden': orden,
+                                                      'cursor': primera.headers['X-Next-Cursor']})
+    assert segunda.status_code == 200
+    ids = [venta['id_venta'] for venta in primera.json + segunda.json]
+    assert len(ids) == len(set(ids)) == 100
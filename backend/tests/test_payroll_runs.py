@@ -0,0 +1,55 @@
+# backend/tests/test_payroll_runs.py
+"""Validación de POST /api/payroll-runs y estado de los procesos entre procesos servidor"""
+import threading
+import pytest
+from utils.cache import MemoryStore
+from utils.jobs import JobQueue
+
+
+@pytest.mark.parametrize('periodo', [None, 202609, 2026.09, ['2026-09'], {'a': 1}, True, '', '2026-13', '26-09'])
+def test_periodo_invalido(client, periodo):
+    response = client.post('/api/payroll-runs', json={'periodo': periodo})
+
+    assert response.status_code == 400
+    assert 'periodo' in response.json['error']
+
+
+@pytest.mark.parametrize('reemplazar', ['false', 'true', '0', 1, 0, [], {}])
+def test_reemplazar_no_booleano(client, reemplazar):
+    response = client.post('/api/payroll-runs', json={'periodo': '2026-09', 'reemplazar': reemplazar})
+
+    assert response.status_code == 400
+    assert 'reemplazar' in response.json['error']
+
+
+def test_estado_compartido_entre_procesos(app):
+    """Dos colas con el mismo almacén simulan dos procesos servidor (gunicorn --workers 2)"""
+    store = MemoryStore()
+    worker_a, worker_b = JobQueue(store=store), JobQueue(store=store)
+    worker_a.init_app(app)
+    worker_b.init_app(app)
+    release = threading.Event()
+
+    def proceso(job):
+        job.update(50, 'A medias')
+        release.wait(5)
+        return {'ok': True}
+
+    job = worker_a.submit('prueba', proceso, clave='2026-09')
+    try:
+        assert worker_b.get(job.id) is None
+        assert worker_b.status(job.id)['tipo'] == 'prueba'
+        assert worker_b.find_active('prueba', '2026-09') == job.id
+        with pytest.raises(RuntimeError):
+            worker_b.submit('prueba', proceso, clave='2026-09')
+    finally:
+        release.set()
+        worker_a._executor.shutdown(wait=True)
+
+    status = worker_b.status(job.id)
+    assert status['estado'] == 'completado'
+    assert status['resultado'] == {'ok': True}
+    assert worker_b.find_active('prueba', '2026-09') is None
+    otro = worker_b.submit('prueba', lambda job: None, clave='2026-09')
+    worker_b._executor.shutdown(wait=True)
+    assert worker_a.status(otro.id)['estado'] == 'completado'
@@ -0,0 +1,62 @@
+# backend/tests/test_sales_batch.py
+"""Validación de POST /api/ventas/batch"""
+import pytest
+
+
+@pytest.mark.parametrize('venta, error', [
+    ({'id_cliente': [1], 'detalles': [{'id_producto': 1, 'cantidad': 1}]}, 'id_cliente'),
+    ({'id_cliente': {'a': 1}, 'detalles': [{'id_producto': 1, 'cantidad': 1}]}, 'id_cliente'),
+    ({'id_cliente': True, 'detalles': [{'id_producto': 1, 'cantidad': 1}]}, 'id_cliente'),
+    ({'id_cliente': 1, 'detalles': [{'id_producto': [1], 'cantidad': 1}]}, 'id_producto'),
+    ({'id_cliente': 1, 'detalles': 5}, 'detalles'),
+    ({'id_cliente': 1, 'detalles': [{'id_producto': 1, 'cantidad': 1, 'precio_unitario': 'nan'}]}, 'Precio'),
+    ({'id_cliente': 1, 'detalles': [{'id_producto': 1, 'cantidad': 1, 'precio_unitario': 'inf'}]}, 'Precio'),
+    ({'id_cliente': 1, 'detalles': [{'id_producto': 1, 'cantidad': 1, 'precio_unitario': -5}]}, 'Precio'),
+    ({'id_cliente': 1, 'detalles': [{'id_producto': 1, 'cantidad': 1, 'precio_unitario': 'diez'}]}, 'Precio'),
+    ({'id_cliente': 1, 'detalles': [{'id_producto': 1, 'cantidad': 1, 'precio_unitario': True}]}, 'Precio'),
+])
+def test_identificadores_invalidos(client, venta, error):
+    response = client.post('/api/ventas/batch', json={'ventas': [venta]})
+
+    assert response.status_code == 400
+    assert error in response.json['resultados'][0]['error']
+
+
+def _inventario(app):
+    from config import db
+    from models import Inventario
+    with app.app_context():
+        return dict(db.session.query(Inventario.id_inventario, Inventario.cantidad).all())
+
+
+def _crear_venta(client):
+    response = client.post('/api/ventas/batch', json={'ventas': [
+        {'id_cliente': 1, 'detalles': [{'id_producto': 1, 'cantidad': 2, 'precio_unitario': 10}]},
+    ]})
+    assert response.status_code == 201
+    assert response.json['resultados'][0]['total'] == 20
+    return response.json['resultados'][0]['id_venta']
+
+
+def test_la_venta_no_mueve_inventario(app, client):
+    antes = _inventario(app)
+
+    id_venta = _crear_venta(client)
+    assert _inventario(app) == antes
+
+    response = client.put(f'/api/ventas/{id_venta}', json={'estado': 'cancelada'})
+    assert response.status_code == 200
+    response = client.delete(f'/api/ventas/{id_venta}')
+    assert response.status_code == 200
+    assert _inventario(app) == antes
+
+
+def test_eliminar_venta_pendiente(app, client):
+    antes = _inventario(app)
+    id_venta = _crear_venta(client)
+
+    response = client.delete(f'/api/ventas/{id_venta}')
+
+    assert response.status_code == 200
+    assert client.get(f'/api/ventas/{id_venta}').status_code == 404
+    assert _inventario(app) == antes
@@ -0,0 +1,37 @@
+# backend/tests/test_sales_queries.py
+"""El listado de ventas y de sus detalles cuesta un número fijo de consultas"""
+
+
+def _statements(client, count_statements, url, **params):
+    with count_statements() as counter:
+        response = client.get(url, query_string=params)
+    assert response.status_code == 200
+    return response, len(counter)
+
+
+def test_ventas_consultas_constantes(client, count_statements):
+    pocas, consultas_pocas = _statements(client, count_statements, '/api/ventas', limit=5)
+    muchas, consultas_muchas = _statements(client, count_statements, '/api/ventas', limit=200)
+
+    assert len(pocas.json) == 5
+    assert len(muchas.json) == 200
+    assert all(venta['detalles'] for venta in muchas.json)
+    # Usuario de la sesión, ventas con cliente y vendedor, detalles con producto
+    assert consultas_muchas == consultas_pocas
+    assert consultas_muchas <= 3
+
+
+def test_ventas_listado_completo(client, count_statements):
+    _, consultas_pagina = _statements(client, count_statements, '/api/ventas', limit=5)
+    completo, consultas_completo = _statements(client, count_statements, '/api/ventas', limit=1000)
+
+    assert len(completo.json) > 200
+    assert consultas_completo == consultas_pagina
+
+
+def test_detalles_venta_consultas_constantes(client, count_statements):
+    una, consultas_una = _statements(client, count_statements, '/api/sales-details', sale_id=1)
+    todos, consultas_todos = _statements(client, count_statements, '/api/sales-details')
+
+    assert len(todos.json) > len(una.json) > 0
+    assert consultas_todos == consultas_una
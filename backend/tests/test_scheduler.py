@@ -0,0 +1,71 @@
+# backend/tests/test_scheduler.py
+"""El replan incremental produce el mismo plan que programar todo desde cero"""
+import random
+import pytest
+from utils.scheduler import Asset, Job, Scheduler
+
+HOY = 740000
+
+
+def _activos(rng):
+    activos = [Asset(i, f'Activo {i}', rng.choice((50, 100, 200)),
+                     [HOY + rng.randrange(120) for _ in range(rng.randint(0, 6))])
+               for i in range(1, 9)]
+    activos.append(Asset(9, 'Activo 9', 100, [HOY + 3], available_from=HOY + 4))
+    return activos
+
+
+def _orden(rng, id):
+    return Job(id, 1, rng.randint(20, 900), HOY + rng.randrange(-10, 90), rng.random() < 0.1)
+
+
+def _comprobar(incremental, activos):
+    completo = Scheduler(activos, HOY)
+    completo.schedule_all(list(incremental.jobs.values()))
+    assert incremental.assignments == completo.assignments
+    assert incremental.unassigned == completo.unassigned
+    assert incremental._history == completo._history
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_replan_igual_que_plan_completo(seed):
+    rng = random.Random(seed)
+    activos = _activos(rng)
+    scheduler = Scheduler(activos, HOY)
+    scheduler.schedule_all([_orden(rng, id) for id in range(1, 201)])
+    siguiente = 201
+
+    for _ in range(100):
+        accion = rng.random()
+        id = rng.choice(list(scheduler.jobs))
+        if accion < 0.6:
+            # Cambio de cantidad, fecha de inicio o estado
+            orden = scheduler.jobs[id]
+            scheduler.replan(id, Job(id, 1, max(1, orden.cantidad + rng.randint(-300, 300)),
+                                     orden.release + rng.choice((0, 0, -5, 7)), rng.random() < 0.1))
+        elif accion < 0.8:
+            # La orden deja de programarse (terminada o eliminada)
+            scheduler.replan(id)
+        else:
+            scheduler.replan(siguiente, _orden(rng, siguiente))
+            siguiente += 1
+        _comprobar(scheduler, activos)
+
+
+def test_replan_de_la_ultima_orden_no_recalcula_las_anteriores():
+    rng = random.Random(7)
+    scheduler = Scheduler(_activos(rng), HOY)
+    scheduler.schedule_all([_orden(rng, id) for id in range(1, 201)])
+    ultima = max(scheduler.jobs.values(), key=lambda job: job.key)
+
+    recalculadas = scheduler.replan(ultima.id, Job(ultima.id, 1, ultima.cantidad + 50, ultima.release,
+                                                   ultima.en_proceso))
+
+    assert recalculadas == 1
+
+
+def test_replan_de_orden_inexistente():
+    scheduler = Scheduler(_activos(random.Random(1)), HOY)
+    scheduler.schedule_all([])
+
+    assert scheduler.replan(99) == 0
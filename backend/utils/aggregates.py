@@ -0,0 +1,102 @@
+# backend/utils/aggregates.py
+"""
+Capa de agregación agrupada para reportes y dashboard.
+
+Cada serie mensual se calcula con una sola consulta GROUP BY (año, mes)
+sobre un rango de fechas semiabierto, de modo que el filtro puede usar
+los índices de la columna de fecha en lugar de envolverla en EXTRACT.
+"""
+import calendar
+from datetime import date
+from sqlalchemy import func, extract
+from config import db
+from models import Venta, OrdenProduccion, Nomina, OrdenCompra, Mantenimiento
+
+
+def month_window(reference, months=6):
+    """
+    Devuelve los últimos `months` pares (año, mes) que terminan en el mes
+    de `reference`, ordenados del más antiguo al más reciente.
+    """
+    pairs = []
+    year, month = reference.year, reference.month
+    for _ in range(months):
+        pairs.append((year, month))
+        month -= 1
+        if month == 0:
+            month = 12
+            year -= 1
+    pairs.reverse()
+    return pairs
+
+
+def month_bounds(year, month):
+    """Rango semiabierto [inicio, fin) que cubre el mes indicado"""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def window_bounds(months):
+    """Rango semiabierto que cubre una ventana de meses contigua"""
+    start, _ = month_bounds(*months[0])
+    _, end = month_bounds(*months[-1])
+    return start, end
+
+
+def monthly_series(value_expr, date_column, months, *filters):
+    """
+    Calcula `value_expr` agrupado por año-mes para los meses indicados.
+
+    Args:
+        value_expr: Expresión agregada (p. ej. func.sum(Venta.total))
+        date_column: Columna de fecha sobre la que se agrupa
+        months: Lista de pares (año, mes) contiguos, como la de month_window
+        *filters: Filtros adicionales de la consulta
+
+    Returns:
+        list: Un valor float por mes, en el mismo orden que `months`
+    """
+    start, end = window_bounds(months)
+    year_col = extract('year', date_column)
+    month_col = extract('month', date_column)
+
+    rows = db.session.query(year_col, month_col, value_expr).filter(
+        date_column >= start,
+        date_column < end,
+        *filters
+    ).group_by(year_col, month_col).all()
+
+    totals = {(int(year), int(month)): float(value or 0) for year, month, value in rows}
+    return [totals.get(pair, 0.0) for pair in months]
+
+
+# Series mensuales del dashboard: nombre -> (expresión, columna de fecha, filtros)
+KPI_SERIES = {
+    'ventas': (func.sum(Venta.total), Venta.fecha, (Venta.estado == 'completada',)),
+    'produccion': (func.sum(OrdenProduccion.cantidad), OrdenProduccion.fecha_inicio,
+                   (OrdenProduccion.estado == 'completada',)),
+    'nominas': (func.sum(Nomina.salario_neto), Nomina.fecha_pago, ()),
+    'compras': (func.sum(OrdenCompra.total), OrdenCompra.fecha, (OrdenCompra.estado == 'recibida',)),
+    'mantenimiento': (func.sum(Mantenimiento.costo), Mantenimiento.fecha, ()),
+}
+
+
+def kpi_series(months, names=None):
+    """
+    Calcula las series mensuales del dashboard, una consulta por tabla.
+
+    Returns:
+        dict: nombre de la serie -> lista de valores alineada con `months`
+    """
+    names = names or KPI_SERIES.keys()
+    series = {}
+    for name in names:
+        value_expr, date_column, filters = KPI_SERIES[name]
+        series[name] = monthly_series(value_expr, date_column, months, *filters)
+    return series
+
+
+def month_label(year, month):
+    """Etiqueta de categoría usada por las gráficas del dashboard"""
+    return f"{calendar.month_abbr[month]} {year}"
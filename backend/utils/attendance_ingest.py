@@ -0,0 +1,321 @@
+# backend/utils/attendance_ingest.py
+"""
+Ingesta de marcas de los relojes de fichaje (POST /api/attendance/bulk).
+
+Las marcas en bruto (empleado, fecha y hora, y opcionalmente si es entrada
+o salida) se agrupan por empleado y día: la entrada es la marca más
+temprana y la salida la más tardía. El día se combina con la fila de
+asistencia que ya exista, de modo que las marcas de un mismo día pueden
+llegar en lotes distintos, y se clasifica como 'tardanza' si la entrada
+supera la hora del turno más la tolerancia.
+
+Las filas se escriben por lotes con un upsert sobre la clave única
+(id_empleado, fecha): INSERT ... ON DUPLICATE KEY UPDATE en MySQL (ON
+CONFLICT en SQLite/PostgreSQL). Antes se leen las filas existentes de los
+días del lote y solo se escriben las que cambian, así que reenviar un lote
+es idempotente y no genera escrituras.
+"""
+import csv
+import io
+from datetime import datetime, timedelta, time
+from sqlalchemy import select, or_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from models import Asistencia, Empleado, ConfiguracionSistema
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 500
+TIPOS_MARCA = ('entrada', 'salida')
+
+# Parámetros del turno en configuracion_sistema y sus valores por defecto
+PARAMETRO_ENTRADA = 'asistencia_hora_entrada'
+PARAMETRO_TOLERANCIA = 'asistencia_tolerancia_minutos'
+HORA_ENTRADA = '08:00'
+TOLERANCIA_MINUTOS = 10
+
+
+class Shift:
+    """Hora de entrada del turno y minutos de tolerancia antes de contar tardanza"""
+
+    def __init__(self, entrada, tolerancia=TOLERANCIA_MINUTOS):
+        self.entrada = entrada
+        self.tolerancia = tolerancia
+        limite = datetime.combine(datetime.min, entrada) + timedelta(minutes=tolerancia)
+        self.limite = limite.time() if limite.date() == datetime.min.date() else time.max
+
+    def classify(self, entrada, salida):
+        """Estado del día según sus horas de entrada y salida"""
+        if entrada is None:
+            return 'presente' if salida is not None else 'ausente'
+        return 'tardanza' if entrada > self.limite else 'presente'
+
+    def to_dict(self):
+        return {'entrada': self.entrada.strftime('%H:%M'), 'tolerancia_minutos': self.tolerancia}
+
+
+def _parse_time(value, name):
+    try:
+        return datetime.strptime(str(value).strip(), '%H:%M').time()
+    except ValueError:
+        try:
+            return datetime.strptime(str(value).strip(), '%H:%M:%S').time()
+        except ValueError:
+            raise ValueError(f'Formato de hora inválido para {name}. Use HH:MM')
+
+
+def _parse_minutes(value, name):
+    try:
+        minutes = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f'{name} debe ser un número entero de minutos')
+    if not 0 <= minutes <= 720:
+        raise ValueError(f'{name} debe estar entre 0 y 720')
+    return minutes
+
+
+def load_shift(session, entrada=None, tolerancia=None):
+    """
+    Turno con el que se clasifican las marcas: los valores indicados o, si
+    faltan, los de configuracion_sistema o los predeterminados
+
+    Raises:
+        ValueError: Si la hora o la tolerancia no son válidas
+    """
+    config = dict(session.execute(
+        select(ConfiguracionSistema.parametro, ConfiguracionSistema.valor)
+        .where(ConfiguracionSistema.parametro.in_([PARAMETRO_ENTRADA, PARAMETRO_TOLERANCIA]))
+    ).all())
+    if entrada is None:
+        entrada = config.get(PARAMETRO_ENTRADA) or HORA_ENTRADA
+    if tolerancia is None:
+        tolerancia = config.get(PARAMETRO_TOLERANCIA) or TOLERANCIA_MINUTOS
+    return Shift(_parse_time(entrada, 'entrada'), _parse_minutes(tolerancia, 'tolerancia_minutos'))
+
+
+# --- Lectura de marcas ---
+
+def _parse_timestamp(value):
+    if isinstance(value, str):
+        value = value.strip().replace('Z', '+00:00')
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        # Las horas de asistencia se guardan en la hora local del servidor
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+def parse_punch(raw):
+    """
+    Valida una marca {"id_empleado", "timestamp", "tipo"?}
+
+    Returns:
+        tuple: (id_empleado, datetime, tipo o None)
+
+    Raises:
+        ValueError: Con el motivo del rechazo
+    """
+    if not isinstance(raw, dict):
+        raise ValueError('Formato de marca inválido')
+    if isinstance(raw.get('id_empleado'), bool):
+        raise ValueError('id_empleado inválido')
+    try:
+        id_empleado = int(raw.get('id_empleado'))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError('id_empleado inválido')
+    try:
+        moment = _parse_timestamp(raw.get('timestamp'))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError('timestamp inválido. Use YYYY-MM-DDTHH:MM:SS')
+    tipo = raw.get('tipo')
+    if tipo is not None and not isinstance(tipo, str):
+        raise ValueError(f"tipo no válido. Use uno de: {', '.join(TIPOS_MARCA)}")
+    tipo = (tipo or '').strip().lower() or None
+    if tipo is not None and tipo not in TIPOS_MARCA:
+        raise ValueError(f"tipo no válido. Use uno de: {', '.join(TIPOS_MARCA)}")
+    return id_empleado, moment, tipo
+
+
+def read_csv_punches(text):
+    """Marcas de un CSV con cabecera id_empleado,timestamp[,tipo]; iterador de (línea, dict)"""
+    reader = csv.DictReader(io.StringIO(text))
+    if reader.fieldnames is None or not {'id_empleado', 'timestamp'} <= {
+            name.strip().lower() for name in reader.fieldnames}:
+        raise ValueError('El CSV debe tener las columnas id_empleado y timestamp')
+    for line, row in enumerate(reader, start=2):
+        yield line, {(key or '').strip().lower(): value for key, value in row.items()}
+
+
+# --- Agrupación y escritura ---
+
+class _Day:
+    """Marcas de un empleado en un día"""
+    __slots__ = ('entradas', 'salidas', 'sin_tipo')
+
+    def __init__(self):
+        self.entradas = []
+        self.salidas = []
+        self.sin_tipo = []
+
+    def add(self, moment, tipo):
+        if tipo == 'entrada':
+            self.entradas.append(moment)
+        elif tipo == 'salida':
+            self.salidas.append(moment)
+        else:
+            self.sin_tipo.append(moment)
+
+    def collapse(self):
+        """(entrada, salida): la marca más temprana y la más tardía si es posterior"""
+        entradas = self.entradas + self.sin_tipo
+        salidas = self.salidas + self.sin_tipo
+        entrada = min(entradas) if entradas else None
+        salida = max(salidas) if salidas else None
+        if entrada is not None and salida is not None and salida <= entrada:
+            salida = None
+        return entrada, salida
+
+
+def _upsert_statement(session):
+    """INSERT ... ON DUPLICATE KEY UPDATE (o ON CONFLICT) sobre (id_empleado, fecha)"""
+    table = Asistencia.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(
+            hora_entrada=stmt.inserted.hora_entrada,
+            hora_salida=stmt.inserted.hora_salida,
+            estado=stmt.inserted.estado,
+        )
+    insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=['id_empleado', 'fecha'],
+        set_={'hora_entrada': stmt.excluded.hora_entrada,
+              'hora_salida': stmt.excluded.hora_salida,
+              'estado': stmt.excluded.estado},
+    )
+
+
+def _existing_rows(session, keys):
+    """Filas de asistencia existentes de las claves (id_empleado, fecha) indicadas"""
+    existing = {}
+    employees = sorted({id_empleado for id_empleado, _ in keys})
+    dates = [fecha for _, fecha in keys]
+    first, last = min(dates), max(dates)
+    for start in range(0, len(employees), BATCH_SIZE):
+        chunk = employees[start:start + BATCH_SIZE]
+        for row in session.execute(
+            select(Asistencia.id_empleado, Asistencia.fecha, Asistencia.hora_entrada,
+                   Asistencia.hora_salida, Asistencia.estado)
+            .where(Asistencia.id_empleado.in_(chunk),
+                   Asistencia.fecha >= first, Asistencia.fecha <= last)
+        ):
+            existing[(row.id_empleado, row.fecha)] = row
+    return existing
+
+
+def _absent_keys(session, dates, present):
+    """Empleados activos sin asistencia en los días laborables indicados"""
+    keys = []
+    for fecha in sorted(dates):
+        if fecha.weekday() >= 5:
+            continue
+        employees = session.execute(
+            select(Empleado.id_empleado).where(
+                Empleado.activo.is_(True),
+                or_(Empleado.fecha_contratacion.is_(None), Empleado.fecha_contratacion <= fecha))
+        ).scalars()
+        keys.extend((id_empleado, fecha) for id_empleado in employees if (id_empleado, fecha) not in present)
+    return keys
+
+
+def ingest_punches(session, punches, shift, marcar_ausentes=False,
+                   batch_size=BATCH_SIZE, max_errors=MAX_ERRORS):
+    """
+    Agrupa las marcas por empleado y día y escribe la asistencia resultante.
+
+    No hace commit: las filas quedan en la transacción de `session`.
+
+    Args:
+        session: Sesión de SQLAlchemy
+        punches: Iterable de (línea o posición, dict de la marca)
+        shift: Shift con el que se clasifica la entrada
+        marcar_ausentes: Si es True, los empleados activos sin marcas ni
+            asistencia en los días laborables del lote se registran como 'ausente'
+
+    Returns:
+        dict: Resumen con marcas procesadas, filas insertadas, actualizadas y
+        sin cambios, y errores por línea
+    """
+    summary = {'marcas': 0, 'descartadas': 0, 'dias': 0, 'insertados': 0, 'actualizados': 0,
+               'sin_cambios': 0, 'ausentes': 0, 'escritos': 0, 'turno': shift.to_dict(),
+               'errores': [], 'errores_omitidos': 0}
+
+    def report(line, message):
+        summary['descartadas'] += 1
+        if len(summary['errores']) < max_errors:
+            summary['errores'].append({'linea': line, 'error': message})
+        else:
+            summary['errores_omitidos'] += 1
+
+    days = {}
+    lines = {}
+    for line, raw in punches:
+        summary['marcas'] += 1
+        try:
+            id_empleado, moment, tipo = parse_punch(raw)
+        except ValueError as e:
+            report(line, str(e))
+            continue
+        key = (id_empleado, moment.date())
+        days.setdefault(key, _Day()).add(moment.time().replace(microsecond=0), tipo)
+        lines.setdefault(id_empleado, []).append(line)
+
+    # Marcas de empleados que no existen
+    known = set()
+    employees = sorted(lines)
+    for start in range(0, len(employees), batch_size):
+        known.update(session.execute(
+            select(Empleado.id_empleado).where(Empleado.id_empleado.in_(employees[start:start + batch_size]))
+        ).scalars())
+    for id_empleado in employees:
+        if id_empleado not in known:
+            for line in lines[id_empleado]:
+                report(line, f'Empleado {id_empleado} no encontrado')
+    days = {key: day for key, day in days.items() if key[0] in known}
+    summary['dias'] = len(days)
+
+    existing = _existing_rows(session, list(days)) if days else {}
+    rows = []
+    for key, day in days.items():
+        previous = existing.get(key)
+        if previous is not None:
+            # Lo ya registrado cuenta como una marca más de su tipo
+            if previous.hora_entrada is not None:
+                day.add(previous.hora_entrada, 'entrada')
+            if previous.hora_salida is not None:
+                day.add(previous.hora_salida, 'salida')
+        entrada, salida = day.collapse()
+        estado = shift.classify(entrada, salida)
+        if previous is not None and (previous.hora_entrada, previous.hora_salida, previous.estado) == (
+                entrada, salida, estado):
+            summary['sin_cambios'] += 1
+            continue
+        summary['actualizados' if previous is not None else 'insertados'] += 1
+        rows.append({'id_empleado': key[0], 'fecha': key[1], 'hora_entrada': entrada,
+                     'hora_salida': salida, 'estado': estado})
+
+    if marcar_ausentes and days:
+        candidates = _absent_keys(session, {fecha for _, fecha in days}, set(days) | set(existing))
+        # Los empleados sin marcas en el lote pueden tener ya asistencia registrada ese día
+        recorded = _existing_rows(session, candidates) if candidates else {}
+        absent = [key for key in candidates if key not in recorded]
+        rows.extend({'id_empleado': id_empleado, 'fecha': fecha, 'hora_entrada': None,
+                     'hora_salida': None, 'estado': 'ausente'} for id_empleado, fecha in absent)
+        summary['ausentes'] = len(absent)
+
+    if rows:
+        stmt = _upsert_statement(session)
+        for start in range(0, len(rows), batch_size):
+            session.execute(stmt, rows[start:start + batch_size])
+    summary['escritos'] = len(rows)
+    return summary
@@ -0,0 +1,225 @@
+# backend/utils/benchmark.py
+"""
+Benchmark reproducible de los endpoints principales.
+
+    flask --app main bench generate --scale 1 --rows detalle_ventas=1000000 --rows asistencia=500000
+    flask --app main bench run --output bench.json
+    flask --app main bench compare antes.json despues.json
+
+`generate` rellena la base configurada (ERP_DATABASE_URL: un archivo
+SQLite o un MySQL local) con utils/synthetic_data.py. `run` ejecuta cada
+escenario de ESCENARIOS con el cliente de pruebas de Flask (sin red ni
+servidor) y escribe un JSON con claves ordenadas y valores redondeados,
+pensado para guardarse junto al commit y compararse con `compare`.
+
+Las consultas por petición salen de la cabecera Server-Timing del perfilado
+(utils/profiling.py), así que un N+1 se ve como un salto en `consultas`.
+"""
+import calendar
+import json
+import platform
+import re
+import subprocess
+import time
+from datetime import datetime
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import func, select
+from config import db
+from models import Venta
+from utils import synthetic_data
+from utils.cache import dashboard_cache
+
+# Escenario: (nombre, ruta, parámetros, preparación)
+# Los parámetros admiten {desde_mes} y {fin_mes} (el último mes con ventas de la base)
+# y {cursor_ventas} (el cursor de la segunda página de ventas)
+ESCENARIOS = (
+    ('dashboard_frio', '/api/dashboard', {}, 'vaciar_dashboard'),
+    ('dashboard_caliente', '/api/dashboard', {}, None),
+    ('ventas_pagina', '/api/ventas', {'limit': 100}, None),
+    ('ventas_ultimo_mes', '/api/ventas', {'limit': 100, 'desde': '{desde_mes}', 'hasta': '{fin_mes}'}, None),
+    ('ventas_siguiente_pagina', '/api/ventas', {'limit': 100, 'cursor': '{cursor_ventas}'}, None),
+    ('ordenes_compra_pagina', '/api/ordenes_compra', {'limit': 100}, None),
+    ('ordenes_compra_recibidas', '/api/ordenes_compra', {'limit': 100, 'estado': 'recibida'}, None),
+    ('inventario_pagina', '/api/inventario', {'limit': 100}, None),
+    ('payroll_pagina', '/api/payroll', {'limit': 100}, None),
+    ('payroll_ultimo_mes', '/api/payroll', {'limit': 100, 'desde': '{desde_mes}', 'hasta': '{fin_mes}'}, None),
+)
+
+_SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) consultas"')
+
+# Variación relativa y absoluta (ms) a partir de la cual `compare` marca un escenario
+UMBRAL_COMPARACION = 0.10
+UMBRAL_MINIMO_MS = 2.0
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, timeout=5, cwd=current_app.root_path).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _context(client):
+    """Valores de los parámetros dependientes de los datos (fechas y cursores)"""
+    hasta = db.session.execute(select(func.max(Venta.fecha))).scalar() or datetime.now().date()
+    db.session.remove()
+    first = client.get('/api/ventas', query_string={'limit': 100})
+    return {
+        'desde_mes': hasta.replace(day=1).isoformat(),
+        'fin_mes': hasta.replace(day=calendar.monthrange(hasta.year, hasta.month)[1]).isoformat(),
+        'cursor_ventas': first.headers.get('X-Next-Cursor', ''),
+    }
+
+
+def _prepare(preparacion):
+    if preparacion == 'vaciar_dashboard':
+        dashboard_cache.invalidate_tables(list(db.metadata.tables))
+
+
+def run_scenarios(repeticiones=10, calentamiento=2, solo=None):
+    """
+    Ejecuta los escenarios con el cliente de pruebas autenticado como el usuario del benchmark.
+
+    Returns:
+        dict: Resultados listos para escribir en JSON
+    """
+    client = current_app.test_client()
+    login = client.post('/api/login', json={'email': synthetic_data.BENCH_EMAIL,
+                                            'password': synthetic_data.BENCH_PASSWORD})
+    if login.status_code != 200:
+        raise click.ClickException('No se pudo iniciar sesión con el usuario del benchmark; '
+                                   'genere los datos con `flask --app main bench generate`')
+    context = _context(client)
+
+    escenarios = {}
+    for nombre, ruta, parametros, preparacion in ESCENARIOS:
+        if solo and nombre not in solo:
+            continue
+        query = {key: str(value).format(**context) for key, value in parametros.items()}
+        timings, consultas, status, size = [], None, None, None
+        for i in range(calentamiento + repeticiones):
+            _prepare(preparacion)
+            started = time.perf_counter()
+            response = client.get(ruta, query_string=query)
+            elapsed = (time.perf_counter() - started) * 1000
+            status, size = response.status_code, len(response.data)
+            match = _SERVER_TIMING_QUERIES.search(response.headers.get('Server-Timing', ''))
+            consultas = int(match.group(1)) if match else None
+            if i >= calentamiento:
+                timings.append(elapsed)
+        timings.sort()
+        escenarios[nombre] = {
+            'ruta': ruta,
+            'parametros': query,
+            'estado': status,
+            'bytes': size,
+            'consultas': consultas,
+            'mediana_ms': round(timings[len(timings) // 2], 1),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+            'min_ms': round(timings[0], 1),
+        }
+
+    return {
+        'commit': _git_commit(),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'base_de_datos': db.engine.url.get_backend_name(),
+        'python': platform.python_version(),
+        'repeticiones': repeticiones,
+        'filas': synthetic_data.row_counts(db.session),
+        'escenarios': escenarios,
+    }
+
+
+def compare(antes, despues, umbral=UMBRAL_COMPARACION):
+    """Líneas de texto con la variación de cada escenario entre dos resultados"""
+    lines = []
+    for nombre, nuevo in despues['escenarios'].items():
+        viejo = antes['escenarios'].get(nombre)
+        if viejo is None:
+            lines.append(f'{nombre}: nuevo ({nuevo["mediana_ms"]} ms, {nuevo["consultas"]} consultas)')
+            continue
+        cambio = (nuevo['mediana_ms'] - viejo['mediana_ms']) / viejo['mediana_ms'] if viejo['mediana_ms'] else 0.0
+        marca = ''
+        if abs(nuevo['mediana_ms'] - viejo['mediana_ms']) >= UMBRAL_MINIMO_MS:
+            marca = ' <-- más lento' if cambio > umbral else (' <-- más rápido' if cambio < -umbral else '')
+        consultas = ''
+        if viejo['consultas'] != nuevo['consultas']:
+            consultas = f', consultas {viejo["consultas"]} -> {nuevo["consultas"]}'
+        lines.append(f'{nombre}: {viejo["mediana_ms"]} -> {nuevo["mediana_ms"]} ms '
+                     f'({cambio:+.0%}){consultas}{marca}')
+    if antes.get('filas') != despues.get('filas'):
+        lines.append('Aviso: los resultados se midieron con volúmenes de datos distintos')
+    return lines
+
+
+# --- CLI: flask --app main bench ---
+
+bench_cli = AppGroup('bench', help='Benchmark de los endpoints con datos sintéticos')
+
+
+@bench_cli.command('generate')
+@click.option('--scale', default=1.0, help='Multiplicador de los tamaños por defecto')
+@click.option('--rows', 'overrides', multiple=True, help='Filas de una tabla, p. ej. detalle_ventas=1000000')
+@click.option('--seed', default=1, help='Semilla aleatoria')
+@click.option('--hasta', help='Fecha final de los datos (YYYY-MM-DD, por defecto hoy)')
+@click.option('--anios', default=3, help='Años de historia')
+@click.option('--reset', is_flag=True, help='Vacía antes las tablas (pide confirmación)')
+@click.option('--yes', is_flag=True, help='No pedir confirmación con --reset')
+def generate_command(scale, overrides, seed, hasta, anios, reset, yes):
+    """Rellena la base configurada con datos sintéticos"""
+    try:
+        sizes = synthetic_data.parse_sizes(scale, overrides)
+        hasta = datetime.strptime(hasta, '%Y-%m-%d').date() if hasta else None
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    url = db.engine.url.render_as_string(hide_password=True)
+    existentes = {tabla: filas for tabla, filas in synthetic_data.row_counts(db.session).items() if filas}
+    if existentes:
+        if not reset:
+            raise click.ClickException(f'La base {url} ya tiene datos ({len(existentes)} tablas con filas); '
+                                       'use --reset para vaciarla')
+        if not yes:
+            click.confirm(f'Se borrarán los datos de {url}. ¿Continuar?', abort=True)
+        synthetic_data.clear(db.session)
+
+    started = time.perf_counter()
+    generator = synthetic_data.Generator(db.session, sizes, seed=seed, hasta=hasta, anios=anios)
+    timings = generator.run(progress=lambda mensaje: click.echo(f'  {mensaje}...'))
+    db.session.commit()
+    for tabla, (filas, segundos) in timings.items():
+        click.echo(f'{tabla}: {filas} filas en {segundos:.1f} s')
+    click.echo(f'Datos generados en {time.perf_counter() - started:.1f} s. '
+               f'Usuario del benchmark: {synthetic_data.BENCH_EMAIL} / {synthetic_data.BENCH_PASSWORD}')
+
+
+@bench_cli.command('run')
+@click.option('--output', type=click.Path(dir_okay=False), help='Archivo JSON de resultados')
+@click.option('--repeticiones', default=10, help='Mediciones por escenario')
+@click.option('--calentamiento', default=2, help='Peticiones previas sin medir')
+@click.option('--escenario', 'solo', multiple=True, type=click.Choice([e[0] for e in ESCENARIOS]),
+              help='Escenario a ejecutar (se puede repetir; por defecto todos)')
+def run_command(output, repeticiones, calentamiento, solo):
+    """Mide los escenarios contra la base configurada"""
+    results = run_scenarios(repeticiones, calentamiento, solo)
+    for nombre, escenario in results['escenarios'].items():
+        click.echo(f"{nombre}: mediana {escenario['mediana_ms']} ms, p95 {escenario['p95_ms']} ms, "
+                   f"{escenario['consultas']} consultas, {escenario['bytes']} bytes (HTTP {escenario['estado']})")
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write('\n')
+        click.echo(f'Resultados guardados en {output}')
+
+
+@bench_cli.command('compare')
+@click.argument('antes', type=click.File(encoding='utf-8'))
+@click.argument('despues', type=click.File(encoding='utf-8'))
+@click.option('--umbral', default=UMBRAL_COMPARACION, help='Variación relativa que se marca (0.10 = 10 %)')
+def compare_command(antes, despues, umbral):
+    """Compara dos archivos de resultados"""
+    for line in compare(json.load(antes), json.load(despues), umbral):
+        click.echo(line)
@@ -0,0 +1,374 @@
+# backend/utils/bulk_import.py
+"""
+Importación masiva de materiales, inventario, productos y clientes desde
+archivos CSV o XLSX.
+
+El archivo se lee fila a fila (csv o openpyxl en modo read_only) y las filas
+válidas se acumulan en lotes que se escriben con bulk_insert_mappings y se
+confirman por separado. La memoria queda acotada por el tamaño del lote y
+por el número máximo de errores que se detallan. Cada fila se valida con las
+mismas reglas que el POST de su ruta. Las filas inválidas se informan con su
+número de línea sin detener la importación; si un lote falla al insertarse
+se reintenta fila a fila para señalar las líneas concretas. Un error de
+lectura a mitad del archivo detiene la lectura, pero los lotes anteriores
+quedan importados y se informan en el resumen.
+"""
+import codecs
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy.exc import DataError, IntegrityError
+from models import Material, Inventario, Producto, Cliente
+from utils.http_cache import publish_core_writes
+
+try:
+    import openpyxl  # Dependencia opcional; sin ella solo se admite CSV
+except ImportError:
+    openpyxl = None
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 500
+
+CATEGORIAS_PRODUCTO = ('automovil', 'motocicleta', 'camion', 'industrial')
+TIPOS_CLIENTE = ('distribuidor', 'mayorista', 'minorista', 'OEM')
+
+
+class ImportFormatError(ValueError):
+    """El archivo no se puede leer o le faltan columnas obligatorias"""
+
+
+# --- Lectura de archivos ---
+
+def read_rows(stream, filename):
+    """
+    Abre un archivo CSV o XLSX y lee su cabecera
+
+    Returns:
+        tuple: (columnas en minúsculas, iterador de (número de línea, dict columna -> valor))
+
+    Raises:
+        ImportFormatError: Si el formato no está soportado o el archivo no se puede leer
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension == 'csv':
+        return _read_csv(stream)
+    if extension == 'xlsx':
+        if openpyxl is None:
+            raise ImportFormatError('Para importar archivos XLSX instale openpyxl')
+        return _read_xlsx(stream)
+    raise ImportFormatError('Formato no soportado. Use un archivo .csv o .xlsx')
+
+
+def _read_csv(stream):
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    try:
+        first = next(lines, '')
+    except UnicodeDecodeError:
+        raise ImportFormatError('El archivo CSV debe estar codificado en UTF-8')
+    delimiter = ';' if first.count(';') > first.count(',') else ','
+    header = _header(next(csv.reader([first], delimiter=delimiter), []))
+    reader = csv.reader(lines, delimiter=delimiter)
+
+    def rows():
+        try:
+            for row in reader:
+                if any(cell.strip() for cell in row):
+                    yield reader.line_num + 1, dict(zip(header, row))
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise ImportFormatError(f"Error de lectura en la línea {reader.line_num + 1}: {e}")
+
+    return header, rows()
+
+
+def _read_xlsx(stream):
+    try:
+        workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    except Exception:
+        raise ImportFormatError('El archivo XLSX no es válido')
+    sheet_rows = workbook.active.iter_rows(values_only=True)
+    header = _header(next(sheet_rows, ()))
+
+    def rows():
+        try:
+            for line, row in enumerate(sheet_rows, start=2):
+                if any(cell not in (None, '') for cell in row):
+                    yield line, dict(zip(header, row))
+        finally:
+            workbook.close()
+
+    return header, rows()
+
+
+def _header(cells):
+    return [str(cell or '').strip().lower() for cell in cells]
+
+
+# --- Conversión de valores ---
+
+def _text(row, column, required=False):
+    value = row.get(column)
+    value = '' if value is None else str(value).strip()
+    if required and not value:
+        raise ValueError(f"El campo '{column}' es obligatorio")
+    return value or None
+
+
+def _integer(row, column, required=False):
+    value = _text(row, column, required)
+    if value is None:
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"El campo '{column}' debe ser un número entero")
+    if not number.is_finite() or number != number.to_integral_value():
+        raise ValueError(f"El campo '{column}' debe ser un número entero")
+    return int(number)
+
+
+def _decimal(row, column, required=False):
+    value = _text(row, column, required)
+    if value is None:
+        return None
+    try:
+        number = Decimal(value.replace(',', '.'))
+    except InvalidOperation:
+        raise ValueError(f"El campo '{column}' debe ser numérico")
+    if not number.is_finite():
+        raise ValueError(f"El campo '{column}' debe ser numérico")
+    return number
+
+
+def _date(row, column):
+    value = row.get(column)
+    if value in (None, ''):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    try:
+        return datetime.strptime(str(value).strip()[:10], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"El campo '{column}' debe tener formato YYYY-MM-DD")
+
+
+# --- Especificaciones por recurso ---
+
+class ImportSpec:
+    """Modelo destino, columnas y validación de las filas de un recurso"""
+
+    model = None
+    required = ()
+    optional = ()
+
+    def __init__(self, session):
+        self.session = session
+
+    @property
+    def columns(self):
+        return self.required + self.optional
+
+    def validate(self, row):
+        """Devuelve el diccionario de columnas a insertar o lanza ValueError"""
+        raise NotImplementedError
+
+    def rejected(self, mapping):
+        """Deshace el estado que validate() registró para una fila que no se insertó"""
+
+
+class MaterialImport(ImportSpec):
+    model = Material
+    required = ('nombre',)
+    optional = ('descripcion', 'unidad_medida', 'stock_minimo', 'stock_maximo')
+
+    def validate(self, row):
+        return {
+            'nombre': _text(row, 'nombre', required=True),
+            'descripcion': _text(row, 'descripcion') or '',
+            'unidad_medida': _text(row, 'unidad_medida') or '',
+            'stock_minimo': _integer(row, 'stock_minimo') or 0,
+            'stock_maximo': _integer(row, 'stock_maximo') or 0,
+        }
+
+
+class InventarioImport(ImportSpec):
+    model = Inventario
+    required = ('id_material', 'cantidad')
+    optional = ('ubicacion', 'lote', 'fecha_ingreso')
+
+    def __init__(self, session):
+        super().__init__(session)
+        # Límites de stock de todos los materiales, cargados una sola vez
+        self.limits = {
+            id_material: (minimo, maximo)
+            for id_material, minimo, maximo in session.query(
+                Material.id_material, Material.stock_minimo, Material.stock_maximo)
+        }
+
+    def validate(self, row):
+        id_material = _integer(row, 'id_material', required=True)
+        cantidad = _integer(row, 'cantidad', required=True)
+        if id_material not in self.limits:
+            raise ValueError(f"El material {id_material} no existe")
+        minimo, maximo = self.limits[id_material]
+        if minimo is not None and cantidad < minimo:
+            raise ValueError(f"La cantidad registrada ({cantidad}) es MENOR que el stock mínimo para este material ({minimo}).")
+        if maximo is not None and cantidad > maximo:
+            raise ValueError(f"La cantidad registrada ({cantidad}) es MAYOR que el stock máximo para este material ({maximo}).")
+        return {
+            'id_material': id_material,
+            'cantidad': cantidad,
+            'ubicacion': _text(row, 'ubicacion'),
+            'lote': _text(row, 'lote'),
+            'fecha_ingreso': _date(row, 'fecha_ingreso'),
+        }
+
+
+class ProductoImport(ImportSpec):
+    model = Producto
+    required = ('codigo', 'nombre', 'precio')
+    optional = ('descripcion', 'categoria')
+
+    def __init__(self, session):
+        super().__init__(session)
+        # Códigos existentes más los ya aceptados en este archivo
+        self.codes = {codigo for (codigo,) in session.query(Producto.codigo)}
+
+    def validate(self, row):
+        codigo = _text(row, 'codigo', required=True)
+        nombre = _text(row, 'nombre', required=True)
+        precio = _decimal(row, 'precio', required=True)
+        if precio <= 0:
+            raise ValueError('El precio debe ser mayor que cero')
+        categoria = _text(row, 'categoria') or 'automovil'
+        if categoria not in CATEGORIAS_PRODUCTO:
+            raise ValueError(f"Categoría no válida: {categoria}")
+        if codigo in self.codes:
+            raise ValueError('El código de producto ya existe')
+        self.codes.add(codigo)
+        return {
+            'codigo': codigo,
+            'nombre': nombre,
+            'descripcion': _text(row, 'descripcion'),
+            'precio': precio,
+            'categoria': categoria,
+        }
+
+    def rejected(self, mapping):
+        self.codes.discard(mapping['codigo'])
+
+
+class ClienteImport(ImportSpec):
+    model = Cliente
+    required = ('nombre', 'email')
+    optional = ('contacto', 'telefono', 'direccion', 'tipo')
+
+    def validate(self, row):
+        tipo = _text(row, 'tipo') or 'distribuidor'
+        if tipo not in TIPOS_CLIENTE:
+            raise ValueError(f"Tipo de cliente no válido: {tipo}")
+        return {
+            'nombre': _text(row, 'nombre', required=True),
+            'email': _text(row, 'email', required=True),
+            'contacto': _text(row, 'contacto') or '',
+            'telefono': _text(row, 'telefono') or '',
+            'direccion': _text(row, 'direccion') or '',
+            'tipo': tipo,
+        }
+
+
+IMPORT_SPECS = {
+    'materiales': MaterialImport,
+    'inventario': InventarioImport,
+    'productos': ProductoImport,
+    'clientes': ClienteImport,
+}
+
+
+# --- Ejecución ---
+
+def _insert_error(error):
+    """Mensaje para una fila que la base de datos rechazó (sin el texto del driver)"""
+    if isinstance(error, IntegrityError):
+        return 'La fila viola una restricción de la base de datos (valor duplicado o referencia inexistente)'
+    if isinstance(error, DataError):
+        return 'Algún valor no es válido para su columna en la base de datos'
+    return f'No se pudo insertar la fila ({error.__class__.__name__})'
+
+
+def run_import(session, resource, header, rows, batch_size=BATCH_SIZE, max_errors=MAX_ERRORS):
+    """
+    Valida e inserta las filas de un recurso en lotes
+
+    Args:
+        session: Sesión de SQLAlchemy
+        resource: Clave de IMPORT_SPECS
+        header: Columnas del archivo
+        rows: Iterable de (número de línea, dict) como el de read_rows
+        batch_size: Filas por lote (cada lote se confirma por separado)
+        max_errors: Errores que se detallan; los siguientes solo se cuentan
+
+    Returns:
+        dict: Resumen con filas procesadas, importadas y errores por línea; si
+        el archivo no se pudo leer hasta el final, 'error_lectura' indica dónde
+        se detuvo (las filas anteriores sí se importan)
+
+    Raises:
+        ImportFormatError: Si faltan columnas obligatorias en la cabecera
+    """
+    spec_class = IMPORT_SPECS[resource]
+    missing = [column for column in spec_class.required if column not in header]
+    if missing:
+        raise ImportFormatError(f"Faltan columnas obligatorias: {', '.join(missing)}")
+
+    spec = spec_class(session)
+    summary = {'recurso': resource, 'procesadas': 0, 'importadas': 0,
+               'con_error': 0, 'errores': [], 'errores_omitidos': 0}
+
+    def report(line, message):
+        summary['con_error'] += 1
+        if len(summary['errores']) < max_errors:
+            summary['errores'].append({'linea': line, 'error': message})
+        else:
+            summary['errores_omitidos'] += 1
+
+    def insert(batch):
+        session.bulk_insert_mappings(spec.model, [mapping for _, mapping in batch])
+        session.commit()
+        summary['importadas'] += len(batch)
+
+    def flush(batch):
+        try:
+            insert(batch)
+        except Exception:
+            session.rollback()
+            # Se reintenta fila a fila para informar qué líneas rechaza la base
+            for line, mapping in batch:
+                try:
+                    insert([(line, mapping)])
+                except Exception as e:
+                    session.rollback()
+                    spec.rejected(mapping)
+                    report(line, _insert_error(e))
+
+    batch = []
+    try:
+        try:
+            for line, row in rows:
+                summary['procesadas'] += 1
+                try:
+                    batch.append((line, spec.validate(row)))
+                except ValueError as e:
+                    report(line, str(e))
+                    continue
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+        except ImportFormatError as e:
+            summary['error_lectura'] = str(e)
+        if batch:
+            flush(batch)
+    finally:
+        if summary['importadas']:
+            # bulk_insert_mappings no pasa por los eventos de flush del ORM
+            publish_core_writes([spec.model.__tablename__])
+    return summary
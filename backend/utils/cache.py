@@ -0,0 +1,183 @@
+# backend/utils/cache.py
+"""
+Caché de secciones con TTL e invalidación por escritura.
+
+Cada sección se registra con un TTL y las tablas que lee. Al confirmar
+una transacción que escribe en alguna de esas tablas, la sección se
+invalida (evento after_commit de la sesión). El almacenamiento por
+defecto es en memoria del proceso; con CACHE_REDIS_URL se usa un
+servidor compatible con Redis, compartido entre procesos.
+"""
+import json
+import threading
+import time
+from flask import g
+from sqlalchemy import event
+
+_PENDING_KEY = 'cache_tablas_modificadas'
+
+
+class MemoryStore:
+    """Almacén en memoria con la interfaz mínima de Redis (get/setex/add/delete/incr)"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def setex(self, key, ttl, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def add(self, key, ttl, value):
+        """Guarda el valor solo si la clave no existe (SET NX); devuelve si se guardó"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return False
+            self._data[key] = (time.monotonic() + ttl, value)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            value = (entry[1] if entry and entry[0] > time.monotonic() else 0) + 1
+            self._data[key] = (float('inf'), value)
+            return value
+
+
+class RedisStore:
+    """Adaptador para un cliente compatible con Redis; serializa los valores en JSON"""
+
+    def __init__(self, client, prefix='erp:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url):
+        import redis  # Dependencia opcional, solo necesaria con CACHE_REDIS_URL
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def setex(self, key, ttl, value):
+        self.client.setex(self.prefix + key, int(max(ttl, 1)), json.dumps(value))
+
+    def add(self, key, ttl, value):
+        return bool(self.client.set(self.prefix + key, json.dumps(value), nx=True, ex=int(max(ttl, 1))))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+
+class SectionCache:
+    """
+    Registro de secciones cacheables con TTL propio e invalidación
+    según las tablas que lee cada sección.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or MemoryStore()
+        self.sections = {}
+        self.stats = {'hits': 0, 'misses': 0, 'invalidaciones': 0}
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app, session):
+        """Selecciona el almacén según la configuración y conecta la invalidación"""
+        if app.config.get('CACHE_REDIS_URL'):
+            self.store = RedisStore.from_url(app.config['CACHE_REDIS_URL'])
+        if not event.contains(session, 'after_flush', self._collect_tables):
+            event.listen(session, 'after_flush', self._collect_tables)
+            event.listen(session, 'after_commit', self._invalidate_pending)
+            event.listen(session, 'after_rollback', self._discard_pending)
+
+    def section(self, name, ttl, tables):
+        """Registra una sección con su TTL (segundos) y las tablas de las que depende"""
+        self.sections[name] = {'ttl': ttl, 'tables': frozenset(tables)}
+
+    def get_or_compute(self, name, version, compute):
+        """
+        Devuelve el valor cacheado de la sección o lo calcula y lo guarda.
+
+        Args:
+            name: Nombre de una sección registrada
+            version: Marca que debe coincidir con la guardada (p. ej. el mes actual)
+            compute: Función sin argumentos que calcula el valor (serializable en JSON)
+        """
+        cached = self.store.get(name)
+        if cached is not None and cached.get('version') == version:
+            self._record(name, 'hit')
+            return cached['data']
+
+        self._record(name, 'miss')
+        data = compute()
+        self.store.setex(name, self.sections[name]['ttl'], {'version': version, 'data': data})
+        return data
+
+    def invalidate_tables(self, tables):
+        """Elimina las secciones que leen alguna de las tablas indicadas"""
+        names = [name for name, spec in self.sections.items() if spec['tables'] & set(tables)]
+        if names:
+            self.store.delete(*names)
+            with self._stats_lock:
+                self.stats['invalidaciones'] += len(names)
+        return names
+
+    def reset_request_stats(self):
+        """Reinicia los contadores de la petición actual"""
+        g.cache_stats = {'hits': 0, 'misses': 0, 'secciones': {}}
+
+    def request_stats(self):
+        """Estadísticas de aciertos/fallos de la petición actual y acumuladas del proceso"""
+        stats = g.get('cache_stats', {'hits': 0, 'misses': 0, 'secciones': {}})
+        with self._stats_lock:
+            stats['acumulado'] = dict(self.stats)
+        return stats
+
+    def _record(self, name, result):
+        with self._stats_lock:
+            self.stats['hits' if result == 'hit' else 'misses'] += 1
+        if 'cache_stats' not in g:
+            self.reset_request_stats()
+        g.cache_stats['hits' if result == 'hit' else 'misses'] += 1
+        g.cache_stats['secciones'][name] = result
+
+    def _collect_tables(self, session, flush_context):
+        tables = session.info.setdefault(_PENDING_KEY, set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            table = getattr(obj, '__tablename__', None)
+            if table:
+                tables.add(table)
+
+    def _invalidate_pending(self, session):
+        tables = session.info.pop(_PENDING_KEY, None)
+        if tables:
+            self.invalidate_tables(tables)
+
+    def _discard_pending(self, session):
+        session.info.pop(_PENDING_KEY, None)
+
+
+# Caché de las secciones del dashboard
+dashboard_cache = SectionCache()
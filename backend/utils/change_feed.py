@@ -0,0 +1,282 @@
+# backend/utils/change_feed.py
+"""
+Canal de cambios por fila para los clientes de escritorio (Server-Sent Events).
+
+Los eventos de la sesión recogen, en cada flush, las filas insertadas,
+modificadas o eliminadas: tabla, operación, clave primaria y, en las
+inserciones y modificaciones, los campos que cambiaron. Al confirmar la
+transacción se publican como un único evento con un identificador
+creciente. Si la transacción se revierte, se descartan. Los últimos
+eventos se conservan en memoria para que un cliente que se reconecta con
+Last-Event-ID reciba lo que se perdió.
+
+Los administradores reciben los campos; el resto de roles solo la tabla,
+la operación y la clave de las filas que su listado REST les devuelve, y
+vuelven a pedir esas filas al API, que aplica sus propias reglas.
+
+Cada suscriptor ocupa un hilo del servidor WSGI mientras está conectado,
+así que el número de suscriptores simultáneos se limita por debajo del de
+hilos (ERP_CHANGE_FEED_MAX_SUBSCRIBERS, por defecto la mitad de
+ERP_WSGI_THREADS); los que exceden el límite reciben 503 y reintentan.
+
+El canal es local al proceso; con varios procesos cada cliente solo ve
+los cambios confirmados en el proceso al que está conectado.
+"""
+import json
+import os
+import threading
+import time as _time
+from collections import deque
+from datetime import date, datetime, time
+from decimal import Decimal
+from sqlalchemy import event, inspect
+
+_PENDING_KEY = 'change_feed_cambios'
+
+# Campos que nunca se envían
+SENSITIVE_FIELDS = {'password'}
+
+HISTORY_SIZE = 1000
+
+
+def _plain(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _related(obj, relation, column):
+    target = getattr(obj, relation)
+    return getattr(target, column, None) if target is not None else None
+
+
+def _same(key):
+    """La fila pertenece al usuario: su valor `key` coincide con el del usuario"""
+    return lambda viewer, scope: viewer.get(key) is not None and scope.get(key) == viewer[key]
+
+
+def _one_of(key, values):
+    return lambda viewer, scope: scope.get(key) in values
+
+
+# Alcance por rol de las tablas cuyo listado REST depende del rol (ver routes/).
+# Para cada tabla: función que captura del objeto, al hacer flush, los valores
+# que usa el filtro, y por rol no administrador la condición sobre ellos (True:
+# todas las filas). Un rol que no aparece no puede listar la tabla y no recibe
+# sus cambios. Las tablas que no aparecen las listan todos los roles.
+ROW_RULES = {
+    'usuarios': (lambda obj: {'rol': obj.rol},
+                 {'supervisor': _one_of('rol', ('empleado',))}),
+    'empleados': (lambda obj: {'id_empleado': obj.id_empleado, 'id_area': obj.id_area},
+                  {'supervisor': _same('id_area'), 'empleado': _same('id_empleado')}),
+    'nominas': (lambda obj: {'id_empleado': obj.id_empleado, 'id_area': _related(obj, 'empleado', 'id_area')},
+                {'supervisor': _same('id_area'), 'empleado': _same('id_empleado')}),
+    'asistencia': (None, {'supervisor': True}),
+    'mantenimiento': (None, {'supervisor': True}),
+    'costos_materiales': (None, {'supervisor': True}),
+    'costos_productos': (None, {'supervisor': True}),
+    'configuracion_sistema': (None, {}),
+    'areas_trabajo': (lambda obj: {'id_area': obj.id_area},
+                      {'supervisor': True, 'empleado': _same('id_area')}),
+    'activos_produccion': (lambda obj: {'id_area': obj.id_area},
+                           {'supervisor': True, 'empleado': _same('id_area')}),
+    'inventario': (lambda obj: {'ubicacion': obj.ubicacion},
+                   {'supervisor': True, 'empleado': _same('ubicacion')}),
+    'ordenes_compra': (lambda obj: {'id_usuario': obj.id_usuario},
+                       {'supervisor': True, 'empleado': _same('id_usuario')}),
+    'detalle_ordenes_compra': (None, {'supervisor': True}),
+    'ordenes_produccion': (lambda obj: {'id_usuario': obj.id_usuario, 'id_area': _related(obj, 'usuario', 'id_area')},
+                           {'supervisor': _same('id_area'), 'empleado': _same('id_usuario')}),
+    'control_calidad': (lambda obj: {'id_usuario': obj.id_usuario,
+                                     'id_area': _related(obj, 'orden_produccion', 'id_area')},
+                        {'supervisor': _same('id_area'), 'empleado': _same('id_usuario')}),
+    'incidentes': (lambda obj: {'id_empleado': obj.id_empleado_reporta},
+                   {'supervisor': True, 'empleado': _same('id_empleado')}),
+    'proyectos_i_d': (lambda obj: {'estado': obj.estado},
+                      {'supervisor': _one_of('estado', ('activo', 'planificacion')),
+                       'empleado': _one_of('estado', ('activo',))}),
+    'clientes': (lambda obj: {'tipo': obj.tipo},
+                 {'supervisor': True, 'empleado': _one_of('tipo', ('minorista',))}),
+    'ventas': (lambda obj: {'id_usuario': obj.id_usuario, 'tipo_cliente': _related(obj, 'cliente', 'tipo')},
+               {'supervisor': _one_of('tipo_cliente', ('minorista', 'distribuidor')),
+                'empleado': _same('id_usuario')}),
+    'detalle_ventas': (lambda obj: {'id_usuario': _related(obj, 'venta', 'id_usuario')},
+                       {'supervisor': True, 'empleado': _same('id_usuario')}),
+}
+
+
+def viewer_of(user):
+    """Datos del usuario que usan las reglas de alcance (se leen antes de soltar la sesión)"""
+    return {key: getattr(user, key, None)
+            for key in ('rol', 'id_usuario', 'id_empleado', 'id_area', 'ubicacion')}
+
+
+class ChangeFeed:
+    """Publicación de deltas por fila y suscriptores bloqueantes"""
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self._events = deque(maxlen=history_size)
+        # Los identificadores parten de la hora de arranque: los de un arranque
+        # anterior son menores y se detectan como no reanudables
+        self._last_id = int(_time.time() * 1000)
+        self._condition = threading.Condition()
+        self.max_subscribers = None
+        self._subscribers = 0
+
+    def init_app(self, app, session):
+        """Conecta el seguimiento de cambios a la sesión"""
+        threads = int(os.environ.get('ERP_WSGI_THREADS', 16))
+        self.max_subscribers = int(os.environ.get('ERP_CHANGE_FEED_MAX_SUBSCRIBERS', max(1, threads // 2)))
+        if not event.contains(session, 'after_flush', self._collect_changes):
+            event.listen(session, 'after_flush', self._collect_changes)
+            event.listen(session, 'after_commit', self._publish_pending)
+            event.listen(session, 'after_rollback', self._discard_pending)
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def subscribe(self):
+        """Reserva un puesto de suscriptor; False si ya se alcanzó max_subscribers"""
+        with self._condition:
+            if self.max_subscribers is not None and self._subscribers >= self.max_subscribers:
+                return False
+            self._subscribers += 1
+            return True
+
+    def unsubscribe(self):
+        with self._condition:
+            self._subscribers = max(0, self._subscribers - 1)
+
+    def is_resumable(self, after_id):
+        """
+        Indica si se pueden entregar todos los eventos posteriores a `after_id`.
+        No es así si ya salieron del historial o si el identificador es de
+        otro arranque del servidor.
+        """
+        with self._condition:
+            return self._resumable(after_id)
+
+    def _resumable(self, after_id):
+        if after_id > self._last_id:
+            return False
+        oldest = self._events[0][0] if self._events else self._last_id + 1
+        return after_id >= oldest - 1
+
+    def publish(self, changes):
+        """Publica una lista de cambios como un solo evento; devuelve su identificador"""
+        if not changes:
+            return None
+        with self._condition:
+            self._last_id += 1
+            self._events.append((self._last_id, changes))
+            self._condition.notify_all()
+            return self._last_id
+
+    def publish_tables(self, tables, op='bulk'):
+        """
+        Publica un cambio sin clave para cada tabla indicada. Las escrituras
+        del ORM se publican solas; llamarlo tras escrituras masivas con Core.
+        """
+        return self.publish([{'tabla': table, 'op': op} for table in sorted(set(tables))])
+
+    def wait(self, after_id, timeout):
+        """
+        Eventos posteriores a `after_id`, esperando hasta `timeout` segundos si no hay
+
+        Returns:
+            list | None: Pares (id, cambios); vacía si venció el timeout y None
+            si algún evento posterior a `after_id` ya salió del historial
+        """
+        with self._condition:
+            if after_id >= self._last_id:
+                self._condition.wait(timeout)
+            if not self._resumable(after_id):
+                return None
+            return [(event_id, changes) for event_id, changes in self._events if event_id > after_id]
+
+    # --- Seguimiento de escrituras ---
+
+    def _collect_changes(self, session, flush_context):
+        pending = session.info.setdefault(_PENDING_KEY, [])
+        for op, objects in (('insert', session.new), ('update', session.dirty),
+                            ('delete', session.deleted)):
+            for obj in objects:
+                change = self._describe(obj, op)
+                if change is not None:
+                    pending.append(change)
+
+    def _describe(self, obj, op):
+        table = getattr(obj, '__tablename__', None)
+        if table is None:
+            return None
+        state = inspect(obj)
+        mapper = state.mapper
+        fields = {}
+        if op != 'delete':
+            for attr in mapper.column_attrs:
+                if attr.key in SENSITIVE_FIELDS:
+                    continue
+                if op == 'insert' or state.attrs[attr.key].history.has_changes():
+                    fields[attr.key] = _plain(getattr(obj, attr.key))
+            if op == 'update' and not fields:
+                # Solo cambiaron relaciones; la fila no se modificó
+                return None
+
+        identity = state.identity or tuple(getattr(obj, col.key) for col in mapper.primary_key)
+        change = {'tabla': table, 'op': op, 'id': identity[0] if len(identity) == 1 else list(identity)}
+        if fields:
+            change['campos'] = fields
+        capture = ROW_RULES.get(table, (None, None))[0]
+        if capture is not None:
+            change['alcance'] = capture(obj)
+        return change
+
+    def _publish_pending(self, session):
+        changes = session.info.pop(_PENDING_KEY, None)
+        if changes:
+            self.publish(changes)
+
+    def _discard_pending(self, session):
+        session.info.pop(_PENDING_KEY, None)
+
+
+def visible_changes(changes, viewer, tables=None):
+    """
+    Cambios que puede ver un usuario, opcionalmente filtrados por tabla
+
+    Args:
+        changes: Cambios de un evento
+        viewer: Resultado de viewer_of() para el usuario conectado
+        tables: Tablas pedidas o None para todas
+    """
+    role = viewer['rol']
+    visible = []
+    for change in changes:
+        table = change['tabla']
+        if tables and table not in tables:
+            continue
+        if role == 'admin':
+            visible.append({key: value for key, value in change.items() if key != 'alcance'})
+            continue
+        if table in ROW_RULES:
+            condition = ROW_RULES[table][1].get(role)
+            if condition is None:
+                continue
+            # Los cambios masivos no tienen alcance: solo avisan de recargar la tabla
+            if condition is not True and 'alcance' in change and not condition(viewer, change['alcance']):
+                continue
+        visible.append({key: change[key] for key in ('tabla', 'op', 'id') if key in change})
+    return visible
+
+
+def format_sse(event_id, changes):
+    """Evento SSE 'cambios' con la lista de cambios en JSON"""
+    data = json.dumps({'cambios': changes}, ensure_ascii=False, separators=(',', ':'))
+    return f"id: {event_id}\nevent: cambios\ndata: {data}\n\n"
+
+
+# Canal de cambios de la aplicación
+change_feed = ChangeFeed()
@@ -0,0 +1,275 @@
+# backend/utils/costing.py
+"""
+Costos estándar de productos (tablas costos_materiales y costos_productos).
+
+El costo de cada material se toma de las órdenes de compra recibidas: el
+precio medio ponderado por cantidad y el precio de la última compra. El
+costo de un producto es la suma, para cada línea de su receta, de la
+cantidad por el costo del material, con ambos métodos.
+
+Las tablas se mantienen de forma incremental dentro de la misma transacción
+que las modifica: un cambio en una receta recalcula solo ese producto, y un
+cambio en las compras recibidas (detalle, estado o fecha de la orden)
+recalcula los materiales afectados y los productos que los usan. Así el
+margen de cada línea de venta es un join con costos_productos en lugar de
+recorrer recetas y compras por cada consulta. El comando
+`flask --app main costos rebuild` reconstruye ambas tablas por completo.
+"""
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, select, func, case, inspect
+from config import db
+from models import CostoMaterial, CostoProducto, RecetaProduccion, OrdenCompra, DetalleOrdenCompra
+
+METODOS = ('promedio', 'ultimo')
+ESTADO_RECIBIDA = 'recibida'
+
+# Tamaño máximo de las listas IN al recalcular por lotes
+_CHUNK = 500
+
+_PENDING_KEY = 'costos_pendientes'
+
+
+def _chunks(ids):
+    ids = sorted(ids)
+    for start in range(0, len(ids), _CHUNK):
+        yield ids[start:start + _CHUNK]
+
+
+def _material_rows(session, materials=None):
+    """
+    Costo de los materiales con compras recibidas (todos si materials es None)
+
+    Returns:
+        list: dicts listos para insertar en costos_materiales
+    """
+    received = [OrdenCompra.estado == ESTADO_RECIBIDA,
+                DetalleOrdenCompra.precio_unitario.isnot(None),
+                DetalleOrdenCompra.cantidad > 0]
+    if materials is not None:
+        received.append(DetalleOrdenCompra.id_material.in_(materials))
+
+    averages = session.execute(
+        select(DetalleOrdenCompra.id_material,
+               func.sum(DetalleOrdenCompra.cantidad * DetalleOrdenCompra.precio_unitario),
+               func.sum(DetalleOrdenCompra.cantidad))
+        .join(OrdenCompra, DetalleOrdenCompra.id_orden_compra == OrdenCompra.id_orden_compra)
+        .where(*received)
+        .group_by(DetalleOrdenCompra.id_material)
+    ).all()
+
+    # Última compra: la de fecha más reciente (y mayor id de detalle en caso de empate)
+    ranked = (
+        select(DetalleOrdenCompra.id_material,
+               DetalleOrdenCompra.precio_unitario,
+               OrdenCompra.fecha,
+               func.row_number().over(
+                   partition_by=DetalleOrdenCompra.id_material,
+                   order_by=(OrdenCompra.fecha.desc(), DetalleOrdenCompra.id_detalle.desc())
+               ).label('posicion'))
+        .join(OrdenCompra, DetalleOrdenCompra.id_orden_compra == OrdenCompra.id_orden_compra)
+        .where(*received)
+        .subquery()
+    )
+    latest = {
+        row.id_material: row for row in session.execute(
+            select(ranked.c.id_material, ranked.c.precio_unitario, ranked.c.fecha)
+            .where(ranked.c.posicion == 1)
+        )
+    }
+
+    return [{
+        'id_material': id_material,
+        'precio_promedio': round(float(total) / float(cantidad), 4),
+        'precio_ultimo': float(latest[id_material].precio_unitario),
+        'cantidad_comprada': int(cantidad),
+        'fecha_ultima_compra': latest[id_material].fecha,
+    } for id_material, total, cantidad in averages]
+
+
+def _product_rows(session, products=None):
+    """
+    Costo de los productos con receta (todos si products es None), a partir
+    de costos_materiales ya actualizada en la transacción
+
+    Returns:
+        list: dicts listos para insertar en costos_productos
+    """
+    stmt = (
+        select(RecetaProduccion.id_producto,
+               func.sum(RecetaProduccion.cantidad * CostoMaterial.precio_promedio),
+               func.sum(RecetaProduccion.cantidad * CostoMaterial.precio_ultimo),
+               func.count(),
+               func.sum(case((CostoMaterial.id_material.is_(None), 1), else_=0)))
+        .outerjoin(CostoMaterial, RecetaProduccion.id_material == CostoMaterial.id_material)
+        .group_by(RecetaProduccion.id_producto)
+    )
+    if products is not None:
+        stmt = stmt.where(RecetaProduccion.id_producto.in_(products))
+
+    return [{
+        'id_producto': id_producto,
+        'costo_promedio': round(float(promedio or 0), 4),
+        'costo_ultimo': round(float(ultimo or 0), 4),
+        'materiales': int(lineas),
+        'materiales_sin_precio': int(sin_precio or 0),
+    } for id_producto, promedio, ultimo, lineas, sin_precio in session.execute(stmt)]
+
+
+def _replace(session, model, key, ids, rows_for):
+    """Reemplaza las filas de `model` con clave en `ids` (todas si ids es None)"""
+    table = model.__table__
+    if ids is None:
+        session.execute(table.delete())
+        rows = rows_for(None)
+        if rows:
+            session.execute(table.insert(), rows)
+        return len(rows)
+
+    written = 0
+    for chunk in _chunks(ids):
+        session.execute(table.delete().where(key.in_(chunk)))
+        rows = rows_for(chunk)
+        if rows:
+            session.execute(table.insert(), rows)
+        written += len(rows)
+    return written
+
+
+def refresh(session, materials=(), products=()):
+    """
+    Recalcula los costos de los materiales y productos indicados.
+
+    Los productos cuyas recetas usan alguno de los materiales también se
+    recalculan. Los que se quedan sin receta (o los materiales sin compras
+    recibidas) pierden su fila.
+
+    Args:
+        session: Sesión de SQLAlchemy en la que se escriben los cambios
+        materials: Iterable de id_material
+        products: Iterable de id_producto
+
+    Returns:
+        tuple: (materiales recalculados, productos recalculados)
+    """
+    materials = {m for m in materials if m is not None}
+    products = {p for p in products if p is not None}
+    if materials:
+        _replace(session, CostoMaterial, CostoMaterial.id_material, materials,
+                 lambda chunk: _material_rows(session, chunk))
+        for chunk in _chunks(materials):
+            products.update(session.execute(
+                select(RecetaProduccion.id_producto)
+                .where(RecetaProduccion.id_material.in_(chunk)).distinct()
+            ).scalars())
+    if products:
+        _replace(session, CostoProducto, CostoProducto.id_producto, products,
+                 lambda chunk: _product_rows(session, chunk))
+    return len(materials), len(products)
+
+
+def rebuild(session):
+    """
+    Reconstruye ambas tablas a partir de todas las recetas y compras recibidas
+
+    Returns:
+        tuple: (filas de costos_materiales, filas de costos_productos)
+    """
+    materials = _replace(session, CostoMaterial, CostoMaterial.id_material, None,
+                         lambda chunk: _material_rows(session))
+    products = _replace(session, CostoProducto, CostoProducto.id_producto, None,
+                        lambda chunk: _product_rows(session))
+    return materials, products
+
+
+def product_cost(metodo):
+    """Columna de costos_productos del método indicado; lanza ValueError si no es válido"""
+    if metodo not in METODOS:
+        raise ValueError(f"metodo no válido. Use uno de: {', '.join(METODOS)}")
+    return CostoProducto.costo_promedio if metodo == 'promedio' else CostoProducto.costo_ultimo
+
+
+# --- Mantenimiento incremental ---
+
+def _values(obj, attr):
+    """Valor actual del atributo y el anterior si cambió en esta sesión"""
+    values = {getattr(obj, attr)}
+    values.update(inspect(obj).attrs[attr].history.deleted or ())
+    return values
+
+
+def _changed(obj, *attrs):
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def _collect_changes(session, flush_context, instances):
+    """Antes de cada flush, registra los materiales y productos cuyo costo puede cambiar"""
+    pending = session.info.setdefault(_PENDING_KEY, {'materiales': set(), 'productos': set()})
+    orders = set()
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(obj, RecetaProduccion):
+                if obj in session.dirty and not _changed(obj, 'id_producto', 'id_material', 'cantidad'):
+                    continue
+                pending['productos'].update(_values(obj, 'id_producto'))
+            elif isinstance(obj, DetalleOrdenCompra):
+                if obj in session.dirty and not _changed(
+                        obj, 'id_material', 'id_orden_compra', 'cantidad', 'precio_unitario'):
+                    continue
+                pending['materiales'].update(_values(obj, 'id_material'))
+            elif isinstance(obj, OrdenCompra) and obj not in session.new:
+                # Las órdenes nuevas llegan con sus detalles, que ya se registran arriba
+                if ESTADO_RECIBIDA not in _values(obj, 'estado'):
+                    continue
+                if obj in session.deleted or _changed(obj, 'estado', 'fecha'):
+                    orders.add(obj.id_orden_compra)
+        if orders:
+            # Se consulta antes del flush: los detalles aún existen si la orden se elimina
+            pending['materiales'].update(session.execute(
+                select(DetalleOrdenCompra.id_material)
+                .where(DetalleOrdenCompra.id_orden_compra.in_(orders)).distinct()
+            ).scalars())
+
+
+def _apply_pending(session):
+    """Antes de confirmar, recalcula los costos pendientes en la misma transacción"""
+    session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and (pending['materiales'] or pending['productos']):
+        refresh(session, pending['materiales'], pending['productos'])
+
+
+def _discard_pending(session, previous_transaction=None):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+def register_cost_listeners():
+    """Conecta el mantenimiento incremental de los costos a la sesión de db"""
+    if event.contains(db.session, 'before_flush', _collect_changes):
+        return
+    event.listen(db.session, 'before_flush', _collect_changes)
+    event.listen(db.session, 'before_commit', _apply_pending)
+    event.listen(db.session, 'after_rollback', _discard_pending)
+    # active_history conserva el valor anterior aunque el objeto esté expirado,
+    # para recalcular también el producto, material o estado de origen
+    for attribute in (RecetaProduccion.id_producto, DetalleOrdenCompra.id_material,
+                      OrdenCompra.estado):
+        event.listen(attribute, 'set', _keep_previous_value, active_history=True, retval=True)
+
+
+# --- CLI: flask --app main costos rebuild ---
+
+costs_cli = AppGroup('costos', help='Mantenimiento de la caché de costos estándar')
+
+
+@costs_cli.command('rebuild')
+def rebuild_command():
+    """Reconstruye costos_materiales y costos_productos"""
+    materials, products = rebuild(db.session)
+    db.session.commit()
+    click.echo(f'Costos reconstruidos: {materials} materiales, {products} productos')
@@ -0,0 +1,248 @@
+# backend/utils/db_pool.py
+"""
+Pool de conexiones a la base de datos: configuración y métricas.
+
+El tamaño, el desbordamiento, el tiempo de espera, el reciclado y el ping
+previo del pool se toman, por orden de prioridad, de las variables de
+entorno ERP_DB_* (p. ej. ERP_DB_POOL_SIZE=20), del archivo de configuración
+indicado en ERP_SETTINGS y de los valores por defecto de POOL_SETTINGS. La
+URL de la base de datos se puede cambiar con ERP_DATABASE_URL.
+
+El pool registra cuántas conexiones se han pedido, cuánto se ha esperado
+por ellas y cuántas peticiones agotaron el tiempo de espera; junto con su
+estado actual (en uso, desbordamiento, libres) se consulta en
+GET /api/_metrics. Con un pool pequeño para el número de hilos del
+servidor, las peticiones se serializan esperando conexión, y esa espera es
+la que muestran estas métricas.
+"""
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+# Clave de configuración: (tipo, valor por defecto, argumento de create_engine)
+POOL_SETTINGS = {
+    'DB_POOL_SIZE': (int, 10, 'pool_size'),            # Conexiones que se mantienen abiertas
+    'DB_MAX_OVERFLOW': (int, 20, 'max_overflow'),      # Conexiones adicionales en picos de carga
+    'DB_POOL_TIMEOUT': (float, 30, 'pool_timeout'),    # Segundos de espera por una conexión libre
+    'DB_POOL_RECYCLE': (int, 1800, 'pool_recycle'),    # Segundos de vida (menor que wait_timeout de MySQL)
+    'DB_POOL_PRE_PING': (bool, True, 'pool_pre_ping'), # Comprueba la conexión antes de usarla
+}
+
+# Argumentos que solo admite QueuePool (no los pools de SQLite en memoria)
+_QUEUE_ONLY = ('pool_size', 'max_overflow', 'pool_timeout')
+
+# Esperas recientes que se conservan para calcular percentiles
+_RECENT_WAITS = 2000
+
+_TRUE = ('1', 'true', 'yes', 'si', 'sí', 'on')
+_FALSE = ('0', 'false', 'no', 'off')
+
+
+def _convert(key, kind, value):
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE or text in _FALSE:
+            return text in _TRUE
+        raise ValueError(f'{key} debe ser true o false')
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{key} debe ser numérico') from None
+
+
+def _in_memory_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def configure_pool(app):
+    """
+    Completa SQLALCHEMY_ENGINE_OPTIONS con la configuración del pool.
+
+    Debe llamarse antes de db.init_app(app). Las opciones ya presentes en
+    SQLALCHEMY_ENGINE_OPTIONS no se sobrescriben.
+
+    Raises:
+        ValueError: Si algún valor no tiene el tipo esperado
+    """
+    app.config.from_envvar('ERP_SETTINGS', silent=True)
+    if os.environ.get('ERP_DATABASE_URL'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['ERP_DATABASE_URL']
+
+    options = {}
+    for key, (kind, default, argument) in POOL_SETTINGS.items():
+        value = os.environ.get(f'ERP_{key}', app.config.get(key, default))
+        app.config[key] = _convert(key, kind, value)
+        options[argument] = app.config[key]
+
+    if _in_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        # SQLite en memoria usa una única conexión (StaticPool): no hay pool que dimensionar
+        for argument in _QUEUE_ONLY:
+            options.pop(argument)
+    else:
+        options['poolclass'] = MeteredQueuePool
+
+    engine_options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    for argument, value in options.items():
+        engine_options.setdefault(argument, value)
+    return engine_options
+
+
+class PoolStats:
+    """Contadores de las peticiones de conexión de un pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.solicitudes = 0
+        self.agotadas = 0
+        self.esperando = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self._recent = deque(maxlen=_RECENT_WAITS)
+
+    def started(self):
+        with self._lock:
+            self.esperando += 1
+
+    def finished(self, seconds, timed_out=False):
+        with self._lock:
+            self.esperando -= 1
+            self.solicitudes += 1
+            self.agotadas += int(timed_out)
+            self.espera_total += seconds
+            self.espera_max = max(self.espera_max, seconds)
+            self._recent.append(seconds)
+
+    def to_dict(self):
+        with self._lock:
+            recent = sorted(self._recent)
+            solicitudes = self.solicitudes
+
+            def percentile(p):
+                return round(recent[min(len(recent) - 1, int(len(recent) * p))] * 1000, 2) if recent else 0.0
+
+            return {
+                'solicitudes': solicitudes,
+                'agotadas': self.agotadas,
+                'esperando': self.esperando,
+                'espera_media_ms': round(self.espera_total / solicitudes * 1000, 2) if solicitudes else 0.0,
+                'espera_p95_ms': percentile(0.95),
+                'espera_max_ms': round(self.espera_max * 1000, 2),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool que mide el tiempo que se tarda en obtener cada conexión"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        self.stats.started()
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except PoolTimeout:
+            timed_out = True
+            raise
+        finally:
+            self.stats.finished(time.perf_counter() - started, timed_out)
+
+    def recreate(self):
+        # Al invalidar el pool (p. ej. tras perder la conexión) se conservan los contadores
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def pool_status(engine):
+    """Estado actual y contadores del pool de un engine"""
+    pool = engine.pool
+    status = {'clase': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            'tamano': pool.size(),
+            'en_uso': pool.checkedout(),
+            'libres': pool.checkedin(),
+            'desbordamiento': max(0, pool.overflow()),
+            'max_desbordamiento': pool._max_overflow,
+            'timeout': pool.timeout(),
+        })
+    stats = getattr(pool, 'stats', None)
+    if stats is not None:
+        status.update(stats.to_dict())
+    return status
+
+
+# --- CLI: flask --app main pool loadtest ---
+
+pool_cli = AppGroup('pool', help='Pool de conexiones a la base de datos')
+
+
+@pool_cli.command('loadtest')
+@click.option('--url', default='http://localhost:5000/api', help='URL base del API en marcha')
+@click.option('--email', required=True, help='Usuario administrador')
+@click.option('--password', prompt=True, hide_input=True)
+@click.option('--concurrency', default=32, help='Peticiones simultáneas')
+@click.option('--requests', 'total', default=2000, help='Número total de peticiones')
+@click.option('--path', 'paths', multiple=True,
+              default=('/ventas', '/inventario', '/ordenes_compra', '/payroll', '/attendance'),
+              help='Rutas GET a recorrer (se puede repetir)')
+def loadtest_command(url, email, password, concurrency, total, paths):
+    """Lanza GET concurrentes contra un servidor en marcha y muestra latencias y espera del pool"""
+    import requests
+    from concurrent.futures import ThreadPoolExecutor
+
+    base = url.rstrip('/')
+    local = threading.local()
+
+    def session():
+        # Una sesión autenticada por hilo (requests.Session no es segura entre hilos)
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+            response = local.session.post(f'{base}/login', json={'email': email, 'password': password})
+            response.raise_for_status()
+        return local.session
+
+    def hit(index):
+        path = paths[index % len(paths)]
+        started = time.perf_counter()
+        try:
+            # Sin If-None-Match: cada petición llega a la base de datos
+            status = session().get(f'{base}{path}').status_code
+        except requests.RequestException:
+            status = None
+        return path, status, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(hit, range(total)))
+    elapsed = time.perf_counter() - started
+
+    host = urlsplit(base).netloc
+    click.echo(f'{total} peticiones a {host} con {concurrency} simultáneas en {elapsed:.2f} s '
+               f'({total / elapsed:.0f} peticiones/s)')
+    for path in paths:
+        timings = sorted(t for p, s, t in results if p == path)
+        errors = sum(1 for p, s, t in results if p == path and s != 200)
+        click.echo(f'  {path}: mediana {timings[len(timings) // 2] * 1000:.0f} ms, '
+                   f'p95 {timings[int(len(timings) * 0.95)] * 1000:.0f} ms, {errors} errores')
+
+    metrics = session().get(f'{base}/_metrics')
+    if metrics.status_code == 200:
+        for nombre, status in metrics.json()['pools'].items():
+            click.echo(f"  pool {nombre}: tamaño {status.get('tamano')}, "
+                       f"espera media {status.get('espera_media_ms')} ms, "
+                       f"p95 {status.get('espera_p95_ms')} ms, agotadas {status.get('agotadas')}")
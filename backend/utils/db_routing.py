@@ -0,0 +1,146 @@
+# backend/utils/db_routing.py
+"""
+Lecturas de informes en una réplica de la base de datos.
+
+Con ERP_REPLICA_DATABASE_URL definida, las consultas de los endpoints de
+solo lectura (los blueprints de READ_ONLY_BLUEPRINTS y las vistas con
+@read_only) se ejecutan en la réplica, para que los informes (dashboard,
+exportaciones, planes, márgenes) no compitan con las escrituras. Todo lo
+demás, y cualquier escritura, va a la base principal.
+
+Lecturas de las propias escrituras: cuando un usuario confirma una
+transacción que escribe, sus peticiones de solo lectura siguen yendo a la
+principal durante DB_REPLICA_STICKY_SECONDS (el retraso de replicación que
+se tolera). Las secciones del dashboard se cachean para todos los usuarios:
+si se calculan en la réplica justo después de una escritura de otro
+usuario pueden reflejar ese retraso hasta su siguiente invalidación.
+
+Para probarlo en local basta con dos archivos SQLite (p. ej. una copia de
+la base principal como réplica):
+
+    ERP_DATABASE_URL=sqlite:///principal.db ERP_REPLICA_DATABASE_URL=sqlite:///replica.db
+"""
+import contextlib
+import functools
+import os
+from flask import g, has_request_context, request, session as flask_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from utils.cache import MemoryStore, RedisStore
+
+REPLICA_BIND = 'replica'
+
+# Blueprints cuyos GET solo leen (informes y exportaciones)
+READ_ONLY_BLUEPRINTS = ('dashboard_bp', 'exports')
+
+_WROTE_KEY = 'replica_transaccion_escribe'
+
+
+def read_only(func):
+    """Marca una vista cuyas consultas pueden ir a la réplica"""
+    @functools.wraps(func)
+    def wrapped_function(*args, **kwargs):
+        g.db_read_only = True
+        return func(*args, **kwargs)
+    return wrapped_function
+
+
+@contextlib.contextmanager
+def on_primary():
+    """Envía a la base principal las consultas del bloque aunque la vista sea de solo lectura"""
+    if not has_request_context():
+        yield
+        return
+    previous = g.get('db_read_only', False)
+    g.db_read_only = False
+    try:
+        yield
+    finally:
+        g.db_read_only = previous
+
+
+class RoutingSession(Session):
+    """Sesión de db que envía a la réplica las lecturas de las vistas de solo lectura"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and replica_router.use_replica(self, clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaRouter:
+    """Decide la base de cada consulta y recuerda qué usuarios acaban de escribir"""
+
+    def __init__(self):
+        self.store = MemoryStore()
+        self.sticky_seconds = 10
+        self.enabled = False
+
+    def init_app(self, app, session):
+        """
+        Registra la réplica como bind si hay URL y conecta el seguimiento de escrituras.
+
+        Debe llamarse antes de db.init_app(app).
+        """
+        url = os.environ.get('ERP_REPLICA_DATABASE_URL', app.config.get('SQLALCHEMY_REPLICA_URI'))
+        self.sticky_seconds = float(os.environ.get('ERP_DB_REPLICA_STICKY_SECONDS',
+                                                   app.config.get('DB_REPLICA_STICKY_SECONDS', 10)))
+        self.enabled = bool(url)
+        if not self.enabled:
+            return
+        app.config.setdefault('SQLALCHEMY_BINDS', {})[REPLICA_BIND] = url
+        if app.config.get('CACHE_REDIS_URL'):
+            # La marca de escritura reciente se comparte entre procesos
+            self.store = RedisStore.from_url(app.config['CACHE_REDIS_URL'])
+
+        app.before_request(self._mark_read_only_blueprint)
+        if not event.contains(session, 'after_flush', self._mark_write):
+            event.listen(session, 'after_flush', self._mark_write)
+            event.listen(session, 'do_orm_execute', self._mark_statement)
+            event.listen(session, 'after_commit', self._remember_write)
+            event.listen(session, 'after_rollback', self._discard_write)
+
+    def use_replica(self, session, clause=None):
+        """True si la consulta puede ir a la réplica"""
+        if not self.enabled or not has_request_context() or not g.get('db_read_only'):
+            return False
+        if session._flushing or session.new or session.dirty or session.deleted:
+            return False
+        if clause is not None and (getattr(clause, 'is_dml', False)
+                                   or getattr(clause, '_for_update_arg', None) is not None):
+            return False
+        if 'db_primario' not in g:
+            # Una consulta al almacén por petición; se usa el id de la cookie de sesión
+            # y no current_user, que cargaría el usuario con otra consulta
+            user_id = flask_session.get('_user_id')
+            g.db_primario = bool(user_id and self.store.get(f'primario:{user_id}'))
+        return not g.db_primario
+
+    # --- Seguimiento de escrituras ---
+
+    def _mark_read_only_blueprint(self):
+        if request.method == 'GET' and request.blueprint in READ_ONLY_BLUEPRINTS:
+            g.db_read_only = True
+
+    def _mark_write(self, session, flush_context):
+        session.info[_WROTE_KEY] = True
+
+    def _mark_statement(self, orm_execute_state):
+        # Escrituras con Core a través de la sesión (no pasan por el flush)
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            orm_execute_state.session.info[_WROTE_KEY] = True
+
+    def _remember_write(self, session):
+        if not session.info.pop(_WROTE_KEY, False) or not has_request_context():
+            return
+        g.db_primario = True
+        user_id = flask_session.get('_user_id')
+        if user_id:
+            self.store.setex(f'primario:{user_id}', self.sticky_seconds, 1)
+
+    def _discard_write(self, session, previous_transaction=None):
+        session.info.pop(_WROTE_KEY, None)
+
+
+# Enrutado de lecturas a la réplica (sin ERP_REPLICA_DATABASE_URL todo va a la principal)
+replica_router = ReplicaRouter()
@@ -0,0 +1,197 @@
+# backend/utils/exports.py
+"""
+Exportación en streaming (NDJSON o CSV) de tablas grandes.
+
+La consulta selecciona solo las columnas pedidas (sin construir objetos del
+ORM) y se ejecuta con yield_per, que usa un cursor del lado del servidor
+(stream_results) y trae las filas por bloques. Cada bloque se serializa y se
+envía como un fragmento de la respuesta (transfer-encoding chunked), así que
+la memoria no depende del tamaño de la tabla.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy import select
+from models import Venta, DetalleVenta, Cliente, Producto, Asistencia, Empleado, Nomina
+
+CHUNK_SIZE = 2000
+FORMATOS = ('ndjson', 'csv')
+
+
+class ExportSpec:
+    """Columnas exportables, tablas unidas y columnas de filtro de un recurso"""
+
+    def __init__(self, columns, base, joins=(), pk=None, date_column=None,
+                 estado_column=None, roles=('admin', 'supervisor'), row_filter=None):
+        self.columns = dict(columns)
+        self.base = base
+        self.joins = joins
+        self.pk = pk
+        self.date_column = date_column
+        self.estado_column = estado_column
+        self.roles = roles
+        # Función usuario -> condición de las filas que puede ver (None: todas)
+        self.row_filter = row_filter
+
+    def statement(self, params, user):
+        """
+        SELECT con las columnas y filtros de los parámetros de la petición
+
+        Args:
+            params: ListParams (se usan fields, desde, hasta, estados e ids)
+            user: Usuario que exporta; limita las filas como su listado
+
+        Raises:
+            ValueError: Si se pide una columna o un filtro que el recurso no admite
+        """
+        names = params.fields or list(self.columns)
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise ValueError(f"Columnas no válidas: {', '.join(unknown)}. "
+                             f"Disponibles: {', '.join(self.columns)}")
+
+        from_clause = self.base
+        for target, on in self.joins:
+            from_clause = from_clause.outerjoin(target, on)
+        stmt = select(*[self.columns[name].label(name) for name in names]).select_from(from_clause)
+        if self.row_filter is not None:
+            condition = self.row_filter(user)
+            if condition is not None:
+                stmt = stmt.where(condition)
+
+        if params.desde or params.hasta:
+            if self.date_column is None:
+                raise ValueError('Este recurso no admite filtros por fecha')
+            # Rango semiabierto para que el filtro pueda usar el índice de la fecha
+            if params.desde:
+                stmt = stmt.where(self.date_column >= params.desde)
+            if params.hasta:
+                stmt = stmt.where(self.date_column < params.hasta + timedelta(days=1))
+        if params.estados:
+            if self.estado_column is None:
+                raise ValueError('Este recurso no admite filtro por estado')
+            stmt = stmt.where(self.estado_column.in_(params.estados))
+        if params.ids:
+            stmt = stmt.where(self.pk.in_(params.ids))
+        return stmt.order_by(self.pk), names
+
+
+def _ventas_visibles(user):
+    """Mismo alcance que GET /ventas: el supervisor ve las ventas a minoristas y distribuidores, el empleado las propias"""
+    if user.rol == 'supervisor':
+        return Venta.id_cliente.in_(
+            select(Cliente.id_cliente).where(Cliente.tipo.in_(['minorista', 'distribuidor']))
+        )
+    if user.rol != 'admin':
+        return Venta.id_usuario == user.id_usuario
+    return None
+
+
+EXPORT_SPECS = {
+    'ventas': ExportSpec(
+        columns=[
+            ('id_venta', Venta.id_venta),
+            ('fecha', Venta.fecha),
+            ('id_cliente', Venta.id_cliente),
+            ('cliente', Cliente.nombre),
+            ('total', Venta.total),
+            ('estado', Venta.estado),
+            ('id_usuario', Venta.id_usuario),
+        ],
+        base=Venta.__table__,
+        joins=[(Cliente.__table__, Venta.id_cliente == Cliente.id_cliente)],
+        pk=Venta.id_venta, date_column=Venta.fecha, estado_column=Venta.estado,
+        row_filter=_ventas_visibles,
+    ),
+    'detalle_ventas': ExportSpec(
+        columns=[
+            ('id_detalle', DetalleVenta.id_detalle),
+            ('id_venta', DetalleVenta.id_venta),
+            ('fecha_venta', Venta.fecha),
+            ('id_producto', DetalleVenta.id_producto),
+            ('producto', Producto.nombre),
+            ('cantidad', DetalleVenta.cantidad),
+            ('precio_unitario', DetalleVenta.precio_unitario),
+            ('subtotal', DetalleVenta.subtotal),
+        ],
+        base=DetalleVenta.__table__,
+        joins=[(Venta.__table__, DetalleVenta.id_venta == Venta.id_venta),
+               (Producto.__table__, DetalleVenta.id_producto == Producto.id_producto)],
+        pk=DetalleVenta.id_detalle, date_column=Venta.fecha, estado_column=Venta.estado,
+        row_filter=_ventas_visibles,
+    ),
+    'asistencia': ExportSpec(
+        columns=[
+            ('id_asistencia', Asistencia.id_asistencia),
+            ('id_empleado', Asistencia.id_empleado),
+            ('nombre', Empleado.nombre),
+            ('apellidos', Empleado.apellidos),
+            ('fecha', Asistencia.fecha),
+            ('hora_entrada', Asistencia.hora_entrada),
+            ('hora_salida', Asistencia.hora_salida),
+            ('estado', Asistencia.estado),
+        ],
+        base=Asistencia.__table__,
+        joins=[(Empleado.__table__, Asistencia.id_empleado == Empleado.id_empleado)],
+        pk=Asistencia.id_asistencia, date_column=Asistencia.fecha, estado_column=Asistencia.estado,
+    ),
+    'nominas': ExportSpec(
+        columns=[
+            ('id_nomina', Nomina.id_nomina),
+            ('id_empleado', Nomina.id_empleado),
+            ('nombre', Empleado.nombre),
+            ('apellidos', Empleado.apellidos),
+            ('periodo', Nomina.periodo),
+            ('fecha_pago', Nomina.fecha_pago),
+            ('salario_bruto', Nomina.salario_bruto),
+            ('deducciones', Nomina.deducciones),
+            ('bonos', Nomina.bonos),
+            ('salario_neto', Nomina.salario_neto),
+        ],
+        base=Nomina.__table__,
+        joins=[(Empleado.__table__, Nomina.id_empleado == Empleado.id_empleado)],
+        pk=Nomina.id_nomina, date_column=Nomina.fecha_pago,
+        roles=('admin',),
+    ),
+}
+
+
+def _plain(value):
+    """Valor serializable en JSON/CSV (fechas ISO, decimales como float)"""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def stream_rows(session, stmt, names, formato, chunk_size=CHUNK_SIZE):
+    """
+    Genera la exportación por fragmentos de texto
+
+    Cada fragmento corresponde a un bloque de `chunk_size` filas leídas del
+    cursor del servidor; en CSV el primero incluye la cabecera.
+    """
+    result = session.execute(stmt.execution_options(yield_per=chunk_size))
+    try:
+        if formato == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+            for partition in result.partitions():
+                writer.writerows([[_plain(value) for value in row] for row in partition])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for partition in result.partitions():
+                yield ''.join(
+                    json.dumps(dict(zip(names, map(_plain, row))), ensure_ascii=False) + '\n'
+                    for row in partition
+                )
+    finally:
+        result.close()
@@ -0,0 +1,211 @@
+# backend/utils/http_cache.py
+"""
+ETag condicionales y compresión de respuestas del API.
+
+Cada tabla tiene un contador de versión que se incrementa al confirmar una
+transacción que la modifica. El ETag (débil) de un GET se calcula con las
+versiones de las tablas que lee su blueprint y el usuario autenticado, sin
+serializar ni recorrer el cuerpo. Si coincide con If-None-Match se responde
+304 antes de ejecutar la vista. Las respuestas grandes se comprimen con
+brotli (si está instalado) o gzip según Accept-Encoding.
+
+Los contadores en memoria son de cada proceso: con varios procesos (p. ej.
+gunicorn --workers N) una escritura atendida por uno no cambiaría el ETag de
+los demás, que responderían 304 con datos viejos. Por eso, sin almacén
+compartido (CACHE_REDIS_URL), no se emiten ETag cuando el servidor WSGI
+indica wsgi.multiprocess.
+"""
+import gzip
+import hashlib
+import uuid
+from flask import current_app, g, request
+from flask_login import current_user
+from sqlalchemy import event
+from utils.cache import MemoryStore, RedisStore, dashboard_cache
+from utils.change_feed import change_feed
+
+try:
+    import brotli  # Dependencia opcional; sin ella solo se usa gzip
+except ImportError:
+    brotli = None
+
+ALL_TABLES = '*'
+_PENDING_KEY = 'http_cache_tablas_modificadas'
+
+# Tablas que leen los GET de cada blueprint (incluidas las relaciones que serializan).
+# Los blueprints no listados dependen de todas las tablas.
+BLUEPRINT_TABLES = {
+    'ventas': ('ventas', 'detalle_ventas', 'clientes', 'productos', 'usuarios', 'inventario'),
+    'sales_details': ('detalle_ventas', 'ventas', 'productos'),
+    'purchase_orders': ('ordenes_compra', 'detalle_ordenes_compra', 'proveedores', 'materiales', 'usuarios'),
+    'purchase_orders_details': ('detalle_ordenes_compra', 'ordenes_compra', 'materiales'),
+    'production_orders': ('ordenes_produccion', 'productos', 'usuarios'),
+    'inventory': ('inventario', 'materiales'),
+    'materials': ('materiales', 'inventario'),
+    'products_bp': ('productos',),
+    'clients_bp': ('clientes',),
+    'employees': ('empleados', 'areas_trabajo', 'usuarios'),
+    'attendance': ('asistencia', 'empleados'),
+    'payroll': ('nominas', 'empleados'),
+    'quality_control_bp': ('control_calidad', 'ordenes_produccion', 'productos', 'usuarios'),
+    'providers_bp': ('proveedores',),
+    'suppliers': ('proveedores',),
+    'production_recipes': ('recetas_produccion', 'productos', 'materiales'),
+    'work_areas': ('areas_trabajo', 'empleados', 'usuarios'),
+    'maintenance': ('mantenimiento', 'activos_produccion', 'empleados'),
+    'production_assets': ('activos_produccion', 'areas_trabajo'),
+    'incidents': ('incidentes', 'areas_trabajo', 'empleados'),
+    'legal_regulations': ('normativas_legales',),
+    'r_d_projects': ('proyectos_i_d',),
+    'system_configuration': ('configuracion_sistema',),
+    'users_bp': ('usuarios',),
+    'imports': (),
+    # Las tablas de costos se escriben con Core al confirmar cambios de sus tablas de origen
+    'costs': ('costos_productos', 'costos_materiales', 'recetas_produccion', 'ordenes_compra',
+              'detalle_ordenes_compra', 'productos', 'materiales', 'detalle_ventas', 'ventas'),
+}
+
+# Blueprints sin ETag: autenticación, el dashboard (tiene su propia caché por secciones),
+# las respuestas en streaming (exportaciones y canal de cambios), los planes (MRP y
+# programación), que además de las tablas dependen de la fecha actual, y el estado de
+# los procesos en segundo plano y las métricas del servidor
+EXCLUDED_BLUEPRINTS = ('auth_bp', 'dashboard_bp', 'exports', 'changes', 'mrp', 'scheduling',
+                       'payroll_runs', 'metrics')
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/csv', 'text/plain', 'text/html')
+
+
+class HttpCache:
+    """Versiones por tabla, respuestas 304 y compresión para una aplicación Flask"""
+
+    def __init__(self):
+        self.store = MemoryStore()
+        # Distingue los contadores en memoria de un proceso de los de otro arranque
+        self.instance = uuid.uuid4().hex[:8]
+        # Si los contadores son comunes a todos los procesos del servidor
+        self.shared = False
+
+    def init_app(self, app, session):
+        """Conecta los hooks de la petición y el seguimiento de escrituras"""
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        if app.config.get('CACHE_REDIS_URL'):
+            # Contadores compartidos entre procesos; persisten entre reinicios
+            self.store = RedisStore.from_url(app.config['CACHE_REDIS_URL'])
+            self.instance = 'redis'
+            self.shared = True
+
+        app.before_request(self._check_not_modified)
+        app.after_request(self._finish_response)
+        if not event.contains(session, 'after_flush', self._collect_tables):
+            event.listen(session, 'after_flush', self._collect_tables)
+            event.listen(session, 'after_commit', self._bump_pending)
+            event.listen(session, 'after_rollback', self._discard_pending)
+
+    def bump_tables(self, tables):
+        """
+        Incrementa la versión de las tablas indicadas. Las escrituras del ORM
+        se registran solas; llamarlo tras escrituras masivas con Core.
+        """
+        for table in set(tables):
+            self.store.incr(f'tabla:{table}')
+        self.store.incr(f'tabla:{ALL_TABLES}')
+
+    def etag_for(self, blueprint):
+        """ETag débil de un GET del blueprint indicado, o None si no aplica"""
+        if blueprint is None or blueprint in EXCLUDED_BLUEPRINTS:
+            return None
+        if not self.shared and request.environ.get('wsgi.multiprocess'):
+            # Contadores en memoria de un solo proceso: no valen para los demás
+            return None
+        tables = BLUEPRINT_TABLES.get(blueprint, (ALL_TABLES,))
+        versions = [str(self.store.get(f'tabla:{table}') or 0) for table in tables]
+        user = current_user.get_id() if current_user.is_authenticated else 'anon'
+        raw = f"{self.instance}|{blueprint}|{user}|{'.'.join(versions)}"
+        return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+    # --- Hooks de la petición ---
+
+    def _check_not_modified(self):
+        if request.method != 'GET':
+            return None
+        etag = self.etag_for(request.blueprint)
+        g.http_etag = etag
+        if etag and request.if_none_match.contains_weak(etag):
+            return self._not_modified(etag)
+        return None
+
+    def _not_modified(self, etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        response.vary.add('Cookie')
+        return response
+
+    def _finish_response(self, response):
+        etag = g.get('http_etag')
+        if etag and response.status_code == 200 and not response.headers.get('ETag'):
+            response.set_etag(etag, weak=True)
+            response.vary.add('Cookie')
+        return self._compress(response)
+
+    def _compress(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        accepted = request.accept_encodings
+        encoding = None
+        if brotli is not None and accepted['br']:
+            encoding = 'br'
+        elif accepted['gzip']:
+            encoding = 'gzip'
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < current_app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        level = current_app.config['COMPRESS_LEVEL']
+        if encoding == 'br':
+            data = brotli.compress(data, quality=min(level, 11))
+        else:
+            data = gzip.compress(data, compresslevel=level)
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    # --- Seguimiento de escrituras ---
+
+    def _collect_tables(self, session, flush_context):
+        tables = session.info.setdefault(_PENDING_KEY, set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            table = getattr(obj, '__tablename__', None)
+            if table:
+                tables.add(table)
+
+    def _bump_pending(self, session):
+        tables = session.info.pop(_PENDING_KEY, None)
+        if tables:
+            self.bump_tables(tables)
+
+    def _discard_pending(self, session):
+        session.info.pop(_PENDING_KEY, None)
+
+
+# ETag y compresión de las respuestas del API
+http_cache = HttpCache()
+
+
+def publish_core_writes(tables):
+    """
+    Tras confirmar escrituras que no pasan por los eventos del ORM
+    (bulk_insert_mappings, sentencias Core): nuevas versiones de ETag,
+    secciones del dashboard invalidadas y aviso en el canal de cambios.
+    """
+    tables = list(tables)
+    http_cache.bump_tables(tables)
+    dashboard_cache.invalidate_tables(tables)
+    change_feed.publish_tables(tables)
@@ -0,0 +1,235 @@
+# backend/utils/jobs.py
+"""
+Procesos en segundo plano con seguimiento de progreso.
+
+Un proceso es una función que se ejecuta en un hilo del pool, dentro de un
+contexto de la aplicación (con su propia sesión de db), y que informa de su
+avance con job.update(progreso, mensaje). El estado se guarda en memoria
+del proceso servidor y se consulta por ID; se conservan los últimos
+procesos terminados.
+
+Con CACHE_REDIS_URL el estado de cada proceso y la marca de proceso activo
+por tipo y clave se publican también en el almacén compartido, de modo que
+con varios procesos servidor (gunicorn --workers N) cualquiera de ellos
+puede consultar el avance o rechazar un proceso duplicado. Sin ese almacén
+solo lo ve el proceso que lo lanzó.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from utils.cache import RedisStore
+
+logger = logging.getLogger(__name__)
+
+ESTADOS_ACTIVOS = ('en_cola', 'en_proceso')
+
+# Procesos terminados que se conservan para consultar su resultado
+HISTORY_SIZE = 50
+
+# Segundos que se conserva el estado publicado en el almacén compartido
+STORE_TTL = 24 * 3600
+# La marca de proceso activo caduca si no se renueva (p. ej. si el proceso
+# servidor que lo ejecutaba muere); se renueva con cada avance
+ACTIVE_TTL = 15 * 60
+
+
+class Job:
+    """Estado de un proceso en segundo plano"""
+
+    def __init__(self, tipo, clave=None, usuario=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.tipo = tipo
+        self.clave = clave
+        self.usuario = usuario
+        self.estado = 'en_cola'
+        self.progreso = 0
+        self.mensaje = 'En cola'
+        self.resultado = None
+        self.error = None
+        self.creado = datetime.now()
+        self.iniciado = None
+        self.terminado = None
+        self._started = None
+        self._finished = None
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def update(self, progreso=None, mensaje=None):
+        """Actualiza el avance (0-100) y el mensaje visible del proceso"""
+        with self._lock:
+            if progreso is not None:
+                self.progreso = max(0, min(100, int(progreso)))
+            if mensaje is not None:
+                self.mensaje = mensaje
+        if self._listener:
+            self._listener(self)
+
+    @property
+    def activo(self):
+        return self.estado in ESTADOS_ACTIVOS
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'id_proceso': self.id,
+                'tipo': self.tipo,
+                'clave': self.clave,
+                'estado': self.estado,
+                'progreso': self.progreso,
+                'mensaje': self.mensaje,
+                'resultado': self.resultado,
+                'error': self.error,
+                'creado': self.creado.isoformat(timespec='seconds'),
+                'iniciado': self.iniciado.isoformat(timespec='seconds') if self.iniciado else None,
+                'terminado': self.terminado.isoformat(timespec='seconds') if self.terminado else None,
+                'duracion_ms': self.duracion_ms,
+            }
+
+    @property
+    def duracion_ms(self):
+        if self._started is None:
+            return None
+        return round(((self._finished or time.perf_counter()) - self._started) * 1000)
+
+
+class JobQueue:
+    """Pool de hilos para procesos en segundo plano de una aplicación Flask"""
+
+    def __init__(self, max_workers=2, history_size=HISTORY_SIZE, store=None):
+        self.app = None
+        self.history_size = history_size
+        # Almacén compartido entre procesos (None: estado solo en este proceso)
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        if app.config.get('CACHE_REDIS_URL'):
+            self.store = RedisStore.from_url(app.config['CACHE_REDIS_URL'])
+
+    def submit(self, tipo, func, *args, clave=None, usuario=None, **kwargs):
+        """
+        Encola func(job, *args, **kwargs); su valor de retorno es el resultado del proceso
+
+        Args:
+            clave: Identificador opcional; no se admite otro proceso activo del mismo tipo y clave
+            usuario: ID del usuario que lanzó el proceso
+
+        Returns:
+            Job: El proceso encolado
+
+        Raises:
+            RuntimeError: Si ya hay un proceso activo del mismo tipo y clave
+                (en este proceso servidor o, con almacén compartido, en otro)
+        """
+        job = Job(tipo, clave, usuario)
+        with self._lock:
+            if clave is not None:
+                if self._find_local(tipo, clave) is not None or (
+                        self.store is not None
+                        and not self.store.add(self._active_key(tipo, clave), ACTIVE_TTL, job.id)):
+                    raise RuntimeError(f'Ya hay un proceso {tipo} en curso para {clave}')
+            self._jobs[job.id] = job
+            self._prune()
+        if self.store is not None:
+            job._listener = self._publish
+            self._publish(job)
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        """Proceso lanzado desde este proceso servidor, o None"""
+        return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        """
+        Estado de un proceso como diccionario (Job.to_dict), o None si no existe.
+        Con almacén compartido incluye los lanzados desde otros procesos servidor.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is not None:
+            return self.store.get(self._job_key(job_id))
+        return None
+
+    def find_active(self, tipo, clave):
+        """ID del proceso activo del tipo y clave indicados, o None"""
+        job = self._find_local(tipo, clave)
+        if job is not None:
+            return job.id
+        if self.store is not None:
+            return self.store.get(self._active_key(tipo, clave))
+        return None
+
+    def _find_local(self, tipo, clave):
+        for job in list(self._jobs.values()):
+            if job.tipo == tipo and job.clave == clave and job.activo:
+                return job
+        return None
+
+    @staticmethod
+    def _job_key(job_id):
+        return f'proceso:{job_id}'
+
+    @staticmethod
+    def _active_key(tipo, clave):
+        return f'proceso_activo:{tipo}:{clave}'
+
+    def _publish(self, job):
+        """Copia el estado del proceso en el almacén compartido y renueva su marca de activo"""
+        try:
+            self.store.setex(self._job_key(job.id), STORE_TTL, job.to_dict())
+            if job.clave is not None and job.activo:
+                self.store.setex(self._active_key(job.tipo, job.clave), ACTIVE_TTL, job.id)
+        except Exception:
+            # El proceso sigue aunque el almacén no responda; solo se pierde la consulta remota
+            logger.exception('No se pudo publicar el estado del proceso %s', job.id)
+
+    def _release(self, job):
+        """Retira la marca de proceso activo del almacén compartido"""
+        key = self._active_key(job.tipo, job.clave)
+        try:
+            if self.store.get(key) == job.id:
+                self.store.delete(key)
+        except Exception:
+            logger.exception('No se pudo liberar el proceso %s', job.id)
+
+    def _run(self, job, func, args, kwargs):
+        job.estado = 'en_proceso'
+        job.iniciado = datetime.now()
+        job._started = time.perf_counter()
+        job.update(mensaje='Iniciando')
+        try:
+            with self.app.app_context():
+                result = func(job, *args, **kwargs)
+            job.resultado = result
+            job.estado = 'completado'
+            job.update(100, 'Completado')
+        except Exception as e:
+            logger.exception('Error en el proceso %s %s', job.tipo, job.id)
+            job.error = str(e)
+            job.estado = 'error'
+            job.update(mensaje='Error')
+        finally:
+            job._finished = time.perf_counter()
+            job.terminado = datetime.now()
+            if self.store is not None:
+                self._publish(job)
+                if job.clave is not None:
+                    self._release(job)
+
+    def _prune(self):
+        """Descarta los procesos terminados más antiguos por encima de history_size"""
+        finished = [job for job in self._jobs.values() if not job.activo]
+        for job in sorted(finished, key=lambda j: j.creado)[:max(0, len(finished) - self.history_size)]:
+            del self._jobs[job.id]
+
+
+# Procesos en segundo plano del API (p. ej. el cálculo de nómina de un periodo)
+job_queue = JobQueue()
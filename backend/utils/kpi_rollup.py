@@ -0,0 +1,287 @@
+# backend/utils/kpi_rollup.py
+"""
+Rollup mensual de KPIs (tabla kpi_mensual).
+
+Cada fila guarda el valor agregado de una métrica para un (año, mes,
+dimensión). Las filas se mantienen de forma incremental: al confirmar una
+transacción que escribe ventas, órdenes de producción, nóminas, órdenes de
+compra o mantenimientos, solo se recalculan los meses afectados dentro de
+la misma transacción. El comando `flask --app main kpi rebuild` reconstruye
+el rollup completo para cargas históricas.
+"""
+from datetime import date
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, func, extract, inspect, tuple_
+from sqlalchemy.exc import IntegrityError
+from config import db
+from models import KpiMensual, Venta, OrdenProduccion, Nomina, OrdenCompra, Mantenimiento
+from utils.aggregates import KPI_SERIES, month_bounds
+from utils.db_routing import on_primary
+
+DIMENSION_TOTAL = 'total'
+
+# Modelo origen de cada métrica del rollup
+METRIC_SOURCES = {
+    'ventas': Venta,
+    'produccion': OrdenProduccion,
+    'nominas': Nomina,
+    'compras': OrdenCompra,
+    'mantenimiento': Mantenimiento,
+}
+
+# Métricas que además se desglosan por una columna del modelo origen
+METRIC_DIMENSIONS = {
+    'mantenimiento': Mantenimiento.tipo,
+}
+
+_PENDING_KEY = 'kpi_rollup_pendientes'
+
+# Intentos de completar los meses que faltan cuando otra petición los guarda a la vez
+FILL_ATTEMPTS = 3
+
+
+def _months_between(start, end):
+    """Pares (año, mes) desde el mes de `start` hasta el de `end`, inclusive"""
+    pairs = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        pairs.append((year, month))
+        month += 1
+        if month == 13:
+            month = 1
+            year += 1
+    return pairs
+
+
+def _grouped_values(session, metric, start, end):
+    """
+    Agrega una métrica por (año, mes, dimensión) en el rango [start, end).
+
+    Returns:
+        dict: (año, mes, dimensión) -> (valor, registros), incluyendo la
+        dimensión 'total' de cada mes con datos
+    """
+    value_expr, date_column, filters = KPI_SERIES[metric]
+    year_col = extract('year', date_column)
+    month_col = extract('month', date_column)
+    dimension_col = METRIC_DIMENSIONS.get(metric)
+    group_cols = [year_col, month_col] + ([dimension_col] if dimension_col is not None else [])
+
+    rows = session.query(*group_cols, value_expr, func.count()).filter(
+        date_column >= start,
+        date_column < end,
+        *filters
+    ).group_by(*group_cols).all()
+
+    values = {}
+    for row in rows:
+        year, month = int(row[0]), int(row[1])
+        value, count = float(row[-2] or 0), int(row[-1] or 0)
+        total_value, total_count = values.get((year, month, DIMENSION_TOTAL), (0.0, 0))
+        values[(year, month, DIMENSION_TOTAL)] = (total_value + value, total_count + count)
+        if dimension_col is not None:
+            values[(year, month, str(row[2]))] = (value, count)
+    return values
+
+
+def _write_months(session, metric, months):
+    """Recalcula y reemplaza las filas del rollup de `metric` para `months`"""
+    if not months:
+        return
+    months = sorted(set(months))
+    start, _ = month_bounds(*months[0])
+    _, end = month_bounds(*months[-1])
+    values = _grouped_values(session, metric, start, end)
+    wanted = set(months)
+
+    session.execute(
+        KpiMensual.__table__.delete().where(
+            KpiMensual.metrica == metric,
+            tuple_(KpiMensual.anio, KpiMensual.mes).in_(months)
+        )
+    )
+
+    # Siempre se escribe la fila 'total' para distinguir meses sin datos de meses sin calcular
+    rows = [
+        {'anio': year, 'mes': month, 'metrica': metric, 'dimension': DIMENSION_TOTAL,
+         'valor': 0, 'registros': 0}
+        for year, month in months
+        if (year, month, DIMENSION_TOTAL) not in values
+    ]
+    rows.extend(
+        {'anio': year, 'mes': month, 'metrica': metric, 'dimension': dimension,
+         'valor': round(value, 2), 'registros': count}
+        for (year, month, dimension), (value, count) in values.items()
+        if (year, month) in wanted
+    )
+    session.execute(KpiMensual.__table__.insert(), rows)
+
+
+def refresh_buckets(session, buckets):
+    """
+    Recalcula los buckets (métrica, año, mes) indicados.
+
+    Args:
+        session: Sesión de SQLAlchemy en la que se escriben los cambios
+        buckets: Iterable de tuplas (métrica, año, mes)
+    """
+    by_metric = {}
+    for metric, year, month in buckets:
+        by_metric.setdefault(metric, set()).add((year, month))
+    for metric, months in by_metric.items():
+        _write_months(session, metric, months)
+
+
+def rebuild(session, start=None, end=None, metrics=None):
+    """
+    Reconstruye el rollup entre los meses de `start` y `end` (inclusive).
+    Sin fechas, cubre desde el registro más antiguo hasta el mes actual.
+
+    Returns:
+        dict: métrica -> número de meses reconstruidos
+    """
+    end = end or date.today()
+    result = {}
+    for metric in metrics or METRIC_SOURCES:
+        date_column = KPI_SERIES[metric][1]
+        metric_start = start or session.query(func.min(date_column)).scalar()
+        if metric_start is None:
+            result[metric] = 0
+            continue
+        months = _months_between(metric_start, end)
+        _write_months(session, metric, months)
+        result[metric] = len(months)
+    return result
+
+
+def _stored_totals(months, names):
+    """Filas 'total' guardadas de las métricas y meses pedidos, y los buckets que faltan"""
+    rows = db.session.query(
+        KpiMensual.metrica, KpiMensual.anio, KpiMensual.mes, KpiMensual.valor
+    ).filter(
+        KpiMensual.metrica.in_(names),
+        KpiMensual.dimension == DIMENSION_TOTAL,
+        tuple_(KpiMensual.anio, KpiMensual.mes).in_(months)
+    ).all()
+    stored = {(metrica, anio, mes): float(valor) for metrica, anio, mes, valor in rows}
+    missing = [
+        (metric, year, month)
+        for metric in names
+        for year, month in months
+        if (metric, year, month) not in stored
+    ]
+    return stored, missing
+
+
+def rollup_series(months, names=None):
+    """
+    Lee las series mensuales del rollup, alineadas con `months`.
+
+    Los meses que aún no tienen fila en kpi_mensual se calculan y se guardan
+    en ese momento, de modo que el rollup se completa solo la primera vez.
+    Ese cálculo se hace siempre en la base principal: en la réplica los
+    agregados podrían llegar con retraso y quedarían guardados así. Si otra
+    petición guarda a la vez los mismos meses, la clave primaria rechaza la
+    segunda inserción: se descarta y se leen las filas de la otra.
+
+    Returns:
+        dict: nombre de la métrica -> lista de valores
+    """
+    names = list(names or METRIC_SOURCES)
+    stored, missing = _stored_totals(months, names)
+    attempts = 0
+    while missing:
+        with on_primary():
+            try:
+                refresh_buckets(db.session, missing)
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                attempts += 1
+                if attempts >= FILL_ATTEMPTS:
+                    raise
+            stored, missing = _stored_totals(months, names)
+
+    return {
+        metric: [stored[(metric, year, month)] for year, month in months]
+        for metric in names
+    }
+
+
+# --- Mantenimiento incremental ---
+
+def _metrics_for(obj):
+    return [metric for metric, model in METRIC_SOURCES.items() if isinstance(obj, model)]
+
+
+def _collect_buckets(session, flush_context, instances):
+    """Antes de cada flush, registra los meses afectados por los objetos modificados"""
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            for metric in _metrics_for(obj):
+                date_attr = KPI_SERIES[metric][1].key
+                # Fecha actual (se carga si el objeto está expirado) y anterior si cambió
+                fechas = [getattr(obj, date_attr)] + list(inspect(obj).attrs[date_attr].history.deleted or ())
+                for fecha in fechas:
+                    if fecha is not None:
+                        pending.add((metric, fecha.year, fecha.month))
+
+
+def _apply_pending(session):
+    """Antes de confirmar, recalcula los meses pendientes en la misma transacción"""
+    session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        refresh_buckets(session, pending)
+
+
+def _discard_pending(session, previous_transaction=None):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _keep_previous_date(target, value, oldvalue, initiator):
+    return value
+
+
+def register_rollup_listeners():
+    """Conecta el mantenimiento incremental del rollup a la sesión de db"""
+    if event.contains(db.session, 'before_flush', _collect_buckets):
+        return
+    event.listen(db.session, 'before_flush', _collect_buckets)
+    event.listen(db.session, 'before_commit', _apply_pending)
+    event.listen(db.session, 'after_rollback', _discard_pending)
+    # active_history conserva la fecha anterior aunque el objeto esté expirado,
+    # para poder recalcular también el mes de origen cuando la fecha cambia
+    for metric in METRIC_SOURCES:
+        event.listen(KPI_SERIES[metric][1], 'set', _keep_previous_date,
+                     active_history=True, retval=True)
+
+
+# --- CLI: flask --app main kpi rebuild ---
+
+kpi_cli = AppGroup('kpi', help='Mantenimiento del rollup kpi_mensual')
+
+
+def _parse_month(value):
+    if not value:
+        return None
+    try:
+        year, month = value.split('-')
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise click.BadParameter('Formato de mes inválido. Use YYYY-MM')
+
+
+@kpi_cli.command('rebuild')
+@click.option('--desde', help='Primer mes a reconstruir (YYYY-MM)')
+@click.option('--hasta', help='Último mes a reconstruir (YYYY-MM)')
+@click.option('--metrica', 'metricas', multiple=True, type=click.Choice(list(METRIC_SOURCES)),
+              help='Métrica a reconstruir (se puede repetir)')
+def rebuild_command(desde, hasta, metricas):
+    """Reconstruye kpi_mensual a partir de las tablas de origen"""
+    result = rebuild(db.session, _parse_month(desde), _parse_month(hasta), metricas or None)
+    db.session.commit()
+    for metric, count in result.items():
+        click.echo(f"{metric}: {count} meses reconstruidos")
@@ -0,0 +1,111 @@
+# backend/utils/migrations.py
+"""
+Migraciones versionadas del esquema (backend/database/migrations).
+
+Cada migración es un archivo NNN_descripcion.sql con sentencias separadas
+por ';'. Las versiones aplicadas se registran en la tabla schema_migrations,
+de modo que `flask --app main schema upgrade` solo ejecuta las pendientes.
+Los CREATE INDEX de índices que ya existen y los ALTER TABLE ... ADD COLUMN
+de columnas que ya existen (p. ej. creados por db.create_all en una base
+nueva) se omiten.
+"""
+import os
+import re
+from datetime import datetime
+import click
+from flask.cli import AppGroup
+from sqlalchemy import Table, Column, String, DateTime, MetaData, inspect, select, text
+from config import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              'database', 'migrations')
+
+_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', _metadata,
+    Column('version', String(50), primary_key=True),
+    Column('aplicada', DateTime, nullable=False),
+)
+
+_CREATE_INDEX = re.compile(r'^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)', re.IGNORECASE)
+_ADD_COLUMN = re.compile(r'^\s*ALTER\s+TABLE\s+(\w+)\s+ADD\s+(?:COLUMN\s+)?(\w+)', re.IGNORECASE)
+
+
+def available_migrations():
+    """Pares (versión, ruta) de los archivos de migración, ordenados por versión"""
+    migrations = []
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if name.endswith('.sql'):
+            migrations.append((name[:-len('.sql')], os.path.join(MIGRATIONS_DIR, name)))
+    return migrations
+
+
+def applied_versions(connection):
+    schema_migrations.create(connection, checkfirst=True)
+    return {row.version for row in connection.execute(select(schema_migrations.c.version))}
+
+
+def _statements(path):
+    with open(path, encoding='utf-8') as f:
+        lines = [line for line in f if not line.lstrip().startswith('--')]
+    return [s.strip() for s in ''.join(lines).split(';') if s.strip()]
+
+
+def _already_applied(connection, statement):
+    """Indica si el índice o la columna que crea la sentencia ya existe"""
+    match = _CREATE_INDEX.match(statement)
+    if match:
+        index, table = match.groups()
+        return any(i['name'] == index for i in inspect(connection).get_indexes(table))
+    match = _ADD_COLUMN.match(statement)
+    if match:
+        table, column = match.groups()
+        return any(c['name'] == column for c in inspect(connection).get_columns(table))
+    return False
+
+
+def upgrade(engine=None):
+    """
+    Aplica las migraciones pendientes, cada una en su propia transacción
+
+    Returns:
+        list: Versiones aplicadas
+    """
+    engine = engine or db.engine
+    applied = []
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+    for version, path in available_migrations():
+        if version in done:
+            continue
+        with engine.begin() as connection:
+            for statement in _statements(path):
+                if not _already_applied(connection, statement):
+                    connection.execute(text(statement))
+            connection.execute(schema_migrations.insert().values(version=version, aplicada=datetime.now()))
+        applied.append(version)
+    return applied
+
+
+# --- CLI: flask --app main schema upgrade|status ---
+
+schema_cli = AppGroup('schema', help='Migraciones versionadas del esquema')
+
+
+@schema_cli.command('upgrade')
+def upgrade_command():
+    """Aplica las migraciones pendientes"""
+    applied = upgrade()
+    for version in applied:
+        click.echo(f"Aplicada {version}")
+    if not applied:
+        click.echo('El esquema está al día')
+
+
+@schema_cli.command('status')
+def status_command():
+    """Muestra las migraciones aplicadas y pendientes"""
+    with db.engine.begin() as connection:
+        done = applied_versions(connection)
+    for version, _ in available_migrations():
+        click.echo(f"{'aplicada ' if version in done else 'pendiente'}  {version}")
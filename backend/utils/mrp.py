@@ -0,0 +1,208 @@
+# backend/utils/mrp.py
+"""
+Planificación de necesidades de materiales (MRP).
+
+Las órdenes de producción planificadas o en proceso se agregan en una
+matriz periodos x productos con las unidades a fabricar, que se multiplica
+por la matriz de recetas productos x materiales para obtener las
+necesidades brutas por periodo. Se netean contra el inventario y las
+recepciones pendientes de las órdenes de compra abiertas: la disponibilidad
+proyectada es el stock más la suma acumulada de recepciones menos
+necesidades, y el faltante de cada periodo es lo que esa proyección cae por
+debajo del peor saldo negativo anterior (lo ya pedido para cubrir un saldo
+negativo sigue cubriéndolo aunque una recepción lo reduzca después).
+
+Los datos se leen con consultas de columnas (sin objetos del ORM) y el
+cálculo se hace con NumPy, así que el coste no depende de recorrer las
+órdenes una a una.
+"""
+from datetime import date
+from sqlalchemy import select, func
+from models import OrdenProduccion, RecetaProduccion, Inventario, OrdenCompra, DetalleOrdenCompra, Material
+
+try:
+    import numpy as np  # Dependencia opcional; sin ella el MRP no está disponible
+except ImportError:
+    np = None
+
+PERIODOS = ('dia', 'semana', 'mes')
+ESTADOS_ORDEN = ('planificada', 'en_proceso')
+ESTADOS_COMPRA = ('pendiente', 'aprobada')
+
+# Tolerancia para no informar faltantes por errores de redondeo de las recetas
+_EPSILON = 1e-9
+
+
+class MrpUnavailable(RuntimeError):
+    """NumPy no está instalado"""
+
+
+def _period_start(days, periodo):
+    """Fecha de inicio del periodo (datetime64[D]) de cada fecha del array"""
+    if periodo == 'mes':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    if periodo == 'semana':
+        # 1970-01-01 fue jueves: (días + 3) % 7 es el día de la semana con lunes = 0
+        offsets = (days.astype('int64') + 3) % 7
+        return days - offsets.astype('timedelta64[D]')
+    return days
+
+
+def _dates(values, today):
+    """Array datetime64[D] de fechas, con las pasadas o vacías llevadas a hoy"""
+    days = np.array([value or today for value in values], dtype='datetime64[D]')
+    return np.maximum(days, np.datetime64(today, 'D'))
+
+
+def build_plan(session, periodo='semana', hasta=None, solo_faltantes=False, today=None):
+    """
+    Calcula el plan de materiales
+
+    Args:
+        session: Sesión de SQLAlchemy
+        periodo: Agrupación temporal: 'dia', 'semana' (lunes) o 'mes'
+        hasta: Fecha opcional; las órdenes que empiezan después no se planifican
+        solo_faltantes: Si es True solo se devuelven los materiales con faltante
+        today: Fecha de referencia (por defecto hoy); lo vencido se planifica en su periodo
+
+    Returns:
+        dict: Periodos, materiales con sus necesidades por periodo y totales
+
+    Raises:
+        MrpUnavailable: Si NumPy no está instalado
+        ValueError: Si el periodo no es válido
+    """
+    if np is None:
+        raise MrpUnavailable('Para calcular el MRP instale numpy')
+    if periodo not in PERIODOS:
+        raise ValueError(f"periodo no válido. Use uno de: {', '.join(PERIODOS)}")
+    today = today or date.today()
+
+    # --- Órdenes de producción abiertas ---
+    stmt = select(OrdenProduccion.id_producto, OrdenProduccion.cantidad, OrdenProduccion.fecha_inicio).where(
+        OrdenProduccion.estado.in_(ESTADOS_ORDEN)
+    )
+    if hasta is not None:
+        stmt = stmt.where(OrdenProduccion.fecha_inicio <= hasta)
+    orders = session.execute(stmt).all()
+
+    # --- Recetas (matriz productos x materiales) ---
+    recipes = session.execute(
+        select(RecetaProduccion.id_producto, RecetaProduccion.id_material, RecetaProduccion.cantidad)
+    ).all()
+
+    order_products = np.fromiter((row[0] for row in orders), dtype='int64', count=len(orders))
+    order_qty = np.fromiter((row[1] for row in orders), dtype='float64', count=len(orders))
+    recipe_products = np.fromiter((row[0] for row in recipes), dtype='int64', count=len(recipes))
+    recipe_materials = np.fromiter((row[1] for row in recipes), dtype='int64', count=len(recipes))
+    recipe_qty = np.fromiter((float(row[2]) for row in recipes), dtype='float64', count=len(recipes))
+
+    products, product_index = np.unique(np.concatenate([recipe_products, order_products]),
+                                        return_inverse=True)
+    recipe_product_index = product_index[:len(recipes)]
+    order_product_index = product_index[len(recipes):]
+    materials, recipe_material_index = np.unique(recipe_materials, return_inverse=True)
+
+    bom = np.zeros((len(products), len(materials)))
+    np.add.at(bom, (recipe_product_index, recipe_material_index), recipe_qty)
+    has_recipe = np.zeros(len(products), dtype=bool)
+    has_recipe[recipe_product_index] = True
+
+    # --- Recepciones pendientes de órdenes de compra abiertas ---
+    receipts = session.execute(
+        select(DetalleOrdenCompra.id_material,
+               func.coalesce(OrdenCompra.fecha_entrega_esperada, OrdenCompra.fecha),
+               func.sum(DetalleOrdenCompra.cantidad))
+        .join(OrdenCompra, DetalleOrdenCompra.id_orden_compra == OrdenCompra.id_orden_compra)
+        .where(OrdenCompra.estado.in_(ESTADOS_COMPRA),
+               DetalleOrdenCompra.id_material.in_(materials.tolist()))
+        .group_by(DetalleOrdenCompra.id_material,
+                  func.coalesce(OrdenCompra.fecha_entrega_esperada, OrdenCompra.fecha))
+    ).all() if len(materials) else []
+
+    # --- Periodos: los de las órdenes y los de las recepciones ---
+    order_periods = _period_start(_dates([row[2] for row in orders], today), periodo)
+    receipt_periods = _period_start(_dates([row[1] for row in receipts], today), periodo)
+    periods, period_index = np.unique(np.concatenate([order_periods, receipt_periods]),
+                                      return_inverse=True)
+    order_period_index = period_index[:len(orders)]
+    receipt_period_index = period_index[len(orders):]
+
+    # Necesidades brutas: (periodos x productos) @ (productos x materiales)
+    production = np.zeros((len(periods), len(products)))
+    np.add.at(production, (order_period_index, order_product_index), order_qty)
+    gross = production @ bom
+
+    incoming = np.zeros((len(periods), len(materials)))
+    if receipts:
+        receipt_materials = np.searchsorted(materials, [row[0] for row in receipts])
+        np.add.at(incoming, (receipt_period_index, receipt_materials),
+                  [float(row[2]) for row in receipts])
+
+    stock = np.zeros(len(materials))
+    if len(materials):
+        on_hand = session.execute(
+            select(Inventario.id_material, func.sum(Inventario.cantidad))
+            .where(Inventario.id_material.in_(materials.tolist()))
+            .group_by(Inventario.id_material)
+        ).all()
+        if on_hand:
+            stock[np.searchsorted(materials, [row[0] for row in on_hand])] = [float(row[1]) for row in on_hand]
+
+    # Netear: disponibilidad proyectada al final de cada periodo y faltante nuevo del periodo
+    projected = stock + np.cumsum(incoming - gross, axis=0)
+    shortage = np.maximum.accumulate(np.maximum(-projected, 0), axis=0)
+    net = np.diff(shortage, axis=0, prepend=np.zeros((1, len(materials))))
+    net = np.ceil(np.maximum(net, 0) - _EPSILON).clip(min=0)
+
+    totals_gross = gross.sum(axis=0)
+    totals_net = net.sum(axis=0)
+    selected = np.flatnonzero(totals_net > 0 if solo_faltantes else totals_gross > _EPSILON)
+
+    names = {}
+    if len(selected):
+        names = {
+            row.id_material: row for row in session.execute(
+                select(Material.id_material, Material.nombre, Material.unidad_medida, Material.stock_minimo)
+                .where(Material.id_material.in_(materials[selected].tolist()))
+            )
+        }
+
+    period_labels = [str(p) for p in periods]
+    resultado = []
+    for m in selected:
+        id_material = int(materials[m])
+        info = names.get(id_material)
+        active = np.flatnonzero((gross[:, m] > _EPSILON) | (incoming[:, m] > 0) | (net[:, m] > 0))
+        short_periods = np.flatnonzero(net[:, m] > 0)
+        resultado.append({
+            'id_material': id_material,
+            'nombre': info.nombre if info else None,
+            'unidad_medida': info.unidad_medida if info else None,
+            'stock_minimo': info.stock_minimo if info else None,
+            'stock': float(stock[m]),
+            'en_camino': float(incoming[:, m].sum()),
+            'requerido': round(float(totals_gross[m]), 2),
+            'faltante': float(totals_net[m]),
+            'primer_faltante': period_labels[short_periods[0]] if len(short_periods) else None,
+            'periodos': [{
+                'periodo': period_labels[t],
+                'requerido': round(float(gross[t, m]), 2),
+                'recepciones': float(incoming[t, m]),
+                'disponible': round(float(projected[t, m]), 2),
+                'faltante': float(net[t, m]),
+            } for t in active],
+        })
+    resultado.sort(key=lambda item: (item['primer_faltante'] is None, item['primer_faltante'] or '',
+                                     -item['faltante']))
+
+    sin_receta = ~has_recipe[order_product_index] if len(orders) else np.zeros(0, dtype=bool)
+    return {
+        'periodo': periodo,
+        'fecha_referencia': today.isoformat(),
+        'periodos': period_labels,
+        'ordenes': len(orders),
+        'ordenes_sin_receta': int(sin_receta.sum()),
+        'productos_sin_receta': sorted(set(products[order_product_index[sin_receta]].tolist())),
+        'materiales': resultado,
+    }
@@ -0,0 +1,228 @@
+# backend/utils/pagination.py
+"""
+Paginación por cursor (keyset), proyección de campos y filtros comunes
+para los endpoints de listado.
+
+Parámetros de consulta admitidos:
+    limit   Tamaño de página. Sin limit ni cursor se devuelve el listado completo.
+    cursor  Valor de X-Next-Cursor de la página anterior.
+    orden   'id' (por defecto), '-id', 'fecha' o '-fecha'.
+    fields  Lista de campos a incluir, separados por comas.
+    desde / hasta  Rango de fechas YYYY-MM-DD (hasta es inclusivo).
+    estado  Uno o varios estados separados por comas.
+    ids     Lista de claves primarias separadas por comas (consulta por lotes).
+
+La respuesta sigue siendo una lista JSON; si hay más filas, el cursor de
+la página siguiente se envía en la cabecera X-Next-Cursor.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from flask import request, jsonify
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+ORDENES = ('id', '-id', 'fecha', '-fecha')
+
+
+class ListParams:
+    """Parámetros de paginación, proyección y filtros de una petición de listado"""
+
+    def __init__(self, limit=None, cursor=None, orden='id', fields=None,
+                 desde=None, hasta=None, estados=None, ids=None):
+        self.limit = limit
+        self.cursor = cursor
+        self.orden = orden
+        self.fields = fields
+        self.desde = desde
+        self.hasta = hasta
+        self.estados = estados
+        self.ids = ids
+
+    @classmethod
+    def from_args(cls, args):
+        """Construye los parámetros a partir de request.args; lanza ValueError si son inválidos"""
+        limit = args.get('limit')
+        cursor = args.get('cursor')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise ValueError('limit debe ser un número entero')
+            if limit <= 0:
+                raise ValueError('limit debe ser mayor a 0')
+            limit = min(limit, MAX_LIMIT)
+        elif cursor:
+            limit = DEFAULT_LIMIT
+
+        orden = args.get('orden', 'id')
+        if orden not in ORDENES:
+            raise ValueError(f"orden no válido. Use uno de: {', '.join(ORDENES)}")
+
+        fields = args.get('fields')
+        fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+        estados = args.get('estado')
+        estados = [e.strip() for e in estados.split(',') if e.strip()] if estados else None
+
+        return cls(
+            limit=limit,
+            cursor=_decode_cursor(cursor) if cursor else None,
+            orden=orden,
+            fields=fields,
+            desde=_parse_date(args.get('desde'), 'desde'),
+            hasta=_parse_date(args.get('hasta'), 'hasta'),
+            estados=estados,
+            ids=parse_id_list(args.get('ids'))
+        )
+
+    def apply(self, query, pk_column, date_column=None, estado_column=None):
+        """
+        Aplica filtros, orden y cursor a la consulta.
+
+        Returns:
+            tuple: (filas de la página, cursor de la página siguiente o None)
+        """
+        if self.desde or self.hasta or self.orden.endswith('fecha'):
+            if date_column is None:
+                raise ValueError('Este listado no admite filtros ni orden por fecha')
+        if self.estados and estado_column is None:
+            raise ValueError('Este listado no admite filtro por estado')
+
+        # Rango semiabierto para que el filtro pueda usar el índice de la fecha
+        if self.desde:
+            query = query.filter(date_column >= self.desde)
+        if self.hasta:
+            query = query.filter(date_column < self.hasta + timedelta(days=1))
+        if self.estados:
+            query = query.filter(estado_column.in_(self.estados))
+        if self.ids is not None:
+            query = query.filter(pk_column.in_(self.ids))
+
+        descending = self.orden.startswith('-')
+        by_date = self.orden.endswith('fecha')
+        keys = [date_column, pk_column] if by_date else [pk_column]
+        query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
+
+        if self.limit is None:
+            return query.all(), None
+
+        if self.cursor is not None:
+            query = query.filter(_after_cursor(keys, self.cursor, descending, by_date))
+
+        rows = query.limit(self.limit + 1).all()
+        if len(rows) <= self.limit:
+            return rows, None
+
+        rows = rows[:self.limit]
+        last = rows[-1]
+        last_key = [_attr(last, pk_column)]
+        if by_date:
+            last_key.insert(0, _attr(last, date_column).isoformat())
+        return rows, _encode_cursor(last_key)
+
+    def project(self, item):
+        """Reduce un diccionario serializado a los campos pedidos en ?fields="""
+        if not self.fields:
+            return item
+        return {field: item[field] for field in self.fields if field in item}
+
+
+def paginated_response(query, serialize, pk_column, date_column=None, estado_column=None):
+    """
+    Responde un listado aplicando los parámetros de la petición actual.
+
+    Args:
+        query: Consulta base (ya filtrada por permisos)
+        serialize: Función que convierte una fila en diccionario
+        pk_column: Columna de clave primaria, usada como desempate del cursor
+        date_column: Columna de fecha para los filtros desde/hasta y orden por fecha
+        estado_column: Columna de estado para el filtro ?estado=
+    """
+    try:
+        params = ListParams.from_args(request.args)
+        rows, next_cursor = params.apply(query, pk_column, date_column, estado_column)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = jsonify([params.project(serialize(row)) for row in rows])
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+
+def parse_id_list(value):
+    """
+    Convierte el parámetro ?ids=1,2,3 en una lista de enteros.
+
+    Returns:
+        list | None: None si el parámetro no viene; lanza ValueError si es inválido
+    """
+    if value is None:
+        return None
+    try:
+        ids = sorted({int(part) for part in value.split(',') if part.strip()})
+    except ValueError:
+        raise ValueError('ids debe ser una lista de números separados por comas')
+    if len(ids) > MAX_LIMIT:
+        raise ValueError(f'ids admite como máximo {MAX_LIMIT} valores')
+    return ids
+
+
+def _attr(row, column):
+    return getattr(row, column.key)
+
+
+def _after_cursor(keys, cursor, descending, by_date):
+    """Condición keyset: filas estrictamente posteriores al cursor en el orden elegido"""
+    if len(cursor) != len(keys):
+        raise ValueError('El cursor no corresponde al orden solicitado')
+    # El cursor llega del cliente: [id] o ["YYYY-MM-DD", id]
+    pk = cursor[-1]
+    if not isinstance(pk, int) or isinstance(pk, bool):
+        raise ValueError('cursor no válido')
+    if by_date:
+        if not isinstance(cursor[0], str):
+            raise ValueError('cursor no válido')
+        try:
+            fecha = datetime.strptime(cursor[0], '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError('cursor no válido')
+        values = [fecha, pk]
+    else:
+        values = [pk]
+
+    def after(column, value):
+        return column < value if descending else column > value
+
+    if len(keys) == 1:
+        return after(keys[0], values[0])
+    return or_(
+        after(keys[0], values[0]),
+        and_(keys[0] == values[0], after(keys[1], values[1]))
+    )
+
+
+def _encode_cursor(values):
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('cursor no válido')
+    if not isinstance(values, list) or not values:
+        raise ValueError('cursor no válido')
+    return values
+
+
+def _parse_date(value, name):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Formato de fecha inválido para {name}. Use YYYY-MM-DD")
@@ -0,0 +1,227 @@
+# backend/utils/payroll_run.py
+"""
+Cálculo de la nómina de un periodo completo (YYYY-MM).
+
+Se leen con consultas de conjunto los empleados activos, el resumen de su
+asistencia del periodo (ausencias y tardanzas por empleado en un solo
+GROUP BY) y las nóminas ya existentes; los importes se calculan con NumPy
+para todos los empleados a la vez y las filas se insertan por lotes con
+Core, todo en una sola transacción.
+
+Reglas:
+    - El salario de la ficha del empleado es mensual. Si la contratación
+      cae dentro del periodo, se prorratea por días laborables (lunes a
+      viernes) trabajables.
+    - Cada ausencia descuenta un día de salario y cada tardanza una
+      fracción del día (parámetro nomina_fraccion_tardanza).
+    - Los empleados sin ausencias ni tardanzas y con asistencia registrada
+      cobran un bono de puntualidad (porcentaje nomina_bono_puntualidad).
+    - Las deducciones nunca superan el salario bruto.
+
+Los parámetros se pueden ajustar en configuracion_sistema.
+"""
+import calendar
+import re
+import time
+from datetime import date
+from sqlalchemy import select, func, case, and_, or_
+from config import db
+from models import Empleado, Asistencia, Nomina, ConfiguracionSistema
+from utils.http_cache import publish_core_writes
+from utils.kpi_rollup import refresh_buckets
+
+try:
+    import numpy as np  # Dependencia opcional; sin ella el cálculo por periodo no está disponible
+except ImportError:
+    np = None
+
+TIPO_PROCESO = 'nomina'
+
+# Parámetros de configuracion_sistema y sus valores por defecto
+PARAMETROS = {
+    'nomina_fraccion_tardanza': 0.25,   # Fracción del salario diario que descuenta una tardanza
+    'nomina_bono_puntualidad': 0.05,    # Bono sobre el bruto sin ausencias ni tardanzas
+}
+
+# Filas insertadas por sentencia
+BATCH_SIZE = 500
+
+_PERIODO = re.compile(r'^(\d{4})-(\d{2})$')
+
+
+class PayrollUnavailable(RuntimeError):
+    """NumPy no está instalado"""
+
+
+def period_bounds(periodo):
+    """
+    Primer y último día de un periodo YYYY-MM
+
+    Raises:
+        ValueError: Si el periodo no tiene el formato YYYY-MM
+    """
+    match = _PERIODO.match(periodo) if isinstance(periodo, str) else None
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        raise ValueError('Formato de periodo inválido. Use YYYY-MM')
+    year, month = int(match.group(1)), int(match.group(2))
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _parametros(session):
+    valores = dict(PARAMETROS)
+    rows = session.execute(
+        select(ConfiguracionSistema.parametro, ConfiguracionSistema.valor)
+        .where(ConfiguracionSistema.parametro.in_(list(PARAMETROS)))
+    ).all()
+    for parametro, valor in rows:
+        try:
+            valores[parametro] = float(valor)
+        except (TypeError, ValueError):
+            pass
+    return valores
+
+
+def compute_payroll(session, periodo, fecha_pago=None, reemplazar=False, progress=None):
+    """
+    Calcula e inserta la nómina del periodo para todos los empleados activos.
+
+    No hace commit: las filas quedan en la transacción de `session`.
+
+    Args:
+        session: Sesión de SQLAlchemy
+        periodo: Periodo YYYY-MM
+        fecha_pago: Fecha de pago (por defecto el último día del periodo)
+        reemplazar: Si es True se recalculan las nóminas ya existentes del
+            periodo; si no, esos empleados se omiten
+        progress: Función opcional progress(porcentaje, mensaje)
+
+    Returns:
+        dict: Resumen del cálculo
+
+    Raises:
+        PayrollUnavailable: Si NumPy no está instalado
+        ValueError: Si el periodo no es válido
+    """
+    if np is None:
+        raise PayrollUnavailable('Para calcular la nómina por periodo instale numpy')
+    progress = progress or (lambda porcentaje, mensaje: None)
+    inicio, fin = period_bounds(periodo)
+    fecha_pago = fecha_pago or fin
+    started = time.perf_counter()
+
+    # --- Lectura: empleados, asistencia agregada y nóminas existentes ---
+    progress(5, 'Leyendo empleados y asistencia')
+    empleados = session.execute(
+        select(Empleado.id_empleado, Empleado.salario, Empleado.fecha_contratacion)
+        .where(Empleado.activo.is_(True), Empleado.salario.isnot(None),
+               or_(Empleado.fecha_contratacion.is_(None), Empleado.fecha_contratacion <= fin))
+        .order_by(Empleado.id_empleado)
+    ).all()
+
+    asistencia = {
+        row.id_empleado: row for row in session.execute(
+            select(Asistencia.id_empleado,
+                   func.count().label('registros'),
+                   func.sum(case((Asistencia.estado == 'ausente', 1), else_=0)).label('ausencias'),
+                   func.sum(case((Asistencia.estado == 'tardanza', 1), else_=0)).label('tardanzas'))
+            .where(Asistencia.fecha >= inicio, Asistencia.fecha <= fin)
+            .group_by(Asistencia.id_empleado)
+        )
+    }
+
+    existentes = set(session.execute(
+        select(Nomina.id_empleado).where(Nomina.periodo == periodo).distinct()
+    ).scalars())
+    omitidos = 0
+    if existentes and not reemplazar:
+        omitidos = sum(1 for row in empleados if row.id_empleado in existentes)
+        empleados = [row for row in empleados if row.id_empleado not in existentes]
+
+    # --- Cálculo vectorizado ---
+    progress(20, f'Calculando {len(empleados)} nóminas')
+    parametros = _parametros(session)
+    n = len(empleados)
+    ids = np.fromiter((row.id_empleado for row in empleados), dtype='int64', count=n)
+    salario = np.fromiter((float(row.salario) for row in empleados), dtype='float64', count=n)
+    desde = np.array([max(row.fecha_contratacion or inicio, inicio) for row in empleados],
+                     dtype='datetime64[D]')
+    ausencias = np.fromiter((int(asistencia[i].ausencias or 0) if i in asistencia else 0 for i in ids.tolist()),
+                            dtype='float64', count=n)
+    tardanzas = np.fromiter((int(asistencia[i].tardanzas or 0) if i in asistencia else 0 for i in ids.tolist()),
+                            dtype='float64', count=n)
+    con_registros = np.fromiter((i in asistencia for i in ids.tolist()), dtype=bool, count=n)
+
+    fin_exclusivo = np.datetime64(fin, 'D') + np.timedelta64(1, 'D')
+    dias_periodo = np.busday_count(np.datetime64(inicio, 'D'), fin_exclusivo)
+    dias_trabajables = np.busday_count(desde, fin_exclusivo)
+
+    bruto = np.round(salario * dias_trabajables / dias_periodo, 2)
+    diario = np.divide(bruto, dias_trabajables, out=np.zeros(n), where=dias_trabajables > 0)
+    deducciones = np.minimum(
+        np.round(diario * (ausencias + tardanzas * parametros['nomina_fraccion_tardanza']), 2), bruto
+    )
+    puntual = con_registros & (ausencias == 0) & (tardanzas == 0)
+    bonos = np.where(puntual, np.round(bruto * parametros['nomina_bono_puntualidad'], 2), 0.0)
+    neto = np.round(bruto - deducciones + bonos, 2)
+
+    # --- Escritura por lotes en la transacción ---
+    table = Nomina.__table__
+    meses = {(fecha_pago.year, fecha_pago.month)} if n else set()
+    reemplazados = 0
+    if reemplazar and existentes:
+        progress(30, 'Eliminando las nóminas anteriores del periodo')
+        anteriores = and_(Nomina.periodo == periodo, Nomina.id_empleado.in_(ids.tolist()))
+        meses.update((f.year, f.month) for f in session.execute(
+            select(Nomina.fecha_pago).where(anteriores).distinct()
+        ).scalars())
+        reemplazados = session.execute(table.delete().where(anteriores)).rowcount
+
+    rows = [{
+        'id_empleado': id_empleado,
+        'periodo': periodo,
+        'fecha_pago': fecha_pago,
+        'salario_bruto': b,
+        'deducciones': d,
+        'bonos': o,
+        'salario_neto': t,
+    } for id_empleado, b, d, o, t in zip(ids.tolist(), bruto.tolist(), deducciones.tolist(),
+                                         bonos.tolist(), neto.tolist())]
+    for start in range(0, len(rows), BATCH_SIZE):
+        session.execute(table.insert(), rows[start:start + BATCH_SIZE])
+        done = min(start + BATCH_SIZE, len(rows))
+        progress(30 + 65 * done // len(rows), f'Guardadas {done} de {len(rows)} nóminas')
+
+    if meses:
+        # Las escrituras con Core no pasan por los eventos del ORM: se actualiza
+        # el rollup mensual de los meses de pago afectados antes de confirmar
+        refresh_buckets(session, [('nominas', year, month) for year, month in meses])
+
+    return {
+        'periodo': periodo,
+        'fecha_pago': fecha_pago.isoformat(),
+        'empleados': len(rows),
+        'omitidos': omitidos,
+        'reemplazados': reemplazados,
+        'dias_laborables': int(dias_periodo),
+        'total_bruto': round(float(bruto.sum()), 2),
+        'total_deducciones': round(float(deducciones.sum()), 2),
+        'total_bonos': round(float(bonos.sum()), 2),
+        'total_neto': round(float(neto.sum()), 2),
+        'ms': round((time.perf_counter() - started) * 1000),
+    }
+
+
+def run_payroll(job, periodo, fecha_pago=None, reemplazar=False):
+    """
+    Proceso en segundo plano: calcula la nómina del periodo y la confirma en una transacción
+    """
+    try:
+        result = compute_payroll(db.session, periodo, fecha_pago, reemplazar, progress=job.update)
+        job.update(97, 'Confirmando')
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    if result['empleados'] or result['reemplazados']:
+        publish_core_writes(['nominas'])
+    return result
@@ -0,0 +1,203 @@
+# backend/utils/profiling.py
+"""
+Perfilado de cada petición del API.
+
+Por petición se mide el tiempo total, el número de sentencias SQL y su
+tiempo (eventos before/after_cursor_execute de todos los engines), las
+sentencias más lentas y cuántas veces se repite la más repetida: una
+sentencia idéntica ejecutada decenas de veces en una petición es la firma
+de un N+1.
+
+Cada petición:
+    - añade la cabecera Server-Timing (db, app y total);
+    - escribe una línea JSON en el logger erp.perfil (nivel INFO; con
+      ERP_PROFILE_LOG se guarda en ese archivo);
+    - registra en erp.perfil (nivel WARNING) las sentencias que superan
+      PROFILE_SLOW_QUERY_MS.
+
+Los tiempos se agregan por ruta (p50/p95/p99 de las últimas peticiones) y
+se consultan en GET /api/_profile. ERP_PROFILE=0 lo desactiva.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('erp.perfil')
+
+# Peticiones recientes por ruta que se conservan para los percentiles
+_WINDOW = 1000
+
+# Campos del resumen por los que se puede ordenar
+ORDENES = ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'db_p95_ms', 'consultas_media', 'consultas_max',
+           'repeticion_max', 'peticiones', 'errores')
+
+# Caracteres de una sentencia que se guardan en el log y en el resumen
+_STATEMENT_CHARS = 300
+
+
+def _percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+class RouteStats:
+    """Tiempos de las últimas peticiones de una ruta"""
+
+    def __init__(self):
+        self.peticiones = 0
+        self.errores = 0
+        self.total = deque(maxlen=_WINDOW)
+        self.db = deque(maxlen=_WINDOW)
+        self.consultas = deque(maxlen=_WINDOW)
+        self.repeticion_max = 0
+        self.sentencia_repetida = None
+
+    def add(self, total_ms, db_ms, consultas, status, repeticion, sentencia):
+        self.peticiones += 1
+        self.errores += int(status >= 500)
+        self.total.append(total_ms)
+        self.db.append(db_ms)
+        self.consultas.append(consultas)
+        if repeticion > self.repeticion_max:
+            self.repeticion_max = repeticion
+            self.sentencia_repetida = sentencia
+
+    def to_dict(self):
+        total = sorted(self.total)
+        consultas = list(self.consultas)
+        return {
+            'peticiones': self.peticiones,
+            'errores': self.errores,
+            'p50_ms': round(_percentile(total, 0.50), 1),
+            'p95_ms': round(_percentile(total, 0.95), 1),
+            'p99_ms': round(_percentile(total, 0.99), 1),
+            'max_ms': round(total[-1], 1) if total else 0.0,
+            'db_p95_ms': round(_percentile(sorted(self.db), 0.95), 1),
+            'consultas_media': round(sum(consultas) / len(consultas), 1) if consultas else 0.0,
+            'consultas_max': max(consultas, default=0),
+            'repeticion_max': self.repeticion_max,
+            'sentencia_repetida': self.sentencia_repetida,
+        }
+
+
+class RequestProfiler:
+    """Instrumentación por petición y agregados por ruta para una aplicación Flask"""
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = 200
+        self.top = 5
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILE_ENABLED', os.environ.get('ERP_PROFILE', '1') != '0')
+        app.config.setdefault('PROFILE_SLOW_QUERY_MS', float(os.environ.get('ERP_PROFILE_SLOW_QUERY_MS', 200)))
+        app.config.setdefault('PROFILE_TOP_QUERIES', 5)
+        app.config.setdefault('PROFILE_LOG', os.environ.get('ERP_PROFILE_LOG'))
+        self.enabled = app.config['PROFILE_ENABLED']
+        if not self.enabled:
+            return
+        self.slow_query_ms = app.config['PROFILE_SLOW_QUERY_MS']
+        self.top = app.config['PROFILE_TOP_QUERIES']
+
+        if app.config['PROFILE_LOG'] and not logger.handlers:
+            handler = logging.FileHandler(app.config['PROFILE_LOG'], encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        # Todos los engines (principal y réplica); las consultas fuera de una petición se ignoran
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    # --- Hooks de la petición ---
+
+    def _start(self):
+        g.perfil = {'inicio': time.perf_counter(), 'consultas': 0, 'db': 0.0,
+                    'lentas': [], 'repeticiones': Counter()}
+
+    def _finish(self, response):
+        perfil = g.pop('perfil', None)
+        if perfil is None:
+            return response
+        total_ms = (time.perf_counter() - perfil['inicio']) * 1000
+        db_ms = perfil['db'] * 1000
+        ruta = f'{request.method} {request.url_rule.rule}' if request.url_rule else f'{request.method} (sin ruta)'
+        sentencia, repeticion = (perfil['repeticiones'].most_common(1) or [(None, 0)])[0]
+
+        response.headers['Server-Timing'] = (
+            f'db;dur={db_ms:.1f};desc="{perfil["consultas"]} consultas", '
+            f'app;dur={max(total_ms - db_ms, 0):.1f}, total;dur={total_ms:.1f}'
+        )
+
+        with self._lock:
+            stats = self.routes.get(ruta)
+            if stats is None:
+                stats = self.routes[ruta] = RouteStats()
+            stats.add(total_ms, db_ms, perfil['consultas'], response.status_code, repeticion,
+                      sentencia[:_STATEMENT_CHARS] if sentencia else None)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'ruta': ruta,
+                'ruta_real': request.path,
+                'estado': response.status_code,
+                'total_ms': round(total_ms, 1),
+                'db_ms': round(db_ms, 1),
+                'consultas': perfil['consultas'],
+                'repeticion_max': repeticion,
+                'lentas': [{'ms': round(ms, 1), 'sql': sql[:_STATEMENT_CHARS]} for ms, sql in perfil['lentas']],
+            }, ensure_ascii=False))
+        return response
+
+    def record_statement(self, statement, seconds):
+        perfil = g.get('perfil')
+        if perfil is None:
+            return
+        perfil['consultas'] += 1
+        perfil['db'] += seconds
+        perfil['repeticiones'][statement] += 1
+        ms = seconds * 1000
+        lentas = perfil['lentas']
+        if len(lentas) < self.top or ms > lentas[-1][0]:
+            lentas.append((ms, statement))
+            lentas.sort(key=lambda item: item[0], reverse=True)
+            del lentas[self.top:]
+        if ms >= self.slow_query_ms:
+            logger.warning('Consulta lenta (%.0f ms) en %s %s: %s', ms, request.method, request.path,
+                           statement[:_STATEMENT_CHARS])
+
+    def summary(self, orden='p95_ms'):
+        """Agregados por ruta, ordenados de mayor a menor según `orden` (uno de ORDENES)"""
+        if orden not in ORDENES:
+            raise ValueError(f"orden no válido. Use uno de: {', '.join(ORDENES)}")
+        with self._lock:
+            rutas = [dict(ruta=ruta, **stats.to_dict()) for ruta, stats in self.routes.items()]
+        return sorted(rutas, key=lambda item: item[orden], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.routes.clear()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['perfil_inicio'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('perfil_inicio', None)
+    if started is not None and has_request_context():
+        request_profiler.record_statement(statement, time.perf_counter() - started)
+
+
+# Perfilado de las peticiones del API (resumen en GET /api/_profile)
+request_profiler = RequestProfiler()
@@ -0,0 +1,92 @@
+# backend/utils/serializers.py
+"""
+Serializadores compartidos de ventas y detalles de venta.
+
+Las consultas se construyen con carga anticipada (selectinload/joinedload)
+de cliente, usuario, detalles y producto, de modo que serializar un
+listado cuesta un número constante de consultas sin importar cuántas
+ventas o líneas contenga.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+from models import Venta, DetalleVenta
+
+
+def venta_load_options():
+    """Opciones de carga para serializar ventas con cliente, vendedor, detalles y producto"""
+    return (
+        joinedload(Venta.cliente),
+        joinedload(Venta.usuario),
+        selectinload(Venta.detalles).joinedload(DetalleVenta.producto),
+    )
+
+
+def detalle_venta_load_options():
+    """Opciones de carga para serializar detalles con su venta y producto"""
+    return (
+        joinedload(DetalleVenta.venta),
+        joinedload(DetalleVenta.producto),
+    )
+
+
+def serialize_linea_venta(det):
+    """Línea de detalle tal como se anida dentro de una venta"""
+    return {
+        'id_detalle': det.id_detalle,
+        'id_producto': det.id_producto,
+        'nombre_producto': det.producto.nombre if det.producto else 'Desconocido',
+        'cantidad': det.cantidad,
+        'precio_unitario': float(det.precio_unitario),
+        'subtotal': float(det.subtotal)
+    }
+
+
+def serialize_venta(venta, incluir_vendedor=False):
+    """
+    Serializa una venta con su cliente y sus líneas de detalle.
+
+    Args:
+        venta: Instancia de Venta (idealmente cargada con venta_load_options)
+        incluir_vendedor: Añade el nombre del usuario que registró la venta
+    """
+    venta_json = {
+        'id_venta': venta.id_venta,
+        'fecha': venta.fecha.strftime('%Y-%m-%d'),
+        'total': float(venta.total),
+        'estado': venta.estado,
+        'cliente': {
+            'id_cliente': venta.cliente.id_cliente,
+            'nombre': venta.cliente.nombre,
+            'tipo': venta.cliente.tipo
+        } if venta.cliente else None,
+        'detalles': [serialize_linea_venta(det) for det in venta.detalles]
+    }
+    if incluir_vendedor:
+        venta_json['vendedor'] = venta.usuario.nombre if venta.usuario else 'Desconocido'
+    return venta_json
+
+
+def serialize_detalle_venta(det, completo=False):
+    """
+    Serializa un detalle de venta de forma independiente (endpoint /sales-details).
+
+    Args:
+        det: Instancia de DetalleVenta (idealmente cargada con detalle_venta_load_options)
+        completo: Añade el estado de la venta y la categoría del producto
+    """
+    venta = det.venta
+    producto = det.producto
+    detalle_json = {
+        'id_detalle': det.id_detalle,
+        'id_venta': det.id_venta,
+        'venta_fecha': venta.fecha.strftime('%Y-%m-%d') if venta else None,
+        'id_producto': det.id_producto,
+        'producto_nombre': producto.nombre if producto else None,
+        'producto_codigo': producto.codigo if producto else None,
+        'cantidad': det.cantidad,
+        'precio_unitario': float(det.precio_unitario),
+        'subtotal': float(det.subtotal)
+    }
+    if completo:
+        detalle_json['venta_estado'] = venta.estado if venta else None
+        detalle_json['producto_categoria'] = producto.categoria if producto else None
+    return detalle_json
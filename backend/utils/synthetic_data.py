@@ -0,0 +1,415 @@
+# backend/utils/synthetic_data.py
+"""
+Generador de datos sintéticos para medir el backend con volúmenes reales.
+
+Rellena todas las tablas de models.py con un número de filas configurable
+(TAMANOS por defecto, multiplicados por una escala y ajustables tabla a
+tabla) de forma determinista: la misma semilla, escala y fecha final
+producen los mismos datos en SQLite y en MySQL. Los identificadores se
+asignan de forma explícita (1..N), así que las tablas deben estar vacías.
+Las cabeceras y sus líneas (ventas, órdenes de compra) se generan juntas
+para que los totales cuadren, y asistencia y nóminas son únicas por
+empleado y día o periodo. Las tablas derivadas (kpi_mensual y las de
+costos) se reconstruyen al final.
+
+Las filas se insertan con Core por lotes, sin pasar por los eventos del ORM.
+"""
+import calendar
+import random
+import time
+from datetime import date, time as dtime, timedelta
+from sqlalchemy import func, select
+from werkzeug.security import generate_password_hash
+from models import (
+    Usuario, AreaTrabajo, Empleado, Asistencia, Proveedor, Material, Inventario, OrdenCompra,
+    DetalleOrdenCompra, Producto, OrdenProduccion, RecetaProduccion, ControlCalidad, Cliente, Venta,
+    DetalleVenta, Nomina, ProyectoID, NormativaLegal, Incidente, ActivoProduccion, Mantenimiento,
+    KpiMensual, CostoMaterial, CostoProducto
+)
+from utils import costing, kpi_rollup
+
+# Filas por tabla con escala 1 (una planta mediana con tres años de historia)
+TAMANOS = {
+    'usuarios': 50,
+    'areas_trabajo': 12,
+    'empleados': 800,
+    'proveedores': 150,
+    'materiales': 600,
+    'productos': 400,
+    'clientes': 3000,
+    'activos_produccion': 250,
+    'inventario': 1500,
+    'recetas_produccion': 2400,
+    'ordenes_compra': 8000,
+    'detalle_ordenes_compra': 32000,
+    'ordenes_produccion': 10000,
+    'control_calidad': 10000,
+    'ventas': 40000,
+    'detalle_ventas': 160000,
+    'asistencia': 100000,
+    'nominas': 20000,
+    'proyectos_i_d': 60,
+    'normativas_legales': 120,
+    'incidentes': 2000,
+    'mantenimiento': 4000,
+}
+
+# Tablas calculadas a partir de las demás (se reconstruyen, no se generan)
+DERIVADAS = (KpiMensual, CostoMaterial, CostoProducto)
+
+# Usuario administrador con el que se ejecutan los escenarios del benchmark
+BENCH_EMAIL = 'bench@erp.local'
+BENCH_PASSWORD = 'benchmark'
+
+# Filas por sentencia INSERT
+BATCH_SIZE = 5000
+
+
+def parse_sizes(scale=1.0, overrides=()):
+    """
+    Filas por tabla: TAMANOS por la escala y los valores tabla=N indicados
+
+    Raises:
+        ValueError: Si una tabla no existe o el número no es válido
+    """
+    sizes = {tabla: max(1, int(round(filas * scale))) for tabla, filas in TAMANOS.items()}
+    for override in overrides:
+        tabla, _, filas = override.partition('=')
+        if tabla not in TAMANOS:
+            raise ValueError(f"Tabla desconocida: {tabla}. Use una de: {', '.join(TAMANOS)}")
+        try:
+            sizes[tabla] = max(1, int(filas))
+        except ValueError:
+            raise ValueError(f'Número de filas inválido para {tabla}: {filas}') from None
+    return sizes
+
+
+def _batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Generator:
+    """Genera e inserta las filas de todas las tablas en una sesión"""
+
+    def __init__(self, session, sizes, seed=1, hasta=None, anios=3):
+        self.session = session
+        self.n = sizes
+        self.rng = random.Random(seed)
+        self.hasta = hasta or date.today()
+        self.desde = self.hasta - timedelta(days=365 * anios)
+        self.dias = (self.hasta - self.desde).days
+        self.timings = {}
+
+    # --- Utilidades ---
+
+    def _fecha(self):
+        return self.desde + timedelta(days=self.rng.randrange(self.dias + 1))
+
+    def _id(self, tabla):
+        return self.rng.randint(1, self.n[tabla])
+
+    def _reparto(self, padres, hijos):
+        """Número de hijos de cada padre: hijos/padres de media, con variación, sumando `hijos`"""
+        base, resto = divmod(hijos, padres)
+        cuentas = [base + (1 if i < resto else 0) for i in range(padres)]
+        for i in range(0, padres - 1, 2):
+            # Se mueve una línea entre pares de padres para no tener todos el mismo tamaño
+            if cuentas[i] > 1 and self.rng.random() < 0.5:
+                cuentas[i] -= 1
+                cuentas[i + 1] += 1
+        return cuentas
+
+    def _insert(self, model, rows):
+        started = time.perf_counter()
+        count = 0
+        for batch in _batches(rows):
+            self.session.execute(model.__table__.insert(), batch)
+            count += len(batch)
+        self._timed(model.__tablename__, count, started)
+        return count
+
+    def _insert_pairs(self, parent, child, pairs):
+        """Inserta cabeceras y líneas generadas juntas, siempre las cabeceras primero"""
+        started = time.perf_counter()
+        parents, children, counts = [], [], [0, 0]
+
+        def flush():
+            if parents:
+                self.session.execute(parent.__table__.insert(), parents)
+            if children:
+                self.session.execute(child.__table__.insert(), children)
+            counts[0] += len(parents)
+            counts[1] += len(children)
+            parents.clear()
+            children.clear()
+
+        for head, lines in pairs:
+            parents.append(head)
+            children.extend(lines)
+            if len(children) >= BATCH_SIZE:
+                flush()
+        flush()
+        self._timed(f'{parent.__tablename__}+{child.__tablename__}', counts[0] + counts[1], started)
+
+    def _timed(self, name, count, started):
+        self.timings[name] = (count, time.perf_counter() - started)
+
+    # --- Tablas ---
+
+    def usuarios(self):
+        # Un solo hash para todos: generar uno por fila dominaría el tiempo
+        password = generate_password_hash(BENCH_PASSWORD)
+        roles = ('admin', 'supervisor', 'empleado', 'empleado')
+        for i in range(1, self.n['usuarios'] + 1):
+            yield {'id_usuario': i, 'nombre': f'Usuario {i}',
+                   'email': BENCH_EMAIL if i == 1 else f'usuario{i}@erp.local',
+                   'password': password, 'rol': 'admin' if i == 1 else roles[i % len(roles)]}
+
+    def areas_trabajo(self):
+        for i in range(1, self.n['areas_trabajo'] + 1):
+            yield {'id_area': i, 'nombre_area': f'Área {i}', 'descripcion': None,
+                   'responsable': self._id('usuarios')}
+
+    def empleados(self):
+        for i in range(1, self.n['empleados'] + 1):
+            yield {'id_empleado': i, 'nombre': f'Empleado {i}', 'apellidos': f'Apellido {i % 97}',
+                   'id_area': self._id('areas_trabajo'), 'puesto': f'Puesto {i % 20}',
+                   'salario': round(self.rng.uniform(9000, 45000), 2),
+                   'fecha_contratacion': self.desde - timedelta(days=self.rng.randrange(3650)),
+                   'activo': self.rng.random() < 0.95}
+
+    def proveedores(self):
+        tipos = ('caucho', 'acero', 'quimicos', 'otros')
+        for i in range(1, self.n['proveedores'] + 1):
+            yield {'id_proveedor': i, 'nombre': f'Proveedor {i}', 'contacto': f'Contacto {i}',
+                   'telefono': f'55{i:08d}', 'email': f'proveedor{i}@erp.local', 'direccion': None,
+                   'tipo_material': tipos[i % len(tipos)]}
+
+    def materiales(self):
+        unidades = ('kg', 'l', 'm', 'pza')
+        for i in range(1, self.n['materiales'] + 1):
+            minimo = self.rng.randint(10, 500)
+            yield {'id_material': i, 'nombre': f'Material {i}', 'descripcion': None,
+                   'unidad_medida': unidades[i % len(unidades)],
+                   'stock_minimo': minimo, 'stock_maximo': minimo * self.rng.randint(4, 20)}
+
+    def productos(self):
+        categorias = ('automovil', 'motocicleta', 'camion', 'industrial')
+        for i in range(1, self.n['productos'] + 1):
+            yield {'id_producto': i, 'codigo': f'SYN-{i:07d}', 'nombre': f'Producto {i}', 'descripcion': None,
+                   'precio': round(self.rng.uniform(400, 9000), 2), 'categoria': categorias[i % len(categorias)]}
+
+    def clientes(self):
+        tipos = ('distribuidor', 'mayorista', 'minorista', 'OEM')
+        for i in range(1, self.n['clientes'] + 1):
+            yield {'id_cliente': i, 'nombre': f'Cliente {i}', 'contacto': f'Contacto {i}',
+                   'telefono': f'33{i:08d}', 'email': f'cliente{i}@erp.local', 'direccion': None,
+                   'tipo': tipos[i % len(tipos)]}
+
+    def activos_produccion(self):
+        tipos = ('maquinaria', 'herramienta', 'equipo')
+        for i in range(1, self.n['activos_produccion'] + 1):
+            yield {'id_activo': i, 'nombre': f'Activo {i}', 'tipo': tipos[i % len(tipos)],
+                   'id_area': self._id('areas_trabajo'), 'fecha_adquisicion': self._fecha(),
+                   'estado': self.rng.choices(('operativo', 'mantenimiento', 'baja'), (90, 8, 2))[0],
+                   'capacidad_diaria': self.rng.randint(50, 800)}
+
+    def inventario(self):
+        for i in range(1, self.n['inventario'] + 1):
+            yield {'id_inventario': i, 'id_material': self._id('materiales'),
+                   'cantidad': self.rng.randint(0, 5000), 'ubicacion': f'Almacén {i % 6}',
+                   'lote': f'L{i:06d}', 'fecha_ingreso': self._fecha()}
+
+    def recetas_produccion(self):
+        cuentas = self._reparto(self.n['productos'], self.n['recetas_produccion'])
+        id_receta = 0
+        for id_producto, lineas in enumerate(cuentas, start=1):
+            for id_material in self.rng.sample(range(1, self.n['materiales'] + 1),
+                                               min(lineas, self.n['materiales'])):
+                id_receta += 1
+                yield {'id_receta': id_receta, 'id_producto': id_producto, 'id_material': id_material,
+                       'cantidad': round(self.rng.uniform(0.1, 12), 2)}
+
+    def ordenes_compra(self):
+        cuentas = self._reparto(self.n['ordenes_compra'], self.n['detalle_ordenes_compra'])
+        id_detalle = 0
+        for id_orden, lineas in enumerate(cuentas, start=1):
+            fecha = self._fecha()
+            detalles = []
+            for _ in range(lineas):
+                id_detalle += 1
+                cantidad = self.rng.randint(1, 500)
+                precio = round(self.rng.uniform(5, 400), 2)
+                detalles.append({'id_detalle': id_detalle, 'id_orden_compra': id_orden,
+                                 'id_material': self._id('materiales'), 'cantidad': cantidad,
+                                 'precio_unitario': precio, 'subtotal': round(cantidad * precio, 2)})
+            reciente = (self.hasta - fecha).days < 30
+            estado = self.rng.choices(('pendiente', 'aprobada', 'recibida', 'cancelada'),
+                                      (40, 30, 25, 5) if reciente else (2, 3, 90, 5))[0]
+            yield ({'id_orden_compra': id_orden, 'id_proveedor': self._id('proveedores'),
+                    'id_usuario': self._id('usuarios'), 'fecha': fecha,
+                    'fecha_entrega_esperada': fecha + timedelta(days=self.rng.randint(5, 30)),
+                    'estado': estado, 'total': round(sum(d['subtotal'] for d in detalles), 2)}, detalles)
+
+    def ordenes_produccion(self):
+        for i in range(1, self.n['ordenes_produccion'] + 1):
+            inicio = self._fecha()
+            reciente = (self.hasta - inicio).days < 45
+            estado = self.rng.choices(('planificada', 'en_proceso', 'completada', 'cancelada'),
+                                      (40, 35, 20, 5) if reciente else (1, 2, 92, 5))[0]
+            yield {'id_orden_produccion': i, 'id_producto': self._id('productos'),
+                   'cantidad': self.rng.randint(50, 5000), 'fecha_inicio': inicio,
+                   'fecha_fin': inicio + timedelta(days=self.rng.randint(1, 20)) if estado == 'completada' else None,
+                   'estado': estado, 'id_usuario': self._id('usuarios')}
+
+    def control_calidad(self):
+        for i in range(1, self.n['control_calidad'] + 1):
+            yield {'id_control': i, 'id_orden_produccion': self._id('ordenes_produccion'), 'fecha': self._fecha(),
+                   'resultado': self.rng.choices(('aprobado', 'rechazado', 'reparacion'), (88, 7, 5))[0],
+                   'observaciones': None, 'id_usuario': self._id('usuarios')}
+
+    def ventas(self):
+        cuentas = self._reparto(self.n['ventas'], self.n['detalle_ventas'])
+        id_detalle = 0
+        for id_venta, lineas in enumerate(cuentas, start=1):
+            detalles = []
+            for _ in range(lineas):
+                id_detalle += 1
+                cantidad = self.rng.randint(1, 40)
+                precio = round(self.rng.uniform(400, 9000), 2)
+                detalles.append({'id_detalle': id_detalle, 'id_venta': id_venta,
+                                 'id_producto': self._id('productos'), 'cantidad': cantidad,
+                                 'precio_unitario': precio, 'subtotal': round(cantidad * precio, 2)})
+            yield ({'id_venta': id_venta, 'id_cliente': self._id('clientes'), 'fecha': self._fecha(),
+                    'total': round(sum(d['subtotal'] for d in detalles), 2),
+                    'estado': self.rng.choices(('pendiente', 'completada', 'cancelada'), (10, 85, 5))[0],
+                    'id_usuario': self._id('usuarios')}, detalles)
+
+    def asistencia(self):
+        """Días laborables hacia atrás desde la fecha final, todos los empleados de cada día"""
+        total, dia, id_asistencia = self.n['asistencia'], self.hasta, 0
+        while id_asistencia < total:
+            if dia.weekday() < 5:
+                for id_empleado in range(1, self.n['empleados'] + 1):
+                    if id_asistencia >= total:
+                        break
+                    id_asistencia += 1
+                    estado = self.rng.choices(('presente', 'ausente', 'tardanza'), (90, 4, 6))[0]
+                    entrada = None if estado == 'ausente' else dtime(
+                        8 if estado == 'tardanza' else 7, self.rng.randint(15, 59))
+                    yield {'id_asistencia': id_asistencia, 'id_empleado': id_empleado, 'fecha': dia,
+                           'hora_entrada': entrada,
+                           'hora_salida': dtime(17, self.rng.randint(0, 59)) if entrada else None,
+                           'estado': estado}
+            dia -= timedelta(days=1)
+
+    def nominas(self):
+        """Periodos mensuales hacia atrás desde la fecha final, una nómina por empleado"""
+        total, id_nomina = self.n['nominas'], 0
+        year, month = self.hasta.year, self.hasta.month
+        while id_nomina < total:
+            pago = date(year, month, calendar.monthrange(year, month)[1])
+            for id_empleado in range(1, self.n['empleados'] + 1):
+                if id_nomina >= total:
+                    break
+                id_nomina += 1
+                bruto = round(self.rng.uniform(9000, 45000), 2)
+                deducciones = round(bruto * self.rng.uniform(0.05, 0.2), 2)
+                bonos = round(bruto * 0.05, 2) if self.rng.random() < 0.3 else 0.0
+                yield {'id_nomina': id_nomina, 'id_empleado': id_empleado, 'periodo': f'{year}-{month:02d}',
+                       'fecha_pago': pago, 'salario_bruto': bruto, 'deducciones': deducciones,
+                       'bonos': bonos, 'salario_neto': round(bruto - deducciones + bonos, 2)}
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+
+    def proyectos_i_d(self):
+        for i in range(1, self.n['proyectos_i_d'] + 1):
+            inicio = self._fecha()
+            yield {'id_proyecto': i, 'nombre': f'Proyecto {i}', 'descripcion': None, 'fecha_inicio': inicio,
+                   'fecha_fin_estimada': inicio + timedelta(days=self.rng.randint(90, 720)),
+                   'presupuesto': round(self.rng.uniform(1e5, 5e6), 2),
+                   'estado': self.rng.choice(('planificacion', 'en_desarrollo', 'completado', 'cancelado'))}
+
+    def normativas_legales(self):
+        tipos = ('ambiental', 'seguridad', 'laboral', 'calidad')
+        for i in range(1, self.n['normativas_legales'] + 1):
+            yield {'id_normativa': i, 'nombre': f'Normativa {i}', 'tipo': tipos[i % len(tipos)],
+                   'descripcion': None, 'fecha_actualizacion': self._fecha(), 'aplicable_a': 'Planta'}
+
+    def incidentes(self):
+        for i in range(1, self.n['incidentes'] + 1):
+            yield {'id_incidente': i, 'tipo': self.rng.choice(('seguridad', 'calidad', 'logistica')),
+                   'descripcion': f'Incidente {i}', 'fecha': self._fecha(),
+                   'id_area': self._id('areas_trabajo'), 'id_empleado_reporta': self._id('empleados'),
+                   'estado': self.rng.choices(('reportado', 'investigacion', 'resuelto'), (10, 15, 75))[0]}
+
+    def mantenimiento(self):
+        for i in range(1, self.n['mantenimiento'] + 1):
+            yield {'id_mantenimiento': i, 'id_activo': self._id('activos_produccion'),
+                   'tipo': self.rng.choice(('preventivo', 'correctivo')), 'fecha': self._fecha(),
+                   'descripcion': None, 'costo': round(self.rng.uniform(200, 40000), 2),
+                   'id_empleado': self._id('empleados')}
+
+    # --- Proceso completo ---
+
+    def run(self, progress=None):
+        """
+        Genera todas las tablas en orden de dependencias y reconstruye las derivadas.
+
+        No hace commit. Devuelve {tabla: (filas, segundos)}.
+        """
+        progress = progress or (lambda mensaje: None)
+        simples = (
+            (Usuario, self.usuarios), (AreaTrabajo, self.areas_trabajo), (Empleado, self.empleados),
+            (Proveedor, self.proveedores), (Material, self.materiales), (Producto, self.productos),
+            (Cliente, self.clientes), (ActivoProduccion, self.activos_produccion),
+            (Inventario, self.inventario), (RecetaProduccion, self.recetas_produccion),
+        )
+        for model, rows in simples:
+            progress(model.__tablename__)
+            self._insert(model, rows())
+        progress('ordenes_compra y detalle_ordenes_compra')
+        self._insert_pairs(OrdenCompra, DetalleOrdenCompra, self.ordenes_compra())
+        for model, rows in ((OrdenProduccion, self.ordenes_produccion), (ControlCalidad, self.control_calidad)):
+            progress(model.__tablename__)
+            self._insert(model, rows())
+        progress('ventas y detalle_ventas')
+        self._insert_pairs(Venta, DetalleVenta, self.ventas())
+        for model, rows in ((Asistencia, self.asistencia), (Nomina, self.nominas),
+                            (ProyectoID, self.proyectos_i_d), (NormativaLegal, self.normativas_legales),
+                            (Incidente, self.incidentes), (Mantenimiento, self.mantenimiento)):
+            progress(model.__tablename__)
+            self._insert(model, rows())
+
+        progress('kpi_mensual y costos (tablas derivadas)')
+        started = time.perf_counter()
+        kpi_rollup.rebuild(self.session, end=self.hasta)
+        costing.rebuild(self.session)
+        self._timed('derivadas', 0, started)
+        return self.timings
+
+
+def generated_models():
+    """Modelos que rellena el generador, en orden de inserción"""
+    return [Usuario, AreaTrabajo, Empleado, Proveedor, Material, Producto, Cliente, ActivoProduccion,
+            Inventario, RecetaProduccion, OrdenCompra, DetalleOrdenCompra, OrdenProduccion,
+            ControlCalidad, Venta, DetalleVenta, Asistencia, Nomina, ProyectoID, NormativaLegal,
+            Incidente, Mantenimiento]
+
+
+def row_counts(session):
+    """Filas actuales de cada tabla generada y derivada"""
+    return {model.__tablename__: session.execute(select(func.count()).select_from(model.__table__)).scalar()
+            for model in generated_models() + list(DERIVADAS)}
+
+
+def clear(session):
+    """Vacía las tablas generadas y derivadas (en orden inverso de dependencias)"""
+    for model in list(DERIVADAS) + generated_models()[::-1]:
+        session.execute(model.__table__.delete())
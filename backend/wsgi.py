@@ -0,0 +1,46 @@
+# backend/wsgi.py
+"""
+Punto de entrada para producción.
+
+Con waitress (Windows y Linux), un proceso con varios hilos que comparten
+el pool de conexiones:
+
+    python wsgi.py                          (ERP_WSGI_THREADS, ERP_WSGI_PORT)
+    waitress-serve --threads 16 --port 5000 wsgi:app
+
+Con gunicorn (Linux), varios procesos con hilos:
+
+    gunicorn --workers 4 --threads 8 --worker-class gthread --bind 0.0.0.0:5000 wsgi:app
+
+Cada proceso tiene su propio pool (ERP_DB_POOL_SIZE + ERP_DB_MAX_OVERFLOW
+conexiones como máximo), así que el total no debe superar max_connections
+de MySQL. Con más de un proceso hay que definir ERP_CACHE_REDIS_URL para
+que las cachés, los ETag y el estado de los procesos en segundo plano
+(nómina de un periodo) sean comunes; sin ella no se envían ETag. El canal
+de cambios vive en el proceso que atiende cada conexión.
+
+Cada cliente de escritorio mantiene abierta una conexión a /api/cambios, que
+ocupa un hilo mientras dura. Por eso cada proceso admite como mucho
+ERP_CHANGE_FEED_MAX_SUBSCRIBERS suscriptores (por defecto la mitad de
+ERP_WSGI_THREADS); los demás reciben 503 con Retry-After y reintentan. Para
+N clientes abiertos a la vez hacen falta unos 2 x N hilos en total (entre
+todos los procesos), o bien subir el límite dejando siempre hilos libres
+para el resto del API.
+"""
+import os
+from main import app
+
+if __name__ == '__main__':
+    import waitress  # Dependencia de producción: pip install waitress
+
+    threads = int(os.environ.get('ERP_WSGI_THREADS', 16))
+    conexiones = app.config['DB_POOL_SIZE'] + app.config['DB_MAX_OVERFLOW']
+    if conexiones < threads:
+        app.logger.warning('El pool admite %d conexiones para %d hilos: las peticiones esperarán conexión',
+                           conexiones, threads)
+    from utils.change_feed import change_feed
+    if change_feed.max_subscribers >= threads:
+        app.logger.warning('El canal de cambios admite %d suscriptores para %d hilos: '
+                           'pueden ocupar todos los hilos', change_feed.max_subscribers, threads)
+    waitress.serve(app, host=os.environ.get('ERP_WSGI_HOST', '0.0.0.0'),
+                   port=int(os.environ.get('ERP_WSGI_PORT', 5000)), threads=threads)
@@ -12,6 +12,10 @@ class AppConfig:
     
     # Configuración de la API
     API_BASE_URL = "http://localhost:5000/api"
+    API_TIMEOUT = 15  # segundos por petición si no se indica otro
+    API_MAX_CONCURRENT_REQUESTS = 4  # peticiones simultáneas en segundo plano
+    IMPORT_TIMEOUT = 30 * 60  # segundos para subir y procesar una importación masiva
+    EXPORT_TIMEOUT = 5 * 60  # segundos de espera máxima entre fragmentos de una exportación
     
     # Rutas de recursos
     ICONS_PATH = "resources/icons/"
@@ -28,6 +32,10 @@ class AppConfig:
     # Configuración de caché
     CACHE_ENABLED = True
     CACHE_TIMEOUT = 5 * 60  # 5 minutos en segundos
+    CACHE_MAX_BYTES = 20 * 1024 * 1024  # tamaño máximo de las respuestas guardadas
+
+    # Actualización en tiempo real de listados y panel con los cambios de otros usuarios
+    LIVE_UPDATES_ENABLED = True
     
     # Roles de usuario
     ROLES = {
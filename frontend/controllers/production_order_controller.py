@@ -1,5 +1,5 @@
 from typing import List, Dict, Any, Optional
-from models import ProductionOrder
+from models.production_order_model import ProductionOrder
 from datetime import datetime
 
 class ProductionOrderController:
@@ -7,13 +7,13 @@ class ProductionOrderController:
         self.api_client = api_client
     
     async def get_production_orders(self, params=None):
-        response = await self.api_client.get_production_orders(params)
+        response = await self.api_client.get('/ordenes_produccion', params=params)
         if response:
             return [ProductionOrder.from_dict(item) for item in response]
         return []
     
     async def get_production_order(self, order_id):
-        response = await self.api_client.get_production_order(order_id)
+        response = await self.api_client.get(f'/ordenes_produccion/{order_id}')
         if response:
             return ProductionOrder.from_dict(response)
         return None
@@ -24,7 +24,7 @@ class ProductionOrderController:
             raise ValueError("Datos de orden inválidos: " + ", ".join(errors.values()))
         
         formatted_data = self._format_dates(order_data)
-        response = await self.api_client.create_production_order(formatted_data)
+        response = await self.api_client.post('/ordenes_produccion', json=formatted_data)
         
         if response:
             return ProductionOrder.from_dict(response)
@@ -36,14 +36,14 @@ class ProductionOrderController:
             raise ValueError("Datos de orden inválidos: " + ", ".join(errors.values()))
         
         formatted_data = self._format_dates(order_data)
-        response = await self.api_client.update_production_order(order_id, formatted_data)
+        response = await self.api_client.put(f'/ordenes_produccion/{order_id}', json=formatted_data)
         
         if response:
             return ProductionOrder.from_dict(response)
         return None
     
     async def delete_production_order(self, order_id):
-        return await self.api_client.delete_production_order(order_id)
+        return await self.api_client.delete(f'/ordenes_produccion/{order_id}')
     
     def validate_production_order_data(self, data):
         errors = {}
@@ -1,5 +1,5 @@
 from typing import List, Dict, Any, Optional
-from models.sales_model import ProductionRecipe
+from models.production_recipe_model import ProductionRecipe
 
 class ProductionRecipeController:
     """Controlador para gestionar recetas de producción"""
@@ -1,11 +1,19 @@
+import time
+STARTED = time.time()  # Inicio del intérprete, para medir el arranque (utils/startup_probe.py)
+
 import sys
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from views.main_window import MainWindow
 from views.login_view import LoginView
+from views.view_registry import prefetch
 from utils.api_client import ApiClient
+from utils.startup_probe import StartupProbe
 from utils.theme import Theme
 
+# Milisegundos tras mostrar el login antes de precargar el dashboard en segundo plano
+DASHBOARD_PREFETCH_DELAY = 200
+
 class ERP_Pirelli(QApplication):
     """Aplicación principal del ERP de Pirelli"""
     
@@ -22,12 +30,22 @@ class ERP_Pirelli(QApplication):
         # Ventana principal (se mostrará después del login)
         self.main_window = None
         
+        # Medición del arranque (solo con ERP_STARTUP_PROBE definida)
+        self.startup_probe = StartupProbe.from_env()
+        
         # Ventana de login (primera en mostrarse)
         self.login_view = LoginView(self.api_client)
         self.login_view.login_successful.connect(self.on_login_successful)
+        if self.startup_probe:
+            self.startup_probe.mark("python", STARTED)
+            self.startup_probe.watch(self.login_view, "login")
+            self.startup_probe.finished.connect(self.quit_after_probe)
         
         # Mostrar ventana de login
         self.login_view.show()
+        
+        # Mientras se escriben las credenciales se importa el dashboard (QtCharts)
+        QTimer.singleShot(DASHBOARD_PREFETCH_DELAY, lambda: prefetch(["dashboard"]))
     
     def on_login_successful(self, user_data):
         """Maneja el evento de inicio de sesión exitoso"""
@@ -37,8 +55,17 @@ class ERP_Pirelli(QApplication):
         # Crear y mostrar la ventana principal
         self.main_window = MainWindow(self.api_client, user_data)
         self.main_window.logout_requested.connect(self.on_logout_requested)
+        if self.startup_probe:
+            self.startup_probe.watch(self.main_window.dashboard_view, "dashboard")
         self.main_window.show()
     
+    def quit_after_probe(self):
+        """Termina tras la medición del arranque sin dejar peticiones en curso"""
+        self.api_client.changes.stop()
+        self.api_client.pool.cancel_all()
+        self.api_client.pool.wait()
+        self.exit(0)
+    
     def on_logout_requested(self):
         """Maneja el evento de cierre de sesión"""
         # Cerrar la ventana principal
@@ -1,5 +1,71 @@
+import os
+import threading
 import requests
 from PyQt6.QtCore import QObject, pyqtSignal
+from app_config import AppConfig
+from utils.async_requests import RequestPool, run_coroutine
+from utils.response_cache import ResponseCache
+from utils.lookup_service import DimensionLookup
+from utils.change_feed import ChangeSubscriber, TABLE_RESOURCES
+
+# Recurso de importación -> ruta del listado correspondiente en el API
+IMPORT_RESOURCE_PATHS = {
+    "materiales": "materiales",
+    "inventario": "inventario",
+    "productos": "products",
+    "clientes": "clientes",
+}
+
+
+class TimeoutSession(requests.Session):
+    """
+    Sesión HTTP que aplica un timeout por defecto a las peticiones que no lo
+    indican y, si se le asigna una ResponseCache, sirve los GET desde caché
+    """
+
+    def __init__(self, timeout, cache=None):
+        super().__init__()
+        self.timeout = timeout
+        self.cache = cache
+        # Funciones a las que se avisa (con la URL) tras cada escritura correcta
+        self.write_listeners = []
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        if method.upper() != "GET":
+            response = super().request(method, url, **kwargs)
+            if response.status_code < 400:
+                if self.cache is not None:
+                    self.cache.invalidate(url)
+                for listener in self.write_listeners:
+                    listener(url)
+            return response
+
+        if self.cache is None:
+            return super().request(method, url, **kwargs)
+
+        if not self.cache.cacheable(url):
+            return super().request(method, url, **kwargs)
+
+        key = self.cache.key(url, kwargs.get("params"))
+        cached, fresh = self.cache.lookup(key)
+        if fresh:
+            return cached
+        if cached is not None:
+            # Entrada caducada con ETag/Last-Modified: petición condicional
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.update(self.cache.validators(cached))
+            response = super().request(method, url, headers=headers, **kwargs)
+            if response.status_code == 304:
+                self.cache.renew(key)
+                return cached
+        else:
+            response = super().request(method, url, **kwargs)
+
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
 
 class ApiClient(QObject):
     """
@@ -17,12 +83,59 @@ class ApiClient(QObject):
         super().__init__()
         self.base_url = base_url.rstrip("/")
         self.token = None
-        self.session = requests.Session()
+        self.session = TimeoutSession(AppConfig.API_TIMEOUT)
+        if AppConfig.CACHE_ENABLED:
+            self.session.cache = ResponseCache(
+                self.base_url, AppConfig.CACHE_TIMEOUT, AppConfig.CACHE_MAX_BYTES
+            )
+        # Registros de dimensión (proveedores, materiales...) para enriquecer listados
+        self.lookups = DimensionLookup(
+            self.session, self.base_url, AppConfig.CACHE_TIMEOUT if AppConfig.CACHE_ENABLED else 0
+        )
+        self.session.write_listeners.append(self.lookups.invalidate)
+        # Peticiones en segundo plano para no bloquear el hilo de la interfaz.
+        # requests.Session no admite uso concurrente: cada hilo del pool usa la
+        # suya, con copia de las cabeceras y cookies de self.session
+        self.pool = RequestPool(AppConfig.API_MAX_CONCURRENT_REQUESTS)
+        # Por identificador de hilo: threading.local no persiste entre tareas de QThreadPool
+        self._thread_sessions = {}
+        self._thread_sessions_lock = threading.Lock()
+        self._share_credentials()
+        # Cambios hechos por otros usuarios, recibidos en tiempo real
+        self.changes = ChangeSubscriber(self.base_url, self.session.cookies, self)
+        self.changes.changes_received.connect(self._on_changes)
     
     def set_auth_header(self):
         """Configura el encabezado de autorización con el token JWT si existe"""
         if self.token:
             self.session.headers.update({'Authorization': f'Bearer {self.token}'})
+        self._share_credentials()
+
+    def _share_credentials(self):
+        """Copia las cabeceras y cookies actuales para las sesiones de los hilos del pool"""
+        self._credentials = (dict(self.session.headers), self.session.cookies.copy())
+
+    def _thread_session(self):
+        """Sesión HTTP del hilo actual: la principal en el hilo de la interfaz, una propia en el pool"""
+        if threading.current_thread() is threading.main_thread():
+            return self.session
+        with self._thread_sessions_lock:
+            entry = self._thread_sessions.get(threading.get_ident())
+            if entry is None:
+                session = TimeoutSession(self.session.timeout, self.session.cache)
+                session.write_listeners = self.session.write_listeners
+                entry = self._thread_sessions[threading.get_ident()] = [session, None]
+        session, copied = entry
+        credentials = self._credentials
+        if copied is not credentials:
+            # Tras iniciar o cerrar sesión se vuelven a copiar
+            headers, cookies = credentials
+            session.headers.clear()
+            session.headers.update(headers)
+            session.cookies.clear()
+            session.cookies.update(cookies)
+            entry[1] = credentials
+        return session
     
     # --- AUTENTICACIÓN Y USUARIOS ---
     def login(self, email, password):
@@ -37,6 +150,9 @@ class ApiClient(QObject):
                 data = response.json()
                 self.token = data.get('token')
                 self.set_auth_header()
+                self.clear_cache()
+                if AppConfig.LIVE_UPDATES_ENABLED:
+                    self.changes.start()
                 self.login_success.emit(data)
                 return data
             else:
@@ -50,6 +166,9 @@ class ApiClient(QObject):
     
     def logout(self):
         """Cierra la sesión y limpia el token"""
+        self.pool.cancel_all()
+        self.changes.stop()
+        self.clear_cache()
         try:
             if self.token:
                 response = self.session.post(f"{self.base_url}/logout")
@@ -60,6 +179,8 @@ class ApiClient(QObject):
         except Exception as e:
             self.request_error.emit(f"Error al cerrar sesión: {str(e)}")
             return False
+        finally:
+            self._share_credentials()
     
     def get_user_info(self):
         """Obtiene información del usuario actual"""
@@ -218,6 +339,271 @@ class ApiClient(QObject):
             self.request_error.emit(f"Error al eliminar producto: {str(e)}")
             return None
     
+    def clear_cache(self):
+        """Vacía la caché de respuestas (p. ej. al cambiar de usuario)"""
+        if self.session.cache is not None:
+            self.session.cache.clear()
+        self.lookups.clear()
+
+    def _on_changes(self, changes):
+        """Descarta las respuestas guardadas de las tablas que otro usuario modificó"""
+        for table in {change["tabla"] for change in changes}:
+            for resource in TABLE_RESOURCES.get(table, ()):
+                url = f"{self.base_url}/{resource}"
+                if self.session.cache is not None:
+                    self.session.cache.invalidate(url)
+                self.lookups.invalidate(url)
+
+    def lookup_many(self, dimension, ids):
+        """
+        Obtiene por lotes registros de una dimensión ("suppliers", "materials",
+        "products" o "employees") con una sola petición para los IDs no cacheados
+
+        Returns:
+            dict: ID -> registro (o None); vacío si la petición falla
+        """
+        try:
+            return self.lookups.get_many(dimension, ids)
+        except Exception as e:
+            self.request_error.emit(f"Error al obtener {dimension}: {str(e)}")
+            return {}
+
+    def _fill_names(self, items, dimension, id_field, name_field):
+        """Completa name_field en los elementos que no lo traen, con una petición por lotes"""
+        pending = [item for item in items if not item.get(name_field) and item.get(id_field)]
+        if not pending:
+            return
+        records = self.lookup_many(dimension, [item[id_field] for item in pending])
+        for item in pending:
+            record = records.get(int(item[id_field]))
+            if record:
+                item[name_field] = record.get("nombre", "")
+
+    # --- PETICIONES EN SEGUNDO PLANO ---
+    def _send(self, method, path, timeout=None, **kwargs):
+        """
+        Realiza una petición y devuelve el JSON de la respuesta.
+        Se ejecuta en un hilo del pool, por lo que no emite señales.
+        """
+        response = self._thread_session().request(
+            method, f"{self.base_url}{path}", timeout=timeout or AppConfig.API_TIMEOUT, **kwargs
+        )
+        if response.status_code >= 400:
+            raise Exception(f"{response.status_code} {self._error_message(response)}")
+        return response.json() if response.content else {}
+
+    @staticmethod
+    def _error_message(response):
+        """Mensaje de error del JSON de la respuesta, o su texto si no lo trae"""
+        try:
+            return response.json().get("error", response.text)
+        except Exception:
+            return response.text
+
+    def request_async(self, method, path, key=None, timeout=None, **kwargs):
+        """
+        Ejecuta una petición en segundo plano
+
+        Args:
+            method: Método HTTP ("GET", "POST"...)
+            path: Ruta relativa a base_url, con barra inicial (p. ej. "/clientes")
+            key: Clave opcional; una petición nueva con la misma clave cancela la anterior
+            timeout: Timeout en segundos (por defecto AppConfig.API_TIMEOUT)
+            **kwargs: Argumentos de requests (params, json...)
+
+        Returns:
+            ApiFuture: Su resultado es el JSON de la respuesta, o None si falla
+            (en ese caso además se emite request_error)
+        """
+        def report_error(f):
+            if f.error():
+                self.request_error.emit(f"Error en {method} {path}: {f.error()}")
+
+        future = self.pool.submit(self._send, method, path, timeout, key=key, **kwargs)
+        future.add_done_callback(report_error)
+        return future
+
+    def get(self, path, params=None, **kwargs):
+        """GET en segundo plano; se puede esperar con await desde los controladores"""
+        return self.request_async("GET", path, params=params, **kwargs)
+
+    def post(self, path, json=None, **kwargs):
+        """POST en segundo plano; se puede esperar con await desde los controladores"""
+        return self.request_async("POST", path, json=json, **kwargs)
+
+    def put(self, path, json=None, **kwargs):
+        """PUT en segundo plano; se puede esperar con await desde los controladores"""
+        return self.request_async("PUT", path, json=json, **kwargs)
+
+    def delete(self, path, **kwargs):
+        """DELETE en segundo plano; se puede esperar con await desde los controladores"""
+        return self.request_async("DELETE", path, **kwargs)
+
+    def run(self, coro, callback=None):
+        """Ejecuta una corrutina de un controlador sin bloquear la interfaz"""
+        run_coroutine(coro, callback)
+
+    def fetch_async(self, data_type, path, params=None, timeout=None):
+        """
+        GET en segundo plano que publica el resultado por data_received como
+        {"type": data_type, "data": ...}. Una nueva petición del mismo tipo
+        cancela la anterior, que ya no emitirá nada.
+        """
+        def publish(f):
+            if not f.cancelled() and f.error() is None:
+                self.data_received.emit({"type": data_type, "data": f.result()})
+
+        future = self.request_async("GET", path, key=data_type, timeout=timeout, params=params)
+        future.add_done_callback(publish)
+        return future
+
+    # --- PLANIFICACIÓN DE MATERIALES ---
+    def get_mrp_plan_async(self, periodo="semana", hasta=None, solo_faltantes=False):
+        """
+        Calcula en segundo plano el plan de necesidades de materiales (/mrp/plan)
+
+        Returns:
+            ApiFuture: Su resultado es el plan (periodos y materiales con sus
+            necesidades, recepciones y faltantes por periodo), o None si falla
+        """
+        params = {"periodo": periodo, "solo_faltantes": "1" if solo_faltantes else "0"}
+        if hasta:
+            params["hasta"] = hasta
+        return self.get("/mrp/plan", params=params, key="mrp_plan")
+
+    def get_schedule_async(self, desde=None, hasta=None):
+        """
+        Obtiene en segundo plano la programación de la producción (/programacion)
+        de la ventana de fechas indicada
+
+        Returns:
+            ApiFuture: Su resultado es el plan por activo (órdenes asignadas y
+            días de mantenimiento), o None si falla
+        """
+        params = {key: value for key, value in (("desde", desde), ("hasta", hasta)) if value}
+        return self.get("/programacion", params=params, key="programacion")
+
+    # --- IMPORTACIÓN MASIVA ---
+    def get_import_specs(self):
+        """Recursos importables con sus columnas obligatorias y opcionales"""
+        try:
+            response = self.session.get(f"{self.base_url}/importar")
+            if response.status_code == 200:
+                return response.json()
+            self.request_error.emit(f"Error al obtener los recursos importables: {response.status_code}")
+            return None
+        except Exception as e:
+            self.request_error.emit(f"Error al obtener los recursos importables: {str(e)}")
+            return None
+
+    def import_file_async(self, resource, file_path):
+        """
+        Sube un archivo CSV/XLSX a /importar/<resource> en segundo plano
+
+        Returns:
+            ApiFuture: Su resultado es el resumen de la importación (filas
+            importadas y errores por línea), o None si falla
+        """
+        def upload():
+            with open(file_path, "rb") as f:
+                result = self._send("POST", f"/importar/{resource}", AppConfig.IMPORT_TIMEOUT,
+                                    files={"archivo": (os.path.basename(file_path), f)})
+            # La escritura fue sobre /importar: se descartan también las copias del recurso importado
+            url = f"{self.base_url}/{IMPORT_RESOURCE_PATHS.get(resource, resource)}"
+            if self.session.cache is not None:
+                self.session.cache.invalidate(url)
+            self.lookups.invalidate(url)
+            return result
+
+        def report_error(f):
+            if f.error():
+                self.request_error.emit(f"Error al importar {resource}: {f.error()}")
+
+        future = self.pool.submit(upload, key=f"importar:{resource}")
+        future.add_done_callback(report_error)
+        return future
+
+    # --- EXPORTACIÓN EN STREAMING ---
+    def export_to_file_async(self, resource, file_path, formato="csv", **params):
+        """
+        Descarga /export/<resource> en segundo plano escribiendo directamente en disco
+
+        Args:
+            resource: ventas, detalle_ventas, asistencia o nominas
+            file_path: Archivo de destino (se escribe primero en <file_path>.part)
+            formato: "csv" o "ndjson"
+            **params: Filtros del API (desde, hasta, estado, fields...)
+
+        Returns:
+            ApiFuture: Su resultado es {"archivo", "bytes"}, o None si falla
+        """
+        def download():
+            query = {"formato": formato, **{k: v for k, v in params.items() if v}}
+            with self._thread_session().get(f"{self.base_url}/export/{resource}", params=query,
+                                            stream=True, timeout=AppConfig.EXPORT_TIMEOUT) as response:
+                if response.status_code >= 400:
+                    try:
+                        error_msg = response.json().get("error", response.text)
+                    except Exception:
+                        error_msg = response.text
+                    raise Exception(f"{response.status_code} {error_msg}")
+                partial_path = f"{file_path}.part"
+                written = 0
+                try:
+                    with open(partial_path, "wb") as f:
+                        for chunk in response.iter_content(chunk_size=64 * 1024):
+                            f.write(chunk)
+                            written += len(chunk)
+                except Exception:
+                    if os.path.exists(partial_path):
+                        os.remove(partial_path)
+                    raise
+            os.replace(partial_path, file_path)
+            return {"archivo": file_path, "bytes": written}
+
+        def report_error(f):
+            if f.error():
+                self.request_error.emit(f"Error al exportar {resource}: {f.error()}")
+
+        future = self.pool.submit(download, key=f"exportar:{resource}")
+        future.add_done_callback(report_error)
+        return future
+
+    # --- LISTADOS PAGINADOS ---
+    def get_page(self, endpoint, cursor=None, limit=200, **params):
+        """
+        Pide en segundo plano una página de un listado paginado por cursor
+
+        Args:
+            endpoint: Ruta del listado relativa a base_url (p. ej. "ventas")
+            cursor: Cursor devuelto por la página anterior (None para la primera)
+            limit: Número máximo de registros de la página
+            **params: Filtros y proyección admitidos por el listado (estado, fields, desde...)
+
+        Returns:
+            ApiFuture: Su resultado es (lista de registros, cursor de la página
+            siguiente o None), o None si la petición falla (en ese caso además
+            se emite request_error)
+        """
+        query = {key: value for key, value in params.items() if value}
+        query["limit"] = limit
+        if cursor:
+            query["cursor"] = cursor
+
+        def fetch():
+            response = self._thread_session().get(f"{self.base_url}/{endpoint}", params=query)
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} {self._error_message(response)}")
+            return response.json(), response.headers.get("X-Next-Cursor")
+
+        def report_error(f):
+            if f.error():
+                self.request_error.emit(f"Error al obtener {endpoint}: {f.error()}")
+
+        future = self.pool.submit(fetch)
+        future.add_done_callback(report_error)
+        return future
+
     # --- VENTAS (CRUD) ---
     def get_sales(self):
         """Obtiene la lista de ventas"""
@@ -279,6 +665,29 @@ class ApiClient(QObject):
             self.request_error.emit(f"Error al crear venta: {str(e)}")
             return None
     
+    def create_sales_batch(self, sales):
+        """
+        Crea varias ventas en una sola petición (POST /ventas/batch)
+
+        Returns:
+            dict: Resumen con el resultado de cada venta (id_venta o error), o None
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/ventas/batch",
+                json={"ventas": sales}
+            )
+            if response.status_code in [201, 400] and "resultados" in response.json():
+                result = response.json()
+                self.request_success.emit("create_sales_batch", result)
+                return result
+            error_msg = response.json().get("error", response.text)
+            self.request_error.emit(f"Error al crear ventas: {error_msg}")
+            return None
+        except Exception as e:
+            self.request_error.emit(f"Error al crear ventas: {str(e)}")
+            return None
+    
     def update_sale(self, sale_id, sale_data):
         """Actualiza una venta existente"""
         try:
@@ -331,6 +740,13 @@ class ApiClient(QObject):
             self.request_error.emit(f"Error de conexión al dashboard: {str(e)}")
             return None
     
+    def get_dashboard_data_async(self):
+        """
+        Igual que get_dashboard_data pero sin bloquear la interfaz: el resultado
+        llega por data_received ({"type": "dashboard", ...}) o request_error.
+        """
+        return self.fetch_async("dashboard", "/dashboard")
+
     # --- EMPLEADOS (CRUD) ---
     def get_employees(self):
         """Obtiene la lista de empleados"""
@@ -838,6 +1254,37 @@ class ApiClient(QObject):
             self.request_error.emit(f"Error al eliminar nómina: {str(e)}")
             return None
 
+    def start_payroll_run_async(self, periodo, fecha_pago=None, reemplazar=False):
+        """
+        Lanza en el servidor el cálculo de la nómina de todos los empleados
+        activos del periodo (YYYY-MM)
+
+        Returns:
+            ApiFuture: Su resultado es el proceso creado ({"id_proceso", "estado",
+            "progreso"...}), o None si falla (p. ej. si ya hay uno en curso)
+        """
+        data = {"periodo": periodo, "reemplazar": reemplazar}
+        if fecha_pago:
+            data["fecha_pago"] = fecha_pago
+        return self.post("/payroll-runs", json=data)
+
+    def get_payroll_run_async(self, run_id):
+        """
+        Consulta el progreso de un cálculo de nómina. Cuando el proceso termina
+        se descartan las nóminas guardadas en caché.
+
+        Returns:
+            ApiFuture: Su resultado es el estado del proceso, o None si falla
+        """
+        def invalidate(f):
+            result = f.result()
+            if result and result.get("estado") == "completado" and self.session.cache is not None:
+                self.session.cache.invalidate(f"{self.base_url}/payroll")
+
+        future = self.get(f"/payroll-runs/{run_id}", key="payroll_run")
+        future.add_done_callback(invalidate)
+        return future
+
     # === MÉTODOS PARA INVENTARIO ===
     def get_inventory(self):
         """Obtiene la lista de items de inventario"""
@@ -1270,13 +1717,12 @@ class ApiClient(QObject):
                 # Adaptación de formato a frontend
                 orders = [self._backend_to_frontend_order(o) for o in data]
                 
-                # Enriquecimiento adicional de datos si es necesario
-                for order in orders:
-                    # Asegurar que todos los campos críticos estén presentes
-                    if not order.get("supplier_name") and order.get("supplier_id"):
-                        supplier = self.get_supplier(order["supplier_id"])
-                        if supplier:
-                            order["supplier_name"] = supplier.get("nombre", "")
+                # Completar nombres que falten (una petición por dimensión)
+                self._fill_names(orders, "suppliers", "supplier_id", "supplier_name")
+                self._fill_names(
+                    [d for order in orders for d in order.get("details", [])],
+                    "materials", "material_id", "material_name"
+                )
                 
                 self.data_received.emit({"type": "purchase_orders", "data": orders})
                 return orders
@@ -1307,28 +1753,17 @@ class ApiClient(QObject):
                 order = response.json()
                 converted_order = self._backend_to_frontend_order(order)
                 
-                # Enriquecer con información adicional si es necesario
-                if not converted_order.get("supplier_name") and converted_order.get("supplier_id"):
-                    supplier = self.get_supplier(converted_order["supplier_id"])
-                    if supplier:
-                        converted_order["supplier_name"] = supplier.get("nombre", "")
-                
-                # Enriquecer detalles con nombres de materiales si es necesario
-                for detail in converted_order.get("details", []):
-                    if not detail.get("material_name") and detail.get("material_id"):
-                        material = self.get_material(detail["material_id"])
-                        if material:
-                            detail["material_name"] = material.get("nombre", "")
+                # Completar nombres de proveedor y materiales que falten
+                self._fill_names([converted_order], "suppliers", "supplier_id", "supplier_name")
+                self._fill_names(converted_order.get("details", []), "materials", "material_id", "material_name")
                 
                 return converted_order
             else:
-                # Fallback: filtrar desde todas las órdenes
-                all_orders = self.get_purchase_orders()
-                for order in all_orders:
-                    if order.get('po_id') == order_id:
-                        return order
-                
-                self.request_error.emit(f"Error al obtener orden de compra: No se encontró la orden con ID {order_id}")
+                try:
+                    error_msg = response.json().get("error", response.text)
+                except Exception:
+                    error_msg = response.text
+                self.request_error.emit(f"Error al obtener orden de compra {order_id}: {response.status_code} {error_msg}")
                 return None
         except Exception as e:
             self.request_error.emit(f"Error al obtener orden de compra: {str(e)}")
@@ -1466,17 +1901,12 @@ class ApiClient(QObject):
                 data = response.json()
                 
                 # Convertir los detalles al formato frontend
-                converted_details = []
-                for detail in data:
-                    converted_detail = self._backend_to_frontend_detail(detail, 
-                                                                       is_spanish="id_detalle" in detail)
-                    # Enriquecer con información adicional si es necesario
-                    if not converted_detail.get("material_name") and converted_detail.get("material_id"):
-                        material = self.get_material(converted_detail["material_id"])
-                        if material:
-                            converted_detail["material_name"] = material.get("nombre", "")
-                    
-                    converted_details.append(converted_detail)
+                converted_details = [
+                    self._backend_to_frontend_detail(detail, is_spanish="id_detalle" in detail)
+                    for detail in data
+                ]
+                # Completar nombres de materiales que falten (una sola petición)
+                self._fill_names(converted_details, "materials", "material_id", "material_name")
                 
                 self.data_received.emit({"type": "purchase_order_details", "data": converted_details})
                 return converted_details
@@ -1509,11 +1939,8 @@ class ApiClient(QObject):
                 converted_detail = self._backend_to_frontend_detail(detail, 
                                                                   is_spanish="id_detalle" in detail)
                 
-                # Enriquecer con información adicional si es necesario
-                if not converted_detail.get("material_name") and converted_detail.get("material_id"):
-                    material = self.get_material(converted_detail["material_id"])
-                    if material:
-                        converted_detail["material_name"] = material.get("nombre", "")
+                # Completar el nombre del material si falta
+                self._fill_names([converted_detail], "materials", "material_id", "material_name")
                 
                 return converted_detail
             else:
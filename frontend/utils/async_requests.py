@@ -0,0 +1,211 @@
+"""
+Ejecución de peticiones al API en segundo plano
+"""
+
+import logging
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+
+class ApiFuture(QObject):
+    """
+    Resultado pendiente de una petición que se ejecuta en el pool de hilos.
+
+    Se completa siempre en el hilo de la interfaz, por lo que los callbacks
+    pueden tocar widgets. Puede esperarse con `await` dentro de una corrutina
+    ejecutada con run_coroutine.
+    """
+
+    def __init__(self, key=None):
+        super().__init__()
+        self.key = key
+        self._done = False
+        self._cancelled = False
+        self._result = None
+        self._error = None
+        self._callbacks = []
+        self._worker = None
+        self._released = None
+
+    def done(self):
+        return self._done
+
+    def cancelled(self):
+        return self._cancelled
+
+    def result(self):
+        """Datos devueltos por la petición, o None si falló o se canceló"""
+        return self._result
+
+    def error(self):
+        """Mensaje de error de la petición, o None si terminó bien"""
+        return self._error
+
+    def cancel(self):
+        """Marca la petición como cancelada; su resultado se descarta"""
+        if self._done:
+            return False
+        self._cancelled = True
+        self._complete(None, None)
+        return True
+
+    def add_done_callback(self, callback):
+        """Llama a callback(future) al completarse (o de inmediato si ya terminó)"""
+        if self._done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def __await__(self):
+        if not self._done:
+            yield self
+        return self._result
+
+    @pyqtSlot(object, object)
+    def _worker_finished(self, result, error):
+        # El worker terminó: se libera aunque la petición ya se hubiera cancelado
+        self._worker = None
+        if self._released:
+            self._released(self)
+        self._complete(result, error)
+
+    def _complete(self, result, error):
+        if self._done:
+            return
+        self._done = True
+        if not self._cancelled:
+            self._result = result
+            self._error = error
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logger.exception("Error en el callback de la petición %s", self.key)
+
+
+def run_coroutine(coro, callback=None):
+    """
+    Ejecuta una corrutina que espera ApiFuture sin bloquear la interfaz.
+
+    Cada `await` sobre una petición suspende la corrutina hasta que la
+    petición se completa; la corrutina continúa en el hilo de la interfaz con
+    el resultado. Si la petición se cancela, la corrutina se cierra.
+
+    Args:
+        coro: Corrutina (p. ej. un método async def de un controlador)
+        callback: Función opcional que recibe el valor devuelto por la corrutina
+    """
+    def step(value=None):
+        try:
+            future = coro.send(value)
+        except StopIteration as stop:
+            if callback:
+                callback(stop.value)
+            return
+        except Exception:
+            logger.exception("Error en la corrutina %r", coro)
+            return
+        if not isinstance(future, ApiFuture):
+            coro.close()
+            raise TypeError("run_coroutine solo admite await sobre peticiones ApiFuture")
+        future.add_done_callback(resume)
+
+    def resume(future):
+        if future.cancelled():
+            coro.close()
+        else:
+            step(future.result())
+
+    step()
+
+
+class _WorkerSignals(QObject):
+    finished = pyqtSignal(object, object)  # resultado, mensaje de error
+
+
+class _Worker(QRunnable):
+    """Ejecuta una función en un hilo del pool y publica su resultado"""
+
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.finished.emit(None, str(e))
+        else:
+            self.signals.finished.emit(result, None)
+
+
+class RequestPool:
+    """
+    Pool de hilos con concurrencia limitada para las peticiones al API.
+
+    Las peticiones enviadas con la misma clave se reemplazan: al enviar una
+    nueva, la anterior se cancela (se retira de la cola si aún no empezó, o
+    se descarta su resultado si ya estaba en curso).
+    """
+
+    def __init__(self, max_workers=4):
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_workers)
+        # Los hilos no caducan: cada uno conserva su sesión HTTP y sus conexiones
+        self._pool.setExpiryTimeout(-1)
+        self._latest = {}
+        # Peticiones cuyo worker sigue vivo; mantiene las referencias hasta que termina
+        self._active = set()
+
+    def submit(self, fn, *args, key=None, **kwargs):
+        """
+        Ejecuta fn(*args, **kwargs) en segundo plano
+
+        Returns:
+            ApiFuture: Se completa con el valor devuelto por fn o con su error
+        """
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                self.cancel(previous)
+
+        future = ApiFuture(key)
+        worker = _Worker(fn, args, kwargs)
+        worker.signals.finished.connect(future._worker_finished)
+        future._worker = worker
+        future._released = self._active.discard
+        self._active.add(future)
+        if key is not None:
+            self._latest[key] = future
+            future.add_done_callback(self._forget)
+
+        self._pool.start(worker)
+        return future
+
+    def cancel(self, future):
+        """Cancela una petición pendiente o en curso"""
+        worker = future._worker
+        if worker is not None and self._pool.tryTake(worker):
+            # No llegó a empezar: no habrá señal del worker
+            future._worker = None
+            self._active.discard(future)
+        return future.cancel()
+
+    def cancel_all(self):
+        """Cancela todas las peticiones pendientes o en curso"""
+        for future in list(self._active):
+            self.cancel(future)
+
+    def wait(self, msecs=-1):
+        """Espera a que terminen los hilos en curso (p. ej. al cerrar la aplicación)"""
+        return self._pool.waitForDone(msecs)
+
+    def _forget(self, future):
+        if self._latest.get(future.key) is future:
+            del self._latest[future.key]
@@ -0,0 +1,192 @@
+"""
+Suscripción al canal de cambios del servidor (Server-Sent Events)
+"""
+
+import json
+import logging
+import threading
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+# Tabla de la base de datos -> rutas del API cuyas respuestas dependen de ella
+TABLE_RESOURCES = {
+    "ventas": ("ventas",),
+    "detalle_ventas": ("sales-details", "ventas"),
+    "clientes": ("clientes", "ventas"),
+    "productos": ("products",),
+    "inventario": ("inventario",),
+    "materiales": ("materiales", "inventario"),
+    "proveedores": ("proveedores",),
+    "ordenes_compra": ("ordenes_compra",),
+    "detalle_ordenes_compra": ("ordenes_compra_detalle", "ordenes_compra"),
+    "ordenes_produccion": ("ordenes_produccion",),
+    "recetas_produccion": ("production_recipes",),
+    "control_calidad": ("quality_control",),
+    "empleados": ("employees",),
+    "asistencia": ("attendance",),
+    "nominas": ("payroll",),
+    "areas_trabajo": ("work_areas",),
+    "mantenimiento": ("maintenance",),
+    "activos_produccion": ("production_assets",),
+    "incidentes": ("incidents",),
+    "normativas_legales": ("legal_regulations",),
+    "proyectos_i_d": ("r_d_projects",),
+    "configuracion_sistema": ("system_configuration",),
+    "usuarios": ("users",),
+}
+
+# Segundos sin datos tras los que se da la conexión por perdida (el servidor
+# envía un keep-alive cada 15 s)
+READ_TIMEOUT = 45
+RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+
+
+class _Unavailable(Exception):
+    """El servidor rechazó la conexión (503) e indicó cuándo reintentar"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"503, reintento en {retry_after} s")
+        self.retry_after = retry_after
+
+
+class ChangeSubscriber(QObject):
+    """
+    Mantiene abierta la conexión a /cambios en un hilo propio y reparte los
+    cambios recibidos, ya en el hilo de la interfaz, a los suscriptores de
+    cada tabla.
+
+    Cada cambio es un dict {"tabla", "op", "id", "campos"?} con op igual a
+    "insert", "update", "delete" o "bulk" (escritura masiva sin clave; el
+    suscriptor debe recargar). Si el servidor indica que se perdieron
+    cambios, todos los suscriptores reciben un cambio "bulk".
+    """
+
+    # Lote de cambios recibido (se emite antes de avisar a los suscriptores)
+    changes_received = pyqtSignal(list)
+    _batch = pyqtSignal(list)
+
+    def __init__(self, base_url, cookies, parent=None):
+        super().__init__(parent)
+        self.url = f"{base_url.rstrip('/')}/cambios"
+        self.cookies = cookies
+        self._subscribers = []
+        self._thread = None
+        self._stop = threading.Event()
+        self._response = None
+        self._last_id = None
+        self._batch.connect(self._dispatch)
+
+    def subscribe(self, tables, callback, owner=None):
+        """
+        Llama a callback(cambios) con los cambios de las tablas indicadas
+
+        Args:
+            owner: QObject opcional; la suscripción se cancela al destruirse
+        """
+        self._subscribers.append((frozenset(tables), callback))
+        if owner is not None:
+            owner.destroyed.connect(lambda: self.unsubscribe(callback))
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(t, cb) for t, cb in self._subscribers if cb != callback]
+
+    def start(self):
+        """Abre la conexión en segundo plano (si no está ya abierta)"""
+        if self._thread is not None and self._thread.is_alive() and not self._stop.is_set():
+            return
+        # Cada hilo tiene su propio evento de parada: un hilo que aún está
+        # cerrándose no impide abrir la nueva conexión
+        self._stop = threading.Event()
+        self._last_id = None
+        self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                        name="change-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Cierra la conexión; los cambios posteriores ya no se reciben"""
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+
+    # --- Hilo de lectura ---
+
+    def _run(self, stop):
+        attempt = 0
+        while not stop.is_set():
+            try:
+                self._listen(stop)
+                attempt = 0
+            except _Unavailable as e:
+                # Servidor sin puestos libres para el canal: se espera lo que indica
+                logger.info("Canal de cambios no disponible; reintento en %s s", e.retry_after)
+                stop.wait(e.retry_after)
+                continue
+            except Exception as e:
+                if stop.is_set():
+                    break
+                logger.info("Canal de cambios desconectado: %s", e)
+            delay = RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)]
+            attempt += 1
+            stop.wait(delay)
+
+    def _listen(self, stop):
+        headers = {"Accept": "text/event-stream"}
+        if self._last_id is not None:
+            headers["Last-Event-ID"] = self._last_id
+        with requests.get(self.url, headers=headers, cookies=self.cookies,
+                          stream=True, timeout=(5, READ_TIMEOUT)) as response:
+            if response.status_code == 503:
+                try:
+                    raise _Unavailable(int(response.headers.get("Retry-After", "")))
+                except ValueError:
+                    raise _Unavailable(RECONNECT_DELAYS[-1])
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} {response.text[:200]}")
+            self._response = response
+            event_type, data = None, []
+            for line in response.iter_lines(decode_unicode=True):
+                if stop.is_set():
+                    return
+                if line is None:
+                    continue
+                if not line:
+                    # Línea vacía: fin del evento
+                    self._handle(event_type, "\n".join(data))
+                    event_type, data = None, []
+                elif line.startswith(":"):
+                    continue  # Comentario (keep-alive)
+                else:
+                    field, _, value = line.partition(":")
+                    value = value[1:] if value.startswith(" ") else value
+                    if field == "id":
+                        self._last_id = value
+                    elif field == "event":
+                        event_type = value
+                    elif field == "data":
+                        data.append(value)
+        self._response = None
+
+    def _handle(self, event_type, data):
+        if event_type == "cambios":
+            try:
+                self._batch.emit(json.loads(data)["cambios"])
+            except (ValueError, KeyError):
+                logger.warning("Evento de cambios inválido: %r", data[:200])
+        elif event_type == "reinicio":
+            self._batch.emit([{"tabla": table, "op": "bulk"} for table in TABLE_RESOURCES])
+
+    # --- Hilo de la interfaz ---
+
+    @pyqtSlot(list)
+    def _dispatch(self, changes):
+        self.changes_received.emit(changes)
+        for tables, callback in list(self._subscribers):
+            selected = [change for change in changes if change["tabla"] in tables]
+            if selected:
+                try:
+                    callback(selected)
+                except Exception:
+                    logger.exception("Error al aplicar cambios de %s", sorted(tables))
@@ -0,0 +1,103 @@
+"""
+Consulta por lotes de dimensiones (proveedores, materiales, productos y empleados)
+"""
+
+import threading
+import time
+
+# Dimensión -> (recurso del API, clave primaria del registro)
+DIMENSIONS = {
+    "suppliers": ("proveedores", "id_proveedor"),
+    "materials": ("materiales", "id_material"),
+    "products": ("products", "id_producto"),
+    "employees": ("employees", "id_empleado"),
+}
+
+
+class DimensionLookup:
+    """
+    Caché local de registros de dimensión por ID.
+
+    Los IDs que faltan se piden todos juntos con ?ids=1,2,3, de modo que
+    enriquecer un listado cuesta como mucho una petición por dimensión.
+    Las entradas caducan a los `ttl` segundos y se descartan cuando el
+    cliente escribe en el recurso correspondiente.
+    """
+
+    def __init__(self, session, base_url, ttl):
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self._records = {dimension: {} for dimension in DIMENSIONS}
+        self._lock = threading.Lock()
+
+    def get_many(self, dimension, ids):
+        """
+        Devuelve los registros de los IDs indicados
+
+        Returns:
+            dict: ID -> registro (dict) o None si no existe
+
+        Raises:
+            Exception: Si la petición de los IDs que faltan falla
+        """
+        ids = {int(i) for i in ids if i not in (None, "")}
+        found, missing = self._cached(dimension, ids)
+        if missing:
+            found.update(self._fetch(dimension, missing))
+        return found
+
+    def get(self, dimension, record_id):
+        """Registro de un único ID (o None)"""
+        if record_id in (None, ""):
+            return None
+        return self.get_many(dimension, [record_id]).get(int(record_id))
+
+    def invalidate(self, url):
+        """Descarta la dimensión cuyo recurso coincide con una URL escrita"""
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        resource = path.lstrip("/").split("?")[0].split("/")[0]
+        with self._lock:
+            for dimension, (dimension_resource, _) in DIMENSIONS.items():
+                if dimension_resource == resource:
+                    self._records[dimension].clear()
+
+    def clear(self):
+        with self._lock:
+            for records in self._records.values():
+                records.clear()
+
+    def _cached(self, dimension, ids):
+        now = time.monotonic()
+        found, missing = {}, []
+        with self._lock:
+            records = self._records[dimension]
+            for record_id in ids:
+                entry = records.get(record_id)
+                if entry is not None and entry[0] > now:
+                    found[record_id] = entry[1]
+                else:
+                    missing.append(record_id)
+        return found, sorted(missing)
+
+    def _fetch(self, dimension, ids):
+        resource, pk = DIMENSIONS[dimension]
+        response = self.session.get(
+            f"{self.base_url}/{resource}", params={"ids": ",".join(map(str, ids))}
+        )
+        if response.status_code != 200:
+            try:
+                error_msg = response.json().get("error", response.text)
+            except Exception:
+                error_msg = response.text
+            raise Exception(f"{response.status_code} {error_msg}")
+
+        by_id = {record.get(pk): record for record in response.json()}
+        # Los IDs que no existen también se recuerdan para no volver a pedirlos
+        result = {record_id: by_id.get(record_id) for record_id in ids}
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            records = self._records[dimension]
+            for record_id, record in result.items():
+                records[record_id] = (expires_at, record)
+        return result
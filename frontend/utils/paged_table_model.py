@@ -0,0 +1,240 @@
+"""
+Modelo de tabla paginado con carga bajo demanda para los listados
+"""
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QColor
+
+
+class PagedColumn:
+    """
+    Definición de una columna del modelo paginado.
+
+    Args:
+        header: Título de la columna
+        extract: Función que obtiene el valor crudo a partir del registro del API
+        display: Función que convierte el valor crudo en el texto mostrado
+        align: Alineación del texto (Qt.AlignmentFlag)
+        color: Función que devuelve el color del texto para el valor crudo, o None
+    """
+
+    def __init__(self, header, extract, display=None, align=None, color=None):
+        self.header = header
+        self.extract = extract
+        self.display = display
+        self.align = align
+        self.color = color
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Modelo de solo lectura que carga un listado del API por páginas.
+
+    Los datos se guardan como una lista de valores crudos por columna (sin
+    QStandardItem por celda); el texto, la alineación y el color se calculan
+    al pintar. La vista pide la página siguiente mediante canFetchMore/fetchMore
+    cuando el usuario se desplaza hasta el final de las filas cargadas. Las
+    páginas se piden en segundo plano y las filas se insertan al llegar, sin
+    bloquear la interfaz mientras tanto.
+    """
+
+    # Emitida tras cargar una página: filas cargadas, si quedan más páginas
+    page_loaded = pyqtSignal(int, bool)
+    # Emitida si no se pudo cargar una página
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, columns, fetch_page, page_size=200, key_column=0, parent=None):
+        """
+        Args:
+            columns: Lista de PagedColumn
+            fetch_page: Función (cursor, limit, ids=None) -> ApiFuture cuyo resultado es
+                (registros, cursor siguiente), o None si la petición falla; con `ids`
+                devuelve solo esos registros (si cumplen los filtros actuales)
+            page_size: Número de filas por página
+            key_column: Columna con la clave primaria de cada registro
+        """
+        super().__init__(parent)
+        self._columns = columns
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._key_column = key_column
+        self._values = [[] for _ in columns]
+        self._next_cursor = None
+        self._has_more = True
+        self._loading = False
+        # Se incrementa al recargar: las respuestas de peticiones anteriores se descartan
+        self._generation = 0
+
+    # --- API de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._values[0]) if self._values else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self._columns[index.column()]
+        value = self._values[index.column()][index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column.display:
+                return column.display(value)
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column.align is not None:
+            return column.align
+        if role == Qt.ItemDataRole.ForegroundRole and column.color:
+            color = column.color(value)
+            return QColor(color) if color else None
+        if role == Qt.ItemDataRole.UserRole:
+            return value
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section].header
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        self._loading = True
+        generation = self._generation
+        try:
+            future = self._fetch_page(self._next_cursor, self._page_size)
+        except Exception as e:
+            self._loading = False
+            self._has_more = False
+            self.load_failed.emit(str(e))
+            return
+        future.add_done_callback(lambda f: self._page_arrived(f, generation))
+
+    def _page_arrived(self, future, generation):
+        """Añade al final las filas de la página recibida"""
+        if generation != self._generation:
+            return
+        self._loading = False
+
+        page = future.result()
+        if page is None:
+            self._has_more = False
+            if future.error():
+                self.load_failed.emit(future.error())
+            return
+
+        records, next_cursor = page
+        if records:
+            first = self.rowCount()
+            self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+            for values, column in zip(self._values, self._columns):
+                values.extend(column.extract(record) for record in records)
+            self.endInsertRows()
+
+        self._next_cursor = next_cursor
+        self._has_more = bool(next_cursor)
+        self.page_loaded.emit(self.rowCount(), self._has_more)
+
+    # --- Métodos propios ---
+
+    def reload(self):
+        """Descarta las filas cargadas y vuelve a pedir la primera página"""
+        self.beginResetModel()
+        self._generation += 1
+        self._values = [[] for _ in self._columns]
+        self._next_cursor = None
+        self._has_more = True
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def has_more(self):
+        """Indica si el servidor tiene más páginas por cargar"""
+        return self._has_more
+
+    def value(self, row, column):
+        """Valor crudo de una celda"""
+        return self._values[column][row]
+
+    def column_values(self, column):
+        """Valores crudos cargados de una columna"""
+        return self._values[column]
+
+    def find_row(self, column, value):
+        """Fila cargada cuyo valor en `column` es `value`, o -1 si no está"""
+        try:
+            return self._values[column].index(value)
+        except ValueError:
+            return -1
+
+    def apply_changes(self, changes):
+        """
+        Aplica a las filas cargadas los cambios recibidos del servidor
+
+        Las filas eliminadas se quitan; las insertadas o modificadas se vuelven
+        a pedir en segundo plano con los filtros actuales y, al llegar, se
+        sustituyen en su sitio (o se
+        quitan si ya no cumplen el filtro). Las nuevas se añaden al final solo
+        si ya estaban cargadas todas las páginas; si no, llegarán con su página.
+        Un cambio masivo sin clave recarga el listado.
+
+        Args:
+            changes: Lista de dicts {"op", "id"} de la tabla del listado
+        """
+        if any(change["op"] == "bulk" for change in changes):
+            self.reload()
+            return
+
+        deleted = {change["id"] for change in changes if change["op"] == "delete"}
+        changed = [change["id"] for change in changes
+                   if change["op"] != "delete" and change["id"] not in deleted]
+        changed = list(dict.fromkeys(changed))
+
+        for key in deleted:
+            self._remove_key(key)
+        if not changed:
+            self.page_loaded.emit(self.rowCount(), self._has_more)
+            return
+
+        generation = self._generation
+        future = self._fetch_page(None, len(changed), ids=changed)
+        future.add_done_callback(lambda f: self._changes_arrived(f, changed, generation))
+
+    def _changes_arrived(self, future, changed, generation):
+        """Sustituye, añade o quita las filas cambiadas según los registros recibidos"""
+        page = future.result()
+        if generation != self._generation or page is None:
+            return
+        key_extract = self._columns[self._key_column].extract
+        records = {key_extract(record): record for record in page[0]}
+
+        for key in set(changed) - set(records):
+            self._remove_key(key)
+
+        for key, record in records.items():
+            row = self.find_row(self._key_column, key)
+            if row >= 0:
+                for values, column in zip(self._values, self._columns):
+                    values[row] = column.extract(record)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._columns) - 1))
+            elif not self._has_more:
+                row = self.rowCount()
+                self.beginInsertRows(QModelIndex(), row, row)
+                for values, column in zip(self._values, self._columns):
+                    values.append(column.extract(record))
+                self.endInsertRows()
+
+        self.page_loaded.emit(self.rowCount(), self._has_more)
+
+    def _remove_key(self, key):
+        row = self.find_row(self._key_column, key)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            for values in self._values:
+                del values[row]
+            self.endRemoveRows()
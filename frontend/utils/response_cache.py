@@ -0,0 +1,136 @@
+"""
+Caché de respuestas GET del cliente API
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Recursos cuyas respuestas incluyen datos de otro recurso: una escritura en
+# la clave invalida también los recursos indicados
+RELATED_RESOURCES = {
+    "ventas": ("sales-details",),
+    "sales-details": ("ventas",),
+    "ordenes_compra": ("inventario",),
+}
+
+# Recursos calculados a partir de los demás: cualquier escritura los invalida
+DERIVED_RESOURCES = ("dashboard",)
+
+# Recursos que nunca se guardan en caché
+UNCACHED_RESOURCES = ("login", "logout")
+
+
+class _Entry:
+    __slots__ = ("response", "size", "expires_at", "resource")
+
+    def __init__(self, response, size, expires_at, resource):
+        self.response = response
+        self.size = size
+        self.expires_at = expires_at
+        self.resource = resource
+
+
+class ResponseCache:
+    """
+    Caché LRU con caducidad de respuestas GET, limitada en bytes.
+
+    Las entradas caducadas que traen ETag o Last-Modified se conservan para
+    revalidarlas con una petición condicional; si el servidor responde 304
+    se reutiliza el cuerpo guardado. Una escritura (POST/PUT/PATCH/DELETE)
+    sobre un recurso invalida todas las respuestas de ese recurso.
+    """
+
+    def __init__(self, base_url, ttl, max_bytes):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0}
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def resource_of(self, url):
+        """Primer segmento de la ruta relativa a base_url (p. ej. "ventas")"""
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        return path.lstrip("/").split("?")[0].split("/")[0]
+
+    @staticmethod
+    def key(url, params=None):
+        """Clave de caché: URL más los parámetros ordenados"""
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+        return ("GET", url, tuple(items))
+
+    def cacheable(self, url):
+        return self.resource_of(url) not in UNCACHED_RESOURCES
+
+    def lookup(self, key):
+        """
+        Busca una respuesta guardada
+
+        Returns:
+            tuple: (respuesta o None, si sigue vigente)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if entry.expires_at > time.monotonic():
+                self.stats["hits"] += 1
+                return entry.response, True
+            if not self.validators(entry.response):
+                self._remove(key)
+                self.stats["misses"] += 1
+                return None, False
+            return entry.response, False
+
+    def store(self, key, response):
+        """Guarda una respuesta 200 si cabe en el límite de tamaño"""
+        size = len(response.content or b"")
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(response, size, time.monotonic() + self.ttl,
+                                        self.resource_of(key[1]))
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def renew(self, key):
+        """Extiende la vigencia de una entrada revalidada con 304"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl
+                self.stats["revalidated"] += 1
+
+    def invalidate(self, url):
+        """Elimina las respuestas del recurso de `url` y de sus recursos relacionados"""
+        resource = self.resource_of(url)
+        resources = {resource, *RELATED_RESOURCES.get(resource, ()), *DERIVED_RESOURCES}
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.resource in resources]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @staticmethod
+    def validators(response):
+        """Cabeceras para una petición condicional a partir de una respuesta guardada"""
+        headers = {}
+        if response.headers.get("ETag"):
+            headers["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = response.headers["Last-Modified"]
+        return headers
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= entry.size
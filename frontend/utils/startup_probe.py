@@ -0,0 +1,112 @@
+"""
+Medición del tiempo de arranque de la aplicación.
+
+Con la variable ERP_STARTUP_PROBE=<archivo>, main.py anota en ese archivo
+(una línea JSON por marca, con time.time()) el primer repintado de la
+ventana de login y el del dashboard. Si además se definen
+ERP_STARTUP_EMAIL y ERP_STARTUP_PASSWORD, inicia sesión solo al pintarse
+el login y emite `finished` tras pintarse el dashboard para que la
+aplicación termine.
+
+El benchmark lanza la aplicación varias veces y muestra la mediana desde
+el arranque del proceso hasta cada marca (el backend debe estar en marcha):
+
+    python -m utils.startup_probe --runs 5 --email admin@pirelli.com --password ...
+"""
+import json
+import os
+import time
+from PyQt6.QtCore import QObject, QEvent, QTimer, pyqtSignal
+
+PROBE_ENV = "ERP_STARTUP_PROBE"
+
+# Marcas en orden; el proceso termina tras la última
+MARKS = ("python", "login", "dashboard")
+
+
+class StartupProbe(QObject):
+    """Anota el primer repintado de los widgets vigilados"""
+
+    # Se emite tras la última marca cuando la sonda inicia sesión sola
+    finished = pyqtSignal()
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.email = os.environ.get("ERP_STARTUP_EMAIL")
+        self.password = os.environ.get("ERP_STARTUP_PASSWORD")
+        self._watched = {}
+
+    @classmethod
+    def from_env(cls):
+        """Sonda configurada por ERP_STARTUP_PROBE, o None si no está definida"""
+        path = os.environ.get(PROBE_ENV)
+        return cls(path) if path else None
+
+    def mark(self, name, t=None):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"marca": name, "t": t or time.time()}) + "\n")
+
+    def watch(self, widget, name):
+        self._watched[widget] = name
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and obj in self._watched:
+            name = self._watched.pop(obj)
+            obj.removeEventFilter(self)
+            self.mark(name)
+            # Las acciones se difieren para no bloquear el repintado en curso
+            if name == "login" and self.email:
+                QTimer.singleShot(0, lambda: self._login(obj))
+            elif name == MARKS[-1] and self.email:
+                QTimer.singleShot(0, self.finished.emit)
+        return False
+
+    def _login(self, login_view):
+        login_view.email_input.setText(self.email)
+        login_view.password_input.setText(self.password)
+        login_view.authenticate()
+
+
+def _read_marks(path):
+    with open(path, encoding="utf-8") as f:
+        return {entry["marca"]: entry["t"] for entry in map(json.loads, f)}
+
+
+def main():
+    import argparse
+    import statistics
+    import subprocess
+    import sys
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Tiempo de arranque del cliente de escritorio")
+    parser.add_argument("--runs", type=int, default=5, help="Arranques a medir")
+    parser.add_argument("--email", required=True, help="Usuario con el que iniciar sesión")
+    parser.add_argument("--password", required=True)
+    args = parser.parse_args()
+
+    frontend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {name: [] for name in MARKS}
+    for run in range(args.runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "marcas.jsonl")
+            env = dict(os.environ, ERP_STARTUP_PROBE=path, ERP_STARTUP_EMAIL=args.email,
+                       ERP_STARTUP_PASSWORD=args.password)
+            started = time.time()
+            subprocess.run([sys.executable, "main.py"], cwd=frontend, env=env, timeout=120, check=True)
+            marks = _read_marks(path)
+        missing = [name for name in MARKS if name not in marks]
+        if missing:
+            sys.exit(f"El arranque {run + 1} no llegó a: {', '.join(missing)}")
+        for name in MARKS:
+            results[name].append((marks[name] - started) * 1000)
+        print(f"Arranque {run + 1}: " + ", ".join(f"{name} {results[name][-1]:.0f} ms" for name in MARKS))
+
+    print("Mediana desde el arranque del proceso: " +
+          ", ".join(f"{name} {statistics.median(values):.0f} ms" for name, values in results.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,15 @@ PIRELLI_LIGHT_GRAY = "#E6E6E6"
 CARD_BG = "#FFFFFF"
 CARD_BORDER = "#EEEEEE"
 
+# Tablas que leen las secciones del dashboard (ver SECCIONES en el backend)
+DASHBOARD_TABLES = (
+    "ventas", "detalle_ventas", "clientes", "productos", "ordenes_produccion",
+    "inventario", "materiales", "empleados", "areas_trabajo", "asistencia", "nominas",
+    "ordenes_compra", "control_calidad", "mantenimiento", "activos_produccion", "incidentes",
+)
+# Milisegundos que se agrupan los cambios antes de pedir de nuevo el dashboard
+LIVE_REFRESH_DELAY = 3000
+
 def get_formatted_date():
     """Obtiene la fecha y hora actual formateada en español"""
     now = datetime.now()
@@ -2129,12 +2138,24 @@ class DashboardView(QWidget):
         """Configura las conexiones de señales"""
         self.api_client.data_received.connect(self.update_data)
         self.api_client.request_error.connect(self.handle_api_error)
+        # Los cambios de otros usuarios programan una actualización (una por ráfaga)
+        self.api_client.changes.subscribe(DASHBOARD_TABLES, self.on_remote_changes, owner=self)
         
     def setup_timer(self):
         """Configura el timer para actualizar la hora"""
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_time)
         self.timer.start(60000)  # Actualizar cada minuto
+
+        self.live_refresh_timer = QTimer(self)
+        self.live_refresh_timer.setSingleShot(True)
+        self.live_refresh_timer.setInterval(LIVE_REFRESH_DELAY)
+        self.live_refresh_timer.timeout.connect(self.refresh_data)
+
+    def on_remote_changes(self, changes):
+        """Actualiza las tarjetas y gráficos tras cambios en las tablas que muestran"""
+        if not self.live_refresh_timer.isActive():
+            self.live_refresh_timer.start()
         
     def init_ui(self):
         """Inicializa la interfaz de usuario"""
@@ -2575,7 +2596,8 @@ class DashboardView(QWidget):
             self.refresh_button.setText(" Actualizando...")
             
         try:
-            self.api_client.get_dashboard_data()
+            # En segundo plano: la respuesta llega por data_received o request_error
+            self.api_client.get_dashboard_data_async()
         except Exception as e:
             logging.exception("Error al solicitar datos del dashboard")
             self.show_error_message("Error de conexión", str(e))
@@ -0,0 +1,129 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QHBoxLayout, QLabel, QComboBox, QCheckBox,
+    QDateEdit, QPushButton, QFileDialog, QProgressBar, QDialogButtonBox
+)
+from PyQt6.QtCore import QDate
+
+# Recursos exportables (clave del API -> nombre visible, roles con acceso)
+EXPORT_RESOURCES = {
+    "ventas": ("Ventas", ("admin", "supervisor")),
+    "detalle_ventas": ("Detalle de ventas", ("admin", "supervisor")),
+    "asistencia": ("Asistencia", ("admin", "supervisor")),
+    "nominas": ("Nóminas", ("admin",)),
+}
+
+EXPORT_FORMATS = {
+    "csv": ("CSV", "Archivos CSV (*.csv)"),
+    "ndjson": ("NDJSON (una línea JSON por registro)", "Archivos NDJSON (*.ndjson)"),
+}
+
+
+class ExportDialog(QDialog):
+    """
+    Exportación de tablas grandes a CSV o NDJSON.
+
+    El servidor envía la tabla en streaming y el cliente escribe cada
+    fragmento directamente en el archivo, sin cargar los registros en memoria.
+    """
+
+    def __init__(self, api_client, user_role, parent=None):
+        super().__init__(parent)
+        self.api_client = api_client
+        self.future = None
+
+        self.setWindowTitle("Exportar datos")
+        self.setMinimumWidth(460)
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        self.resource_combo = QComboBox()
+        for resource, (label, roles) in EXPORT_RESOURCES.items():
+            if user_role in roles:
+                self.resource_combo.addItem(label, resource)
+        form.addRow("Datos:", self.resource_combo)
+
+        self.format_combo = QComboBox()
+        for formato, (label, _) in EXPORT_FORMATS.items():
+            self.format_combo.addItem(label, formato)
+        form.addRow("Formato:", self.format_combo)
+
+        self.range_check = QCheckBox("Filtrar por fechas")
+        self.range_check.toggled.connect(self.toggle_range)
+        form.addRow("", self.range_check)
+
+        range_row = QHBoxLayout()
+        today = QDate.currentDate()
+        self.desde_edit = QDateEdit(today.addDays(1 - today.day()))
+        self.hasta_edit = QDateEdit(today)
+        for edit in (self.desde_edit, self.hasta_edit):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("dd/MM/yyyy")
+        range_row.addWidget(QLabel("Desde"))
+        range_row.addWidget(self.desde_edit)
+        range_row.addWidget(QLabel("Hasta"))
+        range_row.addWidget(self.hasta_edit)
+        form.addRow("", range_row)
+        layout.addLayout(form)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        self.progress.hide()
+        layout.addWidget(self.progress)
+
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        buttons = QDialogButtonBox()
+        self.export_button = QPushButton("Exportar...")
+        self.export_button.setEnabled(self.resource_combo.count() > 0)
+        self.export_button.clicked.connect(self.export)
+        buttons.addButton(self.export_button, QDialogButtonBox.ButtonRole.AcceptRole)
+        buttons.addButton("Cerrar", QDialogButtonBox.ButtonRole.RejectRole)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.toggle_range(False)
+
+    def toggle_range(self, enabled):
+        self.desde_edit.setEnabled(enabled)
+        self.hasta_edit.setEnabled(enabled)
+
+    def export(self):
+        resource = self.resource_combo.currentData()
+        formato = self.format_combo.currentData()
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Guardar exportación", f"{resource}.{formato}", EXPORT_FORMATS[formato][1]
+        )
+        if not path:
+            return
+
+        params = {}
+        if self.range_check.isChecked():
+            params["desde"] = self.desde_edit.date().toString("yyyy-MM-dd")
+            params["hasta"] = self.hasta_edit.date().toString("yyyy-MM-dd")
+
+        self.export_button.setEnabled(False)
+        self.progress.show()
+        self.status_label.setText(f"Exportando a {path}...")
+        self.future = self.api_client.export_to_file_async(resource, path, formato, **params)
+        self.future.add_done_callback(self.show_result)
+
+    def show_result(self, future):
+        if future.cancelled():
+            return
+        self.progress.hide()
+        self.export_button.setEnabled(True)
+        result = future.result()
+        if result is None:
+            self.status_label.setText(f"No se pudo exportar: {future.error()}")
+        else:
+            size_kb = result["bytes"] / 1024
+            self.status_label.setText(f"Exportación completada: {result['archivo']} ({size_kb:,.1f} KB)")
+
+    def reject(self):
+        # Cerrar el diálogo descarta el resultado de una exportación en curso
+        if self.future is not None and not self.future.done():
+            self.api_client.pool.cancel(self.future)
+        super().reject()
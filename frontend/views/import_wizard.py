@@ -0,0 +1,187 @@
+from PyQt6.QtWidgets import (
+    QWizard, QWizardPage, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QComboBox,
+    QLineEdit, QPushButton, QFileDialog, QProgressBar, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import Qt
+
+# Recursos importables (clave del API -> nombre visible)
+RESOURCE_LABELS = {
+    "materiales": "Materiales",
+    "inventario": "Inventario",
+    "productos": "Productos",
+    "clientes": "Clientes",
+}
+
+
+class ImportWizard(QWizard):
+    """
+    Asistente de importación masiva desde archivos CSV o XLSX.
+
+    El archivo se sube en segundo plano; el servidor lo procesa por lotes y
+    devuelve las filas importadas y los errores por número de línea.
+    """
+
+    def __init__(self, api_client, parent=None):
+        super().__init__(parent)
+        self.api_client = api_client
+        self.specs = api_client.get_import_specs() or {}
+        self.future = None
+
+        self.setWindowTitle("Importar datos")
+        self.setMinimumSize(640, 480)
+        self.setWizardStyle(QWizard.WizardStyle.ModernStyle)
+        self.setButtonText(QWizard.WizardButton.CommitButton, "Importar")
+        self.setButtonText(QWizard.WizardButton.BackButton, "< Atrás")
+        self.setButtonText(QWizard.WizardButton.FinishButton, "Finalizar")
+        self.setButtonText(QWizard.WizardButton.CancelButton, "Cancelar")
+
+        self.file_page = ImportFilePage(self)
+        self.result_page = ImportResultPage(self)
+        self.addPage(self.file_page)
+        self.addPage(self.result_page)
+
+    def reject(self):
+        # Cerrar el asistente descarta el resultado de una importación en curso
+        if self.future is not None and not self.future.done():
+            self.api_client.pool.cancel(self.future)
+        super().reject()
+
+
+class ImportFilePage(QWizardPage):
+    """Selección del recurso y del archivo a importar"""
+
+    def __init__(self, wizard):
+        super().__init__()
+        self.setTitle("Archivo de origen")
+        self.setSubTitle("Seleccione qué desea importar y el archivo CSV o Excel (.xlsx). "
+                         "La primera fila debe contener los nombres de las columnas.")
+        self.specs = wizard.specs
+        # Una vez lanzada la importación no se puede volver atrás
+        self.setCommitPage(True)
+
+        layout = QFormLayout(self)
+        self.resource_combo = QComboBox()
+        for resource, label in RESOURCE_LABELS.items():
+            if not self.specs or resource in self.specs:
+                self.resource_combo.addItem(label, resource)
+        self.resource_combo.currentIndexChanged.connect(self.update_columns)
+        layout.addRow("Importar:", self.resource_combo)
+
+        self.columns_label = QLabel()
+        self.columns_label.setWordWrap(True)
+        layout.addRow("Columnas:", self.columns_label)
+
+        file_row = QHBoxLayout()
+        self.file_edit = QLineEdit()
+        self.file_edit.setReadOnly(True)
+        self.file_edit.setPlaceholderText("Ningún archivo seleccionado")
+        self.file_edit.textChanged.connect(self.completeChanged)
+        browse_button = QPushButton("Examinar...")
+        browse_button.clicked.connect(self.browse)
+        file_row.addWidget(self.file_edit)
+        file_row.addWidget(browse_button)
+        layout.addRow("Archivo:", file_row)
+
+        self.update_columns()
+
+    def resource(self):
+        return self.resource_combo.currentData()
+
+    def file_path(self):
+        return self.file_edit.text()
+
+    def update_columns(self):
+        spec = self.specs.get(self.resource())
+        if not spec:
+            self.columns_label.setText("")
+            return
+        required = ", ".join(f"<b>{c}</b>" for c in spec["obligatorias"])
+        optional = ", ".join(spec["opcionales"])
+        self.columns_label.setText(f"{required}" + (f", {optional}" if optional else "")
+                                   + "<br><small>(en negrita las obligatorias)</small>")
+
+    def browse(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Seleccionar archivo", "", "Hojas de datos (*.csv *.xlsx)"
+        )
+        if path:
+            self.file_edit.setText(path)
+
+    def isComplete(self):
+        return bool(self.file_path()) and self.resource() is not None
+
+
+class ImportResultPage(QWizardPage):
+    """Progreso de la importación y errores por línea"""
+
+    def __init__(self, wizard):
+        super().__init__()
+        self.setTitle("Resultado de la importación")
+        self.import_done = False
+
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)  # Indeterminado mientras el servidor procesa
+        layout.addWidget(self.progress)
+
+        self.errors_table = QTableWidget(0, 2)
+        self.errors_table.setHorizontalHeaderLabels(["Línea", "Error"])
+        self.errors_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.errors_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.errors_table.verticalHeader().setVisible(False)
+        self.errors_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.errors_table)
+
+    def initializePage(self):
+        wizard = self.wizard()
+        file_page = wizard.file_page
+        self.import_done = False
+        self.errors_table.setRowCount(0)
+        self.errors_table.hide()
+        self.progress.show()
+        self.status_label.setText(f"Importando {file_page.file_edit.text()}...")
+
+        wizard.future = wizard.api_client.import_file_async(file_page.resource(), file_page.file_path())
+        wizard.future.add_done_callback(self.show_result)
+
+    def show_result(self, future):
+        if future.cancelled():
+            return
+        self.progress.hide()
+        self.import_done = True
+        result = future.result()
+        if result is None:
+            self.status_label.setText(f"No se pudo importar el archivo: {future.error()}")
+        else:
+            text = (f"Filas procesadas: {result['procesadas']}<br>"
+                    f"Importadas: <b>{result['importadas']}</b><br>"
+                    f"Con error: {result['con_error']}")
+            if result.get("errores_omitidos"):
+                text += f" (se muestran las primeras {len(result['errores'])})"
+            if result.get("error_lectura"):
+                text += f"<br>Importación interrumpida: {result['error_lectura']}"
+            self.status_label.setText(text)
+            self.fill_errors(result["errores"])
+        self.completeChanged.emit()
+
+    def fill_errors(self, errors):
+        if not errors:
+            return
+        self.errors_table.setRowCount(len(errors))
+        for row, error in enumerate(errors):
+            line_item = QTableWidgetItem(str(error["linea"]))
+            line_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            self.errors_table.setItem(row, 0, line_item)
+            self.errors_table.setItem(row, 1, QTableWidgetItem(error["error"]))
+        self.errors_table.show()
+
+    def isComplete(self):
+        return self.import_done
+
+    def isFinalPage(self):
+        return True
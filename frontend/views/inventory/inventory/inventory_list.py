@@ -1,21 +1,44 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
-    QHeaderView, QComboBox, QLineEdit, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableView,
+    QHeaderView, QComboBox, QLineEdit, QMessageBox, QMenu
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSortFilterProxyModel
 from PyQt6.QtGui import QIcon
+from utils.paged_table_model import PagedColumn, PagedTableModel
+
+# Umbral por debajo del cual un lote se considera stock bajo
+STOCK_BAJO = 10
+
 
 class InventoryListView(QWidget):
     def __init__(self, api_client):
         super().__init__()
         self.api_client = api_client
-        self.last_inventory = []
+        self._setup_models()
         self.init_ui()
         self.refresh_data()
 
+    def _setup_models(self):
+        # Modelo paginado: las filas se piden al API al hacer scroll
+        self.inventory_model = PagedTableModel([
+            PagedColumn("ID", lambda i: i.get("id_inventario")),
+            PagedColumn("Material", lambda i: i.get("material_name") or ""),
+            PagedColumn("Cantidad", lambda i: i.get("cantidad", 0)),
+            PagedColumn("Lote", lambda i: i.get("lote") or ""),
+            PagedColumn("Fecha ingreso", lambda i: i.get("fecha_ingreso") or ""),
+            PagedColumn("Ubicación", lambda i: i.get("ubicacion") or ""),
+        ], self._fetch_page)
+        # Los movimientos de stock de otros usuarios se aplican al vuelo
+        self.api_client.changes.subscribe(("inventario",), self.inventory_model.apply_changes, owner=self)
+
+        # Los filtros de stock y búsqueda se aplican sobre las filas cargadas
+        self.proxy_model = QSortFilterProxyModel()
+        self.proxy_model.setSourceModel(self.inventory_model)
+        self.proxy_model.filterAcceptsRow = self._filter_accepts_row
+
     def init_ui(self):
         main_layout = QVBoxLayout(self)
-        
+
         # Título principal
         title_label = QLabel("Inventario")
         title_label.setStyleSheet("font-size: 24px; font-weight: bold; margin-bottom: 10px;")
@@ -23,7 +46,7 @@ class InventoryListView(QWidget):
 
         # Toolbar de filtros y búsqueda
         toolbar_layout = QHBoxLayout()
-        
+
         status_label = QLabel("Estado:")
         self.filter_combo = QComboBox()
         self.filter_combo.addItems(["Todos", "Stock bajo", "Stock suficiente"])
@@ -47,90 +70,74 @@ class InventoryListView(QWidget):
 
         main_layout.addLayout(toolbar_layout)
 
-        # Tabla de inventario
-        self.inventory_table = QTableWidget(0, 7)
-        self.inventory_table.setHorizontalHeaderLabels([
-            "ID", "Material", "Cantidad", "Lote", "Fecha ingreso", "Ubicación", "Acciones"
-        ])
+        # Tabla de inventario (acciones desde el menú contextual o doble clic)
+        self.inventory_table = QTableView()
+        self.inventory_table.setModel(self.proxy_model)
         self.inventory_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.inventory_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.inventory_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.inventory_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.inventory_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.inventory_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
         self.inventory_table.setAlternatingRowColors(True)
         self.inventory_table.verticalHeader().setVisible(False)
+        self.inventory_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.inventory_table.customContextMenuRequested.connect(self.show_context_menu)
+        self.inventory_table.doubleClicked.connect(self.on_row_double_clicked)
 
         main_layout.addWidget(self.inventory_table)
 
     def refresh_data(self):
-        try:
-            inventory_data = self.api_client.get_inventory()
-            self.last_inventory = inventory_data if isinstance(inventory_data, list) else inventory_data.get('inventario', [])
-            self.apply_filters()
-        except Exception as e:
-            self.show_error(str(e))
+        self.inventory_model.reload()
+
+    def _fetch_page(self, cursor, limit, ids=None):
+        return self.api_client.get_page(
+            "inventario", cursor, limit, ids=",".join(map(str, ids)) if ids else None
+        )
 
     def apply_filters(self):
+        self.proxy_model.invalidateFilter()
+
+    def _filter_accepts_row(self, source_row, source_parent):
         filtro = self.filter_combo.currentText().lower()
         buscar = self.search_input.text().strip().lower()
-        filtered = self.last_inventory
+        value = self.inventory_model.value
 
-        if filtro == "stock bajo":
-            filtered = [i for i in filtered if i.get("cantidad", 0) < 10]
-        elif filtro == "stock suficiente":
-            filtered = [i for i in filtered if i.get("cantidad", 0) >= 10]
+        cantidad = value(source_row, 2) or 0
+        if filtro == "stock bajo" and cantidad >= STOCK_BAJO:
+            return False
+        if filtro == "stock suficiente" and cantidad < STOCK_BAJO:
+            return False
 
         if buscar:
-            filtered = [
-                i for i in filtered
-                if buscar in str(i.get("id_inventario", "")).lower()
-                or buscar in (i.get("material_name", "") or "").lower()
-                or buscar in (i.get("lote", "") or "").lower()
-                or buscar in (i.get("ubicacion", "") or "").lower()
-            ]
-        self.populate_table(filtered)
-
-    def populate_table(self, inventory_items):
-        self.inventory_table.setRowCount(0)
-
-        for row, inv in enumerate(inventory_items):
-            self.inventory_table.insertRow(row)
-
-            self.inventory_table.setItem(row, 0, QTableWidgetItem(str(inv.get("id_inventario", ""))))
-            self.inventory_table.setItem(row, 1, QTableWidgetItem(inv.get("material_name", "")))
-            self.inventory_table.setItem(row, 2, QTableWidgetItem(str(inv.get("cantidad", ""))))
-            self.inventory_table.setItem(row, 3, QTableWidgetItem(inv.get("lote", "")))
-            self.inventory_table.setItem(row, 4, QTableWidgetItem(inv.get("fecha_ingreso", "")))
-            self.inventory_table.setItem(row, 5, QTableWidgetItem(inv.get("ubicacion", "")))
-
-            # Layout de acciones
-            actions_layout = QHBoxLayout()
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            actions_layout.setSpacing(5)
-
-            view_btn = QPushButton()
-            view_btn.setIcon(QIcon("resources/icons/view.png"))
-            view_btn.setFixedSize(30, 30)
-            view_btn.setToolTip("Ver detalles")
-            view_btn.clicked.connect(lambda checked, x=inv: self.view_inventory(x))
-
-            edit_btn = QPushButton()
-            edit_btn.setIcon(QIcon("resources/icons/edit.png"))
-            edit_btn.setFixedSize(30, 30)
-            edit_btn.setToolTip("Editar")
-            edit_btn.clicked.connect(lambda checked, x=inv: self.edit_inventory(x))
-
-            delete_btn = QPushButton()
-            delete_btn.setIcon(QIcon("resources/icons/delete.png"))
-            delete_btn.setFixedSize(30, 30)
-            delete_btn.setToolTip("Eliminar")
-            delete_btn.clicked.connect(lambda checked, x=inv: self.delete_inventory(x))
-
-            actions_layout.addWidget(view_btn)
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-
-            actions_widget = QWidget()
-            actions_widget.setLayout(actions_layout)
-            self.inventory_table.setCellWidget(row, 6, actions_widget)
+            return any(buscar in str(value(source_row, column)).lower() for column in (0, 1, 3, 5))
+        return True
+
+    def _inventory_at(self, index):
+        """Registro (id y material) de la fila de la vista indicada"""
+        row = self.proxy_model.mapToSource(index).row()
+        return {
+            "id_inventario": self.inventory_model.value(row, 0),
+            "material_name": self.inventory_model.value(row, 1),
+        }
+
+    def show_context_menu(self, position):
+        index = self.inventory_table.indexAt(position)
+        if not index.isValid():
+            return
+        inv = self._inventory_at(index)
+
+        menu = QMenu(self)
+        view_action = menu.addAction(QIcon("resources/icons/view.png"), "Ver detalles")
+        edit_action = menu.addAction(QIcon("resources/icons/edit.png"), "Editar")
+        delete_action = menu.addAction(QIcon("resources/icons/delete.png"), "Eliminar")
+
+        view_action.triggered.connect(lambda: self.view_inventory(inv))
+        edit_action.triggered.connect(lambda: self.edit_inventory(inv))
+        delete_action.triggered.connect(lambda: self.delete_inventory(inv))
+
+        menu.exec(self.inventory_table.viewport().mapToGlobal(position))
+
+    def on_row_double_clicked(self, index):
+        self.view_inventory(self._inventory_at(index))
 
     def add_inventory(self):
         from .inventory_form import InventoryForm
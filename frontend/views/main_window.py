@@ -1,13 +1,13 @@
-from PyQt6.QtWidgets import QMainWindow, QMenuBar, QMenu, QMessageBox
+from PyQt6.QtWidgets import QApplication, QMainWindow, QMenuBar, QMenu, QMessageBox
 from PyQt6.QtGui import QIcon, QAction
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import pyqtSignal, Qt, QTimer
 
-from views.dashboard_view import DashboardView
-from views.rrhh.rrhh_window import RecursosHumanosWindow
-from views.inventory.inventory_window import InventoryWindow
-from views.production.production_window import ProductionWindow
-from views.sales.sales_window import VentasWindow
-from views.management.management_window import GestionWindow 
+# Las ventanas de módulo y el dashboard se importan al abrirlos (ver view_registry)
+from views.view_registry import MODULE_WINDOWS, view_class, is_loaded, prefetch
+
+# Milisegundos tras mostrar la ventana principal antes de precargar los módulos,
+# para no competir con el primer repintado y la carga del dashboard
+PREFETCH_DELAY = 1500
 
 class MainWindow(QMainWindow):
     logout_requested = pyqtSignal()
@@ -36,7 +36,7 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage("Bienvenido al sistema ERP Pirelli")
         
         # Crear dashboard como widget central
-        self.dashboard_view = DashboardView(self.api_client)
+        self.dashboard_view = view_class("dashboard")(self.api_client)
         self.setCentralWidget(self.dashboard_view)
         
         # Conectar señales del dashboard
@@ -58,6 +58,14 @@ class MainWindow(QMainWindow):
         exit_action.setShortcut("Alt+F4")
         exit_action.triggered.connect(self.close)
         file_menu.addAction(logout_action)
+        # Importación y exportación masivas (solo admin y supervisor)
+        if self.user_data.get("rol") in ("admin", "supervisor"):
+            import_action = QAction("Importar datos...", self)
+            import_action.triggered.connect(self.show_import_wizard)
+            file_menu.addAction(import_action)
+            export_action = QAction("Exportar...", self)
+            export_action.triggered.connect(self.show_export_dialog)
+            file_menu.addAction(export_action)
         file_menu.addSeparator()
         file_menu.addAction(exit_action)
 
@@ -65,23 +73,23 @@ class MainWindow(QMainWindow):
         modules_menu = menu_bar.addMenu("Módulos")
 
         rrhh_action = QAction("Recursos Humanos", self)
-        rrhh_action.triggered.connect(lambda: self.open_module_window('rrhh_window', RecursosHumanosWindow))
+        rrhh_action.triggered.connect(lambda: self.open_module_window('rrhh_window'))
         modules_menu.addAction(rrhh_action)
 
         inventario_action = QAction("Inventario y Compras", self)
-        inventario_action.triggered.connect(lambda: self.open_module_window('inventario_window', InventoryWindow))
+        inventario_action.triggered.connect(lambda: self.open_module_window('inventario_window'))
         modules_menu.addAction(inventario_action)
 
         production_action = QAction("Producción", self)
-        production_action.triggered.connect(lambda: self.open_module_window('production_window', ProductionWindow))
+        production_action.triggered.connect(lambda: self.open_module_window('production_window'))
         modules_menu.addAction(production_action)
 
         ventas_action = QAction("Ventas", self)
-        ventas_action.triggered.connect(lambda: self.open_module_window('ventas_window', VentasWindow))
+        ventas_action.triggered.connect(lambda: self.open_module_window('ventas_window'))
         modules_menu.addAction(ventas_action)
 
         gestion_action = QAction("Gestión", self)
-        gestion_action.triggered.connect(lambda: self.open_module_window('management_window', GestionWindow))
+        gestion_action.triggered.connect(lambda: self.open_module_window('management_window'))
         modules_menu.addAction(gestion_action)
 
         # ... Agregar más módulos aquí
@@ -92,10 +100,25 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about_dialog)
         help_menu.addAction(about_action)
 
-    def open_module_window(self, window_attr_name, window_class):
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Tras el primer repintado se importan en segundo plano las ventanas de módulo
+        QTimer.singleShot(PREFETCH_DELAY, lambda: prefetch(MODULE_WINDOWS))
+
+    def open_module_window(self, window_attr_name, window_class=None):
         """Abre una ventana de módulo, si no está ya abierta."""
         window = getattr(self, window_attr_name, None)
         if window is None:
+            if window_class is None:
+                # La primera apertura importa el módulo si la precarga aún no lo hizo
+                waiting = not is_loaded(window_attr_name)
+                if waiting:
+                    QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+                try:
+                    window_class = view_class(window_attr_name)
+                finally:
+                    if waiting:
+                        QApplication.restoreOverrideCursor()
             window = window_class(self.api_client)
             window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
             window.show()
@@ -105,10 +128,22 @@ class MainWindow(QMainWindow):
             window.raise_()
             window.activateWindow()
 
+    def show_import_wizard(self):
+        """Abre el asistente de importación masiva desde CSV/XLSX"""
+        from views.import_wizard import ImportWizard
+        wizard = ImportWizard(self.api_client, self)
+        wizard.exec()
+
+    def show_export_dialog(self):
+        """Abre el diálogo de exportación de tablas grandes a CSV/NDJSON"""
+        from views.export_dialog import ExportDialog
+        dialog = ExportDialog(self.api_client, self.user_data.get("rol"), self)
+        dialog.exec()
+
     def show_dashboard(self):
         """Muestra el dashboard como widget central"""
         if not hasattr(self, 'dashboard_view') or self.dashboard_view is None:
-            self.dashboard_view = DashboardView(self.api_client)
+            self.dashboard_view = view_class("dashboard")(self.api_client)
         self.setCentralWidget(self.dashboard_view)
         self.statusBar().showMessage("Dashboard cargado", 3000)
 
@@ -148,17 +183,10 @@ class MainWindow(QMainWindow):
         )
         if reply == QMessageBox.StandardButton.Yes:
             # Cerrar todas las ventanas hijas abiertas
-            if self.rrhh_window is not None:
-                self.rrhh_window.close()
-            if self.inventario_window is not None:
-                self.inventario_window.close()
-            if self.production_window is not None:
-                self.production_window.close()
-            if self.ventas_window is not None:
-                self.ventas_window.close()
-            if self.management_window is not None:
-                self.management_window.close()
-            # Agrega aquí más módulos si tienes otros
+            for window_attr_name in MODULE_WINDOWS:
+                window = getattr(self, window_attr_name, None)
+                if window is not None:
+                    window.close()
             event.accept()
         else:
             event.ignore()
@@ -0,0 +1,189 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableView,
+    QHeaderView, QComboBox, QCheckBox, QDateEdit, QSplitter, QStatusBar, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtGui import QStandardItemModel, QStandardItem, QColor, QFont
+from utils.theme import Theme
+
+PERIODOS = [("Semana", "semana"), ("Día", "dia"), ("Mes", "mes")]
+
+MATERIAL_HEADERS = ["ID", "Material", "Unidad", "Stock", "En camino", "Requerido", "Faltante", "Primer faltante"]
+PERIOD_HEADERS = ["Periodo", "Requerido", "Recepciones", "Disponible", "Faltante"]
+
+
+def _format_date(value):
+    """Convierte YYYY-MM-DD a DD/MM/YYYY"""
+    if not value:
+        return ""
+    return QDate.fromString(value, "yyyy-MM-dd").toString("dd/MM/yyyy")
+
+
+def _number_item(value, highlight=False):
+    item = QStandardItem(f"{value:,.2f}".rstrip("0").rstrip("."))
+    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+    if highlight:
+        item.setForeground(QColor(Theme.DANGER_COLOR))
+        font = QFont()
+        font.setBold(True)
+        item.setFont(font)
+    return item
+
+
+class MrpView(QWidget):
+    """
+    Plan de necesidades de materiales (MRP).
+
+    Muestra, para las órdenes de producción planificadas y en proceso, las
+    necesidades de cada material según las recetas, neteadas contra el
+    inventario y las órdenes de compra pendientes. Al seleccionar un
+    material se ven sus necesidades, recepciones y faltantes por periodo.
+    """
+
+    def __init__(self, api_client):
+        super().__init__()
+        Theme.apply_window_light_theme(self)
+        self.api_client = api_client
+        self.future = None
+        self.materials = []
+
+        self.material_model = QStandardItemModel()
+        self.material_model.setHorizontalHeaderLabels(MATERIAL_HEADERS)
+        self.period_model = QStandardItemModel()
+        self.period_model.setHorizontalHeaderLabels(PERIOD_HEADERS)
+
+        self.init_ui()
+
+    def init_ui(self):
+        """Inicializa la interfaz de usuario"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        title_label = QLabel("Plan de Necesidades de Materiales")
+        title_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        main_layout.addWidget(title_label)
+
+        # Barra de herramientas
+        toolbar_layout = QHBoxLayout()
+        self.period_combo = QComboBox()
+        for label, value in PERIODOS:
+            self.period_combo.addItem(label, value)
+
+        self.horizon_check = QCheckBox("Hasta")
+        self.horizon_edit = QDateEdit(QDate.currentDate().addMonths(3))
+        self.horizon_edit.setCalendarPopup(True)
+        self.horizon_edit.setDisplayFormat("dd/MM/yyyy")
+        self.horizon_edit.setEnabled(False)
+        self.horizon_check.toggled.connect(self.horizon_edit.setEnabled)
+
+        self.shortage_check = QCheckBox("Solo materiales con faltante")
+
+        self.calculate_btn = QPushButton("Calcular")
+        self.calculate_btn.clicked.connect(self.refresh_data)
+
+        toolbar_layout.addWidget(QLabel("Agrupar por:"))
+        toolbar_layout.addWidget(self.period_combo)
+        toolbar_layout.addWidget(self.horizon_check)
+        toolbar_layout.addWidget(self.horizon_edit)
+        toolbar_layout.addWidget(self.shortage_check)
+        toolbar_layout.addStretch()
+        toolbar_layout.addWidget(self.calculate_btn)
+        main_layout.addLayout(toolbar_layout)
+
+        # Materiales (arriba) y detalle por periodo del seleccionado (abajo)
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.material_table = self._create_table(self.material_model)
+        self.material_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.material_table.setColumnHidden(0, True)
+        self.material_table.selectionModel().currentRowChanged.connect(self.show_periods)
+        splitter.addWidget(self.material_table)
+
+        self.period_table = self._create_table(self.period_model)
+        splitter.addWidget(self.period_table)
+        splitter.setSizes([400, 200])
+        main_layout.addWidget(splitter)
+
+        self.summary_label = QLabel()
+        main_layout.addWidget(self.summary_label)
+
+        self.status_bar = QStatusBar()
+        self.status_bar.showMessage("Pulse Calcular para generar el plan")
+        main_layout.addWidget(self.status_bar)
+
+    def _create_table(self, model):
+        table = QTableView()
+        table.setModel(model)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setAlternatingRowColors(True)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def refresh_data(self):
+        """Pide el plan al API en segundo plano"""
+        hasta = self.horizon_edit.date().toString("yyyy-MM-dd") if self.horizon_check.isChecked() else None
+        self.calculate_btn.setEnabled(False)
+        self.status_bar.showMessage("Calculando plan de materiales...")
+        self.future = self.api_client.get_mrp_plan_async(
+            self.period_combo.currentData(), hasta, self.shortage_check.isChecked()
+        )
+        self.future.add_done_callback(self.load_plan)
+
+    def load_plan(self, future):
+        """Muestra el plan recibido"""
+        if future.cancelled():
+            return
+        self.calculate_btn.setEnabled(True)
+        plan = future.result()
+        if plan is None:
+            self.status_bar.showMessage(f"No se pudo calcular el plan: {future.error()}")
+            return
+
+        self.materials = plan.get("materiales", [])
+        self.material_model.removeRows(0, self.material_model.rowCount())
+        self.period_model.removeRows(0, self.period_model.rowCount())
+        for material in self.materials:
+            short = material["faltante"] > 0
+            id_item = QStandardItem(str(material["id_material"]))
+            name_item = QStandardItem(material.get("nombre") or f"Material {material['id_material']}")
+            self.material_model.appendRow([
+                id_item,
+                name_item,
+                QStandardItem(material.get("unidad_medida") or ""),
+                _number_item(material["stock"]),
+                _number_item(material["en_camino"]),
+                _number_item(material["requerido"]),
+                _number_item(material["faltante"], highlight=short),
+                QStandardItem(_format_date(material.get("primer_faltante"))),
+            ])
+
+        with_shortage = sum(1 for material in self.materials if material["faltante"] > 0)
+        summary = (f"Órdenes abiertas: <b>{plan.get('ordenes', 0)}</b> · "
+                   f"Materiales: <b>{len(self.materials)}</b> · "
+                   f"Con faltante: <b>{with_shortage}</b>")
+        if plan.get("ordenes_sin_receta"):
+            summary += (f" · <span style='color:{Theme.WARNING_COLOR}'>Órdenes sin receta: "
+                        f"<b>{plan['ordenes_sin_receta']}</b></span>")
+        self.summary_label.setText(summary)
+        self.status_bar.showMessage(f"Plan calculado al {_format_date(plan.get('fecha_referencia'))}")
+
+        if self.materials:
+            self.material_table.selectRow(0)
+
+    def show_periods(self, current, previous=None):
+        """Muestra las necesidades por periodo del material seleccionado"""
+        self.period_model.removeRows(0, self.period_model.rowCount())
+        if not current.isValid() or current.row() >= len(self.materials):
+            return
+        for period in self.materials[current.row()]["periodos"]:
+            self.period_model.appendRow([
+                QStandardItem(_format_date(period["periodo"])),
+                _number_item(period["requerido"]),
+                _number_item(period["recepciones"]),
+                _number_item(period["disponible"], highlight=period["disponible"] < 0),
+                _number_item(period["faltante"], highlight=period["faltante"] > 0),
+            ])
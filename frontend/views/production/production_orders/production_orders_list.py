@@ -5,14 +5,33 @@ from PyQt6.QtWidgets import (
     QAbstractItemView, QSplitter, QToolBar, QStatusBar, QSizePolicy
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QSortFilterProxyModel, QThread, QSize
-from PyQt6.QtGui import QIcon, QAction, QStandardItemModel, QStandardItem, QFont, QColor
+from PyQt6.QtGui import QIcon, QAction, QFont, QColor
 from utils.theme import Theme
+from utils.paged_table_model import PagedColumn, PagedTableModel
 from datetime import datetime
 
 from .production_orders_detail import ProductionOrderDetailView
 from .production_orders_form import ProductionOrderForm
 from models.production_order_model import ProductionOrder
 
+# Color del texto de la columna Estado
+ESTADO_COLORES = {
+    "planificada": Theme.INFO_COLOR,
+    "en_proceso": Theme.WARNING_COLOR,
+    "completada": Theme.SUCCESS_COLOR,
+    "cancelada": Theme.DANGER_COLOR
+}
+
+
+def _format_date(value):
+    """Convierte una fecha ISO del API a dd/mm/aaaa"""
+    if not value:
+        return "N/A"
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").strftime("%d/%m/%Y")
+    except ValueError:
+        return value
+
 
 class ProductionOrderListView(QWidget):
     """Vista de listado de órdenes de producción para ERP Pirelli"""
@@ -31,12 +50,23 @@ class ProductionOrderListView(QWidget):
         self.api_client.data_received.connect(self.on_data_loaded)
         self.api_client.request_error.connect(self.on_request_error)
 
-        # Modelo para la tabla
-        self.order_model = QStandardItemModel()
-        self.order_model.setHorizontalHeaderLabels([
-            "ID", "Producto", "Cantidad", "Fecha Inicio", "Fecha Fin", 
-            "Estado", "Estado Valor", "Usuario"
-        ])
+        # Modelo paginado para la tabla (las filas se piden al hacer scroll)
+        centered = Qt.AlignmentFlag.AlignCenter
+        right = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        self.order_model = PagedTableModel([
+            PagedColumn("ID", lambda o: o.get("id_orden_produccion"), align=centered),
+            PagedColumn("Producto", lambda o: (o.get("producto") or {}).get("nombre", "N/A")),
+            PagedColumn("Cantidad", lambda o: o.get("cantidad"), align=right),
+            PagedColumn("Fecha Inicio", lambda o: o.get("fecha_inicio"), display=_format_date),
+            PagedColumn("Fecha Fin", lambda o: o.get("fecha_fin"), display=_format_date),
+            PagedColumn("Estado", lambda o: o.get("estado"),
+                        display=lambda e: ProductionOrder.ESTADOS.get(e, "N/A"),
+                        color=ESTADO_COLORES.get),
+            PagedColumn("Usuario", lambda o: (o.get("usuario") or {}).get("nombre", "N/A")),
+        ], self._fetch_page)
+        self.order_model.page_loaded.connect(self.on_page_loaded)
+        # Las órdenes creadas o modificadas por otros usuarios se aplican al vuelo
+        self.api_client.changes.subscribe(("ordenes_produccion",), self.order_model.apply_changes, owner=self)
 
         # Modelo proxy para filtrado avanzado
         self.proxy_model = QSortFilterProxyModel()
@@ -158,29 +188,15 @@ class ProductionOrderListView(QWidget):
         """Método personalizado para determinar si una fila cumple con los filtros"""
         model = self.order_model
         
-        # Obtener valores de los filtros
+        # El estado se filtra en el servidor; la búsqueda, sobre las filas cargadas
         search_text = self.search_input.text().strip().lower()
-        status = self.status_filter.currentData()
-        
-        # Si no hay filtros activos, mostrar todas las filas
-        if not search_text and not status:
+        if not search_text:
             return True
-            
-        # Obtener valores de la fila actual
+
         try:
-            producto = model.item(source_row, 1).text().lower()
-            estado_valor = model.item(source_row, 6).text().lower()  # columna oculta con valor interno
-            
-            # Filtro de búsqueda (producto)
-            if search_text and search_text not in producto:
-                return False
-                
-            # Filtro de estado (compara valor interno exacto)
-            if status and status != estado_valor:
-                return False
-                
-            return True
-        except (AttributeError, IndexError):
+            producto = str(model.value(source_row, 1)).lower()
+            return search_text in producto
+        except IndexError:
             return True
 
     def on_search_changed(self, text):
@@ -190,7 +206,8 @@ class ProductionOrderListView(QWidget):
         self.status_bar.showMessage(f"Filtrando órdenes por: {text}" if text else "Sistema ERP Pirelli - Módulo de Producción v2.1")
 
     def on_status_changed(self, index):
-        """Maneja el cambio en el filtro de estado"""
+        """Maneja el cambio en el filtro de estado (se vuelve a consultar al API)"""
+        self.refresh_data()
         self._on_filters_changed()
 
     def _on_filters_changed(self):
@@ -207,81 +224,27 @@ class ProductionOrderListView(QWidget):
         self.status_bar.showMessage(msg)
 
     def refresh_data(self):
-        """Actualiza los datos de la tabla desde la API"""
+        """Recarga la primera página de órdenes desde la API"""
         self.status_bar.showMessage("Actualizando datos de órdenes de producción...")
-        self.api_client.get_production_orders()
-
-    def load_orders(self, orders):
-        """Carga las órdenes recibidas en la tabla y actualiza estadísticas"""
-        self.order_model.removeRows(0, self.order_model.rowCount())
-        count_planned = count_in_progress = count_completed = 0
-
-        for order in orders:
-            row = []
-
-            # ID
-            id_item = QStandardItem(str(order.id_orden_produccion))
-            id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            row.append(id_item)
-
-            # Producto
-            producto_name = order.producto.get('nombre', 'N/A') if hasattr(order, 'producto') and isinstance(order.producto, dict) else 'N/A'
-            producto_item = QStandardItem(producto_name)
-            row.append(producto_item)
-
-            # Cantidad
-            cantidad_item = QStandardItem(str(order.cantidad))
-            cantidad_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            row.append(cantidad_item)
-
-            # Fecha Inicio
-            fecha_inicio = order.fecha_inicio.strftime("%d/%m/%Y") if hasattr(order, 'fecha_inicio') and order.fecha_inicio else "N/A"
-            fecha_inicio_item = QStandardItem(fecha_inicio)
-            row.append(fecha_inicio_item)
-
-            # Fecha Fin
-            fecha_fin = order.fecha_fin.strftime("%d/%m/%Y") if hasattr(order, 'fecha_fin') and order.fecha_fin else "N/A"
-            fecha_fin_item = QStandardItem(fecha_fin)
-            row.append(fecha_fin_item)
-
-            # Estado (display)
-            estado_display = order.get_estado_display() if hasattr(order, 'get_estado_display') else "N/A"
-            estado_item = QStandardItem(estado_display)
-            
-            # Colorear según estado
-            if order.estado == "planificada":
-                estado_item.setForeground(QColor(Theme.INFO_COLOR))
-                count_planned += 1
-            elif order.estado == "en_proceso":
-                estado_item.setForeground(QColor(Theme.WARNING_COLOR))
-                count_in_progress += 1
-            elif order.estado == "completada":
-                estado_item.setForeground(QColor(Theme.SUCCESS_COLOR))
-                count_completed += 1
-            elif order.estado == "cancelada":
-                estado_item.setForeground(QColor(Theme.DANGER_COLOR))
-            row.append(estado_item)
-
-            # Estado (valor interno, columna oculta)
-            estado_valor_item = QStandardItem(order.estado)
-            row.append(estado_valor_item)
-
-            # Usuario
-            usuario_name = order.usuario.get('nombre', 'N/A') if hasattr(order, 'usuario') and isinstance(order.usuario, dict) else 'N/A'
-            usuario_item = QStandardItem(usuario_name)
-            row.append(usuario_item)
-
-            self.order_model.appendRow(row)
-            
-        # Ocultar columna de valor interno de estado
-        self.order_table.setColumnHidden(6, True)
+        self.order_model.reload()
+
+    def _fetch_page(self, cursor, limit, ids=None):
+        """Pide una página de órdenes (o las órdenes `ids`) con el filtro de estado actual"""
+        return self.api_client.get_page(
+            "ordenes_produccion", cursor, limit,
+            estado=self.status_filter.currentData(),
+            ids=",".join(map(str, ids)) if ids else None
+        )
 
-        total = len(orders)
-        self.total_label.setText(f"Total de órdenes: <b>{total}</b>")
-        self.planned_label.setText(f"Planificadas: <b>{count_planned}</b>")
-        self.in_progress_label.setText(f"En Proceso: <b>{count_in_progress}</b>")
-        self.completed_label.setText(f"Completadas: <b>{count_completed}</b>")
-        self.status_bar.showMessage(f"Se han cargado {total} órdenes de producción")
+    def on_page_loaded(self, loaded, has_more):
+        """Actualiza los totales con las órdenes cargadas hasta el momento"""
+        estados = self.order_model.column_values(5)
+        suffix = "+" if has_more else ""
+        self.total_label.setText(f"Total de órdenes: <b>{loaded}{suffix}</b>")
+        self.planned_label.setText(f"Planificadas: <b>{estados.count('planificada')}</b>")
+        self.in_progress_label.setText(f"En Proceso: <b>{estados.count('en_proceso')}</b>")
+        self.completed_label.setText(f"Completadas: <b>{estados.count('completada')}</b>")
+        self.status_bar.showMessage(f"Se han cargado {loaded} órdenes de producción")
 
     # Añade este método a la clase si no existe
     def get_estado_display(self, estado):
@@ -296,11 +259,7 @@ class ProductionOrderListView(QWidget):
 
     def on_data_loaded(self, data):
         """Maneja los datos cargados desde la API"""
-        if data.get("type") == "production_orders":
-            # Convertir los datos del API a objetos ProductionOrder
-            orders = [ProductionOrder.from_dict(item) for item in data.get("data", [])]
-            self.load_orders(orders)
-        elif data.get("type") == "production_order_created":
+        if data.get("type") == "production_order_created":
             QMessageBox.information(self, "Éxito", "Orden de producción creada correctamente")
             self.refresh_data()
         elif data.get("type") == "production_order_updated":
@@ -318,8 +277,7 @@ class ProductionOrderListView(QWidget):
     def on_row_double_clicked(self, index):
         """Maneja el doble clic en una fila"""
         mapped_index = self.proxy_model.mapToSource(index)
-        row = mapped_index.row()
-        order_id = int(self.order_model.item(row, 0).text())
+        order_id = self.order_model.value(mapped_index.row(), 0)
         self.order_selected.emit(order_id)
         self.on_view_order(order_id)
 
@@ -340,8 +298,7 @@ class ProductionOrderListView(QWidget):
         context_menu.addAction(delete_action)
 
         mapped_index = self.proxy_model.mapToSource(index)
-        row = mapped_index.row()
-        order_id = int(self.order_model.item(row, 0).text())
+        order_id = self.order_model.value(mapped_index.row(), 0)
 
         view_action.triggered.connect(lambda: self.on_view_order(order_id))
         edit_action.triggered.connect(lambda: self.on_edit_order(order_id))
@@ -379,19 +336,19 @@ class ProductionOrderListView(QWidget):
 
     def _get_order_by_id(self, order_id):
         """Busca una orden por su ID en el modelo actual"""
-        for row in range(self.order_model.rowCount()):
-            if int(self.order_model.item(row, 0).text()) == order_id:
-                from models.production_order_model import ProductionOrder
-                return ProductionOrder.from_dict({
-                    "id_orden_produccion": self.order_model.item(row, 0).text(),
-                    "id_producto": "",  # Se cargará del API en el formulario
-                    "cantidad": self.order_model.item(row, 2).text(),
-                    "fecha_inicio": self.order_model.item(row, 3).text(),
-                    "fecha_fin": self.order_model.item(row, 4).text(),
-                    "estado": self.order_model.item(row, 6).text(),
-                    "id_usuario": ""  # Se cargará del API en el formulario
-                })
-        return None
+        row = self.order_model.find_row(0, order_id)
+        if row < 0:
+            return None
+        value = self.order_model.value
+        return ProductionOrder.from_dict({
+            "id_orden_produccion": value(row, 0),
+            "id_producto": "",  # Se cargará del API en el formulario
+            "cantidad": value(row, 2),
+            "fecha_inicio": value(row, 3),
+            "fecha_fin": value(row, 4),
+            "estado": value(row, 5),
+            "id_usuario": ""  # Se cargará del API en el formulario
+        })
 
     def _show_edit_form(self, order):
         """Muestra el formulario de edición con los datos de la orden"""
@@ -6,6 +6,8 @@ from views.production.production_recipe.production_recipe_list import Production
 from views.production.quality_control.quality_control_list import QualityControlListView
 from views.production.production_assets.production_assets_list import ProductionAssetListView
 from views.production.maintenance.maintenance_list import MaintenanceListView
+from views.production.mrp.mrp_view import MrpView
+from views.production.scheduling.gantt_view import GanttView
 
 class ProductionWindow(QMainWindow):
     def __init__(self, api_client):
@@ -22,6 +24,8 @@ class ProductionWindow(QMainWindow):
         self.tab_widget.addTab(QualityControlListView(api_client), "Control de Calidad")
         self.tab_widget.addTab(ProductionAssetListView(api_client), "Activos de Producción")
         self.tab_widget.addTab(MaintenanceListView(api_client), "Mantenimiento")
+        self.tab_widget.addTab(MrpView(api_client), "Plan de Materiales (MRP)")
+        self.tab_widget.addTab(GanttView(api_client), "Programación (Gantt)")
 
     def center_window(self):
         screen = self.screen().availableGeometry()
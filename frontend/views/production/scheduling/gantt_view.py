@@ -0,0 +1,233 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QDateEdit,
+    QGraphicsScene, QGraphicsView, QGraphicsRectItem, QGraphicsSimpleTextItem, QStatusBar
+)
+from PyQt6.QtCore import Qt, QDate, QRectF, QTimer
+from PyQt6.QtGui import QBrush, QColor, QPen, QPainter
+from utils.theme import Theme
+
+# Horizonte visible -> días
+HORIZONTES = [("4 semanas", 28), ("3 meses", 91), ("6 meses", 182), ("1 año", 365)]
+
+ROW_HEIGHT = 28
+BAR_MARGIN = 5
+LABEL_WIDTH = 180
+HEADER_HEIGHT = 36
+# Píxeles por día según el horizonte (el diagrama se desplaza si no cabe)
+MIN_DAY_WIDTH = 4
+MAX_DAY_WIDTH = 32
+
+# Tablas cuyos cambios alteran el plan
+SCHEDULE_TABLES = ("ordenes_produccion", "activos_produccion", "mantenimiento")
+# Milisegundos que se agrupan los cambios antes de pedir de nuevo el plan
+LIVE_REFRESH_DELAY = 2000
+
+
+class GanttView(QWidget):
+    """
+    Diagrama de Gantt de la programación de la producción.
+
+    Cada fila es un activo programable; las barras son las órdenes asignadas
+    (en proceso resaltadas) y las franjas grises los días de mantenimiento.
+    El plan lo calcula el servidor con capacidad finita.
+    """
+
+    def __init__(self, api_client):
+        super().__init__()
+        Theme.apply_window_light_theme(self)
+        self.api_client = api_client
+        self.future = None
+
+        self.live_refresh_timer = QTimer(self)
+        self.live_refresh_timer.setSingleShot(True)
+        self.live_refresh_timer.setInterval(LIVE_REFRESH_DELAY)
+        self.live_refresh_timer.timeout.connect(self.refresh_data)
+        self.api_client.changes.subscribe(SCHEDULE_TABLES, self.on_remote_changes, owner=self)
+
+        self.init_ui()
+        self.refresh_data()
+
+    def init_ui(self):
+        """Inicializa la interfaz de usuario"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        title_label = QLabel("Programación de la Producción")
+        title_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        main_layout.addWidget(title_label)
+
+        toolbar_layout = QHBoxLayout()
+        self.start_edit = QDateEdit(QDate.currentDate())
+        self.start_edit.setCalendarPopup(True)
+        self.start_edit.setDisplayFormat("dd/MM/yyyy")
+        self.start_edit.dateChanged.connect(self.refresh_data)
+
+        self.horizon_combo = QComboBox()
+        for label, days in HORIZONTES:
+            self.horizon_combo.addItem(label, days)
+        self.horizon_combo.currentIndexChanged.connect(self.refresh_data)
+
+        self.refresh_btn = QPushButton("Actualizar")
+        self.refresh_btn.clicked.connect(self.refresh_data)
+        self.recalculate_btn = QPushButton("Recalcular plan")
+        self.recalculate_btn.setToolTip("Recalcula el plan completo en el servidor")
+        self.recalculate_btn.clicked.connect(self.recalculate)
+
+        toolbar_layout.addWidget(QLabel("Desde:"))
+        toolbar_layout.addWidget(self.start_edit)
+        toolbar_layout.addWidget(QLabel("Horizonte:"))
+        toolbar_layout.addWidget(self.horizon_combo)
+        toolbar_layout.addStretch()
+        toolbar_layout.addWidget(self.refresh_btn)
+        toolbar_layout.addWidget(self.recalculate_btn)
+        main_layout.addLayout(toolbar_layout)
+
+        self.scene = QGraphicsScene(self)
+        self.graphics_view = QGraphicsView(self.scene)
+        self.graphics_view.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        self.graphics_view.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        main_layout.addWidget(self.graphics_view)
+
+        self.summary_label = QLabel()
+        main_layout.addWidget(self.summary_label)
+
+        self.status_bar = QStatusBar()
+        main_layout.addWidget(self.status_bar)
+
+    # --- Datos ---
+
+    def _window(self):
+        start = self.start_edit.date()
+        return start, start.addDays(self.horizon_combo.currentData() - 1)
+
+    def refresh_data(self):
+        """Pide al API el plan de la ventana de fechas visible"""
+        start, end = self._window()
+        self.status_bar.showMessage("Cargando programación...")
+        self.future = self.api_client.get_schedule_async(
+            start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd")
+        )
+        self.future.add_done_callback(self.load_plan)
+
+    def recalculate(self):
+        """Recalcula el plan completo y lo vuelve a mostrar"""
+        self.recalculate_btn.setEnabled(False)
+        self.status_bar.showMessage("Recalculando el plan completo...")
+        future = self.api_client.post("/programacion/recalcular")
+
+        def done(f):
+            self.recalculate_btn.setEnabled(True)
+            if not f.cancelled() and f.error() is None:
+                self.refresh_data()
+
+        future.add_done_callback(done)
+
+    def on_remote_changes(self, changes):
+        """Programa una actualización tras cambios de órdenes, activos o mantenimientos"""
+        if not self.live_refresh_timer.isActive():
+            self.live_refresh_timer.start()
+
+    def load_plan(self, future):
+        if future.cancelled():
+            return
+        plan = future.result()
+        if plan is None:
+            self.status_bar.showMessage(f"No se pudo cargar la programación: {future.error()}")
+            return
+        self.draw(plan)
+
+        tasks = sum(len(asset["tareas"]) for asset in plan["activos"])
+        summary = (f"Órdenes programadas: <b>{plan['ordenes']}</b> · "
+                   f"En la ventana: <b>{tasks}</b> · "
+                   f"Activos: <b>{len(plan['activos'])}</b>")
+        if plan.get("fin_plan"):
+            summary += f" · Fin del plan: <b>{QDate.fromString(plan['fin_plan'], 'yyyy-MM-dd').toString('dd/MM/yyyy')}</b>"
+        if plan.get("sin_asignar"):
+            summary += (f" · <span style='color:{Theme.DANGER_COLOR}'>Sin activo disponible: "
+                        f"<b>{len(plan['sin_asignar'])}</b></span>")
+        self.summary_label.setText(summary)
+
+        update = plan.get("actualizacion") or {}
+        if update.get("tipo") == "incremental":
+            detail = f"replan incremental de {update.get('ordenes_recalculadas')} órdenes"
+        else:
+            detail = "plan completo"
+        self.status_bar.showMessage(f"Programación actualizada ({detail}, {update.get('ms', 0)} ms)")
+
+    # --- Dibujo ---
+
+    def draw(self, plan):
+        """Dibuja las filas de activos, las órdenes y los mantenimientos de la ventana"""
+        self.scene.clear()
+        start, end = self._window()
+        days = start.daysTo(end) + 1
+        available = max(self.graphics_view.viewport().width() - LABEL_WIDTH - 10, 200)
+        day_width = min(max(available / days, MIN_DAY_WIDTH), MAX_DAY_WIDTH)
+        width = days * day_width
+        assets = plan["activos"]
+        height = HEADER_HEIGHT + len(assets) * ROW_HEIGHT
+
+        def x_of(iso_date):
+            offset = start.daysTo(QDate.fromString(iso_date, "yyyy-MM-dd"))
+            return LABEL_WIDTH + min(max(offset, 0), days) * day_width
+
+        grid_pen = QPen(QColor("#DDDDDD"))
+        self._draw_header(start, days, day_width, height, grid_pen)
+
+        maintenance_brush = QBrush(QColor("#9E9E9E"), Qt.BrushStyle.BDiagPattern)
+        task_brush = QBrush(QColor(Theme.INFO_COLOR))
+        running_brush = QBrush(QColor(Theme.SECONDARY_COLOR))
+        no_pen = QPen(Qt.PenStyle.NoPen)
+
+        for row, asset in enumerate(assets):
+            top = HEADER_HEIGHT + row * ROW_HEIGHT
+            label = QGraphicsSimpleTextItem(f"{asset['nombre']} ({asset['capacidad_diaria']}/día)")
+            label.setPos(5, top + 6)
+            label.setToolTip(f"Activo #{asset['id_activo']}")
+            self.scene.addItem(label)
+            self.scene.addLine(0, top + ROW_HEIGHT, LABEL_WIDTH + width, top + ROW_HEIGHT, grid_pen)
+
+            for day in asset["mantenimientos"]:
+                x = x_of(day)
+                item = self.scene.addRect(QRectF(x, top, day_width, ROW_HEIGHT), no_pen, maintenance_brush)
+                item.setToolTip(f"Mantenimiento {QDate.fromString(day, 'yyyy-MM-dd').toString('dd/MM/yyyy')}")
+
+            for task in asset["tareas"]:
+                x1 = x_of(task["inicio"])
+                x2 = x_of(QDate.fromString(task["fin"], "yyyy-MM-dd").addDays(1).toString("yyyy-MM-dd"))
+                bar = QGraphicsRectItem(QRectF(x1, top + BAR_MARGIN, max(x2 - x1, 2),
+                                               ROW_HEIGHT - 2 * BAR_MARGIN))
+                bar.setBrush(running_brush if task["en_proceso"] else task_brush)
+                bar.setPen(QPen(QColor("#FFFFFF")))
+                bar.setToolTip(
+                    f"Orden #{task['id_orden_produccion']} · {task.get('producto') or 'Producto'}\n"
+                    f"Cantidad: {task['cantidad']}\n"
+                    f"{QDate.fromString(task['inicio'], 'yyyy-MM-dd').toString('dd/MM/yyyy')} - "
+                    f"{QDate.fromString(task['fin'], 'yyyy-MM-dd').toString('dd/MM/yyyy')}"
+                    + ("\nEn proceso" if task["en_proceso"] else "")
+                )
+                self.scene.addItem(bar)
+
+        # Línea de hoy
+        today = start.daysTo(QDate.currentDate())
+        if 0 <= today < days:
+            x = LABEL_WIDTH + today * day_width
+            self.scene.addLine(x, HEADER_HEIGHT, x, height, QPen(QColor(Theme.DANGER_COLOR), 2))
+        self.scene.setSceneRect(0, 0, LABEL_WIDTH + width, height)
+
+    def _draw_header(self, start, days, day_width, height, grid_pen):
+        """Cabecera con los meses y una marca por día o por semana según el espacio"""
+        step = 1 if day_width >= 18 else 7
+        for offset in range(days):
+            day = start.addDays(offset)
+            x = LABEL_WIDTH + offset * day_width
+            if day.day() == 1 or offset == 0:
+                month = QGraphicsSimpleTextItem(day.toString("MMM yyyy"))
+                month.setPos(x + 2, 2)
+                self.scene.addItem(month)
+            if step == 1 or day.dayOfWeek() == 1:
+                self.scene.addLine(x, HEADER_HEIGHT - 14, x, height, grid_pen)
+                tick = QGraphicsSimpleTextItem(day.toString("d"))
+                tick.setPos(x + 2, HEADER_HEIGHT - 16)
+                self.scene.addItem(tick)
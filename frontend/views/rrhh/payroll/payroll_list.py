@@ -46,11 +46,17 @@ class PayrollListView(QWidget):
         add_btn.setIcon(QIcon("resources/icons/add.png"))
         add_btn.clicked.connect(self.add_payroll)
 
+        # Botón para calcular la nómina de todo un periodo en el servidor
+        run_btn = QPushButton("Calcular periodo")
+        run_btn.setToolTip("Genera la nómina de todos los empleados activos de un periodo")
+        run_btn.clicked.connect(self.run_period)
+
         # Organizar la barra de herramientas
         toolbar_layout.addWidget(QLabel("Periodo:"))
         toolbar_layout.addWidget(self.period_filter)
         toolbar_layout.addStretch()
         toolbar_layout.addWidget(self.search_input)
+        toolbar_layout.addWidget(run_btn)
         toolbar_layout.addWidget(add_btn)
 
         # Tabla de nóminas
@@ -173,6 +179,23 @@ class PayrollListView(QWidget):
         except Exception as e:
             self.show_error(f"Error al abrir el formulario: {e}")
 
+    def run_period(self):
+        """Abre el cálculo de nómina por periodo y recarga la tabla al terminar"""
+        try:
+            from .payroll_run_dialog import PayrollRunDialog
+            dlg = PayrollRunDialog(self.api_client, self)
+            dlg.run_completed.connect(self.on_run_completed)
+            dlg.exec()
+        except Exception as e:
+            self.show_error(f"Error al abrir el cálculo de nómina: {e}")
+
+    def on_run_completed(self, summary):
+        """Muestra el periodo calculado en la tabla"""
+        self.refresh_data()
+        idx = self.period_filter.findText(summary.get("periodo", ""))
+        if idx >= 0:
+            self.period_filter.setCurrentIndex(idx)
+
     def view_payroll(self, pr):
         """Muestra los detalles de una nómina seleccionada"""
         try:
@@ -0,0 +1,128 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QLabel, QCheckBox, QDateEdit, QPushButton,
+    QProgressBar, QDialogButtonBox
+)
+from PyQt6.QtCore import QDate, QTimer, pyqtSignal
+
+# Milisegundos entre consultas del progreso del cálculo
+POLL_INTERVAL = 500
+
+
+class PayrollRunDialog(QDialog):
+    """
+    Cálculo de la nómina de un periodo para todos los empleados activos.
+
+    El servidor hace el cálculo en segundo plano; el diálogo consulta su
+    progreso periódicamente y muestra el resumen al terminar.
+    """
+
+    # Emitida con el resumen cuando el cálculo termina correctamente
+    run_completed = pyqtSignal(dict)
+
+    def __init__(self, api_client, parent=None):
+        super().__init__(parent)
+        self.api_client = api_client
+        self.run_id = None
+        self.future = None
+
+        self.setWindowTitle("Calcular nómina del periodo")
+        self.setMinimumWidth(440)
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        today = QDate.currentDate()
+        self.period_edit = QDateEdit(today)
+        self.period_edit.setDisplayFormat("MM/yyyy")
+        self.period_edit.dateChanged.connect(self.update_payment_date)
+        form.addRow("Periodo:", self.period_edit)
+
+        self.payment_edit = QDateEdit()
+        self.payment_edit.setCalendarPopup(True)
+        self.payment_edit.setDisplayFormat("dd/MM/yyyy")
+        form.addRow("Fecha de pago:", self.payment_edit)
+
+        self.replace_check = QCheckBox("Recalcular las nóminas ya generadas del periodo")
+        form.addRow("", self.replace_check)
+        layout.addLayout(form)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.hide()
+        layout.addWidget(self.progress)
+
+        self.status_label = QLabel("Se calcularán las nóminas de todos los empleados activos "
+                                   "con sus ausencias y tardanzas del periodo.")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        buttons = QDialogButtonBox()
+        self.run_button = QPushButton("Calcular")
+        self.run_button.clicked.connect(self.start_run)
+        buttons.addButton(self.run_button, QDialogButtonBox.ButtonRole.AcceptRole)
+        buttons.addButton("Cerrar", QDialogButtonBox.ButtonRole.RejectRole)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setSingleShot(True)
+        self.poll_timer.setInterval(POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.poll)
+
+        self.update_payment_date(self.period_edit.date())
+
+    def update_payment_date(self, date):
+        """Propone como fecha de pago el último día del periodo"""
+        self.payment_edit.setDate(QDate(date.year(), date.month(), date.daysInMonth()))
+
+    def start_run(self):
+        periodo = self.period_edit.date().toString("yyyy-MM")
+        self.run_button.setEnabled(False)
+        self.progress.setValue(0)
+        self.progress.show()
+        self.status_label.setText(f"Enviando el cálculo de {periodo}...")
+        self.future = self.api_client.start_payroll_run_async(
+            periodo, self.payment_edit.date().toString("yyyy-MM-dd"), self.replace_check.isChecked()
+        )
+        self.future.add_done_callback(self.show_status)
+
+    def poll(self):
+        self.future = self.api_client.get_payroll_run_async(self.run_id)
+        self.future.add_done_callback(self.show_status)
+
+    def show_status(self, future):
+        if future.cancelled():
+            return
+        run = future.result()
+        if run is None:
+            self.finish(f"No se pudo calcular la nómina: {future.error()}")
+            return
+
+        self.run_id = run["id_proceso"]
+        self.progress.setValue(run["progreso"])
+        if run["estado"] == "completado":
+            summary = run["resultado"]
+            text = (f"Nómina de {summary['periodo']} calculada en {run['duracion_ms']} ms: "
+                    f"<b>{summary['empleados']}</b> empleados, neto total "
+                    f"<b>{summary['total_neto']:,.2f}</b>")
+            if summary["omitidos"]:
+                text += f"<br>{summary['omitidos']} empleados ya tenían nómina del periodo y se omitieron"
+            self.finish(text)
+            self.run_completed.emit(summary)
+        elif run["estado"] == "error":
+            self.finish(f"Error al calcular la nómina: {run['error']}")
+        else:
+            self.status_label.setText(run["mensaje"])
+            self.poll_timer.start()
+
+    def finish(self, text):
+        self.status_label.setText(text)
+        self.run_button.setEnabled(True)
+        self.future = None
+
+    def reject(self):
+        # El cálculo sigue en el servidor; solo se deja de consultar su progreso
+        self.poll_timer.stop()
+        if self.future is not None and not self.future.done():
+            self.api_client.pool.cancel(self.future)
+        super().reject()
@@ -3,12 +3,23 @@ from PyQt6.QtWidgets import (
     QPushButton, QLineEdit, QComboBox, QMessageBox, QMenu, QStatusBar
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QSortFilterProxyModel
-from PyQt6.QtGui import QIcon, QStandardItemModel, QStandardItem, QColor
+from PyQt6.QtGui import QIcon
 from utils.theme import Theme
+from utils.paged_table_model import PagedColumn, PagedTableModel
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Color del texto de la columna Estado
+ESTADO_COLORES = {
+    "pendiente": Theme.WARNING_COLOR,
+    "completada": Theme.SUCCESS_COLOR,
+    "cancelada": Theme.DANGER_COLOR
+}
+
+# Campos que necesita el listado (el API omite el resto, como las líneas de detalle)
+LIST_FIELDS = "id_venta,cliente,fecha,total,estado"
+
 class SalesListView(QWidget):
     """Vista de listado de ventas para ERP"""
 
@@ -21,7 +32,6 @@ class SalesListView(QWidget):
         Theme.apply_window_light_theme(self)
         
         self.api_client = api_client
-        self.last_sales = []
         
         # Configurar modelo de datos
         self._setup_models()
@@ -33,10 +43,21 @@ class SalesListView(QWidget):
 
     def _setup_models(self):
         """Configura los modelos de datos para la tabla"""
-        self.sales_model = QStandardItemModel()
-        self.sales_model.setHorizontalHeaderLabels([
-            "ID", "Cliente", "Fecha", "Total", "Estado", "Valor Estado", "Creado por"
-        ])
+        centered = Qt.AlignmentFlag.AlignCenter
+        right = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        self.sales_model = PagedTableModel([
+            PagedColumn("ID", lambda v: v.get("id_venta"), align=centered),
+            PagedColumn("Cliente", lambda v: (v.get("cliente") or {}).get("nombre", "N/A")),
+            PagedColumn("Fecha", lambda v: v.get("fecha", "")),
+            PagedColumn("Total", lambda v: float(v.get("total", 0) or 0),
+                        display=lambda total: f"${total:,.2f}", align=right),
+            PagedColumn("Estado", lambda v: (v.get("estado") or "").lower(),
+                        display=str.capitalize, align=centered, color=ESTADO_COLORES.get),
+            PagedColumn("Creado por", lambda v: v.get("vendedor", "N/A")),
+        ], self._fetch_page)
+        self.sales_model.page_loaded.connect(self.on_page_loaded)
+        # Las ventas creadas o modificadas por otros usuarios se aplican al vuelo
+        self.api_client.changes.subscribe(("ventas",), self.sales_model.apply_changes, owner=self)
         
         # Modelo proxy para filtrado
         self.proxy_model = QSortFilterProxyModel()
@@ -115,9 +136,6 @@ class SalesListView(QWidget):
         self.sales_table.customContextMenuRequested.connect(self.show_context_menu)
         self.sales_table.doubleClicked.connect(self.on_row_double_clicked)
         
-        # Ocultar columnas internas
-        self.sales_table.setColumnHidden(5, True)  # Valor estado
-        
         main_layout.addWidget(self.sales_table)
 
         # Labels de totales
@@ -146,30 +164,16 @@ class SalesListView(QWidget):
         """Método personalizado para determinar si una fila cumple con los filtros"""
         model = self.sales_model
         
-        # Obtener valores de los filtros
+        # El estado se filtra en el servidor; la búsqueda, sobre las filas cargadas
         search_text = self.search_input.text().strip().lower()
-        status = self.status_filter.currentData()
-        
-        # Si no hay filtros activos, mostrar todas las filas
-        if not search_text and not status:
+        if not search_text:
             return True
-            
-        # Obtener valores de la fila actual
+
         try:
-            sale_id = model.item(source_row, 0).text().lower()
-            cliente = model.item(source_row, 1).text().lower()
-            estado_valor = model.item(source_row, 5).text().lower()
-            
-            # Filtro de búsqueda (cliente o ID)
-            if search_text and not (search_text in cliente or search_text in sale_id):
-                return False
-                
-            # Filtro de estado
-            if status and status != estado_valor:
-                return False
-                
-            return True
-        except (AttributeError, IndexError):
+            sale_id = str(model.value(source_row, 0))
+            cliente = str(model.value(source_row, 1)).lower()
+            return search_text in cliente or search_text in sale_id
+        except IndexError:
             return True
 
     def on_search_changed(self, text):
@@ -179,7 +183,8 @@ class SalesListView(QWidget):
         self.status_bar.showMessage(f"Filtrando ventas por: {text}" if text else "Sistema ERP - Módulo de Ventas")
 
     def on_status_changed(self, index):
-        """Maneja el cambio en el filtro de estado"""
+        """Maneja el cambio en el filtro de estado (se vuelve a consultar al API)"""
+        self.refresh_data()
         self._on_filters_changed()
 
     def _on_filters_changed(self):
@@ -210,72 +215,33 @@ class SalesListView(QWidget):
         self.sales_table.customContextMenuRequested.connect(self.show_context_menu)
 
     def refresh_data(self):
-        """Solicita ventas al API"""
+        """Recarga la primera página de ventas desde el API"""
         self.status_bar.showMessage("Cargando ventas...")
-        try:
-            sales_data = self.api_client.get_sales()
-            self.last_sales = sales_data if isinstance(sales_data, list) else sales_data.get('ventas', [])
-            self.load_sales(self.last_sales)
-        except Exception as e:
-            self.show_error(str(e))
-
-    def load_sales(self, sales):
-        """Carga las ventas en la tabla"""
-        self.sales_model.removeRows(0, self.sales_model.rowCount())
-        
-        if not sales:
+        self.sales_model.reload()
+
+    def _fetch_page(self, cursor, limit, ids=None):
+        """Pide una página de ventas (o las ventas `ids`) con el filtro de estado actual"""
+        return self.api_client.get_page(
+            "ventas", cursor, limit,
+            estado=self.status_filter.currentData(),
+            fields=LIST_FIELDS,
+            ids=",".join(map(str, ids)) if ids else None
+        )
+
+    def on_page_loaded(self, loaded, has_more):
+        """Actualiza el resumen con las ventas cargadas hasta el momento"""
+        if not loaded:
             self.status_bar.showMessage("No se encontraron ventas")
-            return
-            
-        count_pendiente = count_completada = count_cancelada = 0
-        
-        for sale in sales:
-            # Contar por estado
-            estado = sale.get("estado", "").lower()
-            if estado == "pendiente":
-                count_pendiente += 1
-            elif estado == "completada":
-                count_completada += 1
-            elif estado == "cancelada":
-                count_cancelada += 1
-                
-            # Crear fila
-            total = float(sale.get('total', 0) or 0)
-            formatted_total = f"${total:,.2f}"
-            
-            row = [
-                QStandardItem(str(sale.get("id_venta", ""))),
-                QStandardItem(sale.get("cliente_nombre", "N/A")),
-                QStandardItem(sale.get("fecha", "")),
-                QStandardItem(formatted_total),
-                QStandardItem(sale.get("estado", "").capitalize()),
-                QStandardItem(estado),
-                QStandardItem(sale.get("usuario_nombre", "N/A"))
-            ]
-            
-            # Formatear celdas
-            row[0].setTextAlignment(Qt.AlignmentFlag.AlignCenter)  # ID
-            row[3].setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)  # Total
-            row[4].setTextAlignment(Qt.AlignmentFlag.AlignCenter)  # Estado
-            
-            # Color por estado
-            if estado == "pendiente":
-                row[4].setForeground(QColor(Theme.WARNING_COLOR))
-            elif estado == "completada":
-                row[4].setForeground(QColor(Theme.SUCCESS_COLOR))
-            elif estado == "cancelada":
-                row[4].setForeground(QColor(Theme.DANGER_COLOR))
-            
-            self.sales_model.appendRow(row)
-        
-        # Actualizar resumen
-        total = len(sales)
-        self.total_label.setText(f"Total: <b>{total}</b>")
-        self.pending_label.setText(f"Pendientes: <b>{count_pendiente}</b>")
-        self.completed_label.setText(f"Completadas: <b>{count_completada}</b>")
-        self.canceled_label.setText(f"Canceladas: <b>{count_cancelada}</b>")
-        
-        self.status_bar.showMessage(f"Cargadas {total} ventas")
+
+        estados = self.sales_model.column_values(4)
+        suffix = "+" if has_more else ""
+        self.total_label.setText(f"Total: <b>{loaded}{suffix}</b>")
+        self.pending_label.setText(f"Pendientes: <b>{estados.count('pendiente')}</b>")
+        self.completed_label.setText(f"Completadas: <b>{estados.count('completada')}</b>")
+        self.canceled_label.setText(f"Canceladas: <b>{estados.count('cancelada')}</b>")
+
+        if loaded:
+            self.status_bar.showMessage(f"Cargadas {loaded} ventas")
 
     def show_context_menu(self, position):
         """Muestra el menú contextual para una venta"""
@@ -285,8 +251,8 @@ class SalesListView(QWidget):
             
         # Obtener la venta seleccionada
         mapped_index = self.proxy_model.mapToSource(index)
-        sale_id = int(self.sales_model.item(mapped_index.row(), 0).text())
-        sale_estado = self.sales_model.item(mapped_index.row(), 5).text()
+        sale_id = self.sales_model.value(mapped_index.row(), 0)
+        sale_estado = self.sales_model.value(mapped_index.row(), 4)
         
         menu = QMenu(self)
         
@@ -331,12 +297,8 @@ class SalesListView(QWidget):
     def delete_sale(self, sale_id):
         """Elimina una venta con confirmación"""
         # Buscar la venta para mostrar información en el mensaje
-        for sale in self.last_sales:
-            if sale.get("id_venta") == sale_id:
-                cliente_nombre = sale.get("cliente_nombre", "Cliente")
-                break
-        else:
-            cliente_nombre = "Cliente"
+        row = self.sales_model.find_row(0, sale_id)
+        cliente_nombre = self.sales_model.value(row, 1) if row >= 0 else "Cliente"
         
         answer = QMessageBox.question(
             self, "Eliminar venta",
@@ -354,7 +316,7 @@ class SalesListView(QWidget):
     def on_row_double_clicked(self, index):
         """Maneja el doble clic en una fila"""
         mapped_index = self.proxy_model.mapToSource(index)
-        sale_id = int(self.sales_model.item(mapped_index.row(), 0).text())
+        sale_id = self.sales_model.value(mapped_index.row(), 0)
         self.view_sale(sale_id)
 
     def show_error(self, msg):
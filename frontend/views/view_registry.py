@@ -0,0 +1,69 @@
+"""
+Registro de vistas que se importan la primera vez que se abren.
+
+Cada ventana de módulo (y el dashboard, que arrastra QtCharts) importa a su
+vez todas sus listas, formularios y detalles, así que importarlas al cargar
+main_window retrasa la pantalla de login. Aquí solo se guarda el módulo y
+la clase de cada vista; view_class() la importa al pedirla y prefetch()
+adelanta las importaciones en un hilo mientras el usuario no las necesita.
+"""
+import importlib
+import logging
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Nombre de la vista: (módulo, clase). Los nombres de las ventanas de módulo
+# coinciden con el atributo de MainWindow que guarda la ventana abierta.
+VIEWS = {
+    "dashboard": ("views.dashboard_view", "DashboardView"),
+    "rrhh_window": ("views.rrhh.rrhh_window", "RecursosHumanosWindow"),
+    "inventario_window": ("views.inventory.inventory_window", "InventoryWindow"),
+    "production_window": ("views.production.production_window", "ProductionWindow"),
+    "ventas_window": ("views.sales.sales_window", "VentasWindow"),
+    "management_window": ("views.management.management_window", "GestionWindow"),
+}
+
+MODULE_WINDOWS = tuple(name for name in VIEWS if name != "dashboard")
+
+_prefetched = set()
+_lock = threading.Lock()
+
+
+def view_class(name):
+    """Clase de la vista indicada; importa su módulo si aún no se ha importado"""
+    module_name, class_name = VIEWS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def is_loaded(name):
+    return VIEWS[name][0] in sys.modules
+
+
+def prefetch(names=None):
+    """
+    Importa en un hilo en segundo plano los módulos de las vistas indicadas
+    (todas por defecto). Solo importa módulos: los widgets se siguen creando
+    en el hilo de la interfaz al abrir cada vista.
+
+    Returns:
+        threading.Thread | None: El hilo lanzado, o None si no queda nada por importar
+    """
+    with _lock:
+        pending = [name for name in (names or VIEWS) if name not in _prefetched]
+        _prefetched.update(pending)
+    if not pending:
+        return None
+
+    def run():
+        for name in pending:
+            try:
+                view_class(name)
+            except Exception:
+                # El error volverá a producirse, y a mostrarse, al abrir la vista
+                logger.exception("No se pudo precargar la vista %s", name)
+
+    thread = threading.Thread(target=run, name="prefetch-vistas", daemon=True)
+    thread.start()
+    return thread